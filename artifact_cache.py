@@ -0,0 +1,185 @@
+"""
+On-disk cache of extracted GitHub Actions artifacts.
+
+Lint and build queries for the same workflow run download the same artifact
+again and again. The cache keeps each artifact extracted in its own directory,
+keyed by repository and artifact id, so concurrent queries for different
+repositories never share an output directory and repeated queries skip the
+download. Archives are streamed to disk instead of being held in memory, and
+the cache is bounded by size, evicting the least recently used artifacts.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+from collections.abc import Callable
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Total bytes of extracted artifacts kept on disk
+DEFAULT_MAX_ARTIFACT_CACHE_BYTES = 1024 * 1024 * 1024
+
+# Name of the per-artifact metadata file, written last to mark completion
+METADATA_FILE = "artifact.json"
+
+# Directory inside an entry holding the extracted files
+FILES_DIR = "files"
+
+
+def extract_archive(archive: Path, extract_dir: Path) -> int:
+    """Extract a zip archive.
+
+    Args:
+        archive: Zip file to extract
+        extract_dir: Destination directory
+
+    Returns:
+        Total uncompressed size in bytes
+    """
+    with zipfile.ZipFile(archive) as z:
+        z.extractall(extract_dir)
+        return sum(member.file_size for member in z.infolist())
+
+
+class ArtifactCache:
+    """Size-bounded LRU cache of extracted artifacts."""
+
+    def __init__(
+        self, cache_dir: Path, max_bytes: int = DEFAULT_MAX_ARTIFACT_CACHE_BYTES
+    ):
+        """Initialize the artifact cache.
+
+        Args:
+            cache_dir: Directory holding one subdirectory per artifact
+            max_bytes: Size bound of all extracted artifacts together
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._key_locks: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(repo_name: str, artifact_id: str | int) -> str:
+        return hashlib.sha256(f"{repo_name}\0{artifact_id}".encode()).hexdigest()
+
+    def _entry_dir(self, key: str) -> Path:
+        return self.cache_dir / key
+
+    def get(self, repo_name: str, artifact_id: str | int) -> Path | None:
+        """Get the extracted files of a cached artifact.
+
+        Args:
+            repo_name: GitHub repository in owner/name form
+            artifact_id: Artifact id
+
+        Returns:
+            Directory of the extracted files, or None if not cached
+        """
+        entry_dir = self._entry_dir(self._key(repo_name, artifact_id))
+        metadata = entry_dir / METADATA_FILE
+        if not metadata.is_file():
+            return None
+        try:
+            os.utime(metadata)
+        except OSError:
+            return None
+        return entry_dir / FILES_DIR
+
+    def get_or_fetch(
+        self,
+        repo_name: str,
+        artifact_id: str | int,
+        download: Callable[[Path], None],
+    ) -> Path:
+        """Get a cached artifact, downloading and extracting it if needed.
+
+        Concurrent callers for the same artifact wait for a single download.
+
+        Args:
+            repo_name: GitHub repository in owner/name form
+            artifact_id: Artifact id
+            download: Writes the artifact's zip archive to the given path
+
+        Returns:
+            Directory of the extracted files
+        """
+        key = self._key(repo_name, artifact_id)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            cached = self.get(repo_name, artifact_id)
+            if cached is not None:
+                logger.info(f"Using cached artifact {artifact_id} of {repo_name}")
+                return cached
+
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            staging = Path(tempfile.mkdtemp(dir=self.cache_dir, prefix=".staging-"))
+            try:
+                archive = staging / "artifact.zip"
+                download(archive)
+                size = extract_archive(archive, staging / FILES_DIR)
+                archive.unlink()
+                (staging / METADATA_FILE).write_text(
+                    json.dumps(
+                        {
+                            "repo": repo_name,
+                            "artifact_id": str(artifact_id),
+                            "size": size,
+                            "created_at": time.time(),
+                        }
+                    )
+                )
+                entry_dir = self._entry_dir(key)
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                os.replace(staging, entry_dir)
+            except BaseException:
+                shutil.rmtree(staging, ignore_errors=True)
+                raise
+
+        logger.info(f"Cached artifact {artifact_id} of {repo_name} ({size} bytes)")
+        self._evict(keep=key)
+        return entry_dir / FILES_DIR
+
+    def total_size(self) -> int:
+        """Get the extracted size of all cached artifacts in bytes."""
+        return sum(size for _, size, _ in self._entries())
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        """List complete entries as (last use, size, directory)."""
+        entries: list[tuple[float, int, Path]] = []
+        if not self.cache_dir.is_dir():
+            return entries
+        for entry_dir in self.cache_dir.iterdir():
+            metadata = entry_dir / METADATA_FILE
+            try:
+                last_used = metadata.stat().st_mtime
+                size = int(json.loads(metadata.read_text())["size"])
+            except (OSError, ValueError, KeyError):
+                continue
+            entries.append((last_used, size, entry_dir))
+        return entries
+
+    def _evict(self, keep: str) -> None:
+        """Delete least recently used artifacts until within max_bytes.
+
+        Args:
+            keep: Key of the artifact just added, which is never evicted
+        """
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry_dir in entries:
+            if total <= self.max_bytes:
+                break
+            if entry_dir.name == keep:
+                continue
+            logger.info(f"Evicting cached artifact {entry_dir.name} ({size} bytes)")
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total -= size
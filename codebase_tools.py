@@ -7,12 +7,12 @@ Contains codebase-related tool implementations for repository analysis and manag
 
 import json
 import logging
-import subprocess
 from collections.abc import Awaitable, Callable
 from pathlib import Path
 from typing import Any
 
-from symbol_storage import AbstractSymbolStorage
+from git_metadata import GitMetadataError, git_metadata
+from symbol_storage import INDEXING_STATE_FAILED, AbstractSymbolStorage
 
 logger = logging.getLogger(__name__)
 
@@ -39,7 +39,7 @@ def get_tools(repo_name: str, repo_path: str) -> list[dict]:
         },
         {
             "name": "search_symbols",
-            "description": f"Search for symbols (functions, classes, variables) in the {repo_name} repository. Supports fuzzy matching by symbol name with optional filtering by symbol kind.",
+            "description": f"Search for symbols (functions, classes, variables) in the {repo_name} repository. Supports fuzzy matching by symbol name with optional filtering by symbol kind. While the repository is still being indexed, results may be partial; the response then sets partial_results and reports indexing progress.",
             "inputSchema": {
                 "type": "object",
                 "properties": {
@@ -125,44 +125,18 @@ async def execute_codebase_health_check(repo_name: str, repo_path: str) -> str:
 
         # Check 3: Basic Git metadata access
         try:
-            # Get current branch
-            result = subprocess.run(
-                ["git", "branch", "--show-current"],
-                cwd=repo_path_obj,
-                capture_output=True,
-                text=True,
-                timeout=10,
+            health_status["checks"]["current_branch"] = git_metadata.current_branch(
+                repo_path_obj
             )
-            if result.returncode == 0:
-                current_branch = result.stdout.strip()
-                health_status["checks"]["current_branch"] = current_branch
-            else:
-                health_status["warnings"].append(
-                    "Could not determine current Git branch"
-                )
 
-            # Get remote origin URL
-            result = subprocess.run(
-                ["git", "config", "--get", "remote.origin.url"],
-                cwd=repo_path_obj,
-                capture_output=True,
-                text=True,
-                timeout=10,
-            )
-            if result.returncode == 0:
-                remote_url = result.stdout.strip()
-                health_status["checks"]["has_remote"] = bool(remote_url)
-                if remote_url:
-                    health_status["checks"]["remote_url"] = remote_url
-            else:
-                health_status["checks"]["has_remote"] = False
+            remote_url = git_metadata.remote_url(repo_path_obj)
+            health_status["checks"]["has_remote"] = bool(remote_url)
+            if remote_url:
+                health_status["checks"]["remote_url"] = remote_url
 
             health_status["checks"]["git_responsive"] = True
 
-        except subprocess.TimeoutExpired:
-            health_status["warnings"].append("Git commands timed out")
-            health_status["checks"]["git_responsive"] = False
-        except subprocess.CalledProcessError as e:
+        except GitMetadataError as e:
             health_status["warnings"].append(f"Could not access Git metadata: {e}")
             health_status["checks"]["git_responsive"] = False
 
@@ -189,6 +163,47 @@ async def execute_codebase_health_check(repo_name: str, repo_path: str) -> str:
         return json.dumps(error_response)
 
 
+def _get_incomplete_indexing_info(
+    symbol_storage: AbstractSymbolStorage, repo_name: str
+) -> dict[str, Any] | None:
+    """Describe the repository's indexing progress if its index is incomplete.
+
+    Only the index searches see matters: incremental updates and rebuilds
+    staged in a generation of their own leave it complete while they run.
+
+    Args:
+        symbol_storage: Symbol storage holding the indexing progress
+        repo_name: Repository name
+
+    Returns:
+        Progress details for the response, or None if the index is complete
+        or no progress has been recorded
+    """
+    try:
+        progress = symbol_storage.get_indexing_progress(repo_name)
+        if progress is None or progress.is_complete:
+            return None
+        if symbol_storage.is_active_generation_complete(repo_name):
+            return None
+    except Exception as e:
+        logger.warning(f"Could not read indexing progress for {repo_name}: {e}")
+        return None
+
+    if progress.state == INDEXING_STATE_FAILED:
+        message = "Indexing failed; results may be incomplete"
+    else:
+        message = "Indexing in progress; results may be incomplete"
+
+    return {
+        "status": progress.state,
+        "message": message,
+        "files_processed": progress.files_processed,
+        "files_total": progress.files_total,
+        "updated_at": progress.updated_at,
+        "error": progress.error_message,
+    }
+
+
 async def execute_search_symbols(
     repo_name: str,
     repo_path: str,
@@ -306,7 +321,7 @@ async def execute_search_symbols(
                 # Continue with other symbols
                 continue
 
-        response = {
+        response: dict[str, Any] = {
             "query": query,
             "symbol_kind": symbol_kind,
             "limit": limit,
@@ -315,6 +330,12 @@ async def execute_search_symbols(
             "symbols": results,
         }
 
+        # Flag results from an index that is still being built
+        indexing = _get_incomplete_indexing_info(symbol_storage, repo_name)
+        if indexing:
+            response["partial_results"] = True
+            response["indexing"] = indexing
+
         logger.info(f"Found {len(results)} symbols for query '{query}' in {repo_name}")
         return json.dumps(response, indent=2)
 
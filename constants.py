@@ -37,3 +37,6 @@ GITHUB_HTTPS_PREFIX = "https://github.com/"
 DATA_DIR = Path.home() / ".local" / "share" / "github-agent"
 LOGS_DIR = DATA_DIR / "logs"
 SYMBOLS_DB_PATH = DATA_DIR / "symbols.db"
+GITHUB_CACHE_DIR = DATA_DIR / "github_cache"
+ARTIFACT_CACHE_DIR = DATA_DIR / "artifacts"
+PR_REPLY_QUEUE_DB_PATH = DATA_DIR / "pr_replies.db"
@@ -0,0 +1,245 @@
+"""
+Source file discovery for repository indexing.
+
+This module lists the files of a repository that should be indexed and the
+files that changed between two commits, using git's own view of the working
+tree so that ignored build output is never walked.
+"""
+
+import logging
+import os
+import subprocess
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Upper bound for a single git invocation; ls-files on huge repos is still fast
+GIT_COMMAND_TIMEOUT = 60.0
+
+
+@dataclass
+class ChangedFiles:
+    """Files that changed between two commits, as absolute paths."""
+
+    modified: list[Path] = field(default_factory=list)
+    deleted: list[Path] = field(default_factory=list)
+
+    @property
+    def all_paths(self) -> list[Path]:
+        """All changed paths, modified and deleted."""
+        return self.modified + self.deleted
+
+
+class AbstractFileDiscovery(ABC):
+    """Abstract base class for repository file discovery backends."""
+
+    @abstractmethod
+    def list_files(self, repo_path: Path, suffix: str) -> list[Path] | None:
+        """List the files with the given suffix that belong to the repository.
+
+        Returns None if this backend cannot handle the directory, in which case
+        the caller falls back to walking the file system.
+        """
+        pass
+
+    @abstractmethod
+    def get_changed_files(
+        self, repo_path: Path, base_commit: str, head_commit: str, suffix: str
+    ) -> ChangedFiles | None:
+        """Get the files with the given suffix that changed between two commits.
+
+        Returns None if the change set cannot be determined.
+        """
+        pass
+
+    @abstractmethod
+    def get_ignored_files(self, repo_path: Path, paths: list[Path]) -> set[Path] | None:
+        """Get the paths that list_files leaves out as ignored.
+
+        Returns None if this backend cannot tell, in which case no path is
+        treated as ignored.
+        """
+        pass
+
+
+class GitFileDiscovery(AbstractFileDiscovery):
+    """File discovery backed by the git index.
+
+    Lists tracked files plus untracked files that are not ignored, so anything
+    covered by ``.gitignore`` (virtualenvs, build trees, caches) is skipped
+    without being walked.
+    """
+
+    def __init__(self, timeout: float = GIT_COMMAND_TIMEOUT):
+        """Initialize git file discovery.
+
+        Args:
+            timeout: Timeout in seconds for each git invocation
+        """
+        self.timeout = timeout
+
+    def _run_git(
+        self,
+        repo_path: Path,
+        args: list[str],
+        stdin: bytes | None = None,
+        success_codes: tuple[int, ...] = (0,),
+    ) -> bytes | None:
+        """Run a git command in the repository.
+
+        Args:
+            repo_path: Directory to run git in
+            args: Arguments following ``git``
+            stdin: Input passed to the command
+            success_codes: Exit codes that don't mean failure
+
+        Returns:
+            Raw stdout, or None if git is unavailable or the command failed
+        """
+        try:
+            result = subprocess.run(
+                ["git", *args],
+                cwd=repo_path,
+                input=stdin,
+                capture_output=True,
+                timeout=self.timeout,
+                check=False,
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.debug(f"git {args[0]} unavailable in {repo_path}: {e}")
+            return None
+
+        if result.returncode not in success_codes:
+            logger.debug(
+                f"git {args[0]} failed in {repo_path}: "
+                f"{result.stderr.decode(errors='replace').strip()}"
+            )
+            return None
+        return result.stdout
+
+    def list_files(self, repo_path: Path, suffix: str) -> list[Path] | None:
+        """List tracked and untracked-but-not-ignored files with the given suffix.
+
+        Args:
+            repo_path: Repository root (or a directory inside a work tree)
+            suffix: File suffix to match, e.g. ``.py``
+
+        Returns:
+            Sorted absolute paths of existing files, or None if repo_path is
+            not inside a git work tree
+        """
+        output = self._run_git(
+            repo_path,
+            [
+                "ls-files",
+                "-z",
+                "--cached",
+                "--others",
+                "--exclude-standard",
+                "--",
+                f"*{suffix}",
+            ],
+        )
+        if output is None:
+            return None
+
+        files = set()
+        for entry in output.split(b"\0"):
+            if not entry:
+                continue
+            path = repo_path / entry.decode(errors="surrogateescape")
+            # Tracked files deleted from the work tree are still in the index
+            if path.is_file():
+                files.add(path)
+
+        logger.debug(f"git ls-files found {len(files)} {suffix} files in {repo_path}")
+        return sorted(files)
+
+    def get_changed_files(
+        self, repo_path: Path, base_commit: str, head_commit: str, suffix: str
+    ) -> ChangedFiles | None:
+        """Get the files with the given suffix that changed between two commits.
+
+        Renames are reported as a deletion of the old path plus a modification
+        of the new one.
+
+        Args:
+            repo_path: Repository root (or a directory inside a work tree)
+            base_commit: Commit the index was built from
+            head_commit: Commit to compare against
+            suffix: File suffix to match, e.g. ``.py``
+
+        Returns:
+            ChangedFiles with absolute paths, or None if git can't compare the
+            commits
+        """
+        output = self._run_git(
+            repo_path,
+            [
+                "diff",
+                "--name-status",
+                "-z",
+                "--no-renames",
+                "--relative",
+                base_commit,
+                head_commit,
+                "--",
+                f"*{suffix}",
+            ],
+        )
+        if output is None:
+            return None
+
+        changed = ChangedFiles()
+        fields = output.split(b"\0")
+        # Output alternates status and path: "M\0path\0D\0other\0"
+        for status, entry in zip(fields[::2], fields[1::2], strict=False):
+            if not entry:
+                continue
+            path = repo_path / entry.decode(errors="surrogateescape")
+            if status.startswith(b"D"):
+                changed.deleted.append(path)
+            else:
+                changed.modified.append(path)
+
+        logger.debug(
+            f"git diff {base_commit}..{head_commit}: {len(changed.modified)} modified, "
+            f"{len(changed.deleted)} deleted {suffix} files"
+        )
+        return changed
+
+    def get_ignored_files(self, repo_path: Path, paths: list[Path]) -> set[Path] | None:
+        """Get the untracked paths matched by the repository's ignore rules.
+
+        Uses the same rules as list_files (``.gitignore``, ``.git/info/exclude``
+        and the global excludes file); tracked files are never ignored. One git
+        invocation checks all paths.
+
+        Args:
+            repo_path: Repository root (or a directory inside a work tree)
+            paths: Absolute paths inside the repository
+
+        Returns:
+            The ignored paths among the given ones, or None if repo_path is not
+            inside a git work tree
+        """
+        if not paths:
+            return set()
+        stdin = b"".join(os.fsencode(path) + b"\0" for path in paths)
+        # check-ignore exits with 1 when none of the paths is ignored
+        output = self._run_git(
+            repo_path,
+            ["check-ignore", "-z", "--stdin"],
+            stdin=stdin,
+            success_codes=(0, 1),
+        )
+        if output is None:
+            return None
+
+        ignored = {
+            repo_path / os.fsdecode(entry) for entry in output.split(b"\0") if entry
+        }
+        logger.debug(f"git check-ignore: {len(ignored)} of {len(paths)} paths ignored")
+        return ignored
@@ -0,0 +1,359 @@
+"""
+Read git metadata straight from the repository's files.
+
+Tool handlers ask for the current branch, the HEAD commit and the origin URL
+on almost every call. Instead of spawning ``git`` for each query, this module
+parses ``.git/HEAD``, loose refs, ``packed-refs`` and the repository config
+itself, following the ``gitdir``/``commondir`` links of linked worktrees.
+
+Results are cached together with the state (mtime, inode and size) of every
+file they were read from, including files that didn't exist. A cached result
+is reused as long as none of those files changed, so a query normally costs a
+few ``stat`` calls.
+"""
+
+import logging
+import re
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Symbolic refs followed before giving up (git itself stops at 5)
+MAX_SYMREF_DEPTH = 5
+
+# SHA-1 or SHA-256 object name
+OBJECT_NAME_RE = re.compile(r"^(?:[0-9a-f]{40}|[0-9a-f]{64})$")
+
+# Section header: [remote "origin"] or the deprecated [remote.origin]
+CONFIG_SECTION_RE = re.compile(
+    r"^\[\s*(?P<section>[A-Za-z0-9.-]+?)"
+    r'(?:\s+"(?P<subsection>(?:[^"\\]|\\.)*)"|\.(?P<legacy>[^\]\s]+))?\s*\]'
+)
+
+# Variable line: name = value, or a bare name meaning true
+CONFIG_VARIABLE_RE = re.compile(
+    r"^(?P<name>[A-Za-z][A-Za-z0-9-]*)\s*(?:=(?P<value>.*))?$"
+)
+
+FileState = tuple[int, int, int] | str | None
+
+
+class GitMetadataError(RuntimeError):
+    """Raised when git metadata can't be read."""
+
+
+@dataclass(frozen=True)
+class GitDirs:
+    """The git directories of a work tree."""
+
+    # Per-worktree directory holding HEAD
+    git_dir: Path
+    # Directory shared by all worktrees, holding refs, packed-refs and config
+    common_dir: Path
+
+
+@dataclass(frozen=True)
+class GitHead:
+    """What HEAD points at."""
+
+    # Full name of the checked out ref, or None if HEAD is detached
+    ref: str | None
+    # Commit HEAD resolves to, or None on an unborn branch
+    commit: str | None
+
+    @property
+    def branch(self) -> str:
+        """Name of the checked out branch, or "" if HEAD is detached."""
+        if self.ref is None or not self.ref.startswith("refs/heads/"):
+            return ""
+        return self.ref.removeprefix("refs/heads/")
+
+
+def _file_state(path: Path) -> FileState:
+    """Capture the state of a file for change detection."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    if path.is_dir():
+        return "dir"
+    return (stat.st_mtime_ns, stat.st_ino, stat.st_size)
+
+
+class _FileReads:
+    """Files a result was computed from, and their state before reading."""
+
+    def __init__(self) -> None:
+        self.states: dict[Path, FileState] = {}
+
+    def check(self, path: Path) -> FileState:
+        """Record and return the state of a file without reading it."""
+        state = _file_state(path)
+        self.states[path] = state
+        return state
+
+    def read(self, path: Path) -> str | None:
+        """Read a text file, recording its state; None if it doesn't exist."""
+        if self.check(path) in (None, "dir"):
+            return None
+        try:
+            return path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            raise GitMetadataError(f"Failed to read {path}: {e}") from e
+
+    def unchanged(self) -> bool:
+        """Check whether none of the recorded files changed since."""
+        return all(_file_state(path) == state for path, state in self.states.items())
+
+
+def _find_git_dirs(repo_path: str | Path, reads: _FileReads) -> GitDirs:
+    """Locate the git directories of a work tree."""
+    dot_git = Path(repo_path) / ".git"
+    if reads.check(dot_git) == "dir":
+        return GitDirs(dot_git, dot_git)
+
+    # Linked worktrees and submodules: ".git" is a file with "gitdir: <path>"
+    content = reads.read(dot_git)
+    if content is None or not content.startswith("gitdir:"):
+        raise GitMetadataError(f"Not a git work tree: {repo_path}")
+    git_dir = (dot_git.parent / content.removeprefix("gitdir:").strip()).resolve()
+
+    commondir = reads.read(git_dir / "commondir")
+    if commondir is None:
+        return GitDirs(git_dir, git_dir)
+    return GitDirs(git_dir, (git_dir / commondir.strip()).resolve())
+
+
+def _parse_packed_refs(content: str) -> dict[str, str]:
+    """Parse packed-refs into a ref name to object name mapping."""
+    refs = {}
+    for line in content.splitlines():
+        # Skip the header and the peeled object names of annotated tags
+        if not line or line.startswith(("#", "^")):
+            continue
+        object_name, _, name = line.partition(" ")
+        refs[name.strip()] = object_name
+    return refs
+
+
+def _resolve_ref(dirs: GitDirs, ref: str, reads: _FileReads) -> str | None:
+    """Resolve a ref to an object name, or None if it doesn't exist."""
+    packed: dict[str, str] | None = None
+    for _ in range(MAX_SYMREF_DEPTH):
+        content = reads.read(dirs.common_dir / ref)
+        if content is None:
+            if packed is None:
+                packed = _parse_packed_refs(
+                    reads.read(dirs.common_dir / "packed-refs") or ""
+                )
+            return packed.get(ref)
+        content = content.strip()
+        if not content.startswith("ref:"):
+            return content if OBJECT_NAME_RE.match(content) else None
+        ref = content.removeprefix("ref:").strip()
+    raise GitMetadataError(f"Too many levels of symbolic refs at {ref}")
+
+
+def _read_head(repo_path: str | Path, reads: _FileReads) -> GitHead:
+    dirs = _find_git_dirs(repo_path, reads)
+    content = reads.read(dirs.git_dir / "HEAD")
+    if content is None:
+        raise GitMetadataError(f"No HEAD in {dirs.git_dir}")
+    content = content.strip()
+    if content.startswith("ref:"):
+        ref = content.removeprefix("ref:").strip()
+        return GitHead(ref, _resolve_ref(dirs, ref, reads))
+    if not OBJECT_NAME_RE.match(content):
+        raise GitMetadataError(f"Malformed HEAD in {dirs.git_dir}: {content!r}")
+    return GitHead(None, content)
+
+
+def _unquote_config_value(raw: str) -> str:
+    """Strip comments, quotes and escapes from a config value."""
+    value = []
+    quoted = False
+    # Whitespace outside quotes is kept only between words
+    pending_space = ""
+    escapes = {"n": "\n", "t": "\t", "b": "\b", '"': '"', "\\": "\\"}
+    i = 0
+    while i < len(raw):
+        char = raw[i]
+        if char == "\\" and i + 1 < len(raw):
+            value.append(pending_space + escapes.get(raw[i + 1], raw[i + 1]))
+            pending_space = ""
+            i += 2
+            continue
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char in "#;":
+            break
+        elif not quoted and char.isspace():
+            if value:
+                pending_space += char
+        else:
+            value.append(pending_space + char)
+            pending_space = ""
+        i += 1
+    return "".join(value)
+
+
+def _parse_config(content: str) -> dict[str, str]:
+    """Parse a git config file into "section.subsection.name" -> last value.
+
+    Section and variable names are lowercased; subsections keep their case.
+    Includes and line continuations are not supported.
+    """
+    values = {}
+    section = ""
+    for raw_line in content.splitlines():
+        line = raw_line.strip()
+        if not line or line.startswith(("#", ";")):
+            continue
+        if line.startswith("["):
+            match = CONFIG_SECTION_RE.match(line)
+            if match is None:
+                section = ""
+                continue
+            section = match["section"].lower()
+            if match["subsection"] is not None:
+                section += "." + re.sub(r"\\(.)", r"\1", match["subsection"])
+            elif match["legacy"] is not None:
+                section += "." + match["legacy"].lower()
+            # A variable may follow the header on the same line
+            line = line[match.end() :].strip()
+            if not line:
+                continue
+        match = CONFIG_VARIABLE_RE.match(line)
+        if match is None or not section:
+            continue
+        value = match["value"]
+        key = f"{section}.{match['name'].lower()}"
+        values[key] = "true" if value is None else _unquote_config_value(value)
+    return values
+
+
+def _read_config(repo_path: str | Path, reads: _FileReads) -> dict[str, str]:
+    dirs = _find_git_dirs(repo_path, reads)
+    return _parse_config(reads.read(dirs.common_dir / "config") or "")
+
+
+class GitMetadataReader:
+    """Cached reader of HEAD, branch, commit and remotes of work trees."""
+
+    def __init__(self) -> None:
+        """Initialize the reader with an empty cache."""
+        self._entries: dict[tuple[str, str], tuple[_FileReads, object]] = {}
+        self._lock = threading.Lock()
+
+    def _cached(self, kind: str, repo_path: str | Path, compute: Callable[..., T]) -> T:
+        """Return a cached result, recomputing it if any of its files changed."""
+        key = (kind, str(repo_path))
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[0].unchanged():
+            return entry[1]  # type: ignore[return-value]
+
+        logger.debug(f"Reading git {kind} of {repo_path}")
+        reads = _FileReads()
+        value = compute(repo_path, reads)
+        with self._lock:
+            self._entries[key] = (reads, value)
+        return value
+
+    def git_dirs(self, repo_path: str | Path) -> GitDirs:
+        """Locate the git directories of a work tree.
+
+        Raises:
+            GitMetadataError: If repo_path is not a work tree root
+        """
+        return self._cached("dirs", repo_path, _find_git_dirs)
+
+    def head(self, repo_path: str | Path) -> GitHead:
+        """Read what HEAD of a work tree points at.
+
+        Raises:
+            GitMetadataError: If the metadata can't be read
+        """
+        return self._cached("head", repo_path, _read_head)
+
+    def current_branch(self, repo_path: str | Path) -> str:
+        """Get the checked out branch, like ``git branch --show-current``.
+
+        Returns:
+            Branch name, or "" if HEAD is detached
+
+        Raises:
+            GitMetadataError: If the metadata can't be read
+        """
+        return self.head(repo_path).branch
+
+    def current_commit(self, repo_path: str | Path) -> str:
+        """Get the commit HEAD resolves to, like ``git rev-parse HEAD``.
+
+        Raises:
+            GitMetadataError: If the metadata can't be read or the branch
+                has no commits yet
+        """
+        head = self.head(repo_path)
+        if head.commit is None:
+            raise GitMetadataError(f"{head.ref} of {repo_path} has no commits yet")
+        return head.commit
+
+    def config_value(self, repo_path: str | Path, key: str) -> str | None:
+        """Get a value of the repository's own config file.
+
+        Args:
+            repo_path: Work tree root
+            key: "section.name" or "section.subsection.name"
+
+        Returns:
+            Last value set for the key, or None if it isn't set there
+
+        Raises:
+            GitMetadataError: If repo_path is not a work tree root
+        """
+        # Subsections are case sensitive, section and variable names aren't
+        section, _, rest = key.partition(".")
+        subsection, _, name = rest.rpartition(".")
+        parts = (
+            [section.lower(), subsection, name.lower()]
+            if subsection
+            else [
+                section.lower(),
+                name.lower(),
+            ]
+        )
+        return self._cached("config", repo_path, _read_config).get(".".join(parts))
+
+    def remote_url(self, repo_path: str | Path, remote: str = "origin") -> str | None:
+        """Get the URL of a remote, like ``git config --get remote.<name>.url``.
+
+        Raises:
+            GitMetadataError: If repo_path is not a work tree root
+        """
+        return self.config_value(repo_path, f"remote.{remote}.url")
+
+    def invalidate(self, repo_path: str | Path | None = None) -> None:
+        """Drop cached results of one work tree, or of all of them.
+
+        Args:
+            repo_path: Work tree to drop; None drops every entry
+        """
+        with self._lock:
+            if repo_path is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[1] == str(repo_path)]:
+                    del self._entries[key]
+
+
+# Reader shared by all tool handlers of this process
+git_metadata = GitMetadataReader()
@@ -0,0 +1,358 @@
+"""
+Conditional-request cache for GitHub REST reads.
+
+GitHub answers a GET carrying ``If-None-Match`` or ``If-Modified-Since`` with
+``304 Not Modified`` when the resource is unchanged, and 304 responses don't
+count against the primary rate limit. The cache keeps the ETag, Last-Modified
+and body of JSON responses in memory and on disk, so agents polling PR
+comments, workflow runs or artifact lists revalidate cheaply instead of
+downloading the same data again. Entries are keyed by URL, Accept header and
+a hash of the token, so different tokens never share responses, and both tiers
+are bounded by size with least-recently-used eviction.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+# Total bytes of response bodies kept in memory
+DEFAULT_MAX_MEMORY_BYTES = 16 * 1024 * 1024
+
+# Total bytes of response bodies kept on disk
+DEFAULT_MAX_DISK_BYTES = 128 * 1024 * 1024
+
+# Responses larger than this aren't cached
+DEFAULT_MAX_ENTRY_BYTES = 2 * 1024 * 1024
+
+# Headers describing the wire encoding of the original body
+TRANSFER_HEADERS = frozenset(
+    {"content-encoding", "content-length", "transfer-encoding"}
+)
+
+
+@dataclass
+class CachedResponse:
+    """Body and validators of a cached GitHub response."""
+
+    url: str
+    headers: dict[str, str]
+    content: bytes
+    etag: str | None
+    last_modified: str | None
+
+    @property
+    def size(self) -> int:
+        return len(self.content)
+
+    def to_response(self, request: requests.PreparedRequest) -> requests.Response:
+        """Build a 200 response for a request the server answered with 304.
+
+        Args:
+            request: The revalidated request
+
+        Returns:
+            Response carrying the cached body
+        """
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.content
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.url = request.url or self.url
+        response.request = request
+        return response
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "url": self.url,
+            "headers": self.headers,
+            "content": self.content.decode("utf-8"),
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> "CachedResponse":
+        return cls(
+            url=data["url"],
+            headers=data["headers"],
+            content=data["content"].encode("utf-8"),
+            etag=data.get("etag"),
+            last_modified=data.get("last_modified"),
+        )
+
+
+def response_cache_key(request: requests.PreparedRequest) -> str:
+    """Compute the cache key of a GET request.
+
+    The token is hashed separately so that "token X" and "Bearer X" share
+    entries while the token itself never ends up in the cache.
+
+    Args:
+        request: Prepared request, including query parameters
+
+    Returns:
+        Hex digest identifying URL, Accept header and token scope
+    """
+    authorization = request.headers.get("Authorization", "")
+    token = authorization.split()[-1] if authorization else ""
+    token_scope = hashlib.sha256(token.encode()).hexdigest()
+    accept = request.headers.get("Accept", "")
+    return hashlib.sha256(
+        f"{token_scope}\0{accept}\0{request.url}".encode()
+    ).hexdigest()
+
+
+class GitHubResponseCache:
+    """Two-tier LRU cache of GitHub responses for conditional requests.
+
+    The memory tier serves lookups within a worker; the disk tier survives
+    restarts and is shared by the workers of all repositories. Disk writes
+    are atomic, so concurrent workers never read a partial entry.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path | None = None,
+        max_memory_bytes: int = DEFAULT_MAX_MEMORY_BYTES,
+        max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES,
+        max_entry_bytes: int = DEFAULT_MAX_ENTRY_BYTES,
+    ):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory for the disk tier; None keeps entries in
+                memory only
+            max_memory_bytes: Size bound of the memory tier
+            max_disk_bytes: Size bound of the disk tier
+            max_entry_bytes: Largest response body that is cached
+        """
+        self.cache_dir = cache_dir
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self._memory: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes: int | None = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _disk_path(self, key: str) -> Path:
+        assert self.cache_dir is not None
+        return self.cache_dir / f"{key}.json"
+
+    def lookup(self, key: str) -> CachedResponse | None:
+        """Find the cached response for a key.
+
+        Args:
+            key: Key from response_cache_key()
+
+        Returns:
+            Cached response, or None if neither tier has it
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return entry
+
+        entry = self._read_disk(key)
+        if entry is not None:
+            with self._lock:
+                self._remember(key, entry)
+        return entry
+
+    def store(self, key: str, response: requests.Response) -> bool:
+        """Cache a response if it can be revalidated later.
+
+        Only 200 JSON responses with an ETag or Last-Modified header and a
+        body within max_entry_bytes are cached.
+
+        Args:
+            key: Key from response_cache_key()
+            response: Response to cache
+
+        Returns:
+            True if the response was cached
+        """
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        content_type = response.headers.get("Content-Type", "")
+        if (
+            response.status_code != 200
+            or not (etag or last_modified)
+            or "json" not in content_type
+        ):
+            return False
+        content = response.content
+        if len(content) > self.max_entry_bytes:
+            return False
+
+        # The body is stored decoded, so transfer headers no longer apply
+        headers = {
+            name: value
+            for name, value in response.headers.items()
+            if name.lower() not in TRANSFER_HEADERS
+        }
+        entry = CachedResponse(
+            url=response.url,
+            headers=headers,
+            content=content,
+            etag=etag,
+            last_modified=last_modified,
+        )
+        with self._lock:
+            self._remember(key, entry)
+        self._write_disk(key, entry)
+        return True
+
+    def record_hit(self) -> None:
+        """Count a request answered from the cache after a 304."""
+        with self._lock:
+            self.hits += 1
+
+    def record_miss(self) -> None:
+        """Count a GET that had to be answered by the server."""
+        with self._lock:
+            self.misses += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Get hit/miss counters and tier sizes.
+
+        Returns:
+            Dictionary of cache statistics
+        """
+        with self._lock:
+            requests_seen = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / requests_seen if requests_seen else 0.0,
+                "evictions": self.evictions,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_bytes": self._disk_bytes,
+            }
+
+    def clear(self) -> None:
+        """Drop all entries from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            self._disk_bytes = 0 if self.cache_dir else None
+        if self.cache_dir is None or not self.cache_dir.is_dir():
+            return
+        for path in self.cache_dir.glob("*.json"):
+            path.unlink(missing_ok=True)
+
+    def _remember(self, key: str, entry: CachedResponse) -> None:
+        """Put an entry into the memory tier; the caller holds the lock."""
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= previous.size
+        self._memory[key] = entry
+        self._memory_bytes += entry.size
+        while self._memory_bytes > self.max_memory_bytes and len(self._memory) > 1:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted.size
+            self.evictions += 1
+
+    def _read_disk(self, key: str) -> CachedResponse | None:
+        """Load an entry from the disk tier and mark it recently used."""
+        if self.cache_dir is None:
+            return None
+        path = self._disk_path(key)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            entry = CachedResponse.from_json(data)
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Dropping unreadable GitHub cache entry {path}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+        return entry
+
+    def _write_disk(self, key: str, entry: CachedResponse) -> None:
+        """Write an entry to the disk tier, evicting old entries if needed."""
+        if self.cache_dir is None:
+            return
+        try:
+            payload = json.dumps(entry.to_json())
+        except UnicodeDecodeError:
+            return
+
+        path = self._disk_path(key)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write GitHub cache entry {path}: {e}")
+            return
+
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan_disk_bytes()
+            else:
+                self._disk_bytes += len(payload)
+            over_budget = self._disk_bytes > self.max_disk_bytes
+        if over_budget:
+            self._evict_disk()
+
+    def _scan_disk_bytes(self) -> int:
+        assert self.cache_dir is not None
+        total = 0
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                total += path.stat().st_size
+            except OSError:
+                pass
+        return total
+
+    def _evict_disk(self) -> None:
+        """Delete least recently used disk entries until within budget.
+
+        Rescans the directory because other workers write to it as well.
+        """
+        assert self.cache_dir is not None
+        files = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        files.sort()
+
+        total = sum(size for _, size, _ in files)
+        evicted = 0
+        for _, size, path in files:
+            if total <= self.max_disk_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            evicted += 1
+
+        with self._lock:
+            self._disk_bytes = total
+            self.evictions += evicted
+        logger.debug(f"Evicted {evicted} GitHub cache entries from disk")
@@ -0,0 +1,310 @@
+"""
+Shared HTTP session for raw GitHub REST API calls.
+
+All raw REST calls of a worker go through one ``requests.Session`` so that
+connections to api.github.com (and the artifact storage hosts it redirects to)
+are kept alive and reused instead of paying a TCP and TLS handshake per call.
+The session retries transient failures: 5xx responses and connection errors
+with exponential backoff, and requests rejected by GitHub's secondary rate
+limits once their Retry-After delay has passed.
+
+When the session has a response cache, GETs are sent as conditional requests
+and a ``304 Not Modified`` is answered from the cache (see github_cache).
+
+Blocking GitHub and git I/O of the async tool handlers runs on a small shared
+thread pool (``run_blocking``), so a slow call never stalls the worker's event
+loop and independent calls can overlap.
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+from collections.abc import Callable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError, ResponseError
+from urllib3.response import BaseHTTPResponse
+from urllib3.util.retry import Retry
+
+from constants import GITHUB_CACHE_DIR
+from github_cache import GitHubResponseCache, response_cache_key
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Number of hosts whose connection pools are kept (the API plus redirect targets)
+DEFAULT_POOL_CONNECTIONS = 4
+
+# Maximum number of connections per host; further requests wait for a free one
+DEFAULT_POOL_MAXSIZE = 8
+
+# Retries per request, and the base of the exponential backoff between them
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+
+# Seconds to wait for a connection or a response chunk when the caller
+# doesn't pass its own timeout
+DEFAULT_REQUEST_TIMEOUT = 30.0
+
+# Threads running blocking GitHub and git calls; bounds their concurrency and
+# matches the per-host connection limit so offloaded calls don't queue twice
+DEFAULT_IO_WORKERS = DEFAULT_POOL_MAXSIZE
+
+# Server errors worth retrying for idempotent requests
+RETRY_STATUS_CODES = frozenset({500, 502, 503, 504})
+
+# Statuses GitHub uses for rate limits; retried when they carry Retry-After
+RATE_LIMIT_STATUS_CODES = frozenset({403, 429})
+
+# Longest Retry-After delay worth waiting for inside a tool call; beyond this
+# the rate-limited response is returned to the caller
+MAX_RATE_LIMIT_WAIT = 60.0
+
+
+class GitHubRetry(Retry):
+    """Retry policy for the GitHub REST API.
+
+    On top of urllib3's handling of 5xx responses for idempotent methods,
+    requests rejected by a secondary rate limit (403/429 with a Retry-After
+    header) are retried for any method, since GitHub didn't process them.
+    Rate limits that lift later than MAX_RATE_LIMIT_WAIT are not waited for.
+    """
+
+    def is_retry(
+        self, method: str, status_code: int, has_retry_after: bool = False
+    ) -> bool:
+        if status_code in RATE_LIMIT_STATUS_CODES and has_retry_after:
+            return bool(self.total)
+        return super().is_retry(method, status_code, has_retry_after)
+
+    def increment(
+        self,
+        method: str | None = None,
+        url: str | None = None,
+        response: BaseHTTPResponse | None = None,
+        error: Exception | None = None,
+        *args: Any,
+        **kwargs: Any,
+    ) -> "GitHubRetry":
+        if response is not None and response.status in RATE_LIMIT_STATUS_CODES:
+            retry_after = self.get_retry_after(response)
+            if retry_after is not None and retry_after > MAX_RATE_LIMIT_WAIT:
+                logger.warning(
+                    f"GitHub rate limit on {url} lifts in {retry_after:.0f}s, "
+                    "not retrying"
+                )
+                raise MaxRetryError(
+                    kwargs.get("_pool"),  # type: ignore[arg-type]
+                    url or "",
+                    ResponseError(f"rate limited for {retry_after:.0f}s"),
+                )
+        logger.info(
+            f"Retrying GitHub request {method} {url}: "
+            f"{response.status if response is not None else error}"
+        )
+        return super().increment(method, url, response, error, *args, **kwargs)
+
+
+class GitHubHTTPAdapter(HTTPAdapter):
+    """HTTP adapter that applies a default timeout to every request."""
+
+    def __init__(self, timeout: float = DEFAULT_REQUEST_TIMEOUT, **kwargs: Any):
+        """Initialize the adapter.
+
+        Args:
+            timeout: Timeout used for requests that don't specify one
+            **kwargs: Passed to ``HTTPAdapter``
+        """
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        stream: bool = False,
+        timeout: float | tuple[float, float] | tuple[float, None] | None = None,
+        verify: bool | str = True,
+        cert: bytes | str | tuple[bytes | str, bytes | str] | None = None,
+        proxies: Mapping[str, str] | None = None,
+    ) -> requests.Response:
+        if timeout is None:
+            timeout = self.timeout
+        return super().send(request, stream, timeout, verify, cert, proxies)
+
+
+class GitHubSession(requests.Session):
+    """Session that revalidates cached GET responses with conditional requests."""
+
+    def __init__(self, cache: GitHubResponseCache | None = None):
+        """Initialize the session.
+
+        Args:
+            cache: Response cache; None disables conditional requests
+        """
+        super().__init__()
+        self.cache = cache
+
+    def send(  # type: ignore[override]
+        self, request: requests.PreparedRequest, **kwargs: Any
+    ) -> requests.Response:
+        if self.cache is None or request.method != "GET" or kwargs.get("stream"):
+            return super().send(request, **kwargs)
+
+        key = response_cache_key(request)
+        cached = self.cache.lookup(key)
+        if cached is not None:
+            if cached.etag:
+                request.headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                request.headers["If-Modified-Since"] = cached.last_modified
+
+        response = super().send(request, **kwargs)
+        if response.status_code == 304 and cached is not None:
+            self.cache.record_hit()
+            response.close()
+            return cached.to_response(request)
+
+        self.cache.record_miss()
+        self.cache.store(key, response)
+        return response
+
+
+def create_github_session(
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+    timeout: float = DEFAULT_REQUEST_TIMEOUT,
+    cache: GitHubResponseCache | None = None,
+) -> GitHubSession:
+    """Create a pooled, retrying session for the GitHub REST API.
+
+    Args:
+        pool_connections: Number of per-host connection pools to keep
+        pool_maxsize: Maximum connections per host; requests beyond it block
+            until a connection is returned to the pool
+        max_retries: Retries per request
+        backoff_factor: Base of the exponential backoff between retries
+        timeout: Default timeout in seconds
+        cache: Response cache for conditional GETs; None disables caching
+
+    Returns:
+        Configured session
+    """
+    retry = GitHubRetry(
+        total=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUS_CODES,
+        respect_retry_after_header=True,
+        # Hand the final failed response to the caller instead of raising
+        raise_on_status=False,
+    )
+    adapter = GitHubHTTPAdapter(
+        timeout=timeout,
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=True,
+        max_retries=retry,
+    )
+    session = GitHubSession(cache)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_session: GitHubSession | None = None
+_session_lock = threading.Lock()
+_response_cache: GitHubResponseCache | None = None
+_response_cache_lock = threading.Lock()
+
+
+def get_github_response_cache() -> GitHubResponseCache:
+    """Get the response cache shared by all sessions of this process.
+
+    Returns:
+        The shared cache, backed by GITHUB_CACHE_DIR
+    """
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = GitHubResponseCache(GITHUB_CACHE_DIR)
+        return _response_cache
+
+
+def get_github_session() -> GitHubSession:
+    """Get the session shared by all raw GitHub REST calls of this process.
+
+    Returns:
+        The shared session, created on first use
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_github_session(cache=get_github_response_cache())
+            logger.debug("Created shared GitHub HTTP session")
+        return _session
+
+
+def close_github_session() -> None:
+    """Close the shared session and its pooled connections."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+            logger.debug("Closed shared GitHub HTTP session")
+
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_github_executor() -> ThreadPoolExecutor:
+    """Get the thread pool that runs blocking GitHub and git calls.
+
+    Returns:
+        The shared executor, created on first use
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=DEFAULT_IO_WORKERS, thread_name_prefix="github-io"
+            )
+        return _executor
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking call on the GitHub I/O pool without blocking the loop.
+
+    At most DEFAULT_IO_WORKERS calls run at once; further calls wait for a
+    free thread.
+
+    Args:
+        func: Blocking callable, e.g. a session request, a PyGithub call or a
+            git subprocess
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        Return value of func; its exceptions propagate to the caller
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_github_executor(), functools.partial(func, *args, **kwargs)
+    )
+
+
+def shutdown_github_executor() -> None:
+    """Shut down the I/O pool, waiting for running calls to finish."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True, cancel_futures=True)
+            _executor = None
+            logger.debug("Shut down GitHub I/O executor")
@@ -5,20 +5,36 @@ GitHub Tools for MCP Server
 Contains all GitHub-related tool implementations.
 """
 
-import io
+import asyncio
 import json
 import logging
 import os
 import re
 import subprocess
-import zipfile
+import tempfile
+import threading
+import time
 from collections.abc import Awaitable, Callable
-from typing import cast
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, cast
 
 import requests
 from github import Github
+from github.PullRequest import PullRequest
 from github.Repository import Repository
 
+from artifact_cache import ArtifactCache, extract_archive
+from constants import ARTIFACT_CACHE_DIR
+from git_metadata import GitMetadataError, git_metadata
+from github_http import get_github_session, run_blocking
+from log_parsing import iter_lint_errors, parse_artifact
+from pr_reply_queue import (
+    PRReplySender,
+    ReplyDelivery,
+    get_pr_reply_queue,
+    post_pr_reply,
+)
 from repository_manager import (
     AbstractRepositoryManager,
     RepositoryConfig,
@@ -36,6 +52,21 @@ logger = logging.getLogger(__name__)
 # Global repository manager (set by worker)
 repo_manager: RepositoryManager | None = None
 
+# Seconds a cached GitHubAPIContext is reused before it is rebuilt. Changes to
+# GITHUB_TOKEN or the repository's git config invalidate it earlier.
+GITHUB_CONTEXT_TTL = 15 * 60.0
+
+# Bytes read per chunk when streaming an artifact archive to disk
+ARTIFACT_CHUNK_SIZE = 1024 * 1024
+
+# Seconds a cached branch-to-PR mapping is trusted before it is looked up again
+BRANCH_PR_CACHE_TTL = 10 * 60.0
+
+# Swift build issue types reported as errors and as test failures; xcodebuild's
+# own errors and failed test cases are listed with the compiler's
+SWIFT_ERROR_TYPES = frozenset({"compiler_error", "xcodebuild_error"})
+SWIFT_TEST_FAILURE_TYPES = frozenset({"test_failure", "test_case_failure"})
+
 
 def get_tools(repo_name: str, repo_path: str) -> list[dict]:
     """Get GitHub tool definitions for MCP registration
@@ -82,21 +113,25 @@ def get_tools(repo_name: str, repo_path: str) -> list[dict]:
         },
         {
             "name": "github_get_pr_comments",
-            "description": f"Retrieve all review comments, issue comments, and discussion threads from a GitHub Pull Request in {repo_name}. Uses GitHub API to fetch comments with author, timestamp, content, and reply status. Essential for finding unanswered code review comments that need responses, tracking discussion threads, and understanding PR feedback. If pr_number is not provided, automatically finds the PR for the current branch using github_find_pr_for_branch.",
+            "description": f"Retrieve all review comments, issue comments, and discussion threads from a GitHub Pull Request in {repo_name}. Uses GitHub API to fetch comments with author, timestamp, content, and reply status. Set unhandled_only to leave out comments already acknowledged as handled. Essential for finding unanswered code review comments that need responses, tracking discussion threads, and understanding PR feedback. If pr_number is not provided, automatically finds the PR for the current branch using github_find_pr_for_branch.",
             "inputSchema": {
                 "type": "object",
                 "properties": {
                     "pr_number": {
                         "type": "integer",
                         "description": "GitHub Pull Request number (e.g., 123 for PR #123). Optional - if not provided, will auto-detect PR for current branch.",
-                    }
+                    },
+                    "unhandled_only": {
+                        "type": "boolean",
+                        "description": "Leave out comments acknowledged as handled with github_pr_reply_status (default: false)",
+                    },
                 },
                 "required": [],
             },
         },
         {
             "name": "github_post_pr_reply",
-            "description": f"Post a reply to a specific comment in a GitHub Pull Request for {repo_name}. Uses GitHub API to create a threaded response to review comments or general PR discussion comments. Supports GitHub Markdown formatting for rich text responses.",
+            "description": f"Post a reply to a specific comment in a GitHub Pull Request for {repo_name}. The reply is queued and returns immediately with a reply_id; it is then posted in the background as a threaded response to review comments or general PR discussion comments, with retries and rate limiting. Several replies to the same comment are combined into one post. Use github_pr_reply_status to check delivery. Supports GitHub Markdown formatting for rich text responses.",
             "inputSchema": {
                 "type": "object",
                 "properties": {
@@ -112,6 +147,28 @@ def get_tools(repo_name: str, repo_path: str) -> list[dict]:
                 "required": ["comment_id", "message"],
             },
         },
+        {
+            "name": "github_pr_reply_status",
+            "description": f"Check the delivery status of PR replies queued with github_post_pr_reply in {repo_name}. Returns each reply's status (queued, sending, sent or failed), attempts, last error and the URL of the posted comment. Set acknowledge to mark a comment as handled once its reply was sent.",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "reply_id": {
+                        "type": "integer",
+                        "description": "Reply ID returned by github_post_pr_reply. Optional.",
+                    },
+                    "comment_id": {
+                        "type": "integer",
+                        "description": "GitHub comment ID whose replies to report. Optional - without reply_id or comment_id, all replies of the repository are listed.",
+                    },
+                    "acknowledge": {
+                        "type": "boolean",
+                        "description": "Mark the comment as handled (default: false)",
+                    },
+                },
+                "required": [],
+            },
+        },
         {
             "name": "github_check_ci_build_and_test_errors_not_local",
             "description": "🚨 CI STATUS & AUTO-FIX TOOL: For ANY mention of build/test status ('check build', 'CI OK?', 'build errors?') - use this tool to check GitHub CI status AND automatically start fixing any issues found. This tool both reports CI status AND initiates the fix workflow when errors exist. When users ask about build status, they expect you to fix problems, not just report them. After calling this tool: if errors found → immediately fix them → run local tests/lint per CLAUDE.md/AGENT.md → commit changes.",
@@ -193,17 +250,14 @@ class GitHubAPIContext:
         )
 
         # Get repo name from git remote
-        cmd = ["git", "config", "--get", "remote.origin.url"]
-        logger.debug(
-            f"GitHubAPIContext.__init__: Running command: {' '.join(cmd)} in {self.repo_config.path}"
-        )
-
         try:
-            output = (
-                subprocess.check_output(cmd, cwd=self.repo_config.path).decode().strip()
-            )
-        except subprocess.CalledProcessError as e:
+            output = git_metadata.remote_url(self.repo_config.path)
+        except GitMetadataError as e:
             raise RuntimeError(f"Failed to get git remote URL: {e}") from e
+        if output is None:
+            raise RuntimeError(
+                f"Failed to get git remote URL: no origin remote in {self.repo_config.path}"
+            )
 
         logger.debug(f"GitHubAPIContext.__init__: Git remote URL: {output}")
 
@@ -235,23 +289,150 @@ class GitHubAPIContext:
 
     def get_current_branch(self) -> str:
         """Get current branch name"""
-        return (
-            subprocess.check_output(
-                ["git", "branch", "--show-current"], cwd=self.repo_config.path
-            )
-            .decode()
-            .strip()
-        )
+        return git_metadata.current_branch(self.repo_config.path)
 
     def get_current_commit(self) -> str:
         """Get current commit hash"""
-        return (
-            subprocess.check_output(
-                ["git", "rev-parse", "HEAD"], cwd=self.repo_config.path
+        return git_metadata.current_commit(self.repo_config.path)
+
+
+def _git_config_path(repo_path: str) -> Path | None:
+    """Locate the git config file of a work tree, following worktree links.
+
+    Args:
+        repo_path: Work tree root
+
+    Returns:
+        Path of the config file, or None if repo_path is not a work tree root
+    """
+    try:
+        return git_metadata.git_dirs(repo_path).common_dir / "config"
+    except GitMetadataError:
+        return None
+
+
+@dataclass
+class _CachedGitHubContext:
+    """A cached context and the state it was built from."""
+
+    context: GitHubAPIContext
+    fingerprint: tuple[str, str | None, int | None]
+    expires_at: float
+
+
+class GitHubContextCache:
+    """Per-repository cache of GitHubAPIContext objects.
+
+    Building a context reads the git remote, creates a Github client and
+    makes a ``get_repo()`` round trip, so all tool handlers share one context per
+    repository. An entry is rebuilt when it expires, when GITHUB_TOKEN changes,
+    or when the repository's git config (and with it possibly the remote URL)
+    is modified. Checking costs one ``stat`` call, no subprocess.
+    """
+
+    def __init__(self, ttl: float = GITHUB_CONTEXT_TTL):
+        """Initialize the context cache.
+
+        Args:
+            ttl: Seconds a context is reused before it is rebuilt
+        """
+        self.ttl = ttl
+        self._entries: dict[str, _CachedGitHubContext] = {}
+        self._build_locks: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _fingerprint(
+        repo_config: RepositoryConfig,
+    ) -> tuple[str, str | None, int | None]:
+        """Capture the inputs a context depends on."""
+        config_path = _git_config_path(repo_config.path)
+        try:
+            config_mtime = config_path.stat().st_mtime_ns if config_path else None
+        except OSError:
+            config_mtime = None
+        return (repo_config.path, os.getenv("GITHUB_TOKEN"), config_mtime)
+
+    def _lookup(
+        self, repo_name: str, fingerprint: tuple[str, str | None, int | None]
+    ) -> GitHubAPIContext | None:
+        """Return a valid cached context; the caller holds the lock."""
+        entry = self._entries.get(repo_name)
+        if entry is None:
+            return None
+        if entry.fingerprint != fingerprint or time.monotonic() >= entry.expires_at:
+            logger.debug(f"GitHub context for {repo_name} is stale, rebuilding")
+            del self._entries[repo_name]
+            return None
+        return entry.context
+
+    def get(self, repo_config: RepositoryConfig) -> GitHubAPIContext:
+        """Get the context of a repository, building it if needed.
+
+        Concurrent callers for the same repository wait for a single build.
+
+        Args:
+            repo_config: Repository configuration
+
+        Returns:
+            Cached or newly built context
+
+        Raises:
+            RuntimeError: If the context can't be built; failures aren't cached
+        """
+        fingerprint = self._fingerprint(repo_config)
+        with self._lock:
+            context = self._lookup(repo_config.name, fingerprint)
+            if context is not None:
+                return context
+            build_lock = self._build_locks.setdefault(
+                repo_config.name, threading.Lock()
             )
-            .decode()
-            .strip()
-        )
+
+        with build_lock:
+            with self._lock:
+                context = self._lookup(repo_config.name, fingerprint)
+            if context is None:
+                context = GitHubAPIContext(repo_config)
+                self.put(repo_config, context, fingerprint)
+        return context
+
+    def put(
+        self,
+        repo_config: RepositoryConfig,
+        context: GitHubAPIContext,
+        fingerprint: tuple[str, str | None, int | None] | None = None,
+    ) -> None:
+        """Store a context built elsewhere, e.g. by the worker at startup.
+
+        Args:
+            repo_config: Repository configuration the context was built from
+            context: Context to cache
+            fingerprint: State the context was built from; captured now if
+                not given
+        """
+        if fingerprint is None:
+            fingerprint = self._fingerprint(repo_config)
+        with self._lock:
+            self._entries[repo_config.name] = _CachedGitHubContext(
+                context, fingerprint, time.monotonic() + self.ttl
+            )
+
+    def invalidate(self, repo_name: str | None = None) -> None:
+        """Drop the cached context of one repository, or of all of them.
+
+        Args:
+            repo_name: Repository to drop; None drops every entry
+        """
+        with self._lock:
+            if repo_name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(repo_name, None)
+
+
+# Contexts shared by all tool handlers of this process
+github_context_cache = GitHubContextCache()
 
 
 def get_github_context(repo_name: str) -> GitHubAPIContext:
@@ -281,42 +462,147 @@ def get_github_context(repo_name: str) -> GitHubAPIContext:
     logger.debug(
         f"get_github_context: Found repo config for '{repo_name}', path: {repo_config.path}"
     )
-    context = GitHubAPIContext(repo_config)
+    context = github_context_cache.get(repo_config)
     logger.debug(
-        f"get_github_context: Created GitHubAPIContext, repo_name: {context.repo_name}"
+        f"get_github_context: Using GitHubAPIContext, repo_name: {context.repo_name}"
     )
     return context
 
 
+class BranchPRCache:
+    """Per-repository cache of the PR number opened from each branch.
+
+    Only open PRs are cached: while a PR is open no other PR can take its
+    place, so a hit needs just one request to refresh the PR itself. Entries
+    are dropped when they expire or when the cached PR is no longer open,
+    since a newer PR may have been opened from the same branch.
+    """
+
+    def __init__(self, ttl: float = BRANCH_PR_CACHE_TTL):
+        """Initialize the branch cache.
+
+        Args:
+            ttl: Seconds a branch-to-PR mapping is trusted
+        """
+        self.ttl = ttl
+        self._entries: dict[tuple[str, str], tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, repo_name: str, branch_name: str) -> int | None:
+        """Get the cached PR number of a branch.
+
+        Args:
+            repo_name: GitHub repository in owner/name form
+            branch_name: Head branch
+
+        Returns:
+            PR number, or None if not cached or expired
+        """
+        with self._lock:
+            entry = self._entries.get((repo_name, branch_name))
+            if entry is None:
+                return None
+            pr_number, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[(repo_name, branch_name)]
+                return None
+            return pr_number
+
+    def put(self, repo_name: str, branch_name: str, pr_number: int) -> None:
+        """Remember the open PR of a branch.
+
+        Args:
+            repo_name: GitHub repository in owner/name form
+            branch_name: Head branch
+            pr_number: Number of the open PR
+        """
+        with self._lock:
+            self._entries[(repo_name, branch_name)] = (
+                pr_number,
+                time.monotonic() + self.ttl,
+            )
+
+    def invalidate(
+        self, repo_name: str | None = None, branch_name: str | None = None
+    ) -> None:
+        """Drop cached mappings.
+
+        Args:
+            repo_name: Repository to drop; None drops every entry
+            branch_name: Branch to drop; None drops all branches of repo_name
+        """
+        with self._lock:
+            if repo_name is None:
+                self._entries.clear()
+            elif branch_name is not None:
+                self._entries.pop((repo_name, branch_name), None)
+            else:
+                for key in [k for k in self._entries if k[0] == repo_name]:
+                    del self._entries[key]
+
+
+# Branch-to-PR mappings shared by all tool handlers of this process
+branch_pr_cache = BranchPRCache()
+
+# Extracted CI artifacts, shared with the workers of other repositories
+artifact_cache = ArtifactCache(ARTIFACT_CACHE_DIR)
+
+
+def _find_pr_by_head_ref(
+    repo: Repository, repo_name: str, branch_name: str
+) -> PullRequest | None:
+    """Find the most recent PR whose head is branch_name.
+
+    Uses the cached mapping when the PR is still open, otherwise asks GitHub
+    to filter by ``head=owner:branch`` and reads only the first result, so the
+    cost doesn't grow with the repository's PR history.
+    """
+    pr_number = branch_pr_cache.get(repo_name, branch_name)
+    if pr_number is not None:
+        pr = repo.get_pull(pr_number)
+        if pr.state == "open":
+            return pr
+        branch_pr_cache.invalidate(repo_name, branch_name)
+
+    owner = repo_name.split("/", 1)[0]
+    # Newest first, matching the order of an unfiltered listing
+    for pr in repo.get_pulls(state="all", head=f"{owner}:{branch_name}"):
+        if pr.head.ref != branch_name:
+            continue
+        if pr.state == "open":
+            branch_pr_cache.put(repo_name, branch_name, pr.number)
+        return pr
+    return None
+
+
 # Tool implementations with repository context
 async def execute_find_pr_for_branch(repo_name: str, branch_name: str) -> str:
     """Find the PR associated with a branch in the specified repository"""
     try:
-        context = get_github_context(repo_name)
+        context = await run_blocking(get_github_context, repo_name)
         if not context.repo:
             return json.dumps(
                 {"error": f"GitHub repository not configured for {repo_name}"}
             )
 
-        pulls = context.repo.get_pulls(state="all")
-
-        # Look for matching branch
-        for pr in pulls:
-            if pr.head.ref == branch_name:
-                return json.dumps(
-                    {
-                        "found": True,
-                        "pr_number": pr.number,
-                        "title": pr.title,
-                        "state": pr.state,
-                        "url": pr.html_url,
-                        "author": pr.user.login,
-                        "base_branch": pr.base.ref,
-                        "head_branch": pr.head.ref,
-                        "repo": context.repo_name,
-                        "repo_config": repo_name,
-                    }
-                )
+        pr = await run_blocking(
+            _find_pr_by_head_ref, context.repo, context.repo_name, branch_name
+        )
+        if pr is not None:
+            return json.dumps(
+                {
+                    "found": True,
+                    "pr_number": pr.number,
+                    "title": pr.title,
+                    "state": pr.state,
+                    "url": pr.html_url,
+                    "author": pr.user.login,
+                    "base_branch": pr.base.ref,
+                    "head_branch": pr.head.ref,
+                    "repo": context.repo_name,
+                    "repo_config": repo_name,
+                }
+            )
 
         return json.dumps(
             {
@@ -336,13 +622,32 @@ async def execute_find_pr_for_branch(repo_name: str, branch_name: str) -> str:
         )
 
 
-async def execute_get_pr_comments(repo_name: str, pr_number: int) -> str:
-    """Get all comments from a PR in the specified repository"""
+def _get_github_json(
+    session: requests.Session, url: str, headers: dict[str, str], what: str
+) -> Any:
+    """GET a GitHub REST resource and decode it, raising on a non-200 status"""
+    logger.info(f"Making GitHub API call to get {what}: {url}")
+    response = session.get(url, headers=headers)
+    logger.info(
+        f"{what} API response: status={response.status_code}, headers={dict(response.headers)}"
+    )
+    if response.status_code != 200:
+        logger.error(
+            f"Failed to get {what}. Status: {response.status_code}, Response: {response.text}"
+        )
+        response.raise_for_status()
+    return response.json()
+
+
+async def execute_get_pr_comments(
+    repo_name: str, pr_number: int, unhandled_only: bool = False
+) -> str:
+    """Get the comments of a PR, optionally only those not acknowledged yet"""
     logger.info(f"Getting PR comments for repository '{repo_name}', PR #{pr_number}")
 
     try:
         logger.debug(f"Getting GitHub context for repository '{repo_name}'")
-        context = get_github_context(repo_name)
+        context = await run_blocking(get_github_context, repo_name)
         if not context.repo:
             logger.error(f"GitHub repository not configured for {repo_name}")
             return json.dumps(
@@ -359,70 +664,47 @@ async def execute_get_pr_comments(repo_name: str, pr_number: int) -> str:
         }  # Log only first 8 chars for security
         logger.debug(f"Using GitHub API headers: {headers}")
 
-        # Get PR details first
-        pr_url = f"https://api.github.com/repos/{context.repo_name}/pulls/{pr_number}"
-        logger.info(f"Making GitHub API call to get PR details: {pr_url}")
-
-        pr_response = requests.get(
-            pr_url, headers={"Authorization": f"token {context.github_token}"}
+        # The PR details and both comment lists are independent, so the three
+        # calls run concurrently on the session's pooled connections
+        session = get_github_session()
+        auth_headers = {"Authorization": f"token {context.github_token}"}
+        base_url = f"https://api.github.com/repos/{context.repo_name}"
+        pr_data, review_comments, issue_comments = await asyncio.gather(
+            run_blocking(
+                _get_github_json,
+                session,
+                f"{base_url}/pulls/{pr_number}",
+                auth_headers,
+                "PR details",
+            ),
+            run_blocking(
+                _get_github_json,
+                session,
+                f"{base_url}/pulls/{pr_number}/comments",
+                auth_headers,
+                "review comments",
+            ),
+            run_blocking(
+                _get_github_json,
+                session,
+                f"{base_url}/issues/{pr_number}/comments",
+                auth_headers,
+                "issue comments",
+            ),
         )
-        logger.info(
-            f"PR details API response: status={pr_response.status_code}, headers={dict(pr_response.headers)}"
-        )
-
-        if pr_response.status_code != 200:
-            logger.error(
-                f"Failed to get PR details. Status: {pr_response.status_code}, Response: {pr_response.text}"
-            )
-            pr_response.raise_for_status()
-
-        pr_data = pr_response.json()
         logger.info(
             f"Successfully got PR details. Title: '{pr_data['title']}', State: {pr_data['state']}"
         )
-
-        # Get review comments
-        comments_url = pr_data["review_comments_url"]
-        logger.info(f"Making GitHub API call to get review comments: {comments_url}")
-
-        comments_resp = requests.get(
-            comments_url, headers={"Authorization": f"token {context.github_token}"}
-        )
-        logger.info(
-            f"Review comments API response: status={comments_resp.status_code}, headers={dict(comments_resp.headers)}"
-        )
-
-        if comments_resp.status_code != 200:
-            logger.error(
-                f"Failed to get review comments. Status: {comments_resp.status_code}, Response: {comments_resp.text}"
-            )
-            comments_resp.raise_for_status()
-
-        review_comments = comments_resp.json()
         logger.info(f"Successfully got {len(review_comments)} review comments")
+        logger.info(f"Successfully got {len(issue_comments)} issue comments")
 
-        # Get issue comments
-        issue_comments_url = f"https://api.github.com/repos/{context.repo_name}/issues/{pr_number}/comments"
-        logger.info(
-            f"Making GitHub API call to get issue comments: {issue_comments_url}"
-        )
-
-        issue_resp = requests.get(
-            issue_comments_url,
-            headers={"Authorization": f"token {context.github_token}"},
-        )
-        logger.info(
-            f"Issue comments API response: status={issue_resp.status_code}, headers={dict(issue_resp.headers)}"
-        )
-
-        if issue_resp.status_code != 200:
-            logger.error(
-                f"Failed to get issue comments. Status: {issue_resp.status_code}, Response: {issue_resp.text}"
+        handled: set[int] = set()
+        if unhandled_only:
+            handled = await run_blocking(
+                get_pr_reply_queue().acked_comment_ids, repo_name
             )
-            issue_resp.raise_for_status()
-
-        issue_comments = issue_resp.json()
-        logger.info(f"Successfully got {len(issue_comments)} issue comments")
+            review_comments = [c for c in review_comments if c["id"] not in handled]
+            issue_comments = [c for c in issue_comments if c["id"] not in handled]
 
         # Format review comments
         formatted_review_comments = []
@@ -468,6 +750,8 @@ async def execute_get_pr_comments(repo_name: str, pr_number: int) -> str:
             "total_comments": len(formatted_review_comments)
             + len(formatted_issue_comments),
         }
+        if unhandled_only:
+            result["unhandled_only"] = True
 
         logger.info(
             f"Successfully completed get_pr_comments for {repo_name} PR #{pr_number}"
@@ -483,96 +767,110 @@ async def execute_get_pr_comments(repo_name: str, pr_number: int) -> str:
         )
 
 
+def _deliver_pr_reply(repo_name: str, comment_id: int, body: str) -> ReplyDelivery:
+    """Post a queued reply; used by the PR reply sender."""
+    context = get_github_context(repo_name)
+    return post_pr_reply(
+        get_github_session(),
+        context.github_token,
+        context.repo_name,
+        comment_id,
+        body,
+    )
+
+
+def create_pr_reply_sender(repo_name: str) -> PRReplySender:
+    """Create the background sender delivering a repository's queued PR replies."""
+    return PRReplySender(
+        get_pr_reply_queue(),
+        _deliver_pr_reply,
+        run_blocking=run_blocking,
+        repo_name=repo_name,
+    )
+
+
 async def execute_post_pr_reply(repo_name: str, comment_id: int, message: str) -> str:
-    """Reply to a PR comment in the specified repository"""
+    """Queue a reply to a PR comment in the specified repository.
+
+    The reply is stored in the durable outbox and posted by the worker's
+    background sender; github_pr_reply_status reports its delivery.
+    """
     try:
-        context = get_github_context(repo_name)
+        context = await run_blocking(get_github_context, repo_name)
         if not context.repo:
             return json.dumps(
                 {"error": f"GitHub repository not configured for {repo_name}"}
             )
 
-        headers = {
-            "Authorization": f"token {context.github_token}",
-            "Accept": "application/vnd.github+json",
-        }
-
-        # Try to get original comment context
-        comment_url = f"https://api.github.com/repos/{context.repo_name}/pulls/comments/{comment_id}"
-        comment_resp = requests.get(comment_url, headers=headers)
+        reply, created = await run_blocking(
+            get_pr_reply_queue().enqueue,
+            repo_name,
+            context.repo_name,
+            comment_id,
+            message,
+        )
+        return json.dumps(
+            {
+                "success": True,
+                "queued": created,
+                "reply_id": reply.id,
+                "status": reply.status,
+                "repo": context.repo_name,
+                "repo_config": repo_name,
+                "in_reply_to": comment_id,
+                "url": reply.reply_url,
+            }
+        )
 
-        if comment_resp.status_code == 200:
-            original_comment = comment_resp.json()
-            pr_url = original_comment.get("pull_request_url", "")
-            pr_number = pr_url.split("/")[-1] if pr_url else None
-        else:
-            # Try as issue comment
-            comment_url = f"https://api.github.com/repos/{context.repo_name}/issues/comments/{comment_id}"
-            comment_resp = requests.get(comment_url, headers=headers)
-            if comment_resp.status_code == 200:
-                original_comment = comment_resp.json()
-                issue_url = original_comment.get("issue_url", "")
-                pr_number = issue_url.split("/")[-1] if issue_url else None
-            else:
-                return json.dumps(
-                    {
-                        "error": f"Could not find comment with ID {comment_id} in {repo_name}"
-                    }
-                )
+    except Exception as e:
+        return json.dumps({"error": f"Failed to post PR reply in {repo_name}: {e!s}"})
 
-        # Strategy 1: Try direct reply to review comment
-        try:
-            reply_url = f"https://api.github.com/repos/{context.repo_name}/pulls/comments/{comment_id}/replies"
-            reply_data = {"body": message}
-            reply_resp = requests.post(reply_url, headers=headers, json=reply_data)
 
-            if reply_resp.status_code in [200, 201]:
+async def execute_pr_reply_status(
+    repo_name: str,
+    reply_id: int | None = None,
+    comment_id: int | None = None,
+    acknowledge: bool = False,
+) -> str:
+    """Report the delivery status of queued PR replies"""
+    try:
+        queue = get_pr_reply_queue()
+        if reply_id is not None:
+            reply = await run_blocking(queue.get, reply_id)
+            if reply is None or reply.repo_name != repo_name:
                 return json.dumps(
-                    {
-                        "success": True,
-                        "method": "direct_reply",
-                        "repo": context.repo_name,
-                        "repo_config": repo_name,
-                        "comment_id": reply_resp.json()["id"],
-                        "url": reply_resp.json()["html_url"],
-                    }
-                )
-        except Exception:
-            pass
-
-        # Strategy 2: Post as issue comment (fallback)
-        if pr_number:
-            try:
-                issue_comment_url = f"https://api.github.com/repos/{context.repo_name}/issues/{pr_number}/comments"
-                issue_comment_data = {
-                    "body": f"@{original_comment['user']['login']} {message}"
-                }
-                issue_resp = requests.post(
-                    issue_comment_url, headers=headers, json=issue_comment_data
+                    {"error": f"No PR reply with ID {reply_id} in {repo_name}"}
                 )
+            replies = [reply]
+            comment_id = reply.comment_id
+        else:
+            replies = await run_blocking(queue.list_replies, repo_name, comment_id)
 
-                if issue_resp.status_code in [200, 201]:
-                    return json.dumps(
-                        {
-                            "success": True,
-                            "method": "issue_comment_fallback",
-                            "repo": context.repo_name,
-                            "repo_config": repo_name,
-                            "comment_id": issue_resp.json()["id"],
-                            "url": issue_resp.json()["html_url"],
-                        }
-                    )
-            except Exception as e:
+        acknowledged = 0
+        if acknowledge:
+            if comment_id is None:
                 return json.dumps(
-                    {
-                        "error": f"All reply strategies failed for {repo_name}. Final error: {e!s}"
-                    }
+                    {"error": "acknowledge requires a reply_id or comment_id"}
                 )
+            acknowledged = await run_blocking(queue.ack, repo_name, comment_id)
+            replies = await run_blocking(queue.list_replies, repo_name, comment_id)
 
-        return json.dumps({"error": f"All reply strategies failed for {repo_name}"})
+        counts: dict[str, int] = {}
+        for reply in replies:
+            counts[reply.status] = counts.get(reply.status, 0) + 1
+        return json.dumps(
+            {
+                "repo_config": repo_name,
+                "counts": counts,
+                "acknowledged": acknowledged,
+                "replies": [reply.to_dict() for reply in replies],
+            }
+        )
 
     except Exception as e:
-        return json.dumps({"error": f"Failed to post PR reply in {repo_name}: {e!s}"})
+        return json.dumps(
+            {"error": f"Failed to get PR reply status for {repo_name}: {e!s}"}
+        )
 
 
 async def execute_get_current_branch(repo_name: str) -> str:
@@ -584,10 +882,10 @@ async def execute_get_current_branch(repo_name: str) -> str:
 
     try:
         logger.debug("Getting GitHub context...")
-        context = get_github_context(repo_name)
+        context = await run_blocking(get_github_context, repo_name)
 
         logger.debug("Getting current branch from git...")
-        branch = context.get_current_branch()
+        branch = await run_blocking(context.get_current_branch)
 
         logger.info(f"Current branch for {repo_name}: {branch}")
         return json.dumps(
@@ -605,8 +903,8 @@ async def execute_get_current_branch(repo_name: str) -> str:
 async def execute_get_current_commit(repo_name: str) -> str:
     """Get current commit for the specified repository"""
     try:
-        context = get_github_context(repo_name)
-        commit = context.get_current_commit()
+        context = await run_blocking(get_github_context, repo_name)
+        commit = await run_blocking(context.get_current_commit)
         return json.dumps(
             {"commit": commit, "repo": context.repo_name, "repo_config": repo_name}
         )
@@ -623,7 +921,7 @@ async def get_artifact_id(
     """Get artifact ID for linter reports (supports both SwiftLint and Python linters)"""
     url = f"https://api.github.com/repos/{repo_name}/actions/runs/{run_id}/artifacts"
     headers = {"Authorization": f"Bearer {token}"}
-    response = requests.get(url, headers=headers)
+    response = await run_blocking(get_github_session().get, url, headers=headers)
     logging.info(f"{response=}")
     response.raise_for_status()
 
@@ -662,160 +960,53 @@ async def get_artifact_id(
     raise RuntimeError(error_msg)
 
 
-async def read_lint_output_file(output_dir: str) -> str:
-    """Read the lint output file from the extracted artifact directory"""
-    import os
-
-    logger.info(f"=== READING LINT OUTPUT FROM {output_dir} ===")
-
-    # Look for common lint output file names
-    possible_files = [
-        "lint-output.txt",
-        "linter-results.txt",
-        "ruff-output.txt",
-        "mypy-output.txt",
-        "lint.txt",
-    ]
-
-    logger.info(f"Looking for lint output files: {possible_files}")
-
-    for filename in possible_files:
-        file_path = os.path.join(output_dir, filename)
-        logger.info(f"Checking: {file_path}")
-        if os.path.exists(file_path):
-            logger.info(f"✓ Found {filename}!")
-            try:
-                file_size = os.path.getsize(file_path)
-                logger.info(f"File size: {file_size} bytes")
-                with open(file_path, encoding="utf-8") as f:
-                    content = f.read()
-                    logger.info(
-                        f"✓ Successfully read {len(content)} characters from {filename}"
-                    )
-                    # Show preview of content
-                    if content:
-                        preview = (
-                            content[:200] + "..." if len(content) > 200 else content
-                        )
-                        logger.info(f"Content preview: {preview!r}")
-                    return content
-            except Exception as e:
-                logger.error(f"✗ Error reading {filename}: {e}")
-        else:
-            logger.info(f"✗ {filename} not found")
-
-    # If no specific file found, try to read all .txt files and combine them
-    logger.info("No specific lint output file found, searching for all .txt files...")
-    txt_files = []
-    txt_files_found = []
-
-    if os.path.exists(output_dir):
-        for file in os.listdir(output_dir):
-            if file.endswith(".txt"):
-                file_path = os.path.join(output_dir, file)
-                logger.info(f"Found .txt file: {file}")
-                if os.path.isfile(file_path):
-                    try:
-                        with open(file_path, encoding="utf-8") as f:
-                            content = f.read().strip()
-                            if content:
-                                txt_files.append(content)
-                                txt_files_found.append(file)
-                                logger.info(
-                                    f"✓ Added content from {file} ({len(content)} chars)"
-                                )
-                            else:
-                                logger.info(f"✗ {file} is empty")
-                    except Exception as e:
-                        logger.error(f"✗ Error reading {file}: {e}")
-
-    combined_content = "\n".join(txt_files) if txt_files else ""
-    logger.info("=== COMBINED RESULT ===")
-    logger.info(f"Files used: {txt_files_found}")
-    logger.info(f"Total content length: {len(combined_content)} characters")
-    if combined_content:
-        preview = (
-            combined_content[:200] + "..."
-            if len(combined_content) > 200
-            else combined_content
-        )
-        logger.info(f"Combined content preview: {preview!r}")
-    logger.info("=== END LINT OUTPUT READING ===")
-
-    return combined_content
-
-
 async def download_and_extract_artifact(
     repo_name: str, artifact_id: str, token: str, extract_dir: str | None = None
 ) -> str:
-    """Download and extract SwiftLint artifact"""
+    """Download and extract an artifact, by default into the artifact cache"""
     url = (
         f"https://api.github.com/repos/{repo_name}/actions/artifacts/{artifact_id}/zip"
     )
     headers = {"Authorization": f"Bearer {token}"}
-    response = requests.get(url, headers=headers)
-    response.raise_for_status()
+
+    def download(archive: Path) -> None:
+        _stream_to_file(url, headers, archive)
 
     if extract_dir is None:
-        extract_dir = "/tmp/swiftlint_output"
+        # Each artifact gets its own cached directory; repeated queries for
+        # the same run skip the download
+        output_dir = await run_blocking(
+            artifact_cache.get_or_fetch, repo_name, artifact_id, download
+        )
+        return str(output_dir)
 
-    with zipfile.ZipFile(io.BytesIO(response.content)) as z:
-        z.extractall(extract_dir)
+    def download_and_extract() -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            archive = Path(tmp) / "artifact.zip"
+            download(archive)
+            extract_archive(archive, Path(extract_dir))
+
+    await run_blocking(download_and_extract)
     return extract_dir
 
 
+def _stream_to_file(url: str, headers: dict[str, str], path: Path) -> None:
+    """Download a URL to a file in chunks instead of buffering it in memory"""
+    with get_github_session().get(url, headers=headers, stream=True) as response:
+        response.raise_for_status()
+        with open(path, "wb") as f:
+            for chunk in response.iter_content(chunk_size=ARTIFACT_CHUNK_SIZE):
+                f.write(chunk)
+
+
 async def parse_swiftlint_output(
-    output_dir: str, expected_filename: str = "swiftlint_all.txt"
+    output_dir: str, expected_filename: str | None = "swiftlint_all.txt"
 ) -> list:
     """Parse SwiftLint output to extract only actual violations/errors"""
-    violations = []
-
-    # Look for the expected SwiftLint output file
-    expected_file_path = os.path.join(output_dir, expected_filename)
-    if not os.path.exists(expected_file_path):
-        # Try common alternative names
-        alternatives = [
-            "swiftlint.txt",
-            "violations.txt",
-            "lint-results.txt",
-            "output.txt",
-        ]
-        found_file = None
-        for alt_name in alternatives:
-            alt_path = os.path.join(output_dir, alt_name)
-            if os.path.exists(alt_path):
-                found_file = alt_path
-                break
-
-        if not found_file:
-            raise FileNotFoundError(
-                f"Expected SwiftLint output file '{expected_filename}' not found in {output_dir}. Available files: {os.listdir(output_dir)}"
-            )
-
-        expected_file_path = found_file
-
-    # Pattern to match SwiftLint violation lines
-    violation_pattern = re.compile(
-        r"^/.+\.swift:\d+:\d+:\s+(error|warning):\s+.+\s+\(.+\)$"
+    return await run_blocking(
+        parse_artifact, output_dir, "swift", "lint", expected_filename
     )
 
-    with open(expected_file_path) as f:
-        for line in f:
-            line = line.strip()
-            if line and violation_pattern.match(line):
-                violations.append(
-                    {
-                        "raw_line": line,
-                        "file": extract_file_from_violation(line),
-                        "line_number": extract_line_number_from_violation(line),
-                        "severity": extract_severity_from_violation(line),
-                        "message": extract_message_from_violation(line),
-                        "rule": extract_rule_from_violation(line),
-                    }
-                )
-
-    return violations
-
 
 def extract_file_from_violation(violation_line: str) -> str:
     """Extract file path from violation line"""
@@ -855,7 +1046,9 @@ async def find_workflow_run(
     headers = {"Authorization": f"Bearer {token}"}
     params = {"head_sha": commit_sha}
 
-    response = requests.get(url, headers=headers, params=params)
+    response = await run_blocking(
+        get_github_session().get, url, headers=headers, params=params
+    )
     response.raise_for_status()
 
     runs_data = response.json()
@@ -879,7 +1072,7 @@ async def execute_github_check_ci_lint_errors_not_local(
 
     try:
         logger.info(f"📋 Step 1: Getting GitHub context for repository '{repo_name}'")
-        context = get_github_context(repo_name)
+        context = await run_blocking(get_github_context, repo_name)
         if not context.repo or not context.repo_name:
             logger.error(f"❌ GitHub repository not configured for {repo_name}")
             return json.dumps(
@@ -900,7 +1093,7 @@ async def execute_github_check_ci_lint_errors_not_local(
 
         if build_id is None:
             logger.info("📋 Step 3: Finding workflow run for current commit")
-            commit_sha = context.get_current_commit()
+            commit_sha = await run_blocking(context.get_current_commit)
             logger.info(f"🔍 Current commit SHA: {commit_sha}")
             build_id = await find_workflow_run(context, commit_sha, token)
             logger.info(
@@ -1001,51 +1194,18 @@ async def execute_github_check_ci_lint_errors_not_local(
             )
         else:
             logger.info("🔍 Step 8a: Using Python linter parser...")
-            # For Python, read the raw output and parse with get_linter_errors
-            logger.info("📄 Step 8b: Reading lint output file...")
-            lint_output = await read_lint_output_file(output_dir)
-            logger.info(
-                f"✅ Step 8b Complete: Read {len(lint_output)} characters from lint output"
-            )
-
-            # Debug: Show first part of lint output
-            if lint_output:
-                preview = (
-                    lint_output[:500] + "..." if len(lint_output) > 500 else lint_output
-                )
-                logger.info(f"📝 Lint output preview: {preview}")
-            else:
-                logger.warning("⚠️ Lint output is empty!")
-
-            logger.info("🔧 Step 8c: Parsing lint errors...")
-            parsed_result = await get_linter_errors(
-                repo_name, lint_output, language, repo_manager
-            )
-            logger.info(
-                f"✅ Step 8c Partial: Parser returned: {len(parsed_result)} characters"
-            )
-
-            logger.info("🔍 Step 8d: Parsing JSON result...")
+            # For Python, dispatch the artifact's files to the ruff and mypy parsers
+            logger.info("📄 Step 8b: Parsing lint output files...")
             try:
-                parsed_data = json.loads(parsed_result)
-                logger.info("✅ Step 8d Complete: JSON parsed successfully")
-                logger.info(f"📊 Parser result keys: {list(parsed_data.keys())}")
-                lint_results = parsed_data.get("errors", [])
-                logger.info(
-                    f"✅ Extracted {len(lint_results)} errors from parser result"
+                lint_results = await run_blocking(
+                    parse_artifact, output_dir, "python", "lint"
                 )
-
-                # Debug: Show first few errors
-                if lint_results:
-                    logger.info("📋 First few errors:")
-                    for i, error in enumerate(lint_results[:3]):
-                        logger.info(f"  Error {i + 1}: {error}")
-                else:
-                    logger.warning("⚠️ No errors found in parser result")
-            except json.JSONDecodeError as e:
-                logger.error(f"❌ Step 8d Failed: Failed to parse JSON result: {e}")
-                logger.error(f"Raw result: {parsed_result}")
+            except FileNotFoundError as e:
+                logger.warning(f"⚠️ {e}")
                 lint_results = []
+            logger.info(
+                f"✅ Step 8b Complete: Python linter parsers found {len(lint_results)} errors"
+            )
 
         # Categorize violations by severity/type - limit to 10 per category to prevent huge responses
         logger.info(
@@ -1183,118 +1343,6 @@ async def execute_github_check_ci_lint_errors_not_local(
         )
 
 
-# Python linter error parsing functions
-def extract_file_from_ruff_error(error_line: str) -> str:
-    """Extract file path from ruff error line"""
-    import re
-
-    # GitHub Actions format: ::error title=Ruff (UP045),file=/path/to/file.py,line=503,col=49,endLine=503,endColumn=62::message
-    match = re.search(r"::error title=Ruff.*?file=([^,]+)", error_line)
-    if match:
-        return match.group(1)
-
-    # Direct command format: Error: filename.py:line:col: RULE message
-    match = re.match(r"^Error: ([^:]+):\d+:\d+:", error_line)
-    return match.group(1) if match else ""
-
-
-def extract_line_number_from_ruff_error(error_line: str) -> int:
-    """Extract line number from ruff error line"""
-    import re
-
-    # GitHub Actions format
-    match = re.search(r"::error title=Ruff.*?line=(\d+)", error_line)
-    if match:
-        return int(match.group(1))
-
-    # Direct command format: Error: filename.py:line:col: RULE message
-    match = re.match(r"^Error: [^:]+:(\d+):\d+:", error_line)
-    return int(match.group(1)) if match else 0
-
-
-def extract_column_from_ruff_error(error_line: str) -> int:
-    """Extract column number from ruff error line"""
-    import re
-
-    # GitHub Actions format
-    match = re.search(r"::error title=Ruff.*?col=(\d+)", error_line)
-    if match:
-        return int(match.group(1))
-
-    # Direct command format: Error: filename.py:line:col: RULE message
-    match = re.match(r"^Error: [^:]+:\d+:(\d+):", error_line)
-    return int(match.group(1)) if match else 0
-
-
-def extract_rule_from_ruff_error(error_line: str) -> str:
-    """Extract rule code from ruff error line"""
-    import re
-
-    # GitHub Actions format
-    match = re.search(r"::error title=Ruff \(([^)]+)\)", error_line)
-    if match:
-        return match.group(1)
-
-    # Direct command format: Error: filename.py:line:col: RULE message
-    match = re.match(r"^Error: [^:]+:\d+:\d+: ([A-Z]+\d+)", error_line)
-    return match.group(1) if match else ""
-
-
-def extract_message_from_ruff_error(error_line: str) -> str:
-    """Extract message from ruff error line"""
-    import re
-
-    # GitHub Actions format: message is after the last ::
-    match = re.search(r"::error title=Ruff.*?::(.+)$", error_line)
-    if match:
-        return match.group(1)
-
-    # Direct command format: Error: filename.py:line:col: RULE message
-    match = re.match(r"^Error: ([^:]+:\d+:\d+: [A-Z]+\d+ .+)$", error_line)
-    return match.group(1) if match else ""
-
-
-def extract_file_from_mypy_error(error_line: str) -> str:
-    """Extract file path from mypy error line"""
-    import re
-
-    # Mypy format: file.py:line: error: message [error-code]
-    # Must have numeric line number and contain "error:"
-    match = re.match(r"^([^:]+\.py):(\d+): error:", error_line)
-    return match.group(1) if match else ""
-
-
-def extract_line_number_from_mypy_error(error_line: str) -> int:
-    """Extract line number from mypy error line"""
-    import re
-
-    # Must contain "error:" to be valid
-    match = re.match(r"^[^:]+\.py:(\d+): error:", error_line)
-    return int(match.group(1)) if match else 0
-
-
-def extract_message_from_mypy_error(error_line: str) -> str:
-    """Extract message from mypy error line"""
-    import re
-
-    # Must be valid mypy error format with numeric line number
-    if not re.match(r"^[^:]+\.py:\d+: error:", error_line):
-        return ""
-    match = re.search(r": error: (.+?)(?:\s+\[[^\]]+\])?$", error_line)
-    return match.group(1) if match else ""
-
-
-def extract_error_code_from_mypy_error(error_line: str) -> str:
-    """Extract error code from mypy error line"""
-    import re
-
-    # Must be valid mypy error format with numeric line number
-    if not re.match(r"^[^:]+\.py:\d+: error:", error_line):
-        return ""
-    match = re.search(r"\[([^\]]+)\]$", error_line)
-    return match.group(1) if match else ""
-
-
 async def get_linter_errors(
     repo_name: str,
     error_output: str,
@@ -1318,93 +1366,12 @@ async def get_linter_errors(
             f"Repository language: {language} (from parameter: {language is not None})"
         )
 
-        errors = []
-        lines = error_output.strip().split("\n")
-        logger.info(f"Split into {len(lines)} lines for processing")
-
-        if language == "python":
-            logger.info("Processing Python linter errors (ruff and mypy)...")
-            # Parse Python linter errors (ruff and mypy)
-            for i, line in enumerate(lines, 1):
-                if not line.strip():
-                    continue
-
-                logger.debug(f"Line {i}: {line[:100]!r}")  # Show first 100 chars
-
-                # Try to parse as ruff error first
-                if "::error title=Ruff" in line:
-                    logger.info(f"Line {i}: Found ruff error")
-                    error_info = {
-                        "type": "ruff",
-                        "file": extract_file_from_ruff_error(line),
-                        "line": extract_line_number_from_ruff_error(line),
-                        "column": extract_column_from_ruff_error(line),
-                        "rule": extract_rule_from_ruff_error(line),
-                        "message": extract_message_from_ruff_error(line),
-                        "severity": "error",
-                    }
-                    if error_info[
-                        "file"
-                    ]:  # Only add if we successfully parsed the file
-                        errors.append(error_info)
-                        logger.info(
-                            f"✓ Added ruff error: {error_info['file']}:{error_info['line']} [{error_info['rule']}]"
-                        )
-                    else:
-                        logger.warning(
-                            f"✗ Failed to parse ruff error (no file): {line}"
-                        )
-
-                # Try to parse as mypy error
-                elif ": error:" in line and line.endswith("]"):
-                    logger.info(f"Line {i}: Found mypy error")
-                    error_info = {
-                        "type": "mypy",
-                        "file": extract_file_from_mypy_error(line),
-                        "line": extract_line_number_from_mypy_error(line),
-                        "message": extract_message_from_mypy_error(line),
-                        "error_code": extract_error_code_from_mypy_error(line),
-                        "severity": "error",
-                    }
-                    if error_info[
-                        "file"
-                    ]:  # Only add if we successfully parsed the file
-                        errors.append(error_info)
-                        logger.info(
-                            f"✓ Added mypy error: {error_info['file']}:{error_info['line']} [{error_info['error_code']}]"
-                        )
-                    else:
-                        logger.warning(
-                            f"✗ Failed to parse mypy error (no file): {line}"
-                        )
-                else:
-                    logger.debug(f"Line {i}: Not a recognized error format")
-
-        elif language == "swift":
-            # Parse Swift linter errors (SwiftLint)
-            for line in lines:
-                if not line.strip():
-                    continue
-
-                # Parse SwiftLint violations
-                if ".swift:" in line and ("error:" in line or "warning:" in line):
-                    error_info = {
-                        "type": "swiftlint",
-                        "file": extract_file_from_violation(line),
-                        "line": extract_line_number_from_violation(line),
-                        "severity": extract_severity_from_violation(line),
-                        "message": extract_message_from_violation(line),
-                        "rule": extract_rule_from_violation(line),
-                    }
-                    if error_info[
-                        "file"
-                    ]:  # Only add if we successfully parsed the file
-                        errors.append(error_info)
-
-        else:
+        if language not in ("python", "swift"):
             logger.warning(f"Unsupported language: {language}")
             return json.dumps({"error": f"Unsupported language: {language}"})
 
+        errors = list(iter_lint_errors(error_output.strip().split("\n"), language))
+
         logger.info("=== PARSING COMPLETE ===")
         logger.info(f"Total errors found: {len(errors)}")
         if errors:
@@ -1431,6 +1398,28 @@ async def get_linter_errors(
         return json.dumps({"error": f"Failed to parse linter errors: {e!s}"})
 
 
+def _get_check_runs(repo_name: str, commit_sha: str, token: str) -> list[dict]:
+    """Fetch all check runs of a commit, following pagination links"""
+    session = get_github_session()
+    headers = {
+        "Authorization": f"token {token}",
+        "Accept": "application/vnd.github+json",
+    }
+    url: str | None = (
+        f"https://api.github.com/repos/{repo_name}/commits/{commit_sha}/check-runs"
+    )
+    params: dict[str, int] | None = {"per_page": 100}
+    check_runs: list[dict] = []
+    while url:
+        response = session.get(url, headers=headers, params=params)
+        response.raise_for_status()
+        check_runs.extend(response.json().get("check_runs", []))
+        # The next link already carries the query parameters
+        url = response.links.get("next", {}).get("url")
+        params = None
+    return check_runs
+
+
 async def execute_get_build_status(
     repo_name: str, commit_sha: str | None = None
 ) -> str:
@@ -1445,9 +1434,9 @@ async def execute_get_build_status(
             logger.error(f"Repository {repo_name} not found in configuration")
             return json.dumps({"error": f"Repository {repo_name} not found"})
 
-        logger.debug("Creating GitHub context...")
+        logger.debug("Getting GitHub context...")
         repo_config = repo_manager.repositories[repo_name]
-        context = GitHubAPIContext(repo_config)
+        context = await run_blocking(github_context_cache.get, repo_config)
 
         if not context.repo:
             logger.error("GitHub repository not configured")
@@ -1455,12 +1444,9 @@ async def execute_get_build_status(
 
         if not commit_sha:
             logger.debug("No commit SHA provided, getting current commit...")
-            commit_sha = context.get_current_commit()
+            commit_sha = await run_blocking(context.get_current_commit)
             logger.debug(f"Using commit SHA: {commit_sha}")
 
-        logger.debug(f"Fetching commit details for {commit_sha}...")
-        commit = context.repo.get_commit(commit_sha)
-
         # Initialize overall_state here; it will be updated based on check runs
         overall_state = (
             "pending"  # Default to pending if no checks or statuses are found
@@ -1472,27 +1458,31 @@ async def execute_get_build_status(
         try:
             # Prefer check runs for detailed build status
             # This is more robust against the 'Resource not accessible' error for combined_status
-            check_runs = list(commit.get_check_runs())
+            # Fetched through the cached session, so polling an unchanged
+            # commit costs only 304 revalidations
+            check_runs = await run_blocking(
+                _get_check_runs, context.repo_name, commit_sha, context.github_token
+            )
             logger.info(f"Found {len(check_runs)} check runs")
 
             for run in check_runs:
                 check_run_info = {
-                    "name": run.name,
-                    "status": run.status,
-                    "conclusion": run.conclusion,
-                    "url": run.html_url,
+                    "name": run["name"],
+                    "status": run["status"],
+                    "conclusion": run["conclusion"],
+                    "url": run["html_url"],
                 }
                 check_runs_data.append(check_run_info)
                 logger.debug(
-                    f"Check run: {run.name} - status: {run.status}, conclusion: {run.conclusion}"
+                    f"Check run: {run['name']} - status: {run['status']}, conclusion: {run['conclusion']}"
                 )
 
-                if run.conclusion in ["failure", "timed_out", "cancelled", "stale"]:
+                if run["conclusion"] in ["failure", "timed_out", "cancelled", "stale"]:
                     has_failures = True
-                    logger.debug(f"Found failure in check run: {run.name}")
+                    logger.debug(f"Found failure in check run: {run['name']}")
                 elif (
-                    run.status == "completed"
-                    and run.conclusion == "success"
+                    run["status"] == "completed"
+                    and run["conclusion"] == "success"
                     and overall_state == "pending"
                 ):
                     overall_state = "success"  # Set to success if at least one successful completed run and no failures yet
@@ -1500,7 +1490,7 @@ async def execute_get_build_status(
                         "Setting overall state to success based on completed run"
                     )
                 elif (
-                    run.status != "completed"
+                    run["status"] != "completed"
                 ):  # If any check is still running, overall is in_progress
                     overall_state = "in_progress"
                     logger.debug("Found in-progress check run")
@@ -1515,7 +1505,8 @@ async def execute_get_build_status(
         if not check_runs_data:
             logger.debug("No check runs found, trying combined status fallback...")
             try:
-                status = commit.get_combined_status()
+                commit = await run_blocking(context.repo.get_commit, commit_sha)
+                status = await run_blocking(commit.get_combined_status)
                 overall_state = status.state
                 logger.debug(f"Combined status state: {status.state}")
 
@@ -1574,210 +1565,19 @@ async def parse_build_output(
     language: str,
     expected_filename: str | None = None,
 ) -> list:
-    """Parse build output to extract compiler errors, warnings, and test failures"""
-    issues = []
-
-    # Set default filename based on language if not provided
-    if expected_filename is None:
-        if language == "python":
-            expected_filename = "python_test_output.txt"
-        else:
-            expected_filename = "build_and_test_all.txt"
+    """Parse build output to extract compiler errors, warnings, and test failures
 
+    Every file of the artifact that matches a build output parser of the
+    language is parsed; unknown languages are parsed as Swift output.
+    """
+    if language != "python":
+        language = "swift"
     logger.info(
         f"parse_build_output: language={language}, expected_filename={expected_filename}"
     )
-
-    # Look for the expected build output file
-    expected_file_path = os.path.join(output_dir, expected_filename)
-    if not os.path.exists(expected_file_path):
-        # Try common alternative names based on language
-        if language == "python":
-            alternatives = [
-                "python_test_output.txt",
-                "output.txt",
-                "log.txt",
-                "test_output.txt",
-            ]
-        else:
-            alternatives = ["build.txt", "output.log", "output.txt", "log.txt"]
-        found_file = None
-        for alt_name in alternatives:
-            alt_path = os.path.join(output_dir, alt_name)
-            if os.path.exists(alt_path):
-                found_file = alt_path
-                break
-
-        if not found_file:
-            raise FileNotFoundError(
-                f"Expected build output file '{expected_filename}' not found in {output_dir}. Available files: {os.listdir(output_dir)}"
-            )
-
-        expected_file_path = found_file
-
-    # Patterns to match different types of build issues based on language
-    if language == "swift":
-        compiler_error_pattern = re.compile(r"^(/.*\.swift):(\d+):(\d+): error: (.+)$")
-        compiler_warning_pattern = re.compile(
-            r"^(/.*\.swift):(\d+):(\d+): warning: (.+)$"
-        )
-        test_failure_pattern = re.compile(r"^(/.*\.swift):(\d+): error: (.+) : (.+)$")
-    elif language == "python":
-        # Python warnings: /usr/lib/python3.12/unittest/case.py:690: DeprecationWarning: It is deprecated...
-        python_warning_pattern = re.compile(r"^(/.*\.py):(\d+): (\w+Warning): (.+)$")
-        # Python test failures: assert result is True -> E assert False is True
-        python_test_failure_pattern = re.compile(r"^>?\s*(assert .+)$")
-        # Python runtime errors: TypeError: is_server_healthy() got an unexpected keyword argument
-        python_runtime_error_pattern = re.compile(r"^E\s+(\w+Error): (.+)$")
-        # Python file/line pattern: tests/test_utilities.py:274: AssertionError
-        python_file_line_pattern = re.compile(
-            r"^([^:]+\.py):(\d+): (\w+(?:Error|Warning|Exception))$"
-        )
-    else:
-        # Default to Swift patterns for unknown languages
-        compiler_error_pattern = re.compile(r"^(/.*\.swift):(\d+):(\d+): error: (.+)$")
-        compiler_warning_pattern = re.compile(
-            r"^(/.*\.swift):(\d+):(\d+): warning: (.+)$"
-        )
-        test_failure_pattern = re.compile(r"^(/.*\.swift):(\d+): error: (.+) : (.+)$")
-
-    with open(expected_file_path) as f:
-        lines = f.readlines()
-
-    for line_num, line in enumerate(lines, 1):
-        line = line.strip()
-
-        if language == "swift":
-            # Check for compiler errors
-            if match := compiler_error_pattern.match(line):
-                file_path, line_no, col_no, message = match.groups()
-                issues.append(
-                    {
-                        "type": "compiler_error",
-                        "raw_line": line,
-                        "file": file_path,
-                        "line_number": int(line_no),
-                        "column": int(col_no),
-                        "message": message,
-                        "severity": "error",
-                    }
-                )
-
-            # Check for compiler warnings
-            elif match := compiler_warning_pattern.match(line):
-                file_path, line_no, col_no, message = match.groups()
-                issues.append(
-                    {
-                        "type": "compiler_warning",
-                        "raw_line": line,
-                        "file": file_path,
-                        "line_number": int(line_no),
-                        "column": int(col_no),
-                        "message": message,
-                        "severity": "warning",
-                    }
-                )
-
-            # Check for test failures
-            elif match := test_failure_pattern.match(line):
-                file_path, line_no, test_info, failure_message = match.groups()
-                issues.append(
-                    {
-                        "type": "test_failure",
-                        "raw_line": line,
-                        "file": file_path,
-                        "line_number": int(line_no),
-                        "test_info": test_info.strip(),
-                        "message": failure_message.strip(),
-                        "severity": "error",
-                    }
-                )
-
-        elif language == "python":
-            # Check for Python warnings
-            if match := python_warning_pattern.match(line):
-                file_path, line_no, warning_type, message = match.groups()
-                issues.append(
-                    {
-                        "type": "python_warning",
-                        "raw_line": line,
-                        "file": file_path,
-                        "line_number": int(line_no),
-                        "warning_type": warning_type,
-                        "message": message,
-                        "severity": "warning",
-                    }
-                )
-
-            # Check for Python runtime errors
-            elif match := python_runtime_error_pattern.match(line):
-                error_type, message = match.groups()
-
-                # Look ahead for file/line info
-                file_path = None
-                line_number = None
-                for i in range(line_num, min(line_num + 5, len(lines))):
-                    next_line = lines[i].strip()
-                    if file_match := python_file_line_pattern.match(next_line):
-                        file_path, line_number, _ = file_match.groups()
-                        break
-
-                issue_data = {
-                    "type": "python_runtime_error",
-                    "raw_line": line,
-                    "error_type": error_type,
-                    "message": message,
-                    "severity": "error",
-                }
-
-                if file_path and line_number:
-                    issue_data.update(
-                        {
-                            "file": file_path,
-                            "line_number": int(line_number),
-                        }
-                    )
-
-                issues.append(issue_data)
-
-            # Check for Python test failures (assertion lines)
-            elif match := python_test_failure_pattern.match(line):
-                assertion = match.group(1)
-                # Look ahead for the error line
-                error_line = ""
-                if line_num < len(lines):
-                    next_line = lines[line_num].strip()
-                    if next_line.startswith("E "):
-                        error_line = next_line[2:]  # Remove "E " prefix
-
-                # Look ahead for file/line info
-                file_path = None
-                line_number = None
-                for i in range(line_num, min(line_num + 5, len(lines))):
-                    next_line = lines[i].strip()
-                    if file_match := python_file_line_pattern.match(next_line):
-                        file_path, line_number, _ = file_match.groups()
-                        break
-
-                issue_data = {
-                    "type": "python_test_failure",
-                    "raw_line": line,
-                    "assertion": assertion,
-                    "error": error_line,
-                    "severity": "error",
-                }
-
-                if file_path and line_number:
-                    issue_data.update(
-                        {
-                            "file": file_path,
-                            "line_number": int(line_number),
-                        }
-                    )
-
-                issues.append(issue_data)
-
-    return issues
+    return await run_blocking(
+        parse_artifact, output_dir, language, "build", expected_filename
+    )
 
 
 async def execute_github_check_ci_build_and_test_errors_not_local(
@@ -1789,7 +1589,7 @@ async def execute_github_check_ci_build_and_test_errors_not_local(
     )
 
     try:
-        context = get_github_context(repo_name)
+        context = await run_blocking(get_github_context, repo_name)
         if not context.repo:
             return json.dumps(
                 {"error": f"GitHub repository not configured for {repo_name}"}
@@ -1821,7 +1621,7 @@ async def execute_github_check_ci_build_and_test_errors_not_local(
             return json.dumps({"error": "GITHUB_TOKEN is not set"})
 
         if build_id is None:
-            commit_sha = context.get_current_commit()
+            commit_sha = await run_blocking(context.get_current_commit)
             build_id = await find_workflow_run(context, commit_sha, token)
             logger.info(f"Using workflow run {build_id} for commit {commit_sha}")
 
@@ -1834,20 +1634,22 @@ async def execute_github_check_ci_build_and_test_errors_not_local(
             context.repo_name, run_id, token, name="build-output"
         )
         output_dir = await download_and_extract_artifact(
-            context.repo_name, artifact_id, token, "/tmp/build_output"
+            context.repo_name, artifact_id, token
         )
         build_issues = await parse_build_output(output_dir, language=language)
 
         # Filter and limit results to prevent huge responses based on language
         if language == "swift":
             compiler_errors = [
-                issue for issue in build_issues if issue["type"] == "compiler_error"
+                issue for issue in build_issues if issue["type"] in SWIFT_ERROR_TYPES
             ][:10]
             compiler_warnings = [
                 issue for issue in build_issues if issue["type"] == "compiler_warning"
             ][:10]
             test_failures = [
-                issue for issue in build_issues if issue["type"] == "test_failure"
+                issue
+                for issue in build_issues
+                if issue["type"] in SWIFT_TEST_FAILURE_TYPES
             ][:10]
         elif language == "python":
             python_warnings = [
@@ -1866,13 +1668,15 @@ async def execute_github_check_ci_build_and_test_errors_not_local(
         else:
             # Default to Swift categorization
             compiler_errors = [
-                issue for issue in build_issues if issue["type"] == "compiler_error"
+                issue for issue in build_issues if issue["type"] in SWIFT_ERROR_TYPES
             ][:10]
             compiler_warnings = [
                 issue for issue in build_issues if issue["type"] == "compiler_warning"
             ][:10]
             test_failures = [
-                issue for issue in build_issues if issue["type"] == "test_failure"
+                issue
+                for issue in build_issues
+                if issue["type"] in SWIFT_TEST_FAILURE_TYPES
             ][:10]
 
         # Build response based on language
@@ -1913,13 +1717,17 @@ async def execute_github_check_ci_build_and_test_errors_not_local(
                     "compiler_warnings": compiler_warnings,
                     "test_failures": test_failures,
                     "total_errors": len(
-                        [i for i in build_issues if i["type"] == "compiler_error"]
+                        [i for i in build_issues if i["type"] in SWIFT_ERROR_TYPES]
                     ),
                     "total_warnings": len(
                         [i for i in build_issues if i["type"] == "compiler_warning"]
                     ),
                     "total_test_failures": len(
-                        [i for i in build_issues if i["type"] == "test_failure"]
+                        [
+                            i
+                            for i in build_issues
+                            if i["type"] in SWIFT_TEST_FAILURE_TYPES
+                        ]
                     ),
                 }
             )
@@ -1948,13 +1756,17 @@ async def execute_github_check_ci_build_and_test_errors_not_local(
                     "compiler_warnings": compiler_warnings,
                     "test_failures": test_failures,
                     "total_errors": len(
-                        [i for i in build_issues if i["type"] == "compiler_error"]
+                        [i for i in build_issues if i["type"] in SWIFT_ERROR_TYPES]
                     ),
                     "total_warnings": len(
                         [i for i in build_issues if i["type"] == "compiler_warning"]
                     ),
                     "total_test_failures": len(
-                        [i for i in build_issues if i["type"] == "test_failure"]
+                        [
+                            i
+                            for i in build_issues
+                            if i["type"] in SWIFT_TEST_FAILURE_TYPES
+                        ]
                     ),
                 }
             )
@@ -1975,6 +1787,7 @@ TOOL_HANDLERS: dict[str, Callable[..., Awaitable[str]]] = {
     "github_find_pr_for_branch": execute_find_pr_for_branch,
     "github_get_pr_comments": execute_get_pr_comments,
     "github_post_pr_reply": execute_post_pr_reply,
+    "github_pr_reply_status": execute_pr_reply_status,
     "github_get_build_status": execute_get_build_status,
     "github_check_ci_lint_errors_not_local": execute_github_check_ci_lint_errors_not_local,
     "github_check_ci_build_and_test_errors_not_local": execute_github_check_ci_build_and_test_errors_not_local,
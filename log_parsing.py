@@ -0,0 +1,671 @@
+"""
+Streaming parsers for CI lint and build output.
+
+Artifact files are read line by line and every line is matched against one
+precompiled regex per output format that captures all fields at once, so
+memory use doesn't grow with the size of the log and no pattern is compiled
+per line. Parsers yield structured issues as they find them.
+
+Output formats are registered in OutputParserRegistry with the file names
+they're usually written to and a probe recognizing them by content. The files
+of an extracted artifact are dispatched to matching parsers. Large artifacts
+are parsed by a bounded pool of worker processes, since regex matching holds
+the GIL and threads wouldn't run it in parallel.
+"""
+
+import fnmatch
+import logging
+import multiprocessing
+import pickle
+import re
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, ClassVar
+
+logger = logging.getLogger(__name__)
+
+# Characters read from the start of a file to detect its format
+PROBE_CHARS = 64 * 1024
+
+# Files of one artifact parsed at the same time
+DEFAULT_PARSE_WORKERS = 4
+
+# Total bytes of output below which files are parsed in the calling process;
+# starting worker processes costs more than parsing small logs
+DEFAULT_PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+
+# Number of following lines searched for the file/line of a Python failure
+PYTHON_LOOKAHEAD_LINES = 5
+
+# ruff in GitHub Actions format:
+# ::error title=Ruff (F401),file=/path/x.py,line=3,col=1,endLine=3,endColumn=9::message
+RUFF_ANNOTATION_RE = re.compile(
+    r"::error title=Ruff(?: \((?P<rule>[^)]+)\))?"
+    r".*?file=(?P<file>[^,]+)"
+    r"(?:.*?line=(?P<line>\d+))?"
+    r"(?:.*?col=(?P<column>\d+))?"
+    r"(?:.*?::(?P<message>.+))?"
+)
+
+# mypy errors:
+# x.py:3: error: message  [error-code]
+MYPY_RE = re.compile(
+    r"^(?P<file>[^:]+\.py):(?P<line>\d+): error: "
+    r"(?P<message>.+?)(?:\s+\[(?P<code>[^\]]+)\])?$"
+)
+
+# SwiftLint or swiftc: /path/x.swift:3:5: warning: message (rule)
+SWIFT_DIAGNOSTIC_RE = re.compile(
+    r"^(?P<file>/[^:]+\.swift)(?::(?P<line>\d+)(?=:))?.*?:\s+(?P<severity>error|warning):"
+    r"\s*(?P<message>.*?)(?:\s+\((?P<rule>[^)]+)\))?$"
+)
+
+# Lines parse_swiftlint_output counts as violations
+SWIFTLINT_VIOLATION_RE = re.compile(
+    r"^(?P<file>/.+\.swift):(?P<line>\d+):\d+:\s+(?P<severity>error|warning):\s+"
+    r"(?P<message>.+)\s+\((?P<rule>[^)]+)\)$"
+)
+
+# swiftc diagnostics and XCTest failures
+SWIFT_COMPILER_ERROR_RE = re.compile(r"^(/.*\.swift):(\d+):(\d+): error: (.+)$")
+SWIFT_COMPILER_WARNING_RE = re.compile(r"^(/.*\.swift):(\d+):(\d+): warning: (.+)$")
+SWIFT_TEST_FAILURE_RE = re.compile(r"^(/.*\.swift):(\d+): error: (.+) : (.+)$")
+
+# xcodebuild's own errors and failed test cases
+XCODEBUILD_ERROR_RE = re.compile(r"^xcodebuild: error: (.+)$")
+XCODEBUILD_TEST_CASE_FAILED_RE = re.compile(
+    r"^Test Case '(.+)' failed \(\d+(?:\.\d+)? seconds\)\.$"
+)
+
+# Python warnings: /usr/lib/python3.12/unittest/case.py:690: DeprecationWarning: ...
+PYTHON_WARNING_RE = re.compile(r"^(/.*\.py):(\d+): (\w+Warning): (.+)$")
+# Python test failures: assert result is True -> E assert False is True
+PYTHON_TEST_FAILURE_RE = re.compile(r"^>?\s*(assert .+)$")
+# Python runtime errors: E   TypeError: is_server_healthy() got an unexpected ...
+PYTHON_RUNTIME_ERROR_RE = re.compile(r"^E\s+(\w+Error): (.+)$")
+# Python file/line: tests/test_utilities.py:274: AssertionError
+PYTHON_FILE_LINE_RE = re.compile(
+    r"^([^:]+\.py):(\d+): (\w+(?:Error|Warning|Exception))$"
+)
+
+
+def iter_file_lines(paths: Iterable[str | Path]) -> Iterator[str]:
+    """Read files one line at a time, without line endings.
+
+    Args:
+        paths: Files to read, in order
+
+    Yields:
+        Lines of all files
+    """
+    for path in paths:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                yield line.rstrip("\r\n")
+
+
+def _ruff_error(line: str) -> dict[str, Any] | None:
+    match = RUFF_ANNOTATION_RE.search(line)
+    if match is None:
+        return None
+    return {
+        "type": "ruff",
+        "file": match["file"],
+        "line": int(match["line"] or 0),
+        "column": int(match["column"] or 0),
+        "rule": match["rule"] or "",
+        "message": match["message"] or "",
+        "severity": "error",
+    }
+
+
+def _mypy_error(line: str) -> dict[str, Any] | None:
+    match = MYPY_RE.match(line)
+    if match is None:
+        return None
+    return {
+        "type": "mypy",
+        "file": match["file"],
+        "line": int(match["line"]),
+        "message": match["message"],
+        "error_code": match["code"] or "",
+        "severity": "error",
+    }
+
+
+def _swiftlint_error(line: str) -> dict[str, Any] | None:
+    match = SWIFT_DIAGNOSTIC_RE.match(line)
+    if match is None:
+        return None
+    return {
+        "type": "swiftlint",
+        "file": match["file"],
+        "line": int(match["line"] or 0),
+        "severity": match["severity"],
+        "message": match["message"] if match["rule"] else "",
+        "rule": match["rule"] or "",
+    }
+
+
+def iter_lint_errors(lines: Iterable[str], language: str) -> Iterator[dict[str, Any]]:
+    """Parse linter output into structured errors.
+
+    Python output is parsed for ruff and mypy errors, Swift output for
+    SwiftLint violations.
+
+    Args:
+        lines: Lines of linter output
+        language: Repository language, "python" or "swift"
+
+    Yields:
+        One dictionary per error
+
+    Raises:
+        ValueError: If the language is not supported
+    """
+    if language not in ("python", "swift"):
+        raise ValueError(f"Unsupported language: {language}")
+
+    for line in lines:
+        if not line.strip():
+            continue
+        if language == "python":
+            if "::error title=Ruff" in line:
+                error = _ruff_error(line)
+            elif ": error:" in line and line.endswith("]"):
+                error = _mypy_error(line)
+            else:
+                continue
+        elif ".swift:" in line and ("error:" in line or "warning:" in line):
+            error = _swiftlint_error(line)
+        else:
+            continue
+
+        if error is None:
+            logger.debug(f"Failed to parse lint line: {line[:200]!r}")
+            continue
+        yield error
+
+
+def iter_swiftlint_violations(lines: Iterable[str]) -> Iterator[dict[str, Any]]:
+    """Parse SwiftLint output into violations.
+
+    Args:
+        lines: Lines of SwiftLint output
+
+    Yields:
+        One dictionary per violation
+    """
+    for line in lines:
+        line = line.strip()
+        match = SWIFTLINT_VIOLATION_RE.match(line)
+        if match is None:
+            continue
+        yield {
+            "raw_line": line,
+            "file": match["file"],
+            "line_number": int(match["line"]),
+            "severity": match["severity"],
+            "message": match["message"],
+            "rule": match["rule"],
+        }
+
+
+def _with_lookahead(lines: Iterable[str], size: int) -> Iterator[tuple[str, list[str]]]:
+    """Pair each line with the (at most) size lines following it."""
+    window: deque[str] = deque()
+    iterator = iter(lines)
+    for line in iterator:
+        window.append(line)
+        if len(window) > size:
+            current = window.popleft()
+            yield current, list(window)
+    while window:
+        current = window.popleft()
+        yield current, list(window)
+
+
+def _python_file_line(following: list[str]) -> tuple[str, int] | None:
+    """Find the file/line marker of a failure in the lines after it."""
+    for next_line in following:
+        if match := PYTHON_FILE_LINE_RE.match(next_line.strip()):
+            return match.group(1), int(match.group(2))
+    return None
+
+
+def _iter_python_build_issues(lines: Iterable[str]) -> Iterator[dict[str, Any]]:
+    for raw, following in _with_lookahead(lines, PYTHON_LOOKAHEAD_LINES):
+        line = raw.strip()
+
+        if match := PYTHON_WARNING_RE.match(line):
+            file_path, line_no, warning_type, message = match.groups()
+            yield {
+                "type": "python_warning",
+                "raw_line": line,
+                "file": file_path,
+                "line_number": int(line_no),
+                "warning_type": warning_type,
+                "message": message,
+                "severity": "warning",
+            }
+            continue
+
+        if match := PYTHON_RUNTIME_ERROR_RE.match(line):
+            error_type, message = match.groups()
+            issue: dict[str, Any] = {
+                "type": "python_runtime_error",
+                "raw_line": line,
+                "error_type": error_type,
+                "message": message,
+                "severity": "error",
+            }
+        elif match := PYTHON_TEST_FAILURE_RE.match(line):
+            error_line = ""
+            if following and following[0].strip().startswith("E "):
+                error_line = following[0].strip()[2:]
+            issue = {
+                "type": "python_test_failure",
+                "raw_line": line,
+                "assertion": match.group(1),
+                "error": error_line,
+                "severity": "error",
+            }
+        else:
+            continue
+
+        if location := _python_file_line(following):
+            issue["file"], issue["line_number"] = location
+        yield issue
+
+
+def _iter_swift_build_issues(lines: Iterable[str]) -> Iterator[dict[str, Any]]:
+    for raw in lines:
+        line = raw.strip()
+        if match := SWIFT_COMPILER_ERROR_RE.match(line):
+            file_path, line_no, col_no, message = match.groups()
+            yield {
+                "type": "compiler_error",
+                "raw_line": line,
+                "file": file_path,
+                "line_number": int(line_no),
+                "column": int(col_no),
+                "message": message,
+                "severity": "error",
+            }
+        elif match := SWIFT_COMPILER_WARNING_RE.match(line):
+            file_path, line_no, col_no, message = match.groups()
+            yield {
+                "type": "compiler_warning",
+                "raw_line": line,
+                "file": file_path,
+                "line_number": int(line_no),
+                "column": int(col_no),
+                "message": message,
+                "severity": "warning",
+            }
+        elif match := SWIFT_TEST_FAILURE_RE.match(line):
+            file_path, line_no, test_info, failure_message = match.groups()
+            yield {
+                "type": "test_failure",
+                "raw_line": line,
+                "file": file_path,
+                "line_number": int(line_no),
+                "test_info": test_info.strip(),
+                "message": failure_message.strip(),
+                "severity": "error",
+            }
+
+
+def iter_ruff_errors(lines: Iterable[str]) -> Iterator[dict[str, Any]]:
+    """Parse ruff GitHub annotations, ignoring other output."""
+    for line in lines:
+        if "::error title=Ruff" in line and (error := _ruff_error(line)):
+            yield error
+
+
+def iter_mypy_errors(lines: Iterable[str]) -> Iterator[dict[str, Any]]:
+    """Parse mypy errors, ignoring other output."""
+    for line in lines:
+        if ": error:" in line and line.endswith("]") and (error := _mypy_error(line)):
+            yield error
+
+
+def iter_xcodebuild_issues(lines: Iterable[str]) -> Iterator[dict[str, Any]]:
+    """Parse xcodebuild's own errors and failed test cases.
+
+    Compiler diagnostics in xcodebuild logs are left to the swiftc parser.
+    """
+    for raw in lines:
+        line = raw.strip()
+        if match := XCODEBUILD_ERROR_RE.match(line):
+            yield {
+                "type": "xcodebuild_error",
+                "raw_line": line,
+                "message": match.group(1),
+                "severity": "error",
+            }
+        elif match := XCODEBUILD_TEST_CASE_FAILED_RE.match(line):
+            yield {
+                "type": "test_case_failure",
+                "raw_line": line,
+                "test_info": match.group(1),
+                "severity": "error",
+            }
+
+
+@dataclass(frozen=True)
+class OutputParser:
+    """A parser for one CI output format."""
+
+    # Unique name of the format
+    name: str
+    # Repository language the format belongs to
+    language: str
+    # Either "build" or "lint"
+    category: str
+    # File names (fnmatch globs) that are always dispatched to this parser
+    globs: tuple[str, ...]
+    # Searched in the head of files whose names match no parser's globs
+    probe: re.Pattern[str]
+    # Turns lines of output into issues
+    parse: Callable[[Iterable[str]], Iterator[dict[str, Any]]]
+
+    def matches_name(self, filename: str) -> bool:
+        """Check whether a file name matches one of the parser's globs."""
+        return any(fnmatch.fnmatch(filename, glob) for glob in self.globs)
+
+
+class OutputParserRegistry:
+    """Registry of output format parsers."""
+
+    _parsers: ClassVar[dict[str, OutputParser]] = {}
+
+    @classmethod
+    def register(cls, parser: OutputParser) -> None:
+        """Register a parser, replacing any parser of the same name."""
+        cls._parsers[parser.name] = parser
+
+    @classmethod
+    def get(cls, name: str) -> OutputParser | None:
+        """Get a parser by name."""
+        return cls._parsers.get(name)
+
+    @classmethod
+    def all_parsers(cls) -> list[OutputParser]:
+        """Get all registered parsers, in registration order."""
+        return list(cls._parsers.values())
+
+    @classmethod
+    def parsers_for(cls, language: str, category: str) -> list[OutputParser]:
+        """Get the parsers of a language and category, in registration order."""
+        return [
+            parser
+            for parser in cls._parsers.values()
+            if parser.language == language and parser.category == category
+        ]
+
+
+OutputParserRegistry.register(
+    OutputParser(
+        name="pytest",
+        language="python",
+        category="build",
+        globs=(
+            "python_test_output.txt",
+            "test_output.txt",
+            "pytest*.txt",
+            "output.txt",
+            "log.txt",
+        ),
+        probe=re.compile(
+            r"^(?:=+ test session starts|E\s+\w+Error: |/.*\.py:\d+: \w+Warning: )",
+            re.MULTILINE,
+        ),
+        parse=_iter_python_build_issues,
+    )
+)
+OutputParserRegistry.register(
+    OutputParser(
+        name="ruff",
+        language="python",
+        category="lint",
+        globs=("ruff-output.txt", "lint-output.txt", "linter-results.txt", "lint.txt"),
+        probe=re.compile(r"::error title=Ruff"),
+        parse=iter_ruff_errors,
+    )
+)
+OutputParserRegistry.register(
+    OutputParser(
+        name="mypy",
+        language="python",
+        category="lint",
+        globs=("mypy-output.txt", "lint-output.txt", "linter-results.txt", "lint.txt"),
+        probe=re.compile(r"^[^:\s]+\.py:\d+: error: .*\]$", re.MULTILINE),
+        parse=iter_mypy_errors,
+    )
+)
+OutputParserRegistry.register(
+    OutputParser(
+        name="swiftc",
+        language="swift",
+        category="build",
+        globs=(
+            "build_and_test_all.txt",
+            "build*.txt",
+            "output.log",
+            "output.txt",
+            "log.txt",
+        ),
+        probe=re.compile(
+            r"^/.*\.swift:\d+:(?:\d+:)? (?:error|warning): ", re.MULTILINE
+        ),
+        parse=_iter_swift_build_issues,
+    )
+)
+OutputParserRegistry.register(
+    OutputParser(
+        name="xcodebuild",
+        language="swift",
+        category="build",
+        globs=("build_and_test_all.txt", "build*.txt", "xcodebuild*", "output.log"),
+        probe=re.compile(
+            r"^(?:xcodebuild: |\*\* (?:BUILD|TEST) (?:SUCCEEDED|FAILED) \*\*)",
+            re.MULTILINE,
+        ),
+        parse=iter_xcodebuild_issues,
+    )
+)
+OutputParserRegistry.register(
+    OutputParser(
+        name="swiftlint",
+        language="swift",
+        category="lint",
+        globs=(
+            "swiftlint*.txt",
+            "violations.txt",
+            "lint-results.txt",
+            "output.txt",
+        ),
+        probe=re.compile(r"^/.+\.swift:\d+:\d+:\s+(?:error|warning):\s+.+\)$", re.M),
+        parse=iter_swiftlint_violations,
+    )
+)
+
+
+def _read_head(path: Path) -> str:
+    with open(path, encoding="utf-8", errors="replace") as f:
+        return f.read(PROBE_CHARS)
+
+
+def dispatch_files(
+    output_dir: str | Path, parsers: list[OutputParser]
+) -> list[tuple[Path, list[OutputParser]]]:
+    """Assign the files of an extracted artifact to parsers.
+
+    A file whose name matches the globs of any registered parser goes to the
+    given parsers with matching globs. Other files go to every given parser
+    whose probe matches the start of the file.
+
+    Args:
+        output_dir: Extracted artifact directory, searched recursively
+        parsers: Candidate parsers
+
+    Returns:
+        (file, parsers) pairs for files with at least one parser, sorted by path
+    """
+    output_dir = Path(output_dir)
+    if not output_dir.is_dir():
+        return []
+    known = OutputParserRegistry.all_parsers()
+    assignments = []
+    for path in sorted(p for p in output_dir.rglob("*") if p.is_file()):
+        if any(parser.matches_name(path.name) for parser in known):
+            matching = [parser for parser in parsers if parser.matches_name(path.name)]
+        else:
+            try:
+                head = _read_head(path)
+            except OSError as e:
+                logger.warning(f"Skipping unreadable output file {path}: {e}")
+                continue
+            matching = [parser for parser in parsers if parser.probe.search(head)]
+        if matching:
+            assignments.append((path, matching))
+    return assignments
+
+
+def _parse_file(path: Path, parser: OutputParser) -> list[dict[str, Any]]:
+    issues = list(parser.parse(iter_file_lines([path])))
+    logger.debug(f"{parser.name} parser found {len(issues)} issues in {path}")
+    return issues
+
+
+def _can_pickle(parser: OutputParser) -> bool:
+    """Check whether a parser can be sent to a worker process."""
+    try:
+        pickle.dumps(parser)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return False
+    return True
+
+
+def _total_size(tasks: list[tuple[Path, OutputParser]]) -> int:
+    total = 0
+    for path in {path for path, _ in tasks}:
+        try:
+            total += path.stat().st_size
+        except OSError:
+            pass
+    return total
+
+
+def parse_files(
+    assignments: list[tuple[Path, list[OutputParser]]],
+    max_workers: int = DEFAULT_PARSE_WORKERS,
+    parallel_min_bytes: int = DEFAULT_PARALLEL_MIN_BYTES,
+) -> list[dict[str, Any]]:
+    """Parse files and merge the issues found.
+
+    Once the files add up to parallel_min_bytes, they are parsed by up to
+    max_workers processes. Parsers that can't be pickled, like ones
+    registered with a lambda, always run in the calling process.
+
+    Issues reported more than once, for example by several jobs whose logs
+    ended up in one artifact, are kept only once.
+
+    Args:
+        assignments: (file, parsers) pairs as returned by dispatch_files
+        max_workers: Upper bound of files parsed at the same time
+        parallel_min_bytes: Total size from which worker processes are used
+
+    Returns:
+        Issues in file order, then parser order
+    """
+    tasks = [(path, parser) for path, parsers in assignments for parser in parsers]
+    if not tasks:
+        return []
+
+    results: list[list[dict[str, Any]] | None] = [None] * len(tasks)
+    remote = []
+    if len(tasks) > 1 and max_workers > 1:
+        if _total_size(tasks) >= parallel_min_bytes:
+            remote = [i for i, (_, parser) in enumerate(tasks) if _can_pickle(parser)]
+    if len(remote) > 1:
+        # Spawn rather than fork: the caller runs other threads, which aren't
+        # safe to duplicate
+        with ProcessPoolExecutor(
+            max_workers=min(max_workers, len(remote)),
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            futures = {i: executor.submit(_parse_file, *tasks[i]) for i in remote}
+            for i, task in enumerate(tasks):
+                if i not in futures:
+                    results[i] = _parse_file(*task)
+            for i, future in futures.items():
+                results[i] = future.result()
+    else:
+        results = [_parse_file(*task) for task in tasks]
+
+    issues = []
+    seen: set[tuple] = set()
+    for file_issues in results:
+        for issue in file_issues or ():
+            key = tuple(sorted(issue.items()))
+            if key not in seen:
+                seen.add(key)
+                issues.append(issue)
+    return issues
+
+
+def parse_artifact(
+    output_dir: str | Path,
+    language: str,
+    category: str,
+    expected_filename: str | None = None,
+    max_workers: int = DEFAULT_PARSE_WORKERS,
+    parallel_min_bytes: int = DEFAULT_PARALLEL_MIN_BYTES,
+) -> list[dict[str, Any]]:
+    """Parse the output files of an extracted artifact.
+
+    Args:
+        output_dir: Extracted artifact directory
+        language: Repository language selecting the parsers
+        category: "build" or "lint"
+        expected_filename: File to parse with every parser of the language and
+            category; if missing, the artifact's files are dispatched instead
+        max_workers: Upper bound of files parsed at the same time
+        parallel_min_bytes: Total size from which worker processes are used
+
+    Returns:
+        Merged and de-duplicated issues
+
+    Raises:
+        FileNotFoundError: If no file of the artifact matches a parser
+    """
+    output_dir = Path(output_dir)
+    parsers = OutputParserRegistry.parsers_for(language, category)
+    expected = output_dir / expected_filename if expected_filename else None
+    if expected is not None and expected.is_file():
+        assignments = [(expected, parsers)]
+    else:
+        assignments = dispatch_files(output_dir, parsers)
+
+    if not assignments:
+        available = (
+            sorted(str(p.relative_to(output_dir)) for p in output_dir.rglob("*"))
+            if output_dir.is_dir()
+            else []
+        )
+        raise FileNotFoundError(
+            f"No {language} {category} output found in {output_dir}. "
+            f"Available files: {available}"
+        )
+
+    for path, matching in assignments:
+        logger.info(
+            f"Parsing {path.relative_to(output_dir)} with "
+            f"{[parser.name for parser in matching]}"
+        )
+    return parse_files(assignments, max_workers, parallel_min_bytes)
@@ -0,0 +1,358 @@
+"""
+Cache of LSP navigation results.
+
+Agents ask the same navigation questions over and over, and a references
+query can keep pyright busy for seconds. The cache keeps the results of
+definition, references, hover and documentSymbol requests, keyed by method,
+request parameters (document and position) and the version of the document:
+the version the client announced with didOpen/didChange while the document is
+open, otherwise a hash of the file's content. Content hashes are cached
+together with the file's stat state, so a lookup normally costs one ``stat``;
+files are stat'ed, read and hashed in a worker thread, off the event loop.
+
+Most results depend on other files too, e.g. the references of a function
+defined in one file and called in another. Those results are dropped whenever
+any file of the workspace changes; document symbols depend on their own
+document only and survive changes elsewhere. Changes are learned from the
+text document notifications the client sends and from file change events
+passed to ``invalidate_path``. Entries are bounded by size with
+least-recently-used eviction.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+from collections import Counter, OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from urllib.parse import unquote, urlparse
+
+from lsp_constants import LSPMethod
+
+logger = logging.getLogger(__name__)
+
+# Total bytes of serialized results kept in memory
+DEFAULT_MAX_MEMORY_BYTES = 32 * 1024 * 1024
+
+# Results larger than this when serialized aren't cached
+DEFAULT_MAX_ENTRY_BYTES = 1024 * 1024
+
+# Methods whose results are cached
+CACHED_METHODS = frozenset(
+    {
+        LSPMethod.DEFINITION,
+        LSPMethod.REFERENCES,
+        LSPMethod.HOVER,
+        LSPMethod.DOCUMENT_SYMBOLS,
+    }
+)
+
+# Cached methods whose results depend on their own document only
+DOCUMENT_LOCAL_METHODS = frozenset({LSPMethod.DOCUMENT_SYMBOLS})
+
+# Notifications after which the results involving a document are stale
+DOCUMENT_CHANGE_NOTIFICATIONS = frozenset(
+    {
+        LSPMethod.DID_OPEN,
+        LSPMethod.DID_CHANGE,
+        LSPMethod.DID_CLOSE,
+        LSPMethod.DID_SAVE,
+    }
+)
+
+# (method, document, document version, serialized parameters)
+CacheKey = tuple[str, str, str, str]
+
+FileState = tuple[int, int, int]
+
+
+@dataclass
+class _CachedResult:
+    """A serialized result and the document it belongs to."""
+
+    document: str
+    payload: str
+
+    @property
+    def size(self) -> int:
+        return len(self.payload)
+
+
+def _document_id(uri: str) -> str:
+    """Identify a document by its path for file URIs, by its URI otherwise.
+
+    Clients build URIs with and without percent-encoding, so file URIs are
+    normalized to make every spelling of a path hit the same entries.
+    """
+    parsed = urlparse(uri)
+    if parsed.scheme != "file":
+        return uri
+    return str(Path(unquote(parsed.path)))
+
+
+def _file_state(path: Path) -> FileState | None:
+    """Capture the state of a file for change detection."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_ino, stat.st_size)
+
+
+class LSPResultCache:
+    """LRU cache of navigation results, versioned by document content.
+
+    Safe to use from any thread, so file change events can be passed in
+    directly from a change source.
+    """
+
+    def __init__(
+        self,
+        max_memory_bytes: int = DEFAULT_MAX_MEMORY_BYTES,
+        max_entry_bytes: int = DEFAULT_MAX_ENTRY_BYTES,
+    ):
+        """Initialize the cache.
+
+        Args:
+            max_memory_bytes: Size bound of all cached results
+            max_entry_bytes: Largest serialized result that is cached
+        """
+        self.max_memory_bytes = max_memory_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self._memory: OrderedDict[CacheKey, _CachedResult] = OrderedDict()
+        self._memory_bytes = 0
+        # Keys of the cached results of each document
+        self._by_document: dict[str, set[CacheKey]] = {}
+        # Versions announced by the client for open documents
+        self._open_versions: dict[str, str] = {}
+        # Content hashes of files and the state they were computed at
+        self._content_hashes: dict[str, tuple[FileState, str]] = {}
+        # Bumped by every change; results computed across one aren't stored
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._method_hits: Counter[str] = Counter()
+        self._method_misses: Counter[str] = Counter()
+
+    def _content_version(self, document: str) -> str | None:
+        """Get the content hash of a closed document, or None if it can't be read.
+
+        Stats, and on a change reads and hashes, the file; call it off the
+        event loop.
+        """
+        path = Path(document)
+        if not path.is_absolute():
+            return None
+        state = _file_state(path)
+        if state is None:
+            return None
+        with self._lock:
+            known = self._content_hashes.get(document)
+        if known is not None and known[0] == state:
+            return known[1]
+
+        try:
+            content_hash = hashlib.sha256(path.read_bytes()).hexdigest()
+        except OSError:
+            return None
+        # The file may have changed while it was read; only keep the hash
+        # if it still matches the state it is recorded with
+        if _file_state(path) != state:
+            return None
+        with self._lock:
+            self._content_hashes[document] = (state, content_hash)
+        return content_hash
+
+    async def _key(self, method: str, params: dict[str, Any]) -> CacheKey | None:
+        """Compute the cache key of a request, or None if it isn't cacheable."""
+        if method not in CACHED_METHODS:
+            return None
+        uri = params.get("textDocument", {}).get("uri")
+        if not uri:
+            return None
+        document = _document_id(uri)
+        with self._lock:
+            version = self._open_versions.get(document)
+        if version is None:
+            version = await asyncio.to_thread(self._content_version, document)
+        if version is None:
+            return None
+        return (method, document, version, json.dumps(params, sort_keys=True))
+
+    async def get_or_fetch(
+        self,
+        method: str,
+        params: dict[str, Any],
+        fetch: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Answer a request from the cache, or fetch and cache its result.
+
+        None results aren't cached, since they also stand for failed
+        requests. Each hit returns a fresh copy, so callers may modify it.
+
+        Args:
+            method: LSP method of the request
+            params: Request parameters, including textDocument.uri
+            fetch: Coroutine function sending the request to the server
+
+        Returns:
+            Result of the request
+        """
+        key = await self._key(method, params)
+        if key is None:
+            return await fetch()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                self._method_hits[method] += 1
+            else:
+                self.misses += 1
+                self._method_misses[method] += 1
+            generation = self._generation
+        if entry is not None:
+            return json.loads(entry.payload)
+
+        result = await fetch()
+        if result is not None:
+            self._store(key, result, generation)
+        return result
+
+    def _store(self, key: CacheKey, result: Any, generation: int) -> None:
+        """Cache a result unless something changed while it was computed."""
+        payload = json.dumps(result)
+        if len(payload) > self.max_entry_bytes:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._remove(key)
+            self._memory[key] = _CachedResult(key[1], payload)
+            self._memory_bytes += len(payload)
+            self._by_document.setdefault(key[1], set()).add(key)
+            while self._memory_bytes > self.max_memory_bytes and len(self._memory) > 1:
+                evicted_key = next(iter(self._memory))
+                self._remove(evicted_key)
+                self.evictions += 1
+
+    def _remove(self, key: CacheKey) -> None:
+        """Drop one entry; the caller holds the lock."""
+        entry = self._memory.pop(key, None)
+        if entry is None:
+            return
+        self._memory_bytes -= entry.size
+        keys = self._by_document[entry.document]
+        keys.discard(key)
+        if not keys:
+            del self._by_document[entry.document]
+
+    def invalidate(self, uri: str) -> None:
+        """Drop the results that may be stale after a document changed.
+
+        Drops every result of the document, and the results of other
+        documents that may depend on it.
+
+        Args:
+            uri: URI of the changed document
+        """
+        document = _document_id(uri)
+        with self._lock:
+            self._generation += 1
+            self.invalidations += 1
+            self._content_hashes.pop(document, None)
+            stale = set(self._by_document.get(document, ()))
+            stale.update(
+                key for key in self._memory if key[0] not in DOCUMENT_LOCAL_METHODS
+            )
+            for key in stale:
+                self._remove(key)
+        if stale:
+            logger.debug(f"Dropped {len(stale)} LSP results after a change of {uri}")
+
+    def invalidate_path(self, file_path: Path) -> None:
+        """Drop stale results after a file changed on disk.
+
+        Matches the change callback of ``AbstractChangeSource``, so it can be
+        passed to a change source directly.
+
+        Args:
+            file_path: Absolute path of the changed file
+        """
+        self.invalidate(Path(file_path).absolute().as_uri())
+
+    def notification_sent(self, method: str, params: dict[str, Any]) -> None:
+        """Track the document changes announced by a client notification.
+
+        Args:
+            method: Method of the notification sent to the server
+            params: Its parameters
+        """
+        if method == LSPMethod.DID_CHANGE_WATCHED_FILES:
+            for change in params.get("changes", []):
+                if change.get("uri"):
+                    self.invalidate(change["uri"])
+            return
+        if method not in DOCUMENT_CHANGE_NOTIFICATIONS:
+            return
+
+        text_document = params.get("textDocument", {})
+        uri = text_document.get("uri")
+        if not uri:
+            return
+        document = _document_id(uri)
+        version = text_document.get("version")
+        with self._lock:
+            if method == LSPMethod.DID_CLOSE:
+                self._open_versions.pop(document, None)
+            elif version is not None:
+                self._open_versions[document] = f"v{version}"
+        # didOpen and didSave needn't change anything, but the content the
+        # server sees may differ from what results were computed from
+        self.invalidate(uri)
+
+    def stats(self) -> dict[str, Any]:
+        """Get hit/miss counters, overall and per method, and the cache size.
+
+        Returns:
+            Dictionary of cache statistics
+        """
+        with self._lock:
+            requests_seen = self.hits + self.misses
+            methods = {}
+            for method in sorted(set(self._method_hits) | set(self._method_misses)):
+                hits = self._method_hits[method]
+                seen = hits + self._method_misses[method]
+                methods[method] = {
+                    "hits": hits,
+                    "misses": seen - hits,
+                    "hit_rate": hits / seen,
+                }
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / requests_seen if requests_seen else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "methods": methods,
+            }
+
+    def clear(self) -> None:
+        """Drop all cached results and document versions."""
+        with self._lock:
+            self._generation += 1
+            self._memory.clear()
+            self._memory_bytes = 0
+            self._by_document.clear()
+            self._open_versions.clear()
+            self._content_hashes.clear()
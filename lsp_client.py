@@ -3,18 +3,25 @@ Abstract LSP Client Infrastructure
 
 This module provides the base infrastructure for Language Server Protocol clients,
 including connection management, message handling, and capability negotiation.
+
+The server runs as an asyncio subprocess. A reader task on the event loop frames
+its stdout and resolves the future of each pending request as its response
+arrives, so any number of requests can be in flight at once. Writes wait for the
+pipe to drain, which applies backpressure when the server falls behind.
+Navigation requests sent through ``request_result`` are answered from an
+optional ``LSPResultCache`` when the documents involved haven't changed.
 """
 
 import asyncio
+import contextlib
 import logging
 import os
-import subprocess
-import threading
 from abc import ABC, abstractmethod
 from collections.abc import Callable
 from enum import Enum
 from typing import Any
 
+from lsp_cache import LSPResultCache
 from lsp_constants import JsonRPCMessage, LSPCapabilities, LSPErrorCode, LSPMethod
 from lsp_jsonrpc import (
     JSONRPCError,
@@ -22,9 +29,20 @@ from lsp_jsonrpc import (
     JSONRPCProtocol,
     JSONRPCRequest,
     JSONRPCResponse,
+    LSPMessageFramer,
 )
 from lsp_server_manager import LSPCommunicationMode, LSPServerManager
 
+# Seconds to wait for the server to exit before terminating, then killing it
+SERVER_EXIT_TIMEOUT = 5.0
+SERVER_TERMINATE_TIMEOUT = 2.0
+
+# Seconds a request may take, including waiting for a slot in the window
+DEFAULT_REQUEST_TIMEOUT = 30.0
+
+# Requests sent to the server without a response yet; more wait for a slot
+DEFAULT_MAX_IN_FLIGHT = 16
+
 
 class LSPClientState(Enum):
     """States of the LSP client connection."""
@@ -45,6 +63,8 @@ class AbstractLSPClient(ABC):
         server_manager: LSPServerManager,
         workspace_root: str,
         logger: logging.Logger,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        result_cache: LSPResultCache | None = None,
     ):
         self.server_manager = server_manager
         self.workspace_root = workspace_root
@@ -52,7 +72,7 @@ class AbstractLSPClient(ABC):
 
         # Connection state
         self.state = LSPClientState.DISCONNECTED
-        self.server_process: subprocess.Popen | None = None
+        self.server_process: asyncio.subprocess.Process | None = None
         self.server_capabilities: dict[str, Any] = {}
 
         # Communication
@@ -61,12 +81,21 @@ class AbstractLSPClient(ABC):
 
         # Message handling
         self._message_handlers: dict[str, Callable] = {}
-        self._response_handlers: dict[str | int, Callable] = {}
         self._notification_handlers: dict[str, Callable] = {}
 
-        # Threading
-        self._reader_thread: threading.Thread | None = None
-        self._stop_event = threading.Event()
+        # Futures of requests awaiting a response, by request id
+        self._pending_responses: dict[str | int, asyncio.Future[JsonRPCMessage]] = {}
+
+        # Window of requests pipelined to the server
+        self.max_in_flight = max_in_flight
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+
+        # Cache of navigation results; None sends every request to the server
+        self.result_cache = result_cache
+
+        # Tasks reading the server's stdout and stderr
+        self._reader_task: asyncio.Task | None = None
+        self._stderr_task: asyncio.Task | None = None
 
         # Initialize built-in handlers
         self._setup_builtin_handlers()
@@ -128,8 +157,8 @@ class AbstractLSPClient(ABC):
                 self._set_state_error("Failed to start LSP server process")
                 return False
 
-            # Start message reading thread
-            self._start_reader_thread()
+            # Start reading messages on the event loop
+            self._start_reader()
 
             # Initialize the connection
             if not await self._initialize_connection():
@@ -157,16 +186,11 @@ class AbstractLSPClient(ABC):
             if self.state in [LSPClientState.INITIALIZED, LSPClientState.INITIALIZING]:
                 await self._send_shutdown()
 
-            # Stop reader thread
-            self._stop_event.set()
-            if self._reader_thread and self._reader_thread.is_alive():
-                self._reader_thread.join(timeout=5.0)
-
             # Terminate server process
             if self.server_process:
                 try:
                     # Send exit notification
-                    if self.server_process.poll() is None:
+                    if self.server_process.returncode is None:
                         exit_notification = self.protocol.create_notification(
                             LSPMethod.EXIT
                         )
@@ -174,15 +198,19 @@ class AbstractLSPClient(ABC):
 
                     # Wait for graceful shutdown
                     try:
-                        self.server_process.wait(timeout=5.0)
-                    except subprocess.TimeoutExpired:
+                        await asyncio.wait_for(
+                            self.server_process.wait(), SERVER_EXIT_TIMEOUT
+                        )
+                    except TimeoutError:
                         self.logger.warning(
                             "Server didn't shut down gracefully, terminating"
                         )
                         self.server_process.terminate()
                         try:
-                            self.server_process.wait(timeout=2.0)
-                        except subprocess.TimeoutExpired:
+                            await asyncio.wait_for(
+                                self.server_process.wait(), SERVER_TERMINATE_TIMEOUT
+                            )
+                        except TimeoutError:
                             self.logger.error("Server didn't terminate, killing")
                             self.server_process.kill()
 
@@ -191,6 +219,9 @@ class AbstractLSPClient(ABC):
                 finally:
                     self.server_process = None
 
+            # Stop the reader tasks
+            await self._stop_reader()
+
             self._set_state_disconnected()
 
         except Exception as e:
@@ -208,12 +239,11 @@ class AbstractLSPClient(ABC):
             self.logger.debug(f"Workspace root: {self.workspace_root}")
 
             if self.communication_mode == LSPCommunicationMode.STDIO:
-                self.server_process = subprocess.Popen(
-                    full_command,
-                    stdin=subprocess.PIPE,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=False,  # Binary mode for proper encoding handling
+                self.server_process = await asyncio.create_subprocess_exec(
+                    *full_command,
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
                     cwd=self.workspace_root,
                     env=os.environ.copy(),
                 )
@@ -226,9 +256,9 @@ class AbstractLSPClient(ABC):
             await asyncio.sleep(0.1)
 
             # Check if process started successfully
-            if self.server_process.poll() is not None:
+            if self.server_process.returncode is not None:
                 if self.server_process.stderr:
-                    stderr = self.server_process.stderr.read().decode(
+                    stderr = (await self.server_process.stderr.read()).decode(
                         "utf-8", errors="replace"
                     )
                     self.logger.error(f"Server failed to start: {stderr}")
@@ -244,82 +274,70 @@ class AbstractLSPClient(ABC):
             self.logger.error(f"Failed to start LSP server: {e}")
             return False
 
-    def _start_reader_thread(self) -> None:
-        """Start the message reader thread."""
-        self._reader_thread = threading.Thread(
-            target=self._message_reader_loop, daemon=True
-        )
-        self._reader_thread.start()
+    def _start_reader(self) -> None:
+        """Start the tasks reading the server's output."""
+        self._reader_task = asyncio.create_task(self._message_reader_loop())
+        self._stderr_task = asyncio.create_task(self._stderr_reader_loop())
 
-    def _message_reader_loop(self) -> None:
+    async def _stop_reader(self) -> None:
+        """Cancel the reader tasks and fail requests still awaiting a response."""
+        for task in (self._reader_task, self._stderr_task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._reader_task = None
+        self._stderr_task = None
+        self._fail_pending_responses(ConnectionError("LSP server connection closed"))
+
+    def _fail_pending_responses(self, error: Exception) -> None:
+        """Fail the futures of all requests still awaiting a response."""
+        pending, self._pending_responses = self._pending_responses, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    async def _message_reader_loop(self) -> None:
         """Main message reading loop."""
-        buffer = b""
+        framer = LSPMessageFramer(logger=self.logger)
+        stdout = self.server_process.stdout if self.server_process else None
+        if stdout is None:
+            return
 
-        while not self._stop_event.is_set() and self.server_process:
-            try:
-                # Read data from server
-                if self.server_process.stdout:
-                    data = self.server_process.stdout.read(1024)
-                else:
-                    break
+        try:
+            while True:
+                data = await stdout.read(framer.read_size)
                 if not data:
-                    if self.server_process.poll() is not None:
-                        self.logger.warning("Server process terminated")
-                        break
-                    continue
-
-                buffer += data
+                    self.logger.warning("Server process terminated")
+                    break
+                framer.feed(data)
 
                 # Process complete messages
-                while True:
+                for body in framer.messages():
                     try:
-                        # Look for complete LSP message
-                        header_end = buffer.find(b"\r\n\r\n")
-                        if header_end == -1:
-                            break
-
-                        # Parse content length
-                        header_data = buffer[:header_end].decode("utf-8")
-                        content_length = None
-                        for line in header_data.split("\r\n"):
-                            if line.startswith("Content-Length:"):
-                                content_length = int(line.split(":", 1)[1].strip())
-                                break
-
-                        if content_length is None:
-                            self.logger.error("Invalid message: missing Content-Length")
-                            buffer = buffer[header_end + 4 :]
-                            continue
-
-                        # Check if we have the complete message
-                        message_end = header_end + 4 + content_length
-                        if len(buffer) < message_end:
-                            break
-
-                        # Extract and process message
-                        content = buffer[header_end + 4 : message_end].decode("utf-8")
-                        buffer = buffer[message_end:]
-
-                        # Process the message
-                        try:
-                            loop = asyncio.get_running_loop()
-                            asyncio.run_coroutine_threadsafe(
-                                self._process_message(content), loop
-                            )
-                        except RuntimeError:
-                            # No event loop running, skip processing
-                            self.logger.warning(
-                                "No event loop running, skipping message processing"
-                            )
-
+                        await self._process_message(str(body, "utf-8"))
                     except Exception as e:
                         self.logger.error(f"Error processing message: {e}")
-                        break
 
-            except Exception as e:
-                if not self._stop_event.is_set():
-                    self.logger.error(f"Error in message reader loop: {e}")
-                break
+        except Exception as e:
+            self.logger.error(f"Error in message reader loop: {e}")
+        finally:
+            # Nothing will answer the requests still in flight
+            self._fail_pending_responses(
+                ConnectionError("LSP server closed its output")
+            )
+
+    async def _stderr_reader_loop(self) -> None:
+        """Log the server's stderr so the pipe never fills up."""
+        stderr = self.server_process.stderr if self.server_process else None
+        if stderr is None:
+            return
+        while line := await stderr.readline():
+            self.logger.debug(
+                f"Server stderr: {line.decode('utf-8', errors='replace').rstrip()}"
+            )
 
     async def _process_message(self, content: str) -> None:
         """Process a received message."""
@@ -354,14 +372,15 @@ class AbstractLSPClient(ABC):
     async def _handle_response(self, message: JsonRPCMessage) -> None:
         """Handle a response message."""
         message_id = message.get("id")
-        if message_id in self._response_handlers:
-            handler = self._response_handlers.pop(message_id)
-            try:
-                await handler(message)
-            except Exception as e:
-                self.logger.error(f"Error in response handler: {e}")
-        else:
+        future = (
+            self._pending_responses.pop(message_id, None)
+            if message_id is not None
+            else None
+        )
+        if future is None:
             self.logger.warning(f"No handler for response ID: {message_id}")
+        elif not future.done():
+            future.set_result(message)
 
     async def _handle_request(self, message: JsonRPCMessage) -> None:
         """Handle a request message."""
@@ -411,9 +430,12 @@ class AbstractLSPClient(ABC):
             if self.server_process and self.server_process.stdin:
                 serialized = self.protocol.serialize_message(message)
                 self.server_process.stdin.write(serialized)
-                self.server_process.stdin.flush()
+                # Wait while the server isn't keeping up with its input
+                await self.server_process.stdin.drain()
 
                 self.logger.debug(f"Sent message: {message.to_dict()}")
+                if self.result_cache and isinstance(message, JSONRPCNotification):
+                    self.result_cache.notification_sent(message.method, message.params)
             else:
                 self.logger.error("Cannot send message: no server connection")
 
@@ -481,33 +503,145 @@ class AbstractLSPClient(ABC):
             return False
 
     async def _send_request(
-        self, request: JSONRPCRequest, timeout: float = 30.0
+        self,
+        request: JSONRPCRequest,
+        timeout: float = DEFAULT_REQUEST_TIMEOUT,
+        windowed: bool = True,
     ) -> JsonRPCMessage | None:
-        """Send a request and wait for response."""
-        response_future: asyncio.Future[JsonRPCMessage] = asyncio.Future()
-
-        async def response_handler(message: JsonRPCMessage) -> None:
-            response_future.set_result(message)
-
-        # Register response handler
-        self._response_handlers[request.id] = response_handler
+        """Send a request and wait for response.
+
+        Up to max_in_flight requests are pipelined; further requests wait for
+        a slot. Requests that aren't windowed, like health checks, are sent
+        right away and don't take a slot. The timeout is a deadline for the
+        whole request, including the wait for a slot. A request that times
+        out, or whose caller is cancelled, is cancelled on the server with
+        $/cancelRequest so it stops working on it.
+        """
+        response_future: asyncio.Future[
+            JsonRPCMessage
+        ] = asyncio.get_running_loop().create_future()
+        sent = False
 
         try:
-            # Send request
-            await self._send_message(request)
+            slot = self._in_flight if windowed else contextlib.nullcontext()
+            async with asyncio.timeout(timeout), slot:
+                # Register the future the reader resolves with the response
+                self._pending_responses[request.id] = response_future
+
+                # Send request
+                sent = True
+                await self._send_message(request)
 
-            # Wait for response
-            response = await asyncio.wait_for(response_future, timeout=timeout)
-            return response
+                # Wait for response
+                return await response_future
 
         except TimeoutError:
             self.logger.error(f"Request timeout: {request.method}")
-            self._response_handlers.pop(request.id, None)
+            await self._cancel_request(request, sent)
             return None
+        except asyncio.CancelledError:
+            # The caller went away; don't leave the server working for nobody
+            await self._cancel_request(request, sent)
+            raise
         except Exception as e:
             self.logger.error(f"Request failed: {e}")
-            self._response_handlers.pop(request.id, None)
+            self._pending_responses.pop(request.id, None)
             return None
+        finally:
+            self.protocol.cancel_request(request.id)
+
+    async def _cancel_request(self, request: JSONRPCRequest, sent: bool) -> None:
+        """Stop waiting for a request and tell the server to drop it."""
+        self._pending_responses.pop(request.id, None)
+        if not sent or self.server_process is None:
+            return
+        self.logger.debug(f"Cancelling request {request.id}: {request.method}")
+        cancel_notification = self.protocol.create_notification(
+            LSPMethod.CANCEL_REQUEST, {"id": request.id}
+        )
+        await self._send_message(cancel_notification)
+
+    async def send_request(
+        self,
+        method: str,
+        params: dict[str, Any] | None = None,
+        timeout: float = DEFAULT_REQUEST_TIMEOUT,
+        windowed: bool = True,
+    ) -> JsonRPCMessage | None:
+        """Send a request to the server and wait for its response.
+
+        Args:
+            method: LSP method name
+            params: Request parameters
+            timeout: Deadline for the request in seconds
+            windowed: Whether the request waits for a slot in the in-flight
+                window; cheap requests that must not queue behind busy ones,
+                like health checks, bypass it
+
+        Returns:
+            Response message, or None if the request failed or timed out
+        """
+        request = self.protocol.create_request(method, params)
+        return await self._send_request(request, timeout, windowed)
+
+    async def send_requests(
+        self,
+        method: str,
+        params_list: list[dict[str, Any]],
+        timeout: float = DEFAULT_REQUEST_TIMEOUT,
+    ) -> list[JsonRPCMessage | None]:
+        """Send requests of one method concurrently and gather their responses.
+
+        The requests are pipelined through the in-flight window; each has its
+        own deadline. Cancelling the caller cancels all of them.
+
+        Args:
+            method: LSP method name
+            params_list: Parameters of each request
+            timeout: Deadline for each request in seconds
+
+        Returns:
+            Responses in the order of params_list; None for failed requests
+        """
+        return list(
+            await asyncio.gather(
+                *(self.send_request(method, params, timeout) for params in params_list)
+            )
+        )
+
+    async def request_result(
+        self,
+        method: str,
+        params: dict[str, Any],
+        timeout: float = DEFAULT_REQUEST_TIMEOUT,
+    ) -> Any:
+        """Send a request and return its result, using the result cache.
+
+        Implementations of the navigation methods should send their requests
+        through here, so repeated questions are answered from the cache.
+
+        Args:
+            method: LSP method name
+            params: Request parameters
+            timeout: Deadline for the request in seconds
+
+        Returns:
+            Result of the request, or None if it failed, timed out or was
+            answered with an error
+        """
+
+        async def fetch() -> Any:
+            response = await self.send_request(method, params, timeout)
+            if response is None:
+                return None
+            if "error" in response:
+                self.logger.warning(f"{method} failed: {response['error']}")
+                return None
+            return response.get("result")
+
+        if self.result_cache is None:
+            return await fetch()
+        return await self.result_cache.get_or_fetch(method, params, fetch)
 
     async def _send_shutdown(self) -> None:
         """Send shutdown request."""
@@ -562,6 +696,15 @@ class AbstractLSPClient(ABC):
         """Check if the client is initialized."""
         return self.state == LSPClientState.INITIALIZED
 
+    def is_server_running(self) -> bool:
+        """Check whether the server process runs and its output is being read."""
+        return (
+            self.server_process is not None
+            and self.server_process.returncode is None
+            and self._reader_task is not None
+            and not self._reader_task.done()
+        )
+
     def get_server_capabilities(self) -> dict[str, Any]:
         """Get the server's capabilities."""
         return self.server_capabilities.copy()
@@ -574,6 +717,24 @@ class AbstractLSPClient(ABC):
         """Remove a notification handler."""
         self._notification_handlers.pop(method, None)
 
+    async def get_hover_batch(
+        self, uri: str, positions: list[tuple[int, int]]
+    ) -> list[dict[str, Any] | None]:
+        """Get hover information for several positions of a document at once.
+
+        Args:
+            uri: Document URI
+            positions: (line, character) pairs
+
+        Returns:
+            Hover information in the order of positions
+        """
+        return list(
+            await asyncio.gather(
+                *(self.get_hover(uri, line, character) for line, character in positions)
+            )
+        )
+
     # Abstract methods for subclasses
     @abstractmethod
     async def get_definition(
@@ -8,7 +8,9 @@ and provides only minimal compatibility wrappers where needed.
 import io
 import json
 import logging
+import re
 import uuid
+from collections.abc import Iterator
 from typing import Any
 
 from pylsp_jsonrpc.streams import JsonRpcStreamReader, JsonRpcStreamWriter
@@ -18,6 +20,17 @@ from lsp_constants import (
     LSPErrorCode,
 )
 
+# Bytes requested from the server's stdout per read
+DEFAULT_READ_SIZE = 64 * 1024
+
+# Separator between the header and the content part of an LSP message
+HEADER_TERMINATOR = b"\r\n\r\n"
+
+# Content-Length header, matched in the raw header bytes. Not anchored with "^",
+# which wouldn't match at the search position of a message that directly
+# follows the previous body
+CONTENT_LENGTH_RE = re.compile(rb"(?i)Content-Length:[ \t]*(\d+)")
+
 
 class JSONRPCError(Exception):
     """Exception for JSON-RPC protocol errors."""
@@ -319,3 +332,121 @@ class JSONRPCProtocol:
             return False
 
         return True
+
+
+class LSPMessageFramer:
+    """Splits a byte stream into LSP message bodies without copying them.
+
+    Received bytes go into one growable buffer, read into directly with
+    ``readinto``. Headers are matched as bytes, and bodies are handed out as
+    memoryviews of the buffer, so a multi-megabyte response is copied only
+    when its caller decodes it. Consumed bytes are reclaimed by moving the
+    unparsed tail to the front when more room is needed, which keeps framing
+    linear in the size of the stream.
+    """
+
+    def __init__(
+        self,
+        read_size: int = DEFAULT_READ_SIZE,
+        logger: logging.Logger | None = None,
+    ):
+        """Initialize the framer with an empty buffer.
+
+        Args:
+            read_size: Minimum number of bytes requested per read
+            logger: Logger for malformed messages
+        """
+        self.read_size = read_size
+        self.logger = logger or logging.getLogger(__name__)
+        self._buffer = bytearray(read_size)
+        # Unparsed data is self._buffer[self._start : self._end]
+        self._start = 0
+        self._end = 0
+        # End of the body whose header was parsed but which is incomplete
+        self._body_end: int | None = None
+
+    @property
+    def buffered(self) -> int:
+        """Number of received bytes not yet returned as messages."""
+        return self._end - self._start
+
+    def _reserve(self, size: int) -> None:
+        """Make room for at least size more bytes after the received data."""
+        if len(self._buffer) - self._end >= size:
+            return
+        pending = self._end - self._start
+        if self._start:
+            # Move the unparsed tail to the front; it is at most one message
+            with memoryview(self._buffer) as view:
+                view[:pending] = view[self._start : self._end]
+            if self._body_end is not None:
+                self._body_end -= self._start
+            self._start, self._end = 0, pending
+        if len(self._buffer) - self._end < size:
+            grow_to = max(len(self._buffer) * 2, self._end + size)
+            self._buffer.extend(bytes(grow_to - len(self._buffer)))
+
+    def feed(self, data: bytes) -> None:
+        """Append received bytes."""
+        self._reserve(len(data))
+        self._buffer[self._end : self._end + len(data)] = data
+        self._end += len(data)
+
+    def read_from(self, stream: io.BufferedIOBase | io.RawIOBase) -> int:
+        """Read once from a stream straight into the buffer.
+
+        The read covers the rest of a partially received body, so a large
+        response arrives in a few big reads.
+
+        Args:
+            stream: Binary stream; buffered streams are read with readinto1,
+                which returns what is available instead of waiting for the
+                whole read size
+
+        Returns:
+            Number of bytes read; 0 at end of stream
+        """
+        size = self.read_size
+        if self._body_end is not None:
+            size = max(size, self._body_end - self._end)
+        self._reserve(size)
+        readinto = getattr(stream, "readinto1", stream.readinto)
+        with memoryview(self._buffer) as view, view[self._end :] as free:
+            count = readinto(free) or 0
+        self._end += count
+        return count
+
+    def _next_body(self) -> tuple[int, int] | None:
+        """Locate the next complete body, consuming its header."""
+        while self._body_end is None:
+            header_end = self._buffer.find(HEADER_TERMINATOR, self._start, self._end)
+            if header_end == -1:
+                return None
+            match = CONTENT_LENGTH_RE.search(self._buffer, self._start, header_end)
+            body_start = header_end + len(HEADER_TERMINATOR)
+            if match is None:
+                self.logger.error("Invalid message: missing Content-Length")
+                self._start = body_start
+                continue
+            self._start = body_start
+            self._body_end = body_start + int(match.group(1))
+
+        if self._end < self._body_end:
+            return None
+        body = (self._start, self._body_end)
+        self._start, self._body_end = self._body_end, None
+        if self._start == self._end:
+            self._start = self._end = 0
+        return body
+
+    def messages(self) -> Iterator[memoryview]:
+        """Yield the bodies of all complete messages received so far.
+
+        Each body is a view into the buffer that is released when the next
+        body is requested; decode it (for example ``str(body, "utf-8")``)
+        before advancing, and don't feed the framer while iterating.
+        """
+        while (body := self._next_body()) is not None:
+            start, end = body
+            with memoryview(self._buffer) as view, view[start:end] as content:
+                yield content
@@ -0,0 +1,396 @@
+"""
+Pool of warm language servers.
+
+Starting pyright and letting it analyze a repository takes seconds, too long
+to pay on the request path of a code navigation tool. The pool starts one
+server per repository when the worker boots, checks periodically that it
+still answers, and restarts it with exponential backoff after it crashed or
+hung. Tools lease the client of a repository's server for the duration of a
+call; while the server is (re)starting, a lease waits for it instead of
+starting a server of its own.
+
+Each server has an ``LSPResultCache`` that outlives restarts and is kept
+current by file change events of the server's workspace, taken from the
+workspace's shared change source.
+
+Workers only start the pool when GITHUB_AGENT_WARM_LSP_SERVERS is set.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from enum import Enum
+from pathlib import Path
+from typing import Any
+
+from lsp_cache import LSPResultCache
+from lsp_client import AbstractLSPClient
+from repository_watcher import AbstractChangeSource, SharedChangeSource
+
+logger = logging.getLogger(__name__)
+
+# Seconds between health checks of a running server
+DEFAULT_HEALTH_CHECK_INTERVAL = 30.0
+
+# Seconds a server may take to answer a health check
+DEFAULT_HEALTH_CHECK_TIMEOUT = 10.0
+
+# Seconds a server may take to start and initialize
+DEFAULT_START_TIMEOUT = 60.0
+
+# Seconds before restarting a failed server; doubles per consecutive failure
+DEFAULT_RESTART_DELAY = 1.0
+MAX_RESTART_DELAY = 300.0
+
+# Seconds a lease waits for a server that is (re)starting
+DEFAULT_LEASE_TIMEOUT = 30.0
+
+# Request any live server answers: requests starting with "$/" that a server
+# doesn't implement must be rejected with MethodNotFound
+HEALTH_CHECK_METHOD = "$/healthCheck"
+
+# Environment variable enabling the pool in workers. Off by default: no tool
+# leases from the pool yet, so warm servers would only cost memory and CPU
+WARM_LSP_SERVERS_ENV = "GITHUB_AGENT_WARM_LSP_SERVERS"
+
+# Builds a client for a server, given the result cache it should use
+ClientFactory = Callable[[LSPResultCache], AbstractLSPClient]
+
+
+class LSPServerState(Enum):
+    """States of a pooled language server."""
+
+    STARTING = "starting"
+    READY = "ready"
+    BACKOFF = "backoff"
+    STOPPED = "stopped"
+
+
+class LSPServerUnavailableError(RuntimeError):
+    """Raised when no ready server can be leased."""
+
+
+class PooledLSPServer:
+    """A language server of the pool and its supervision state."""
+
+    def __init__(
+        self,
+        name: str,
+        workspace_root: str,
+        client_factory: ClientFactory,
+        watch: bool,
+    ):
+        self.name = name
+        self.workspace_root = workspace_root
+        self.client_factory = client_factory
+        self.watch = watch
+        self.result_cache = LSPResultCache()
+        self.client: AbstractLSPClient | None = None
+        self.state = LSPServerState.STOPPED
+        self.restarts = 0
+        self.consecutive_failures = 0
+        self.last_error: str | None = None
+        self.leases = 0
+        self.change_source: AbstractChangeSource | None = None
+        # Set while the client can be leased
+        self.ready = asyncio.Event()
+        # Wakes the supervisor for an early health check
+        self.wake = asyncio.Event()
+        self.supervisor: asyncio.Task | None = None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "state": self.state.value,
+            "workspace": self.workspace_root,
+            "restarts": self.restarts,
+            "consecutive_failures": self.consecutive_failures,
+            "last_error": self.last_error,
+            "leases": self.leases,
+            "result_cache": self.result_cache.stats(),
+        }
+
+
+class LSPServerPool:
+    """Keeps one initialized language server per repository running."""
+
+    def __init__(
+        self,
+        health_check_interval: float = DEFAULT_HEALTH_CHECK_INTERVAL,
+        health_check_timeout: float = DEFAULT_HEALTH_CHECK_TIMEOUT,
+        start_timeout: float = DEFAULT_START_TIMEOUT,
+        restart_delay: float = DEFAULT_RESTART_DELAY,
+        max_restart_delay: float = MAX_RESTART_DELAY,
+    ):
+        """Initialize an empty pool.
+
+        Args:
+            health_check_interval: Seconds between health checks of a server
+            health_check_timeout: Seconds a server may take to answer one
+            start_timeout: Seconds a server may take to start and initialize
+            restart_delay: Seconds before the first restart of a failed server
+            max_restart_delay: Upper bound of the restart delay
+        """
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self.start_timeout = start_timeout
+        self.restart_delay = restart_delay
+        self.max_restart_delay = max_restart_delay
+        self._servers: dict[str, PooledLSPServer] = {}
+        self._running = False
+
+    def add_server(
+        self,
+        name: str,
+        workspace_root: str,
+        client_factory: ClientFactory,
+        watch: bool = True,
+    ) -> None:
+        """Register the server of a repository; started now if the pool runs.
+
+        Args:
+            name: Repository name the server is leased by
+            workspace_root: Root of the workspace the server analyzes
+            client_factory: Builds a client for each (re)start
+            watch: Whether to invalidate cached results on file changes
+
+        Raises:
+            ValueError: If a server is already registered under the name
+        """
+        if name in self._servers:
+            raise ValueError(f"Language server {name} is already registered")
+        server = PooledLSPServer(name, workspace_root, client_factory, watch)
+        self._servers[name] = server
+        if self._running:
+            self._start_supervisor(server)
+
+    def start(self) -> None:
+        """Start all registered servers in tasks of the running event loop."""
+        self._running = True
+        for server in self._servers.values():
+            if server.supervisor is None:
+                self._start_supervisor(server)
+
+    async def stop(self) -> None:
+        """Stop all servers and their supervision."""
+        self._running = False
+        for server in self._servers.values():
+            if server.supervisor is not None:
+                server.supervisor.cancel()
+                try:
+                    await server.supervisor
+                except asyncio.CancelledError:
+                    pass
+                server.supervisor = None
+            await self._stop_client(server)
+            server.state = LSPServerState.STOPPED
+            if server.change_source is not None:
+                await asyncio.to_thread(server.change_source.stop)
+                server.change_source = None
+
+    @asynccontextmanager
+    async def lease(
+        self, name: str, timeout: float = DEFAULT_LEASE_TIMEOUT
+    ) -> AsyncIterator[AbstractLSPClient]:
+        """Lease the initialized client of a repository's server.
+
+        Waits while the server is starting or restarting. The client must not
+        be used after the lease ends, since the pool may replace it.
+
+        Args:
+            name: Repository name
+            timeout: Seconds to wait for the server to become ready
+
+        Yields:
+            Initialized client of the server
+
+        Raises:
+            LSPServerUnavailableError: If the repository has no server, the
+                pool is stopped, or the server isn't ready within the timeout
+        """
+        server = self._servers.get(name)
+        if server is None:
+            raise LSPServerUnavailableError(f"No language server for {name}")
+        if not self._running:
+            raise LSPServerUnavailableError("The language server pool is stopped")
+
+        try:
+            async with asyncio.timeout(timeout):
+                while True:
+                    await server.ready.wait()
+                    client = server.client
+                    if client is not None and client.is_server_running():
+                        break
+                    # Died since the last health check; have it restarted now
+                    server.ready.clear()
+                    server.wake.set()
+        except TimeoutError:
+            raise LSPServerUnavailableError(
+                f"Language server for {name} not ready after {timeout}s "
+                f"({server.state.value}, last error: {server.last_error})"
+            ) from None
+
+        server.leases += 1
+        try:
+            yield client
+        finally:
+            server.leases -= 1
+
+    def stats(self) -> dict[str, Any]:
+        """Get the state, restart counters and cache statistics of each server.
+
+        Returns:
+            Dictionary of server statistics by repository name
+        """
+        return {name: server.stats() for name, server in self._servers.items()}
+
+    def _start_supervisor(self, server: PooledLSPServer) -> None:
+        server.supervisor = asyncio.create_task(
+            self._supervise(server), name=f"lsp-{server.name}"
+        )
+
+    async def _supervise(self, server: PooledLSPServer) -> None:
+        """Keep a server running until the pool stops."""
+        if server.watch and server.change_source is None:
+            # Index watchers run in the master, so in a worker this usually
+            # starts the repository's observer rather than joining one
+            source = SharedChangeSource()
+            try:
+                await asyncio.to_thread(
+                    source.start,
+                    Path(server.workspace_root),
+                    server.result_cache.invalidate_path,
+                )
+                server.change_source = source
+            except Exception as e:
+                logger.warning(f"Not watching {server.name} for LSP cache: {e}")
+
+        while True:
+            if await self._start_client(server):
+                await self._monitor(server)
+            await self._back_off(server)
+
+    async def _start_client(self, server: PooledLSPServer) -> bool:
+        """Start and initialize a new client for the server."""
+        server.state = LSPServerState.STARTING
+        started_at = time.monotonic()
+        try:
+            client = server.client_factory(server.result_cache)
+        except Exception as e:
+            return self._record_failure(server, f"Creating the client failed: {e}")
+        server.client = client
+
+        error = "Starting the server failed"
+        try:
+            started = await asyncio.wait_for(client.start(), self.start_timeout)
+        except TimeoutError:
+            started = False
+            error = f"Not initialized after {self.start_timeout}s"
+        if not started:
+            await self._stop_client(server)
+            return self._record_failure(server, error)
+
+        server.state = LSPServerState.READY
+        server.ready.set()
+        logger.info(
+            f"Language server for {server.name} ready after "
+            f"{time.monotonic() - started_at:.1f}s"
+        )
+        return True
+
+    async def _monitor(self, server: PooledLSPServer) -> None:
+        """Check the server's health until it fails, then stop it."""
+        while True:
+            server.wake.clear()
+            try:
+                await asyncio.wait_for(server.wake.wait(), self.health_check_interval)
+            except TimeoutError:
+                pass
+            error = await self._check_health(server)
+            if error is not None:
+                break
+            server.consecutive_failures = 0
+
+        await self._stop_client(server)
+        self._record_failure(server, error)
+
+    async def _check_health(self, server: PooledLSPServer) -> str | None:
+        """Check that the server runs and answers a request.
+
+        Returns:
+            Why the server is unhealthy, or None if it is healthy
+        """
+        client = server.client
+        if client is None or not client.is_server_running():
+            return "Server process exited"
+        # Outside the in-flight window: a server busy with a full window of
+        # slow requests is still healthy as long as it answers
+        response = await client.send_request(
+            HEALTH_CHECK_METHOD, timeout=self.health_check_timeout, windowed=False
+        )
+        if response is None:
+            return f"No health check response within {self.health_check_timeout}s"
+        return None
+
+    async def _back_off(self, server: PooledLSPServer) -> None:
+        """Wait before restarting a server, longer after each failure."""
+        server.state = LSPServerState.BACKOFF
+        delay = self._restart_delay(server)
+        logger.warning(
+            f"Restarting language server for {server.name} in {delay:.1f}s "
+            f"(failure {server.consecutive_failures}: {server.last_error})"
+        )
+        await asyncio.sleep(delay)
+        server.restarts += 1
+
+    def _restart_delay(self, server: PooledLSPServer) -> float:
+        """Get the delay before the next restart of a failed server."""
+        return min(
+            self.restart_delay * 2 ** (server.consecutive_failures - 1),
+            self.max_restart_delay,
+        )
+
+    def _record_failure(self, server: PooledLSPServer, error: str) -> bool:
+        server.consecutive_failures += 1
+        server.last_error = error
+        logger.error(f"Language server for {server.name} failed: {error}")
+        return False
+
+    async def _stop_client(self, server: PooledLSPServer) -> None:
+        server.ready.clear()
+        client, server.client = server.client, None
+        if client is not None:
+            try:
+                await client.stop()
+            except Exception as e:
+                logger.warning(f"Error stopping language server {server.name}: {e}")
+
+
+def lsp_server_pool_enabled() -> bool:
+    """Whether workers should warm up language servers, see WARM_LSP_SERVERS_ENV."""
+    return os.getenv(WARM_LSP_SERVERS_ENV, "").lower() in ("1", "true", "yes")
+
+
+_pool: LSPServerPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_lsp_server_pool() -> LSPServerPool:
+    """Get the process-wide language server pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = LSPServerPool()
+        return _pool
+
+
+async def close_lsp_server_pool() -> None:
+    """Stop the process-wide language server pool."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        await pool.stop()
@@ -31,13 +31,18 @@ from constants import LOGS_DIR, Language
 from python_symbol_extractor import PythonSymbolExtractor
 from repository_indexer import PythonRepositoryIndexer
 from repository_manager import RepositoryConfig, RepositoryManager
+from repository_watcher import DEFAULT_MAX_UPDATE_LATENCY, RepositoryWatcher
 
 # Import shutdown coordination components
 from shutdown_simple import (
     SimpleHealthMonitor,
     SimpleShutdownCoordinator,
 )
-from startup_orchestrator import CodebaseStartupOrchestrator
+from startup_orchestrator import (
+    DEFAULT_INDEXING_CONCURRENCY,
+    CodebaseStartupOrchestrator,
+    IndexingStatus,
+)
 from symbol_storage import ProductionSymbolStorage, SQLiteSymbolStorage
 from system_utils import MicrosecondFormatter, log_system_state
 
@@ -193,6 +198,8 @@ class MCPMaster:
         symbol_storage: SQLiteSymbolStorage,
         shutdown_coordinator: SimpleShutdownCoordinator,
         health_monitor: SimpleHealthMonitor,
+        watch_repositories: bool = True,
+        max_update_latency: float = DEFAULT_MAX_UPDATE_LATENCY,
     ):
         self.repository_manager = repository_manager
         self.workers = workers
@@ -202,6 +209,12 @@ class MCPMaster:
         self.health_monitor = health_monitor
         self.running = False
 
+        # Keep indexes current while the master runs; a change is searchable
+        # at most max_update_latency seconds after it is saved
+        self.watch_repositories = watch_repositories
+        self.max_update_latency = max_update_latency
+        self.repository_watchers: dict[str, RepositoryWatcher] = {}
+
         # Use system-appropriate log location
         self.log_dir = LOGS_DIR
         self.log_dir.mkdir(parents=True, exist_ok=True)
@@ -215,9 +228,11 @@ class MCPMaster:
             # Get list of repository configurations
             repositories = list(self.repository_manager.repositories.values())
 
-            # Run startup orchestration
+            # Run startup orchestration; each repository is watched as soon as
+            # its own index is built, not after the whole run
             result = await self.startup_orchestrator.initialize_repositories(
-                repositories
+                repositories,
+                self.start_repository_watcher if self.watch_repositories else None,
             )
 
             # Log detailed results
@@ -242,10 +257,66 @@ class MCPMaster:
                         f"  - {status.repository_id}: FAILED - {status.error_message}"
                     )
 
+            if self.watch_repositories:
+                logger.info(f"Watching {len(self.repository_watchers)} repositories")
+
         except Exception as e:
             logger.error(f"Failed to initialize repository indexes: {e}")
             # Don't fail the entire startup - continue without indexing
 
+    async def start_repository_watcher(self, status: IndexingStatus) -> None:
+        """Start watching a repository whose index was just built.
+
+        Files saved after the indexing run scanned them but before the watcher
+        subscribed produce no event, so once the watcher runs the repository
+        is indexed once more; being incremental, that run only stats the files
+        and re-extracts the ones that changed in between.
+
+        Args:
+            status: Indexing status of the repository
+        """
+        if status.repository_id in self.repository_watchers:
+            return
+
+        indexer = self.startup_orchestrator.indexer
+        watcher = RepositoryWatcher(
+            status.repository_path,
+            status.repository_id,
+            indexer,
+            max_update_latency=self.max_update_latency,
+        )
+        try:
+            # Native watchers register every directory up front
+            await asyncio.to_thread(watcher.start)
+        except Exception as e:
+            logger.warning(f"Could not watch {status.repository_id}: {e}")
+            return
+        self.repository_watchers[status.repository_id] = watcher
+
+        try:
+            catch_up = await asyncio.to_thread(
+                indexer.index_repository, status.repository_path, status.repository_id
+            )
+        except Exception as e:
+            logger.warning(
+                f"Could not catch up on changes of {status.repository_id}: {e}"
+            )
+            return
+        if catch_up.processed_files or catch_up.removed_files:
+            logger.info(
+                f"Indexed {len(catch_up.processed_files)} files of "
+                f"{status.repository_id} changed during startup indexing"
+            )
+
+    async def stop_repository_watchers(self) -> None:
+        """Stop all repository watchers, applying their pending changes."""
+        for repository_id, watcher in list(self.repository_watchers.items()):
+            try:
+                await asyncio.to_thread(watcher.stop)
+            except Exception as e:
+                logger.error(f"Error stopping watcher for {repository_id}: {e}")
+        self.repository_watchers.clear()
+
     def start_worker(self, worker: WorkerProcess) -> bool:
         """Start a worker process for a repository"""
         try:
@@ -467,9 +538,6 @@ class MCPMaster:
         # Store loop reference for signal handler
         self.loop = asyncio.get_running_loop()
 
-        # Initialize repository indexes
-        await self.initialize_repository_indexes()
-
         # Set up signal handlers
         signal.signal(signal.SIGTERM, self.signal_handler)
         signal.signal(signal.SIGINT, self.signal_handler)
@@ -485,6 +553,11 @@ class MCPMaster:
         if failed_workers:
             logger.error(f"Failed to start workers for: {failed_workers}")
 
+        # Index repositories in the background; workers serve requests right
+        # away and report partial symbol search results until their index is
+        # complete
+        indexing_task = asyncio.create_task(self.initialize_repository_indexes())
+
         # Start monitoring task
         monitor_task = asyncio.create_task(self.monitor_workers())
 
@@ -525,6 +598,18 @@ class MCPMaster:
 
         logger.info("Shutdown signal received, beginning graceful shutdown...")
 
+        # Stop indexing; running jobs finish the file they are processing
+        if not indexing_task.done():
+            logger.info("Stopping background repository indexing...")
+            self.startup_orchestrator.cancel_indexing()
+            try:
+                await indexing_task
+            except Exception as e:
+                logger.error(f"Error stopping repository indexing: {e}")
+
+        # Stop live re-indexing before the symbol storage is closed
+        await self.stop_repository_watchers()
+
         # Stop health monitoring FIRST to prevent worker restarts during shutdown
         logger.info("Step 1: Stopping health monitoring to prevent worker restarts...")
         try:
@@ -760,7 +845,14 @@ async def main() -> None:
         logger.info("Creating startup orchestrator components...")
         symbol_storage = ProductionSymbolStorage.create_with_schema()
         symbol_extractor = PythonSymbolExtractor()
-        indexer = PythonRepositoryIndexer(symbol_extractor, symbol_storage)
+        # Repositories are indexed concurrently; share the cores between them
+        indexer = PythonRepositoryIndexer(
+            symbol_extractor,
+            symbol_storage,
+            extraction_workers=max(
+                1, (os.cpu_count() or 1) // DEFAULT_INDEXING_CONCURRENCY
+            ),
+        )
 
         startup_orchestrator = CodebaseStartupOrchestrator(
             symbol_storage=symbol_storage,
@@ -16,7 +16,6 @@ import asyncio
 import json
 import logging
 import os
-import queue
 import signal
 import sys
 import traceback
@@ -32,8 +31,14 @@ from fastapi.responses import StreamingResponse
 import codebase_tools
 import github_tools
 from constants import DATA_DIR, LOGS_DIR, Language
+from github_http import (
+    close_github_session,
+    get_github_response_cache,
+    shutdown_github_executor,
+)
 from github_tools import (
     GitHubAPIContext,
+    create_pr_reply_sender,
     execute_find_pr_for_branch,
     execute_get_build_status,
     execute_get_current_branch,
@@ -42,10 +47,20 @@ from github_tools import (
     execute_github_check_ci_build_and_test_errors_not_local,
     execute_github_check_ci_lint_errors_not_local,
 )
+from lsp_cache import LSPResultCache
+from lsp_server_pool import (
+    close_lsp_server_pool,
+    get_lsp_server_pool,
+    lsp_server_pool_enabled,
+)
+from pr_reply_queue import PRReplySender, close_pr_reply_queue
+from pyright_lsp_client import PyrightLSPClient
+from pyright_lsp_manager import PyrightLSPManager
 
 # Import shared functionality
 from repository_manager import RepositoryConfig, RepositoryManager
 from shutdown_simple import SimpleShutdownCoordinator
+from sse_sessions import SESSION_ID_PARAM, SSESessionManager
 from symbol_storage import ProductionSymbolStorage, SQLiteSymbolStorage
 from system_utils import MicrosecondFormatter, log_system_state
 
@@ -156,6 +171,8 @@ class MCPWorker:
         try:
             # Create GitHub context
             self.github_context = GitHubAPIContext(self.repo_config)
+            # Tool handlers reuse it instead of rebuilding it per call
+            github_tools.github_context_cache.put(self.repo_config, self.github_context)
             self.logger.debug("GitHub context created successfully")
         except Exception as e:
             self.logger.error(f"Failed to create GitHub context: {e}")
@@ -171,14 +188,16 @@ class MCPWorker:
             self.logger.error(f"Failed to setup repository manager: {e}")
             raise
 
-        self.logger.debug("Creating message queue...")
-        # Message queue for MCP communication
-        self.message_queue: queue.Queue[dict[str, Any]] = queue.Queue()
+        # Open SSE connections; responses go to the session that sent the request
+        self.sse_sessions = SSESessionManager()
 
         # Server instance for shutdown
         self.server: uvicorn.Server | None = None
         self.shutdown_event = asyncio.Event()
 
+        # Delivers queued PR replies while the server runs
+        self.pr_reply_sender: PRReplySender | None = None
+
         # Initialize symbol storage for Python repositories
         self.symbol_storage = None
         if self.language == Language.PYTHON:
@@ -316,6 +335,8 @@ class MCPWorker:
                 "github_configured": github_configured,
                 "repo_path_exists": os.path.exists(self.repo_path),
                 "tool_categories": ["github", "codebase"],
+                "github_cache": get_github_response_cache().stats(),
+                "lsp_servers": get_lsp_server_pool().stats(),
             }
 
         # Graceful shutdown endpoint
@@ -337,40 +358,8 @@ class MCPWorker:
             client_host = request.client.host if request.client else "unknown"
             self.logger.info(f"SSE connection from {client_host}")
 
-            async def generate_sse():
-                try:
-                    # Send endpoint event with POST URL
-                    yield "event: endpoint\n"
-                    yield f"data: http://localhost:{self.port}/mcp/\n\n"
-
-                    # Process queued messages and keep connection alive
-                    keepalive_counter = 0
-                    while True:
-                        # Check for queued messages
-                        try:
-                            while not self.message_queue.empty():
-                                message = self.message_queue.get_nowait()
-                                yield "event: message\n"
-                                yield f"data: {json.dumps(message)}\n\n"
-                        except Exception as e:
-                            self.logger.warning(
-                                f"Failed to process message from queue: {e}"
-                            )
-
-                        await asyncio.sleep(0.1)
-
-                        # Send keepalive every 30 seconds
-                        keepalive_counter += 1
-                        if keepalive_counter >= 300:
-                            yield ": keepalive\n\n"
-                            keepalive_counter = 0
-
-                except Exception as e:
-                    yield "event: error\n"
-                    yield f'data: {{"error": "{e!s}"}}\n\n'
-
             return StreamingResponse(
-                generate_sse(),
+                self.sse_sessions.stream(f"http://localhost:{self.port}/mcp/"),
                 media_type="text/event-stream",
                 headers={
                     "Cache-Control": "no-cache",
@@ -386,6 +375,19 @@ class MCPWorker:
             try:
                 body = await request.json()
                 self.logger.info(f"Received MCP request: {body.get('method')}")
+                session_id = request.query_params.get(SESSION_ID_PARAM)
+
+                def queue_response(response: dict[str, Any]) -> dict[str, Any]:
+                    if not self.sse_sessions.publish(session_id, response):
+                        return {
+                            "jsonrpc": "2.0",
+                            "id": body.get("id", 1),
+                            "error": {
+                                "code": -32600,
+                                "message": f"Unknown or missing SSE session: {session_id}",
+                            },
+                        }
+                    return {"status": "queued"}
 
                 if body.get("method") == "initialize":
                     response = {
@@ -406,8 +408,7 @@ class MCPWorker:
                             },
                         },
                     }
-                    self.message_queue.put(response)
-                    return {"status": "queued"}
+                    return queue_response(response)
 
                 elif body.get("method") == "notifications/initialized":
                     self.logger.info("Received initialized notification")
@@ -426,8 +427,7 @@ class MCPWorker:
                         "id": body.get("id", 1),
                         "result": {"tools": all_tools},
                     }
-                    self.message_queue.put(response)
-                    return {"status": "queued"}
+                    return queue_response(response)
 
                 elif body.get("method") == "tools/call":
                     # Handle tool execution for this repository
@@ -465,6 +465,7 @@ class MCPWorker:
 
                     elif tool_name == "github_get_pr_comments":
                         pr_number = tool_args.get("pr_number")
+                        unhandled_only = tool_args.get("unhandled_only", False)
                         if not pr_number:
                             # Auto-detect PR for current branch
                             current_branch_result = await execute_get_current_branch(
@@ -492,11 +493,11 @@ class MCPWorker:
                                 else:
                                     pr_number = find_pr_data.get("number")
                                     result = await execute_get_pr_comments(
-                                        self.repo_name, pr_number
+                                        self.repo_name, pr_number, unhandled_only
                                     )
                         else:
                             result = await execute_get_pr_comments(
-                                self.repo_name, pr_number
+                                self.repo_name, pr_number, unhandled_only
                             )
 
                     elif tool_name == "github_get_build_status":
@@ -583,8 +584,11 @@ class MCPWorker:
                                         repo_path=self.repo_path,
                                         **tool_args,
                                     )
-                                elif tool_name == "github_post_pr_reply":
-                                    # This tool only needs repo_name, not repo_path
+                                elif tool_name in [
+                                    "github_post_pr_reply",
+                                    "github_pr_reply_status",
+                                ]:
+                                    # These tools only need repo_name, not repo_path
                                     result = await module.execute_tool(
                                         tool_name,
                                         repo_name=self.repo_name,
@@ -608,8 +612,7 @@ class MCPWorker:
                         "id": body.get("id", 1),
                         "result": {"content": [{"type": "text", "text": result}]},
                     }
-                    self.message_queue.put(response)
-                    return {"status": "queued"}
+                    return queue_response(response)
 
                 return {
                     "jsonrpc": "2.0",
@@ -646,6 +649,25 @@ class MCPWorker:
             self._shutdown_task = asyncio.create_task(self._set_shutdown_event())
             # Store reference to prevent task being garbage collected
 
+    async def _start_lsp_server_pool(self) -> None:
+        """Start warming up pyright for this repository in the background."""
+        try:
+            server_manager = await asyncio.to_thread(
+                PyrightLSPManager, self.repo_path, self.python_path
+            )
+        except RuntimeError as e:
+            self.logger.warning(f"Code navigation disabled: {e}")
+            return
+
+        def create_client(result_cache: LSPResultCache) -> PyrightLSPClient:
+            return PyrightLSPClient(
+                server_manager, self.repo_path, self.logger, result_cache=result_cache
+            )
+
+        pool = get_lsp_server_pool()
+        pool.add_server(self.repo_name, self.repo_path, create_client)
+        pool.start()
+
     async def _set_shutdown_event(self):
         """Set shutdown event from async context"""
         self.shutdown_event.set()
@@ -694,6 +716,10 @@ class MCPWorker:
                 # Run server in background and wait for shutdown event
                 self.logger.info("Creating server and shutdown tasks...")
                 server_task = asyncio.create_task(self.server.serve())
+                self.pr_reply_sender = create_pr_reply_sender(self.repo_name)
+                self.pr_reply_sender.start()
+                if self.language == Language.PYTHON and lsp_server_pool_enabled():
+                    await self._start_lsp_server_pool()
                 shutdown_task = asyncio.create_task(self.shutdown_event.wait())
                 self.logger.debug("Server and shutdown tasks created successfully")
 
@@ -731,10 +757,11 @@ class MCPWorker:
         self.logger.info("Beginning graceful shutdown...")
 
         try:
-            # 1. Stop accepting new connections
+            # 1. Stop accepting new connections and end open SSE streams
             if self.server:
                 self.server.should_exit = True
                 self.logger.info("Server marked for shutdown")
+            self.sse_sessions.close_all()
 
             # 2. Wait briefly for ongoing requests
             await asyncio.sleep(2)
@@ -749,6 +776,15 @@ class MCPWorker:
                 self.logger.info("Closing worker symbol storage connection...")
                 self.symbol_storage.close()
                 self.symbol_storage = None
+            if self.pr_reply_sender:
+                self.logger.info("Stopping PR reply sender...")
+                await self.pr_reply_sender.stop()
+                self.pr_reply_sender = None
+            close_pr_reply_queue()
+            self.logger.info("Stopping language servers...")
+            await close_lsp_server_pool()
+            shutdown_github_executor()
+            close_github_session()
 
             self.logger.info("✓ Graceful shutdown complete")
 
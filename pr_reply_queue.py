@@ -0,0 +1,707 @@
+"""
+Durable outbox for PR comment replies.
+
+Posting a reply used to keep the agent waiting on several sequential GitHub
+round trips. Replies are now written to a local SQLite outbox and the tool
+returns at once; a background sender in the worker delivers them. The sender
+coalesces replies queued for the same comment into one post, retries failed
+posts with exponential backoff, and paces posts against GitHub's rate-limit
+headers. Rows survive worker restarts, and their delivery status can be
+queried and acknowledged through a tool. Comments acknowledged as handled
+can be left out when the agent lists a PR's comments.
+
+Delivery is at least once: a reply whose post was in flight when the worker
+died is sent again after restart.
+"""
+
+import asyncio
+import email.utils
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import requests
+
+from constants import PR_REPLY_QUEUE_DB_PATH
+
+logger = logging.getLogger(__name__)
+
+# Base URL of the GitHub REST API
+GITHUB_API_URL = "https://api.github.com"
+
+# Reply states
+STATUS_QUEUED = "queued"
+STATUS_SENDING = "sending"
+STATUS_SENT = "sent"
+STATUS_FAILED = "failed"
+
+# Delivery attempts before a reply is given up on
+DEFAULT_MAX_ATTEMPTS = 8
+
+# Backoff before the first retry, doubled per attempt up to the maximum
+DEFAULT_RETRY_DELAY = 2.0
+MAX_RETRY_DELAY = 5 * 60.0
+
+# Seconds between two posts; GitHub asks for at least one second between
+# requests that create content
+DEFAULT_MIN_POST_INTERVAL = 1.0
+
+# Seconds to pause after a secondary rate limit that came without Retry-After;
+# GitHub asks to wait at least a minute
+SECONDARY_RATE_LIMIT_PAUSE = 60.0
+
+# Seconds the sender sleeps when it wasn't woken by a new reply
+DEFAULT_POLL_INTERVAL = 30.0
+
+# Replies claimed per batch
+DEFAULT_BATCH_SIZE = 20
+
+# Separator between replies coalesced into one post
+COALESCE_SEPARATOR = "\n\n"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pr_replies (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    repo_name TEXT NOT NULL,
+    github_repo TEXT NOT NULL,
+    comment_id INTEGER NOT NULL,
+    body TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempt_count INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    next_attempt_at REAL NOT NULL,
+    last_attempt_at REAL,
+    last_error TEXT,
+    sent_at REAL,
+    method TEXT,
+    reply_comment_id INTEGER,
+    reply_url TEXT,
+    acked_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_pr_replies_due ON pr_replies (status, next_attempt_at);
+CREATE INDEX IF NOT EXISTS idx_pr_replies_comment ON pr_replies (repo_name, comment_id);
+"""
+
+
+@dataclass
+class PRReply:
+    """A queued reply and its delivery state."""
+
+    id: int
+    repo_name: str
+    github_repo: str
+    comment_id: int
+    body: str
+    status: str
+    attempt_count: int
+    created_at: float
+    next_attempt_at: float
+    last_attempt_at: float | None
+    last_error: str | None
+    sent_at: float | None
+    method: str | None
+    reply_comment_id: int | None
+    reply_url: str | None
+    acked_at: float | None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a JSON-serializable dictionary."""
+        return asdict(self)
+
+
+@dataclass
+class ReplyDelivery:
+    """Outcome of a successful post."""
+
+    # "direct_reply" or "issue_comment_fallback"
+    method: str
+    reply_comment_id: int
+    reply_url: str
+    # Rate limit state reported with the response, if any
+    rate_limit_remaining: int | None = None
+    rate_limit_reset: float | None = None
+
+
+class ReplyDeliveryError(Exception):
+    """Raised when a reply could not be posted."""
+
+    def __init__(self, message: str, retryable: bool, retry_after: float | None = None):
+        """Initialize the error.
+
+        Args:
+            message: Description of the failure
+            retryable: Whether posting again later may succeed
+            retry_after: Seconds GitHub asked to wait before the next request
+        """
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+class PRReplyQueue:
+    """SQLite-backed outbox of PR comment replies."""
+
+    def __init__(self, db_path: str | Path = PR_REPLY_QUEUE_DB_PATH):
+        """Open the outbox, creating the database if needed.
+
+        Args:
+            db_path: Path of the SQLite database file
+        """
+        self.db_path = Path(db_path)
+        if str(self.db_path) != ":memory:":
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Every operation is a few row updates, so one connection behind a lock
+        # serves the event loop and the I/O threads alike
+        self._conn = sqlite3.connect(
+            str(self.db_path), timeout=30.0, check_same_thread=False
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._listeners: list[Callable[[], None]] = []
+
+    def add_listener(self, listener: Callable[[], None]) -> None:
+        """Register a callback invoked after each newly queued reply."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[], None]) -> None:
+        """Unregister a callback added with add_listener."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _select(self, where: str, params: tuple = (), limit: int = -1) -> list[PRReply]:
+        rows = self._conn.execute(
+            f"SELECT * FROM pr_replies WHERE {where} ORDER BY id LIMIT ?",
+            (*params, limit),
+        ).fetchall()
+        return [PRReply(**dict(row)) for row in rows]
+
+    def enqueue(
+        self, repo_name: str, github_repo: str, comment_id: int, body: str
+    ) -> tuple[PRReply, bool]:
+        """Queue a reply for delivery.
+
+        A reply identical to one that is queued, being sent or sent already
+        is not queued twice.
+
+        Args:
+            repo_name: Repository configuration name
+            github_repo: GitHub repository in owner/name form
+            comment_id: Comment replied to
+            body: Reply text
+
+        Returns:
+            The queued reply, and whether it was newly queued
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            existing = self._select(
+                "repo_name = ? AND comment_id = ? AND body = ? AND status != ?",
+                (repo_name, comment_id, body, STATUS_FAILED),
+            )
+            if existing:
+                return existing[0], False
+            cursor = self._conn.execute(
+                "INSERT INTO pr_replies "
+                "(repo_name, github_repo, comment_id, body, created_at, next_attempt_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (repo_name, github_repo, comment_id, body, now, now),
+            )
+            [reply] = self._select("id = ?", (cursor.lastrowid,))
+
+        logger.info(f"Queued reply {reply.id} to comment {comment_id} in {github_repo}")
+        for listener in list(self._listeners):
+            listener()
+        return reply, True
+
+    def claim_due(
+        self,
+        repo_name: str | None = None,
+        now: float | None = None,
+        limit: int = DEFAULT_BATCH_SIZE,
+    ) -> list[PRReply]:
+        """Mark due replies as being sent and return them.
+
+        Args:
+            repo_name: Only claim replies of this repository; None claims all
+            now: Current time; defaults to time.time()
+            limit: Maximum number of replies claimed
+
+        Returns:
+            Claimed replies, oldest first
+        """
+        now = time.time() if now is None else now
+        with self._lock, self._conn:
+            replies = self._select(
+                "status = ? AND next_attempt_at <= ? AND ? IN (repo_name, '')",
+                (STATUS_QUEUED, now, repo_name or ""),
+                limit,
+            )
+            self._conn.executemany(
+                "UPDATE pr_replies SET status = ?, attempt_count = attempt_count + 1,"
+                " last_attempt_at = ? WHERE id = ?",
+                [(STATUS_SENDING, now, reply.id) for reply in replies],
+            )
+        for reply in replies:
+            reply.status = STATUS_SENDING
+            reply.attempt_count += 1
+            reply.last_attempt_at = now
+        return replies
+
+    def next_due_at(self, repo_name: str | None = None) -> float | None:
+        """Get the time the next queued reply is due, or None if none is."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(next_attempt_at) FROM pr_replies"
+                " WHERE status = ? AND ? IN (repo_name, '')",
+                (STATUS_QUEUED, repo_name or ""),
+            ).fetchone()
+        return row[0]
+
+    def mark_sent(self, ids: list[int], delivery: ReplyDelivery) -> None:
+        """Record a successful delivery."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE pr_replies SET status = ?, sent_at = ?, method = ?,"
+                " reply_comment_id = ?, reply_url = ?, last_error = NULL"
+                " WHERE id = ?",
+                [
+                    (
+                        STATUS_SENT,
+                        time.time(),
+                        delivery.method,
+                        delivery.reply_comment_id,
+                        delivery.reply_url,
+                        reply_id,
+                    )
+                    for reply_id in ids
+                ],
+            )
+
+    def mark_retry(self, ids: list[int], error: str, retry_at: float) -> None:
+        """Put replies back in the queue after a failed attempt."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE pr_replies SET status = ?, last_error = ?, next_attempt_at = ?"
+                " WHERE id = ?",
+                [(STATUS_QUEUED, error, retry_at, reply_id) for reply_id in ids],
+            )
+
+    def mark_failed(self, ids: list[int], error: str) -> None:
+        """Give up on replies."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE pr_replies SET status = ?, last_error = ? WHERE id = ?",
+                [(STATUS_FAILED, error, reply_id) for reply_id in ids],
+            )
+
+    def release(self, ids: list[int]) -> None:
+        """Return claimed replies that weren't attempted to the queue."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE pr_replies SET status = ?, attempt_count = attempt_count - 1"
+                " WHERE id = ? AND status = ?",
+                [(STATUS_QUEUED, reply_id, STATUS_SENDING) for reply_id in ids],
+            )
+
+    def requeue_interrupted(self, repo_name: str | None = None) -> int:
+        """Requeue replies left being sent by a previous process.
+
+        Args:
+            repo_name: Only requeue replies of this repository; None requeues all
+
+        Returns:
+            Number of requeued replies
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE pr_replies SET status = ?"
+                " WHERE status = ? AND ? IN (repo_name, '')",
+                (STATUS_QUEUED, STATUS_SENDING, repo_name or ""),
+            )
+        if cursor.rowcount:
+            logger.warning(f"Requeued {cursor.rowcount} interrupted PR replies")
+        return cursor.rowcount
+
+    def get(self, reply_id: int) -> PRReply | None:
+        """Get a reply by id."""
+        with self._lock:
+            replies = self._select("id = ?", (reply_id,))
+        return replies[0] if replies else None
+
+    def list_replies(
+        self, repo_name: str, comment_id: int | None = None
+    ) -> list[PRReply]:
+        """List the replies of a repository, optionally for one comment only."""
+        with self._lock:
+            if comment_id is None:
+                return self._select("repo_name = ?", (repo_name,))
+            return self._select(
+                "repo_name = ? AND comment_id = ?", (repo_name, comment_id)
+            )
+
+    def ack(self, repo_name: str, comment_id: int) -> int:
+        """Mark a comment as handled by the agent.
+
+        Returns:
+            Number of replies to the comment that were acknowledged
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE pr_replies SET acked_at = ?"
+                " WHERE repo_name = ? AND comment_id = ? AND acked_at IS NULL",
+                (time.time(), repo_name, comment_id),
+            )
+        return cursor.rowcount
+
+    def acked_comment_ids(self, repo_name: str) -> set[int]:
+        """Get the ids of the comments of a repository marked as handled."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT comment_id FROM pr_replies"
+                " WHERE repo_name = ? AND acked_at IS NOT NULL",
+                (repo_name,),
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def counts(self) -> dict[str, int]:
+        """Count replies per status."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM pr_replies GROUP BY status"
+            ).fetchall()
+        return {row[0]: row[1] for row in rows}
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def _rate_limit_state(
+    response: requests.Response,
+) -> tuple[int | None, float | None]:
+    """Read X-RateLimit-Remaining and X-RateLimit-Reset from a response."""
+    try:
+        remaining = int(response.headers["X-RateLimit-Remaining"])
+        reset = float(response.headers["X-RateLimit-Reset"])
+    except (KeyError, ValueError):
+        return None, None
+    return remaining, reset
+
+
+def _retry_after_seconds(value: str) -> float | None:
+    """Parse a Retry-After header, given in seconds or as an HTTP date."""
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+def _raise_for_status(response: requests.Response, what: str) -> None:
+    """Turn an unsuccessful response into a ReplyDeliveryError."""
+    if response.status_code in (200, 201):
+        return
+    message = f"{what} failed: {response.status_code} {response.text[:200]}"
+    if response.status_code not in (403, 429):
+        raise ReplyDeliveryError(message, retryable=response.status_code >= 500)
+
+    retry_after = response.headers.get("Retry-After")
+    if retry_after:
+        delay = _retry_after_seconds(retry_after)
+        if delay is not None:
+            raise ReplyDeliveryError(message, retryable=True, retry_after=delay)
+    remaining, reset = _rate_limit_state(response)
+    if remaining == 0:
+        # Remaining and reset are read together, so reset is known here
+        delay = max((reset or 0.0) - time.time(), 0.0)
+        raise ReplyDeliveryError(message, retryable=True, retry_after=delay)
+    # Secondary rate limits leave the primary quota untouched and may come
+    # without Retry-After; a 403 without either is a permission problem
+    if response.status_code == 429 or "secondary rate limit" in response.text.lower():
+        raise ReplyDeliveryError(
+            message, retryable=True, retry_after=SECONDARY_RATE_LIMIT_PAUSE
+        )
+    raise ReplyDeliveryError(message, retryable=False)
+
+
+def post_pr_reply(
+    session: requests.Session,
+    token: str,
+    github_repo: str,
+    comment_id: int,
+    body: str,
+    api_url: str = GITHUB_API_URL,
+) -> ReplyDelivery:
+    """Post a reply to a PR comment.
+
+    Review comments get a threaded reply. Issue comments, which can't be
+    replied to directly, get a new PR comment mentioning their author.
+
+    Args:
+        session: HTTP session used for the requests
+        token: GitHub token
+        github_repo: Repository in owner/name form
+        comment_id: Review or issue comment replied to
+        body: Reply text
+        api_url: Base URL of the GitHub REST API
+
+    Returns:
+        Where the reply was posted
+
+    Raises:
+        ReplyDeliveryError: If the reply could not be posted
+    """
+    base = f"{api_url}/repos/{github_repo}"
+    headers = {
+        "Authorization": f"token {token}",
+        "Accept": "application/vnd.github+json",
+    }
+
+    response = session.post(
+        f"{base}/pulls/comments/{comment_id}/replies",
+        headers=headers,
+        json={"body": body},
+    )
+    method = "direct_reply"
+    if response.status_code in (404, 422):
+        # Not a review comment, or one that can't be replied to; reply on the
+        # PR conversation instead, mentioning the comment's author
+        comment, pr_url = None, ""
+        for path, url_field in (
+            ("pulls/comments", "pull_request_url"),
+            ("issues/comments", "issue_url"),
+        ):
+            comment_resp = session.get(f"{base}/{path}/{comment_id}", headers=headers)
+            if comment_resp.status_code == 404:
+                continue
+            _raise_for_status(comment_resp, "Fetching the comment")
+            comment = comment_resp.json()
+            pr_url = comment.get(url_field, "")
+            break
+        if comment is None or not pr_url:
+            raise ReplyDeliveryError(
+                f"Could not find comment with ID {comment_id} in {github_repo}",
+                retryable=False,
+            )
+        pr_number = pr_url.rstrip("/").split("/")[-1]
+        response = session.post(
+            f"{base}/issues/{pr_number}/comments",
+            headers=headers,
+            json={"body": f"@{comment['user']['login']} {body}"},
+        )
+        method = "issue_comment_fallback"
+
+    _raise_for_status(response, "Posting the reply")
+    posted = response.json()
+    remaining, reset = _rate_limit_state(response)
+    return ReplyDelivery(method, posted["id"], posted["html_url"], remaining, reset)
+
+
+class PRReplySender:
+    """Background task delivering queued replies."""
+
+    def __init__(
+        self,
+        queue: PRReplyQueue,
+        deliver: Callable[[str, int, str], ReplyDelivery],
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        retry_delay: float = DEFAULT_RETRY_DELAY,
+        min_post_interval: float = DEFAULT_MIN_POST_INTERVAL,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        run_blocking: Callable[..., Awaitable[Any]] | None = None,
+        repo_name: str | None = None,
+    ):
+        """Initialize the sender.
+
+        Args:
+            queue: Outbox to deliver from
+            deliver: Posts (repo_name, comment_id, body); blocking, so it runs
+                through run_blocking
+            max_attempts: Attempts before a reply is marked failed
+            retry_delay: Backoff before the first retry
+            min_post_interval: Minimum seconds between two posts
+            poll_interval: Seconds between queue checks without wake-ups
+            run_blocking: Runs blocking calls, deliveries and outbox queries
+                alike, off the event loop; defaults to asyncio.to_thread
+            repo_name: Only deliver replies of this repository; workers of
+                other repositories share the outbox
+        """
+        self.queue = queue
+        self.repo_name = repo_name
+        self.deliver = deliver
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.min_post_interval = min_post_interval
+        self.poll_interval = poll_interval
+        self._run_blocking = run_blocking or asyncio.to_thread
+        self._wake = asyncio.Event()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+        # Wall-clock time before which no post is made
+        self._paused_until = 0.0
+
+    def _notify(self) -> None:
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    def start(self) -> None:
+        """Start delivering in a task of the running event loop."""
+        self._loop = asyncio.get_running_loop()
+        self._stopping = False
+        self.queue.add_listener(self._notify)
+        self._task = asyncio.create_task(self._run(), name="pr-reply-sender")
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Stop after the post in progress, leaving the rest queued."""
+        self._stopping = True
+        self.queue.remove_listener(self._notify)
+        self._wake.set()
+        if self._task is not None:
+            try:
+                await asyncio.wait_for(self._task, timeout)
+            except asyncio.TimeoutError:
+                logger.warning("PR reply sender didn't stop in time, cancelling")
+                self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        await self._run_blocking(self.queue.requeue_interrupted, self.repo_name)
+        while not self._stopping:
+            self._wake.clear()
+            try:
+                delivered = await self.process_due()
+            except Exception as e:
+                logger.error(f"PR reply sender failed: {e}", exc_info=True)
+                delivered = False
+            if delivered:
+                continue
+            await self._sleep_until_due()
+
+    async def _sleep_until_due(self) -> None:
+        timeout = self.poll_interval
+        next_due = await self._run_blocking(self.queue.next_due_at, self.repo_name)
+        if next_due is not None:
+            timeout = min(timeout, next_due - time.time())
+        timeout = max(timeout, self._paused_until - time.time(), 0.0)
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def process_due(self) -> bool:
+        """Deliver the replies that are due.
+
+        Returns:
+            Whether any reply was claimed
+        """
+        if time.time() < self._paused_until:
+            return False
+        replies = await self._run_blocking(self.queue.claim_due, self.repo_name)
+        if not replies:
+            return False
+
+        # Coalesce replies to the same comment into one post
+        groups: dict[tuple[str, int], list[PRReply]] = {}
+        for reply in replies:
+            groups.setdefault((reply.repo_name, reply.comment_id), []).append(reply)
+
+        pending = list(groups.values())
+        while pending:
+            if self._stopping or time.time() < self._paused_until:
+                await self._run_blocking(
+                    self.queue.release, [r.id for group in pending for r in group]
+                )
+                break
+            await self._deliver_group(pending.pop(0))
+        return True
+
+    async def _deliver_group(self, group: list[PRReply]) -> None:
+        first = group[0]
+        ids = [reply.id for reply in group]
+        body = COALESCE_SEPARATOR.join(reply.body for reply in group)
+        if len(group) > 1:
+            logger.info(f"Coalescing replies {ids} to comment {first.comment_id}")
+
+        try:
+            delivery = await self._run_blocking(
+                self.deliver, first.repo_name, first.comment_id, body
+            )
+        except ReplyDeliveryError as e:
+            self._pause(e.retry_after)
+            await self._fail_or_retry(group, str(e), e.retryable, e.retry_after)
+        except Exception as e:
+            # Network errors and the like; GitHub may be reachable again later
+            await self._fail_or_retry(group, f"{type(e).__name__}: {e}", True, None)
+        else:
+            logger.info(
+                f"Delivered replies {ids} to comment {first.comment_id} "
+                f"in {first.github_repo} ({delivery.method}): {delivery.reply_url}"
+            )
+            await self._run_blocking(self.queue.mark_sent, ids, delivery)
+            if delivery.rate_limit_remaining == 0 and delivery.rate_limit_reset:
+                self._pause(delivery.rate_limit_reset - time.time())
+        self._pause(self.min_post_interval)
+
+    def _pause(self, seconds: float | None) -> None:
+        """Hold off further posts for the given number of seconds."""
+        if seconds:
+            self._paused_until = max(self._paused_until, time.time() + seconds)
+
+    async def _fail_or_retry(
+        self,
+        group: list[PRReply],
+        error: str,
+        retryable: bool,
+        retry_after: float | None,
+    ) -> None:
+        ids = [reply.id for reply in group]
+        attempts = max(reply.attempt_count for reply in group)
+        if not retryable or attempts >= self.max_attempts:
+            logger.error(
+                f"Giving up on replies {ids} after {attempts} attempts: {error}"
+            )
+            await self._run_blocking(self.queue.mark_failed, ids, error)
+            return
+        delay = min(self.retry_delay * 2 ** (attempts - 1), MAX_RETRY_DELAY)
+        delay = max(delay, retry_after or 0.0)
+        logger.warning(
+            f"Delivering replies {ids} failed (attempt {attempts}), "
+            f"retrying in {delay:.0f}s: {error}"
+        )
+        await self._run_blocking(self.queue.mark_retry, ids, error, time.time() + delay)
+
+
+_queue: PRReplyQueue | None = None
+_queue_lock = threading.Lock()
+
+
+def get_pr_reply_queue() -> PRReplyQueue:
+    """Get the process-wide reply outbox, opening it on first use."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = PRReplyQueue()
+        return _queue
+
+
+def close_pr_reply_queue() -> None:
+    """Close the process-wide reply outbox."""
+    global _queue
+    with _queue_lock:
+        if _queue is not None:
+            _queue.close()
+            _queue = None
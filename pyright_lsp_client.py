@@ -0,0 +1,58 @@
+"""
+Pyright LSP Client
+
+This module implements the navigation requests of the LSP client for pyright.
+Requests go through ``request_result``, so repeated questions are answered
+from the client's result cache when it has one.
+"""
+
+from typing import Any
+
+from lsp_client import AbstractLSPClient
+from lsp_constants import LSPMethod
+
+
+def _position_params(uri: str, line: int, character: int) -> dict[str, Any]:
+    """Build the parameters of a request about a position in a document."""
+    return {
+        "textDocument": {"uri": uri},
+        "position": {"line": line, "character": character},
+    }
+
+
+class PyrightLSPClient(AbstractLSPClient):
+    """LSP client for the pyright language server."""
+
+    async def get_definition(
+        self, uri: str, line: int, character: int
+    ) -> list[dict[str, Any]] | None:
+        """Get the locations defining the symbol at a position."""
+        result = await self.request_result(
+            LSPMethod.DEFINITION, _position_params(uri, line, character)
+        )
+        # A single Location is as valid an answer as a list of them
+        if isinstance(result, dict):
+            return [result]
+        return result
+
+    async def get_references(
+        self, uri: str, line: int, character: int, include_declaration: bool = True
+    ) -> list[dict[str, Any]] | None:
+        """Get the locations referencing the symbol at a position."""
+        params = _position_params(uri, line, character)
+        params["context"] = {"includeDeclaration": include_declaration}
+        return await self.request_result(LSPMethod.REFERENCES, params)
+
+    async def get_hover(
+        self, uri: str, line: int, character: int
+    ) -> dict[str, Any] | None:
+        """Get hover information for the symbol at a position."""
+        return await self.request_result(
+            LSPMethod.HOVER, _position_params(uri, line, character)
+        )
+
+    async def get_document_symbols(self, uri: str) -> list[dict[str, Any]] | None:
+        """Get the symbols of a document."""
+        return await self.request_result(
+            LSPMethod.DOCUMENT_SYMBOLS, {"textDocument": {"uri": uri}}
+        )
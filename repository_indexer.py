@@ -5,15 +5,23 @@ This module provides functionality to index Python repositories by scanning
 for Python files, extracting symbols, and storing them in the database.
 """
 
+import hashlib
 import logging
+import multiprocessing
 import os
+import pickle
 import subprocess
 from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Callable, Generator
+from concurrent.futures import Future, ProcessPoolExecutor
 from pathlib import Path
+from typing import Any
 
 from constants import Language
+from file_discovery import AbstractFileDiscovery, GitFileDiscovery
 from python_symbol_extractor import AbstractSymbolExtractor
-from symbol_storage import AbstractSymbolStorage
+from symbol_storage import AbstractSymbolStorage, FileFingerprint, Symbol
 from validation_system import (
     AbstractValidator,
     ValidationContext,
@@ -23,6 +31,48 @@ from validation_system import (
 
 logger = logging.getLogger(__name__)
 
+# Called with (files_done, files_total) as indexing advances; an exception
+# raised by the callback aborts the indexing run
+IndexingProgressCallback = Callable[[int, int], None]
+
+# Extractor owned by each process-pool worker, set by _init_extraction_worker
+_worker_extractor: AbstractSymbolExtractor | None = None
+
+
+def _init_extraction_worker(extractor: AbstractSymbolExtractor) -> None:
+    """Install the symbol extractor used by a process-pool worker."""
+    global _worker_extractor
+    _worker_extractor = extractor
+
+
+def _extract_chunk(
+    file_paths: list[str], repository_id: str
+) -> list[tuple[list[Symbol], Exception | None]]:
+    """Extract symbols for a chunk of files inside a process-pool worker.
+
+    Errors are returned rather than raised so that one bad file doesn't lose
+    the results of the rest of the chunk; the writer classifies them.
+
+    Args:
+        file_paths: Files to extract, in indexing order
+        repository_id: Repository identifier
+
+    Returns:
+        One (symbols, error) pair per file, in the same order as file_paths
+    """
+    if _worker_extractor is None:
+        raise RuntimeError("Extraction worker was not initialized")
+
+    outcomes: list[tuple[list[Symbol], Exception | None]] = []
+    for file_path in file_paths:
+        try:
+            outcomes.append(
+                (_worker_extractor.extract_from_file(file_path, repository_id), None)
+            )
+        except Exception as e:
+            outcomes.append(([], e))
+    return outcomes
+
 
 class IndexingResult:
     """Result of a repository indexing operation."""
@@ -33,6 +83,8 @@ class IndexingResult:
         self.failed_files: list[tuple[str, str]] = []  # (file_path, error_message)
         self.total_symbols: int = 0
         self.skipped_files: list[str] = []
+        self.unchanged_files: list[str] = []
+        self.removed_files: list[str] = []
 
     def add_processed_file(self, file_path: str, symbol_count: int) -> None:
         """Add a successfully processed file."""
@@ -47,6 +99,24 @@ class IndexingResult:
         """Add a file that was skipped."""
         self.skipped_files.append(file_path)
 
+    def add_unchanged_file(self, file_path: str, symbol_count: int) -> None:
+        """Add a file whose existing index entries were kept as-is."""
+        self.unchanged_files.append(file_path)
+        self.total_symbols += symbol_count
+
+    def add_removed_file(self, file_path: str) -> None:
+        """Add a previously indexed file that no longer exists."""
+        self.removed_files.append(file_path)
+
+    def merge(self, other: "IndexingResult") -> None:
+        """Append the outcome of another result to this one."""
+        self.processed_files.extend(other.processed_files)
+        self.failed_files.extend(other.failed_files)
+        self.total_symbols += other.total_symbols
+        self.skipped_files.extend(other.skipped_files)
+        self.unchanged_files.extend(other.unchanged_files)
+        self.removed_files.extend(other.removed_files)
+
     @property
     def success_rate(self) -> float:
         """Calculate the success rate of file processing."""
@@ -61,6 +131,8 @@ class IndexingResult:
             f"IndexingResult(processed={len(self.processed_files)}, "
             f"failed={len(self.failed_files)}, "
             f"skipped={len(self.skipped_files)}, "
+            f"unchanged={len(self.unchanged_files)}, "
+            f"removed={len(self.removed_files)}, "
             f"symbols={self.total_symbols}, "
             f"success_rate={self.success_rate:.2%})"
         )
@@ -71,7 +143,10 @@ class AbstractRepositoryIndexer(ABC):
 
     @abstractmethod
     def index_repository(
-        self, repository_path: str, repository_id: str
+        self,
+        repository_path: str,
+        repository_id: str,
+        progress_callback: IndexingProgressCallback | None = None,
     ) -> IndexingResult:
         """Index a repository and return the result."""
         pass
@@ -81,6 +156,13 @@ class AbstractRepositoryIndexer(ABC):
         """Clear all indexed data for a repository."""
         pass
 
+    @abstractmethod
+    def reindex_files(
+        self, repository_path: str, repository_id: str, file_paths: list[str]
+    ) -> IndexingResult:
+        """Re-index only the given files of an already indexed repository."""
+        pass
+
 
 class PythonRepositoryIndexer(AbstractRepositoryIndexer):
     """Repository indexer for Python codebases."""
@@ -91,6 +173,9 @@ class PythonRepositoryIndexer(AbstractRepositoryIndexer):
         symbol_storage: AbstractSymbolStorage,
         exclude_patterns: set[str] | None = None,
         max_file_size_mb: float = 10.0,
+        extraction_workers: int = 1,
+        extraction_chunk_size: int = 64,
+        file_discovery: AbstractFileDiscovery | None = None,
     ):
         """Initialize the Python repository indexer.
 
@@ -102,6 +187,14 @@ class PythonRepositoryIndexer(AbstractRepositoryIndexer):
                 are skipped to prevent memory issues during AST parsing and to avoid
                 processing generated or minified files that typically don't contain
                 meaningful symbols for code navigation.
+            extraction_workers: Number of worker processes used to extract symbols.
+                With more than one worker, AST parsing runs in a process pool while
+                this process remains the only writer to the symbol storage. The
+                extractor must be picklable; otherwise indexing stays serial.
+            extraction_chunk_size: Number of files sent to a worker per task
+            file_discovery: Backend listing the repository's files. Defaults to
+                the git index, falling back to walking the directory tree for
+                directories that aren't git work trees.
         """
         self.symbol_extractor = symbol_extractor
         self.symbol_storage = symbol_storage
@@ -122,21 +215,41 @@ class PythonRepositoryIndexer(AbstractRepositoryIndexer):
             "*.pyd",
         }
         self.max_file_size_bytes = int(max_file_size_mb * 1024 * 1024)
+        self.extraction_workers = max(1, extraction_workers)
+        self.extraction_chunk_size = max(1, extraction_chunk_size)
+        self.file_discovery = file_discovery or GitFileDiscovery()
 
         logger.info(
-            f"Initialized PythonRepositoryIndexer with max_file_size_mb={max_file_size_mb}"
+            f"Initialized PythonRepositoryIndexer with max_file_size_mb={max_file_size_mb}, "
+            f"extraction_workers={self.extraction_workers}"
         )
         logger.debug(f"Exclude patterns: {self.exclude_patterns}")
         logger.debug(f"Max file size bytes: {self.max_file_size_bytes}")
 
     def index_repository(
-        self, repository_path: str, repository_id: str
+        self,
+        repository_path: str,
+        repository_id: str,
+        progress_callback: IndexingProgressCallback | None = None,
+        rebuild: bool = False,
     ) -> IndexingResult:
         """Index a Python repository.
 
+        Indexing is incremental: each file's size, mtime and content hash are
+        recorded in the symbol storage, and on later runs only added or changed
+        files are re-extracted while the rows of removed files are deleted.
+
+        Without a manifest (or when ``rebuild`` is set) the repository is
+        rebuilt into a new index generation. Searches keep seeing the previous
+        generation until the new one is complete and activated in one step.
+
         Args:
             repository_path: Path to the repository root
             repository_id: Unique identifier for the repository
+            progress_callback: Optional callback invoked with (files_done,
+                files_total) after each file; exceptions it raises propagate
+                and abort the run
+            rebuild: Re-extract every file instead of only changed ones
 
         Returns:
             IndexingResult with details about the indexing operation
@@ -159,9 +272,20 @@ class PythonRepositoryIndexer(AbstractRepositoryIndexer):
             f"Indexing configuration: max_file_size_mb={self.max_file_size_bytes / 1024 / 1024:.1f}, exclude_patterns={self.exclude_patterns}"
         )
 
-        # Clear existing data for this repository
-        logger.info(f"Clearing existing index data for repository: {repository_id}")
-        self.clear_repository_index(repository_id)
+        manifest = self.symbol_storage.get_file_fingerprints(repository_id)
+        generation: int | None = None
+        if manifest and not rebuild:
+            logger.info(
+                f"Found manifest with {len(manifest)} files, indexing incrementally"
+            )
+        else:
+            # Without a manifest we cannot tell which stored rows are stale, so
+            # build a fresh generation next to the one searches currently use
+            generation = self.symbol_storage.begin_generation(repository_id)
+            manifest = {}
+            logger.info(
+                f"Rebuilding repository {repository_id} into generation {generation}"
+            )
 
         result = IndexingResult()
         logger.debug("Initialized indexing result tracking")
@@ -169,26 +293,59 @@ class PythonRepositoryIndexer(AbstractRepositoryIndexer):
         # Find all Python files
         python_files = self._find_python_files(repo_path)
         logger.info(f"Found {len(python_files)} Python files to process")
-
-        # Process each Python file
-        for python_file in python_files:
-            logger.info(f"Processing file: {python_file}")
-            try:
-                self._process_file(python_file, repository_id, result)
-            except (MemoryError, KeyboardInterrupt, SystemExit):
-                # Critical system errors that should always propagate immediately
-                raise
-            except Exception as e:
-                # All unexpected errors from _process_file are logged but don't fail entire indexing
-                # This includes database errors, symbol extraction errors, etc.
-                # File-level errors (permissions, syntax errors) are already handled in _process_file
-                error_msg = f"Unexpected error processing {python_file}: {e}"
-                logger.error(error_msg)
-                result.add_failed_file(str(python_file), error_msg)
+        if progress_callback:
+            progress_callback(0, len(python_files))
+
+        # Batch all writes of this run into a few large transactions
+        with self.symbol_storage.bulk_load():
+            # Process each Python file
+            if self.extraction_workers > 1 and self._can_extract_in_pool():
+                self._index_files_in_pool(
+                    python_files,
+                    repository_id,
+                    manifest,
+                    result,
+                    progress_callback,
+                    generation,
+                )
+            else:
+                for files_done, python_file in enumerate(python_files, start=1):
+                    logger.info(f"Processing file: {python_file}")
+                    self._run_file_step(
+                        python_file,
+                        result,
+                        self._process_file,
+                        python_file,
+                        repository_id,
+                        result,
+                        manifest.get(str(python_file)),
+                        generation,
+                    )
+                    if progress_callback:
+                        progress_callback(files_done, len(python_files))
+
+            # Drop files that were indexed before but are no longer present
+            current_files = {str(python_file) for python_file in python_files}
+            for removed_file in sorted(manifest.keys() - current_files):
+                logger.debug(f"Removing deleted file from index: {removed_file}")
+                try:
+                    self.symbol_storage.delete_file_symbols(repository_id, removed_file)
+                    result.add_removed_file(removed_file)
+                except (MemoryError, KeyboardInterrupt, SystemExit):
+                    raise
+                except Exception as e:
+                    error_msg = f"Failed to remove {removed_file} from index: {e}"
+                    logger.error(error_msg)
+                    result.add_failed_file(removed_file, error_msg)
+
+        # Make the rebuilt generation visible to searches in one step
+        if generation is not None:
+            self.symbol_storage.activate_generation(repository_id, generation)
 
         logger.info(f"Indexing completed for repository {repository_id}")
         logger.info(
-            f"Summary: {len(result.processed_files)} files processed, {len(result.failed_files)} failed, {len(result.skipped_files)} skipped"
+            f"Summary: {len(result.processed_files)} files processed, {len(result.unchanged_files)} unchanged, "
+            f"{len(result.removed_files)} removed, {len(result.failed_files)} failed, {len(result.skipped_files)} skipped"
         )
         logger.info(f"Total symbols extracted: {result.total_symbols}")
         logger.info(f"Success rate: {result.success_rate:.1%}")
@@ -204,15 +361,171 @@ class PythonRepositoryIndexer(AbstractRepositoryIndexer):
         logger.info(f"Clearing index for repository: {repository_id}")
         self.symbol_storage.delete_symbols_by_repository(repository_id)
 
+    def reindex_files(
+        self, repository_path: str, repository_id: str, file_paths: list[str]
+    ) -> IndexingResult:
+        """Re-index only the given files of an already indexed repository.
+
+        Files that still exist are re-extracted if their fingerprint changed;
+        files that no longer exist, or are now excluded or ignored by git, are
+        removed from the index. Paths outside the repository are skipped, so
+        the index matches what a full indexing run discovers.
+
+        Args:
+            repository_path: Path to the repository root
+            repository_id: Unique identifier for the repository
+            file_paths: Absolute paths of the files to re-index
+
+        Returns:
+            IndexingResult covering only the given files
+        """
+        repo_path = Path(repository_path)
+        manifest = self.symbol_storage.get_file_fingerprints(repository_id)
+        excluded_names, excluded_suffixes = self._split_exclude_patterns()
+        result = IndexingResult()
+
+        relative_paths: dict[str, Path] = {}
+        for file_str in sorted(set(file_paths)):
+            try:
+                relative_paths[file_str] = Path(file_str).relative_to(repo_path)
+            except ValueError:
+                logger.debug(f"Ignoring file outside repository: {file_str}")
+        # One git call per batch; None outside a git work tree
+        ignored = (
+            self.file_discovery.get_ignored_files(
+                repo_path, [Path(file_str) for file_str in relative_paths]
+            )
+            or set()
+        )
+
+        with self.symbol_storage.bulk_load():
+            for file_str, relative_path in relative_paths.items():
+                file_path = Path(file_str)
+                if (
+                    file_path.is_file()
+                    and self._is_python_file(file_path)
+                    and file_path not in ignored
+                    and not self._is_excluded_relative(
+                        relative_path, excluded_names, excluded_suffixes
+                    )
+                ):
+                    self._run_file_step(
+                        file_path,
+                        result,
+                        self._process_file,
+                        file_path,
+                        repository_id,
+                        result,
+                        manifest.get(file_str),
+                    )
+                elif file_str in manifest:
+                    logger.debug(f"Removing file from index: {file_str}")
+                    self._run_file_step(
+                        file_path,
+                        result,
+                        self.symbol_storage.delete_file_symbols,
+                        repository_id,
+                        file_str,
+                    )
+                    result.add_removed_file(file_str)
+
+        logger.info(f"Re-indexed {len(file_paths)} files of {repository_id}: {result}")
+        return result
+
+    def index_changed_files(
+        self,
+        repository_path: str,
+        repository_id: str,
+        base_commit: str,
+        head_commit: str = "HEAD",
+    ) -> IndexingResult:
+        """Re-index the files that changed between two commits.
+
+        Falls back to a full (incremental) ``index_repository`` run when the
+        change set can't be determined, e.g. outside a git work tree or when
+        the base commit is unknown.
+
+        Args:
+            repository_path: Path to the repository root
+            repository_id: Unique identifier for the repository
+            base_commit: Commit the current index was built from
+            head_commit: Commit to bring the index up to
+
+        Returns:
+            IndexingResult for the re-indexed files
+        """
+        changed = self.file_discovery.get_changed_files(
+            Path(repository_path), base_commit, head_commit, ".py"
+        )
+        if changed is None:
+            logger.info(
+                f"Cannot diff {base_commit}..{head_commit} for {repository_id}, "
+                "re-indexing the whole repository"
+            )
+            return self.index_repository(repository_path, repository_id)
+
+        return self.reindex_files(
+            repository_path, repository_id, [str(p) for p in changed.all_paths]
+        )
+
+    def _split_exclude_patterns(self) -> tuple[frozenset[str], tuple[str, ...]]:
+        """Split the exclude patterns into exact names and wildcard suffixes."""
+        names = frozenset(p for p in self.exclude_patterns if not p.startswith("*"))
+        suffixes = tuple(p[1:] for p in self.exclude_patterns if p.startswith("*"))
+        return names, suffixes
+
+    def _is_excluded_relative(
+        self,
+        relative_path: Path,
+        excluded_names: frozenset[str],
+        excluded_suffixes: tuple[str, ...],
+    ) -> bool:
+        """Check a repository-relative path against the exclude patterns.
+
+        Matches whole path components rather than substrings, so it costs one
+        set lookup per component regardless of the number of patterns.
+
+        Args:
+            relative_path: Path relative to the repository root
+            excluded_names: Directory/file names to exclude
+            excluded_suffixes: File name suffixes to exclude
+
+        Returns:
+            True if the path should be excluded
+        """
+        if not excluded_names.isdisjoint(relative_path.parts):
+            return True
+        return relative_path.name.endswith(excluded_suffixes)
+
     def _find_python_files(self, repo_path: Path) -> list[Path]:
         """Find all Python files in the repository.
 
+        Uses the file discovery backend (the git index by default) and falls
+        back to walking the directory tree when the backend can't handle the
+        repository.
+
         Args:
             repo_path: Path to repository root
 
         Returns:
             List of Python file paths
         """
+        discovered_files = self.file_discovery.list_files(repo_path, ".py")
+        if discovered_files is not None:
+            excluded_names, excluded_suffixes = self._split_exclude_patterns()
+            python_files = [
+                file_path
+                for file_path in discovered_files
+                if not self._is_excluded_relative(
+                    file_path.relative_to(repo_path), excluded_names, excluded_suffixes
+                )
+            ]
+            logger.debug(
+                f"File discovery via {type(self.file_discovery).__name__} completed: "
+                f"found {len(python_files)} Python files"
+            )
+            return python_files
+
         logger.debug(f"Starting file discovery in: {repo_path}")
         python_files = []
         excluded_dirs = []
@@ -278,8 +591,201 @@ class PythonRepositoryIndexer(AbstractRepositoryIndexer):
 
         return False
 
+    def _run_file_step(
+        self,
+        python_file: Path,
+        result: IndexingResult,
+        step: Callable[..., Any],
+        *args: Any,
+    ) -> Any:
+        """Run one per-file indexing step, recording unexpected errors as failures.
+
+        Args:
+            python_file: File the step operates on
+            result: Result object to record unexpected failures in
+            step: Step to run
+            *args: Arguments for the step
+
+        Returns:
+            The step's return value, or None if it failed unexpectedly
+        """
+        try:
+            return step(*args)
+        except (MemoryError, KeyboardInterrupt, SystemExit):
+            # Critical system errors that should always propagate immediately
+            raise
+        except Exception as e:
+            # All unexpected errors from a file step are logged but don't fail entire indexing
+            # This includes database errors, symbol extraction errors, etc.
+            # File-level errors (permissions, syntax errors) are already handled by the steps
+            error_msg = f"Unexpected error processing {python_file}: {e}"
+            logger.error(error_msg)
+            result.add_failed_file(str(python_file), error_msg)
+            return None
+
+    def _can_extract_in_pool(self) -> bool:
+        """Check whether the symbol extractor can be shipped to worker processes."""
+        try:
+            pickle.dumps(self.symbol_extractor)
+        except Exception as e:
+            logger.warning(
+                f"Symbol extractor {type(self.symbol_extractor).__name__} is not "
+                f"picklable, extracting serially: {e}"
+            )
+            return False
+        return True
+
+    def _index_files_in_pool(
+        self,
+        python_files: list[Path],
+        repository_id: str,
+        manifest: dict[str, FileFingerprint],
+        result: IndexingResult,
+        progress_callback: IndexingProgressCallback | None = None,
+        generation: int | None = None,
+    ) -> None:
+        """Index files with extraction fanned out to a process pool.
+
+        Change detection and storage writes stay in this process, so the
+        symbol storage keeps a single writer. Each file's outcome is collected
+        separately and merged in file order, which makes the result identical
+        to the serial path.
+
+        Args:
+            python_files: Files to index, in indexing order
+            repository_id: Repository identifier
+            manifest: Fingerprints recorded by the previous indexing run
+            result: Result object to update
+            progress_callback: Optional callback invoked as files complete
+            generation: Index generation to write to; defaults to the active one
+        """
+        planned: list[
+            tuple[Path, FileFingerprint | None, FileFingerprint | None, IndexingResult]
+        ] = []
+        for python_file in python_files:
+            file_result = IndexingResult()
+            previous = manifest.get(str(python_file))
+            fingerprint = self._run_file_step(
+                python_file,
+                file_result,
+                self._prepare_file,
+                python_file,
+                repository_id,
+                file_result,
+                previous,
+            )
+            planned.append((python_file, previous, fingerprint, file_result))
+
+        to_extract = [str(entry[0]) for entry in planned if entry[2] is not None]
+        logger.info(
+            f"Extracting {len(to_extract)} files with {self.extraction_workers} workers"
+        )
+        outcomes = self._extract_in_pool(to_extract, repository_id)
+
+        try:
+            for files_done, planned_file in enumerate(planned, start=1):
+                python_file, previous, fingerprint, file_result = planned_file
+                if fingerprint is not None:
+                    logger.info(f"Processing file: {python_file}")
+                    symbols, error = next(outcomes)
+                    self._run_file_step(
+                        python_file,
+                        file_result,
+                        self._complete_file,
+                        python_file,
+                        repository_id,
+                        file_result,
+                        previous,
+                        fingerprint,
+                        symbols,
+                        error,
+                        generation,
+                    )
+                result.merge(file_result)
+                if progress_callback:
+                    progress_callback(files_done, len(planned))
+        finally:
+            outcomes.close()
+
+    def _extract_in_pool(
+        self, file_paths: list[str], repository_id: str
+    ) -> Generator[tuple[list[Symbol], Exception | None], None, None]:
+        """Extract symbols for files in a process pool, yielding outcomes in order.
+
+        At most two chunks per worker are in flight, which bounds the number of
+        extracted-but-unwritten symbols held in memory.
+
+        Args:
+            file_paths: Files to extract, in indexing order
+            repository_id: Repository identifier
+
+        Yields:
+            One (symbols, error) pair per file, in the same order as file_paths
+        """
+        chunks = [
+            file_paths[i : i + self.extraction_chunk_size]
+            for i in range(0, len(file_paths), self.extraction_chunk_size)
+        ]
+        if not chunks:
+            return
+
+        # Spawn rather than fork: the parent holds an SQLite connection and
+        # runs other threads, neither of which is safe to duplicate
+        with ProcessPoolExecutor(
+            max_workers=min(self.extraction_workers, len(chunks)),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_extraction_worker,
+            initargs=(self.symbol_extractor,),
+        ) as pool:
+            pending_chunks = iter(chunks)
+            in_flight: deque[
+                tuple[list[str], Future[list[tuple[list[Symbol], Exception | None]]]]
+            ] = deque()
+
+            def submit_next_chunk() -> None:
+                chunk = next(pending_chunks, None)
+                if chunk is None:
+                    return
+                try:
+                    future = pool.submit(_extract_chunk, chunk, repository_id)
+                except Exception as e:
+                    # A broken pool refuses new work; fail the chunk instead
+                    future = Future()
+                    future.set_exception(e)
+                in_flight.append((chunk, future))
+
+            for _ in range(self.extraction_workers * 2):
+                submit_next_chunk()
+
+            while in_flight:
+                chunk, future = in_flight.popleft()
+                try:
+                    chunk_outcomes = future.result()
+                except Exception as e:
+                    logger.error(f"Extraction worker failed on {len(chunk)} files: {e}")
+                    chunk_outcomes = [([], e) for _ in chunk]
+                submit_next_chunk()
+                yield from chunk_outcomes
+
+    def _hash_file(self, file_path: Path) -> str:
+        """Compute the content hash recorded in a file's fingerprint.
+
+        Args:
+            file_path: Path to the file
+
+        Returns:
+            Hex digest of the file contents
+        """
+        with open(file_path, "rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+
     def _process_file(
-        self, file_path: Path, repository_id: str, result: IndexingResult
+        self,
+        file_path: Path,
+        repository_id: str,
+        result: IndexingResult,
+        previous: FileFingerprint | None = None,
+        generation: int | None = None,
     ) -> None:
         """Process a single Python file.
 
@@ -287,6 +793,55 @@ class PythonRepositoryIndexer(AbstractRepositoryIndexer):
             file_path: Path to the Python file
             repository_id: Repository identifier
             result: Result object to update
+            previous: Fingerprint recorded when the file was last indexed, if any
+            generation: Index generation to write to; defaults to the active one
+        """
+        fingerprint = self._prepare_file(file_path, repository_id, result, previous)
+        if fingerprint is None:
+            return
+
+        symbols: list[Symbol] = []
+        error: Exception | None = None
+        try:
+            logger.debug(f"Processing file: {file_path}")
+            symbols = self.symbol_extractor.extract_from_file(
+                str(file_path), repository_id
+            )
+        except (MemoryError, KeyboardInterrupt, SystemExit):
+            # Critical errors that must propagate
+            raise
+        except Exception as e:
+            error = e
+
+        self._complete_file(
+            file_path,
+            repository_id,
+            result,
+            previous,
+            fingerprint,
+            symbols,
+            error,
+            generation,
+        )
+
+    def _prepare_file(
+        self,
+        file_path: Path,
+        repository_id: str,
+        result: IndexingResult,
+        previous: FileFingerprint | None,
+    ) -> FileFingerprint | None:
+        """Decide whether a file needs its symbols extracted.
+
+        Args:
+            file_path: Path to the Python file
+            repository_id: Repository identifier
+            result: Result object to update for files that are done already
+            previous: Fingerprint recorded when the file was last indexed, if any
+
+        Returns:
+            The file's new fingerprint if it must be extracted, None if it was
+            skipped, unchanged or failed
         """
         file_str = str(file_path)
 
@@ -297,7 +852,8 @@ class PythonRepositoryIndexer(AbstractRepositoryIndexer):
         # 4. Generated files: Very large files are typically auto-generated/minified code with minimal value
         # 5. User experience: Prevents indexing from hanging on pathological cases
         try:
-            file_size = file_path.stat().st_size
+            stat_result = file_path.stat()
+            file_size = stat_result.st_size
             if file_size > self.max_file_size_bytes:
                 logger.warning(
                     f"Skipping large file {file_str} "
@@ -305,52 +861,151 @@ class PythonRepositoryIndexer(AbstractRepositoryIndexer):
                     f"{self.max_file_size_bytes / 1024 / 1024:.1f}MB). "
                     f"Large files are skipped to prevent memory issues and improve performance."
                 )
+                if previous is not None:
+                    self.symbol_storage.delete_file_symbols(repository_id, file_str)
                 result.add_skipped_file(file_str)
-                return
+                return None
         except OSError as e:
             logger.warning(f"Cannot stat file {file_str}: {e}")
             result.add_failed_file(file_str, f"Cannot access file: {e}")
-            return
+            return None
+
+        # Unchanged size and mtime: trust the existing index entries
+        if (
+            previous is not None
+            and previous.size == file_size
+            and previous.mtime_ns == stat_result.st_mtime_ns
+        ):
+            logger.debug(f"Unchanged file: {file_str}")
+            result.add_unchanged_file(file_str, previous.symbol_count)
+            return None
 
-        # Extract symbols from the file
         try:
-            logger.debug(f"Processing file: {file_str}")
-            symbols = self.symbol_extractor.extract_from_file(file_str, repository_id)
+            fingerprint = FileFingerprint(
+                file_path=file_str,
+                size=file_size,
+                mtime_ns=stat_result.st_mtime_ns,
+                content_hash=self._hash_file(file_path),
+            )
+
+            # Touched but identical content: only refresh the fingerprint
+            if (
+                previous is not None
+                and previous.content_hash == fingerprint.content_hash
+            ):
+                logger.debug(f"Content unchanged for touched file: {file_str}")
+                fingerprint.symbol_count = previous.symbol_count
+                self.symbol_storage.record_file_fingerprint(repository_id, fingerprint)
+                result.add_unchanged_file(file_str, previous.symbol_count)
+                return None
+        except (MemoryError, KeyboardInterrupt, SystemExit):
+            # Critical errors that must propagate
+            raise
+        except Exception as e:
+            self._record_file_failure(file_path, repository_id, result, previous, e)
+            return None
+
+        return fingerprint
+
+    def _complete_file(
+        self,
+        file_path: Path,
+        repository_id: str,
+        result: IndexingResult,
+        previous: FileFingerprint | None,
+        fingerprint: FileFingerprint,
+        symbols: list[Symbol],
+        error: Exception | None,
+        generation: int | None = None,
+    ) -> None:
+        """Store the outcome of extracting a file's symbols.
+
+        Args:
+            file_path: Path to the Python file
+            repository_id: Repository identifier
+            result: Result object to update
+            previous: Fingerprint recorded when the file was last indexed, if any
+            fingerprint: New fingerprint of the file
+            symbols: Extracted symbols
+            error: Error raised by the extraction, if it failed
+            generation: Index generation to write to; defaults to the active one
+        """
+        file_str = str(file_path)
+
+        if isinstance(error, MemoryError):
+            # Critical errors that must propagate, even from a worker process
+            raise error
+        if error is not None:
+            self._record_file_failure(file_path, repository_id, result, previous, error)
+            return
 
-            # Store symbols in database
+        try:
+            # Store symbols in database, replacing those of the previous version
+            fingerprint.symbol_count = len(symbols)
+            self.symbol_storage.replace_file_symbols(
+                repository_id, file_str, symbols, fingerprint, generation
+            )
             if symbols:
-                self.symbol_storage.insert_symbols(symbols)
                 logger.debug(f"Extracted {len(symbols)} symbols from {file_str}")
             else:
                 logger.debug(f"No symbols found in {file_str}")
 
             result.add_processed_file(file_str, len(symbols))
+        except (MemoryError, KeyboardInterrupt, SystemExit):
+            # Critical errors that must propagate
+            raise
+        except Exception as e:
+            self._record_file_failure(file_path, repository_id, result, previous, e)
+
+    def _record_file_failure(
+        self,
+        file_path: Path,
+        repository_id: str,
+        result: IndexingResult,
+        previous: FileFingerprint | None,
+        error: Exception,
+    ) -> None:
+        """Record a file that failed to index.
+
+        Args:
+            file_path: Path to the Python file
+            repository_id: Repository identifier
+            result: Result object to update
+            previous: Fingerprint recorded when the file was last indexed, if any
+            error: Error that made the file fail
+        """
+        file_str = str(file_path)
 
-        except FileNotFoundError:
+        if isinstance(error, FileNotFoundError):
             # File disappeared during processing - log as error since this is unexpected
             error_msg = f"File not found: {file_str}"
             logger.error(error_msg)
-            result.add_failed_file(file_str, error_msg)
-        except (UnicodeDecodeError, SyntaxError) as e:
+        elif isinstance(error, UnicodeDecodeError | SyntaxError):
             # Expected file-level issues that should be logged as warnings
             # These are common in real codebases and shouldn't fail the indexing
-            error_msg = f"File parsing error: {e}"
-            logger.warning(f"Skipping {file_str} due to parsing error: {e}")
-            result.add_failed_file(file_str, error_msg)
-        except (PermissionError, OSError) as e:
+            error_msg = f"File parsing error: {error}"
+            logger.warning(f"Skipping {file_str} due to parsing error: {error}")
+        elif isinstance(error, PermissionError | OSError):
             # File system access errors - log as warnings since individual file failures
             # shouldn't stop the entire indexing process
-            error_msg = f"File access error: {e}"
-            logger.warning(f"Cannot access {file_str}: {e}")
-            result.add_failed_file(file_str, error_msg)
-        except (MemoryError, KeyboardInterrupt, SystemExit):
-            # Critical errors that must propagate
-            raise
-        except Exception as e:
+            error_msg = f"File access error: {error}"
+            logger.warning(f"Cannot access {file_str}: {error}")
+        else:
             # Unexpected errors in symbol extraction or storage - log but continue
-            error_msg = f"Processing error: {e}"
-            logger.error(f"Error processing {file_str}: {e}")
-            result.add_failed_file(file_str, error_msg)
+            error_msg = f"Processing error: {error}"
+            logger.error(f"Error processing {file_str}: {error}")
+
+        result.add_failed_file(file_str, error_msg)
+
+        # Drop the stale entries of the previous version so the file is
+        # retried on the next run, matching what a full rebuild would store
+        if previous is not None:
+            try:
+                self.symbol_storage.delete_file_symbols(repository_id, file_str)
+            except Exception as e:
+                logger.warning(
+                    f"Could not drop stale index entries for {file_str}: {e}"
+                )
 
 
 class CodebaseValidator(AbstractValidator):
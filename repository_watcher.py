@@ -0,0 +1,493 @@
+"""
+Live file watching for repository indexes.
+
+This module keeps the symbol index of a repository current while the server
+runs. File system events (inotify/FSEvents through watchdog, or mtime polling
+where no native backend is available) are collected into batches: a batch is
+applied once the repository has been quiet for the debounce delay, or at the
+latest after the maximum update latency, and only the touched files are
+re-extracted through the repository indexer.
+"""
+
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from pathlib import Path
+
+from watchdog.events import FileSystemEvent, FileSystemEventHandler
+from watchdog.observers import Observer
+from watchdog.observers.api import BaseObserver
+
+from file_discovery import AbstractFileDiscovery, GitFileDiscovery
+from repository_indexer import AbstractRepositoryIndexer, IndexingResult
+
+logger = logging.getLogger(__name__)
+
+# Seconds without further events before a batch of changes is applied
+DEFAULT_DEBOUNCE_SECONDS = 0.25
+
+# Upper bound in seconds between a change and its batch being applied, even
+# while events keep arriving (e.g. during a large checkout)
+DEFAULT_MAX_UPDATE_LATENCY = 2.0
+
+# Seconds between scans of the polling change source
+DEFAULT_POLL_INTERVAL = 1.0
+
+# Suffix of the files the watcher reports to the indexer
+WATCHED_SUFFIX = ".py"
+
+# Watchdog event types that can change a file's contents or existence;
+# opened/closed_no_write events are ignored
+CHANGE_EVENT_TYPES = frozenset({"created", "modified", "deleted", "moved", "closed"})
+
+# Called with the absolute path of a file that changed
+ChangeCallback = Callable[[Path], None]
+
+
+class AbstractChangeSource(ABC):
+    """Abstract base class for sources of file change notifications."""
+
+    @abstractmethod
+    def start(self, repository_path: Path, on_change: ChangeCallback) -> None:
+        """Start reporting changed files below the repository path.
+
+        Args:
+            repository_path: Repository root to watch
+            on_change: Callback invoked, from any thread, for each changed file
+
+        Raises:
+            OSError: If the source cannot watch the repository
+        """
+        pass
+
+    @abstractmethod
+    def stop(self) -> None:
+        """Stop reporting changes and release the source's resources."""
+        pass
+
+
+class _WatchdogEventHandler(FileSystemEventHandler):
+    """Forwards watchdog file events for watched files to a callback."""
+
+    def __init__(self, on_change: ChangeCallback):
+        self.on_change = on_change
+
+    def on_any_event(self, event: FileSystemEvent) -> None:
+        if event.is_directory or event.event_type not in CHANGE_EVENT_TYPES:
+            return
+        paths = [event.src_path]
+        if event.event_type == "moved":
+            paths.append(event.dest_path)
+        for path in paths:
+            path_str = os.fsdecode(path)
+            if path_str.endswith(WATCHED_SUFFIX):
+                self.on_change(Path(path_str))
+
+
+class WatchdogChangeSource(AbstractChangeSource):
+    """Change source backed by the platform's native file notifications.
+
+    Uses inotify on Linux and FSEvents on macOS through watchdog.
+    """
+
+    def __init__(self) -> None:
+        self._observer: BaseObserver | None = None
+
+    def start(self, repository_path: Path, on_change: ChangeCallback) -> None:
+        """Start watching the repository recursively.
+
+        Args:
+            repository_path: Repository root to watch
+            on_change: Callback invoked on the observer thread for each change
+
+        Raises:
+            OSError: If the native backend is unavailable or out of watches
+        """
+        observer = Observer()
+        observer.schedule(
+            _WatchdogEventHandler(on_change), str(repository_path), recursive=True
+        )
+        observer.daemon = True
+        observer.start()
+        self._observer = observer
+
+    def stop(self) -> None:
+        """Stop the observer thread."""
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+
+
+class PollingChangeSource(AbstractChangeSource):
+    """Change source that compares file sizes and mtimes at a fixed interval.
+
+    Scans only the files reported by the file discovery backend (the git index
+    by default), so ignored build output is not polled.
+    """
+
+    def __init__(
+        self,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        file_discovery: AbstractFileDiscovery | None = None,
+    ):
+        """Initialize the polling change source.
+
+        Args:
+            poll_interval: Seconds between scans
+            file_discovery: Backend listing the repository's files
+        """
+        self.poll_interval = poll_interval
+        self.file_discovery = file_discovery or GitFileDiscovery()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _list_files(self, repository_path: Path) -> list[Path]:
+        """List the watched files of the repository."""
+        files = self.file_discovery.list_files(repository_path, WATCHED_SUFFIX)
+        if files is None:
+            files = list(repository_path.rglob(f"*{WATCHED_SUFFIX}"))
+        return files
+
+    def scan(self, repository_path: Path) -> dict[Path, tuple[int, int]]:
+        """Take a snapshot of the (mtime_ns, size) of every watched file.
+
+        Args:
+            repository_path: Repository root to scan
+
+        Returns:
+            Mapping of file path to (mtime_ns, size)
+        """
+        snapshot = {}
+        for file_path in self._list_files(repository_path):
+            try:
+                stat = file_path.stat()
+            except OSError:
+                continue
+            snapshot[file_path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def start(self, repository_path: Path, on_change: ChangeCallback) -> None:
+        """Start polling the repository on a background thread.
+
+        Args:
+            repository_path: Repository root to watch
+            on_change: Callback invoked on the polling thread for each change
+        """
+        self._stop_event.clear()
+        snapshot = self.scan(repository_path)
+
+        def _poll() -> None:
+            nonlocal snapshot
+            while not self._stop_event.wait(self.poll_interval):
+                try:
+                    current = self.scan(repository_path)
+                except Exception as e:
+                    logger.warning(f"Polling {repository_path} failed: {e}")
+                    continue
+                for file_path in snapshot.keys() | current.keys():
+                    if snapshot.get(file_path) != current.get(file_path):
+                        on_change(file_path)
+                snapshot = current
+
+        self._thread = threading.Thread(
+            target=_poll, name=f"poll-{repository_path.name}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the polling thread."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+def start_change_source(
+    repository_path: Path,
+    on_change: ChangeCallback,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+) -> AbstractChangeSource:
+    """Start native change notifications, falling back to polling.
+
+    Args:
+        repository_path: Repository root to watch
+        on_change: Callback invoked from the source's thread for each change
+        poll_interval: Scan interval of the polling fallback
+
+    Returns:
+        The started change source
+    """
+    try:
+        source: AbstractChangeSource = WatchdogChangeSource()
+        source.start(repository_path, on_change)
+    except OSError as e:
+        logger.warning(
+            f"Native file watching unavailable for {repository_path} "
+            f"({e}), polling every {poll_interval}s instead"
+        )
+        source = PollingChangeSource(poll_interval)
+        source.start(repository_path, on_change)
+    return source
+
+
+class _SharedSource:
+    """One running change source and the callbacks subscribed to it."""
+
+    def __init__(self) -> None:
+        self.source: AbstractChangeSource | None = None
+        # Replaced rather than mutated, so dispatching needs no lock
+        self.callbacks: tuple[ChangeCallback, ...] = ()
+
+    def dispatch(self, file_path: Path) -> None:
+        for callback in self.callbacks:
+            callback(file_path)
+
+
+# Change sources shared by the consumers of this process, by repository path
+_shared_sources: dict[str, _SharedSource] = {}
+_shared_sources_lock = threading.Lock()
+
+
+class SharedChangeSource(AbstractChangeSource):
+    """Subscription to the one change source of a repository in this process.
+
+    Consumers of the same process that watch a repository share one native
+    observer (or poller), started by the first subscriber and stopped with
+    the last. Sharing ends at the process boundary: the master's index
+    watchers and a worker's language server pool each run their own.
+    """
+
+    def __init__(self, poll_interval: float = DEFAULT_POLL_INTERVAL):
+        """Initialize the subscription.
+
+        Args:
+            poll_interval: Scan interval of the polling fallback, if the
+                shared source has to be started
+        """
+        self.poll_interval = poll_interval
+        self._key: str | None = None
+        self._on_change: ChangeCallback | None = None
+
+    @property
+    def source(self) -> AbstractChangeSource | None:
+        """The shared source serving this subscription, while started."""
+        with _shared_sources_lock:
+            shared = _shared_sources.get(self._key) if self._key else None
+            return shared.source if shared else None
+
+    def start(self, repository_path: Path, on_change: ChangeCallback) -> None:
+        """Subscribe to the repository's changes, starting its source if needed.
+
+        Args:
+            repository_path: Repository root to watch
+            on_change: Callback invoked from the source's thread for each change
+
+        Raises:
+            OSError: If no source can watch the repository
+        """
+        key = os.path.abspath(repository_path)
+        with _shared_sources_lock:
+            shared = _shared_sources.get(key)
+            if shared is None:
+                shared = _SharedSource()
+                shared.source = start_change_source(
+                    Path(key), shared.dispatch, self.poll_interval
+                )
+                _shared_sources[key] = shared
+            shared.callbacks = (*shared.callbacks, on_change)
+        self._key = key
+        self._on_change = on_change
+
+    def stop(self) -> None:
+        """Unsubscribe, stopping the shared source after its last subscriber."""
+        if self._key is None:
+            return
+        source = None
+        with _shared_sources_lock:
+            shared = _shared_sources[self._key]
+            shared.callbacks = tuple(
+                callback for callback in shared.callbacks if callback != self._on_change
+            )
+            if not shared.callbacks:
+                del _shared_sources[self._key]
+                source = shared.source
+        self._key = None
+        self._on_change = None
+        if source is not None:
+            source.stop()
+
+
+class RepositoryWatcher:
+    """Keeps the index of one repository current as its files change.
+
+    Changed paths are collected from a change source and applied in batches
+    through ``AbstractRepositoryIndexer.reindex_files`` on a dedicated thread,
+    which replaces the symbols of each touched file atomically. A batch is
+    applied once no event has arrived for ``debounce_seconds``, but no later
+    than ``max_update_latency`` seconds after its first change.
+    """
+
+    def __init__(
+        self,
+        repository_path: str,
+        repository_id: str,
+        indexer: AbstractRepositoryIndexer,
+        change_source: AbstractChangeSource | None = None,
+        debounce_seconds: float = DEFAULT_DEBOUNCE_SECONDS,
+        max_update_latency: float = DEFAULT_MAX_UPDATE_LATENCY,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ):
+        """Initialize the repository watcher.
+
+        Args:
+            repository_path: Path to the repository root
+            repository_id: Unique identifier for the repository
+            indexer: Indexer applying the changes to the symbol storage
+            change_source: Source of change notifications. Defaults to the
+                repository's shared source: native notifications, falling
+                back to polling when they are unavailable.
+            debounce_seconds: Quiet period before a batch is applied
+            max_update_latency: Maximum seconds between a change and its batch
+                being applied
+            poll_interval: Scan interval of the polling fallback
+
+        Raises:
+            ValueError: If the debounce delay exceeds the maximum latency
+        """
+        if debounce_seconds > max_update_latency:
+            raise ValueError(
+                f"debounce_seconds ({debounce_seconds}) must not exceed "
+                f"max_update_latency ({max_update_latency})"
+            )
+        self.repository_path = repository_path
+        self.repository_id = repository_id
+        self.indexer = indexer
+        self.change_source = change_source
+        self.debounce_seconds = debounce_seconds
+        self.max_update_latency = max_update_latency
+        self.poll_interval = poll_interval
+
+        self._condition = threading.Condition()
+        self._pending: set[str] = set()
+        self._first_change_at = 0.0
+        self._last_change_at = 0.0
+        self._running = False
+        self._thread: threading.Thread | None = None
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the watcher is running."""
+        return self._running
+
+    def start(self) -> None:
+        """Start watching the repository and applying its changes."""
+        if self._running:
+            return
+
+        if self.change_source is None:
+            self.change_source = SharedChangeSource(self.poll_interval)
+        self.change_source.start(Path(self.repository_path), self.notify_changed)
+
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name=f"watch-{self.repository_id}", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            f"Watching {self.repository_id} at {self.repository_path} with "
+            f"{type(self.change_source).__name__}"
+        )
+
+    def stop(self) -> None:
+        """Stop watching; changes still pending are applied first."""
+        if not self._running:
+            return
+
+        if self.change_source is not None:
+            self.change_source.stop()
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        logger.info(f"Stopped watching {self.repository_id}")
+
+    def notify_changed(self, file_path: Path) -> None:
+        """Record a changed file; called by the change source from any thread.
+
+        Args:
+            file_path: Absolute path of the changed file
+        """
+        now = time.monotonic()
+        with self._condition:
+            if not self._pending:
+                self._first_change_at = now
+            self._last_change_at = now
+            self._pending.add(str(file_path))
+            self._condition.notify_all()
+
+    def flush(self) -> IndexingResult | None:
+        """Apply the pending changes immediately.
+
+        Returns:
+            IndexingResult of the applied batch, or None if nothing was pending
+        """
+        with self._condition:
+            batch = self._take_batch()
+        return self._apply(batch) if batch else None
+
+    def _take_batch(self) -> list[str]:
+        """Take the pending changes; the caller holds the condition lock."""
+        batch = sorted(self._pending)
+        self._pending.clear()
+        return batch
+
+    def _batch_due_at(self) -> float:
+        """Time at which the pending batch is due; caller holds the lock."""
+        return min(
+            self._last_change_at + self.debounce_seconds,
+            self._first_change_at + self.max_update_latency,
+        )
+
+    def _run(self) -> None:
+        """Apply batches of changes until the watcher is stopped."""
+        while True:
+            with self._condition:
+                while self._running:
+                    if not self._pending:
+                        self._condition.wait()
+                        continue
+                    remaining = self._batch_due_at() - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                batch = self._take_batch()
+                running = self._running
+
+            if batch:
+                self._apply(batch)
+            if not running:
+                return
+
+    def _apply(self, batch: list[str]) -> IndexingResult | None:
+        """Re-index a batch of changed files, logging rather than raising."""
+        try:
+            result = self.indexer.reindex_files(
+                self.repository_path, self.repository_id, batch
+            )
+        except Exception as e:
+            logger.error(
+                f"Failed to apply {len(batch)} changed files of "
+                f"{self.repository_id}: {e}"
+            )
+            return None
+
+        logger.debug(
+            f"Applied {len(batch)} changed files of {self.repository_id}: {result}"
+        )
+        return result
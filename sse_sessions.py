@@ -0,0 +1,147 @@
+"""
+Server-Sent Events sessions for the MCP worker.
+
+Each SSE connection is a session with its own asyncio queue. The endpoint
+event sent at the start of a connection carries the session id in the POST
+URL, so responses to a client's requests are delivered only on that client's
+stream, and the stream wakes up as soon as a message is queued instead of
+polling for it.
+"""
+
+import asyncio
+import json
+import logging
+import uuid
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Query parameter carrying the session id in the POST endpoint URL
+SESSION_ID_PARAM = "session_id"
+
+# Seconds of idle time after which a keepalive comment is sent
+SSE_KEEPALIVE_INTERVAL = 30.0
+
+
+@dataclass
+class SSESession:
+    """An open SSE connection and the messages waiting to be sent on it."""
+
+    session_id: str
+    queue: asyncio.Queue[dict[str, Any] | None] = field(default_factory=asyncio.Queue)
+
+
+class SSESessionManager:
+    """Tracks open SSE sessions and routes messages to them."""
+
+    def __init__(self, keepalive_interval: float = SSE_KEEPALIVE_INTERVAL):
+        """Initialize the session manager.
+
+        Args:
+            keepalive_interval: Idle seconds between keepalive comments
+        """
+        self.keepalive_interval = keepalive_interval
+        self._sessions: dict[str, SSESession] = {}
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def open(self) -> SSESession:
+        """Open a new session.
+
+        Returns:
+            The new session
+        """
+        session = SSESession(uuid.uuid4().hex)
+        self._sessions[session.session_id] = session
+        logger.debug(f"Opened SSE session {session.session_id}")
+        return session
+
+    def close(self, session_id: str) -> None:
+        """Close a session, dropping any messages not yet sent.
+
+        Args:
+            session_id: Session to close
+        """
+        session = self._sessions.pop(session_id, None)
+        if session is not None:
+            logger.debug(
+                f"Closed SSE session {session_id} "
+                f"({session.queue.qsize()} undelivered messages)"
+            )
+
+    def close_all(self) -> None:
+        """End every open stream, e.g. on shutdown."""
+        for session in self._sessions.values():
+            session.queue.put_nowait(None)
+
+    def get(self, session_id: str | None) -> SSESession | None:
+        """Look up the session a request belongs to.
+
+        Clients that don't pass a session id (those written against the
+        single-queue endpoint) are routed to the only open session; with
+        several sessions open the target would be ambiguous.
+
+        Args:
+            session_id: Session id from the request, if any
+
+        Returns:
+            The session, or None if it doesn't exist or can't be determined
+        """
+        if session_id is not None:
+            return self._sessions.get(session_id)
+        if len(self._sessions) == 1:
+            return next(iter(self._sessions.values()))
+        return None
+
+    def publish(self, session_id: str | None, message: dict[str, Any]) -> bool:
+        """Queue a message on a session's stream.
+
+        Args:
+            session_id: Target session id, see ``get``
+            message: JSON-RPC message to send
+
+        Returns:
+            True if the message was queued, False if the session is unknown
+        """
+        session = self.get(session_id)
+        if session is None:
+            logger.warning(f"Dropping message for unknown SSE session {session_id}")
+            return False
+        session.queue.put_nowait(message)
+        return True
+
+    async def stream(self, endpoint_url: str) -> AsyncIterator[str]:
+        """Open a session and produce its SSE stream until it is closed.
+
+        The session is closed when the stream ends, including when the client
+        disconnects.
+
+        Args:
+            endpoint_url: POST endpoint announced to the client; the session id
+                is appended as a query parameter
+
+        Yields:
+            Chunks of the event stream
+        """
+        session = self.open()
+        try:
+            yield "event: endpoint\n"
+            yield f"data: {endpoint_url}?{SESSION_ID_PARAM}={session.session_id}\n\n"
+
+            while True:
+                try:
+                    message = await asyncio.wait_for(
+                        session.queue.get(), self.keepalive_interval
+                    )
+                except TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if message is None:
+                    return
+                yield "event: message\n"
+                yield f"data: {json.dumps(message)}\n\n"
+        finally:
+            self.close(session.session_id)
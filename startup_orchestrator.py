@@ -7,23 +7,43 @@ This module handles the startup sequence for the MCP codebase server,
 including database initialization, repository indexing, and status tracking.
 """
 
+import asyncio
 import logging
+import os
+import sys
+import threading
 import time
 from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 from enum import Enum
+from pathlib import Path
 
 from constants import Language
+from file_discovery import AbstractFileDiscovery, GitFileDiscovery
 from python_symbol_extractor import AbstractSymbolExtractor
 from repository_indexer import (
     AbstractRepositoryIndexer,
+    IndexingProgressCallback,
     IndexingResult,
 )
 from repository_manager import RepositoryConfig
-from symbol_storage import AbstractSymbolStorage
+from symbol_storage import AbstractSymbolStorage, IndexingProgress
 
 logger = logging.getLogger(__name__)
 
+# Number of repositories indexed at the same time. Each indexing run keeps a
+# CPU busy (or a process pool, for large repositories), so stay below the core
+# count and leave room for the workers that start serving as repos complete.
+DEFAULT_INDEXING_CONCURRENCY = min(4, os.cpu_count() or 1)
+
+# Minimum number of seconds between progress records written for a repository
+PROGRESS_PUBLISH_INTERVAL = 1.0
+
+
+class IndexingCancelledError(Exception):
+    """Raised inside an indexing run when indexing has been cancelled."""
+
 
 class IndexingStatusEnum(Enum):
     """Enumeration for indexing status values."""
@@ -45,6 +65,8 @@ class IndexingStatus:
     end_time: float | None = None
     result: IndexingResult | None = None
     error_message: str | None = None
+    files_processed: int = 0
+    files_total: int = 0
 
     @property
     def duration(self) -> float | None:
@@ -55,6 +77,11 @@ class IndexingStatus:
         return end_time - self.start_time
 
 
+# Awaited with the status of each repository right after its index completed,
+# while other repositories may still be indexing
+RepositoryIndexedCallback = Callable[[IndexingStatus], Awaitable[None]]
+
+
 @dataclass
 class StartupResult:
     """Result of startup orchestration."""
@@ -80,7 +107,9 @@ class AbstractStartupOrchestrator(ABC):
 
     @abstractmethod
     async def initialize_repositories(
-        self, repositories: list[RepositoryConfig]
+        self,
+        repositories: list[RepositoryConfig],
+        on_repository_indexed: RepositoryIndexedCallback | None = None,
     ) -> StartupResult:
         """Initialize and index repositories."""
         pass
@@ -99,6 +128,8 @@ class CodebaseStartupOrchestrator(AbstractStartupOrchestrator):
         symbol_storage: AbstractSymbolStorage,
         symbol_extractor: AbstractSymbolExtractor,
         indexer: AbstractRepositoryIndexer,
+        max_concurrent_indexing: int = DEFAULT_INDEXING_CONCURRENCY,
+        repository_priorities: dict[str, int] | None = None,
     ):
         """Initialize the startup orchestrator.
 
@@ -106,10 +137,23 @@ class CodebaseStartupOrchestrator(AbstractStartupOrchestrator):
             symbol_storage: Symbol storage backend for database operations
             symbol_extractor: Symbol extractor for parsing code files
             indexer: Repository indexer for processing repositories
+            max_concurrent_indexing: Maximum number of repositories indexed at
+                the same time
+            repository_priorities: Optional priority per repository name;
+                higher priorities are indexed first (default 0)
         """
+        if max_concurrent_indexing < 1:
+            raise ValueError(
+                f"max_concurrent_indexing must be at least 1, got {max_concurrent_indexing}"
+            )
+
         self.symbol_storage = symbol_storage
         self.symbol_extractor = symbol_extractor
         self.indexer = indexer
+        self.max_concurrent_indexing = max_concurrent_indexing
+        self.repository_priorities = repository_priorities or {}
+        self._cancel_event = threading.Event()
+        self._progress_published_at: dict[str, float] = {}
 
         logger.info(
             f"Initialized startup orchestrator with storage: {type(symbol_storage).__name__}"
@@ -134,13 +178,31 @@ class CodebaseStartupOrchestrator(AbstractStartupOrchestrator):
             logger.error(f"Failed to initialize database: {e}")
             raise
 
+    def cancel_indexing(self) -> None:
+        """Stop indexing as soon as possible.
+
+        Running indexing jobs stop after the file they are processing, and
+        queued repositories are not started; both end up failed. Everything
+        indexed so far is kept.
+        """
+        logger.info("Cancelling repository indexing")
+        self._cancel_event.set()
+
     async def initialize_repositories(
-        self, repositories: list[RepositoryConfig]
+        self,
+        repositories: list[RepositoryConfig],
+        on_repository_indexed: RepositoryIndexedCallback | None = None,
     ) -> StartupResult:
         """Initialize and index repositories.
 
+        Progress is recorded in the symbol storage as indexing advances, so
+        that workers can serve a repository while its index is being built.
+
         Args:
             repositories: List of repository configurations
+            on_repository_indexed: Optional callback awaited as soon as each
+                repository has been indexed successfully; errors it raises
+                are logged
 
         Returns:
             StartupResult with details about the startup process
@@ -168,29 +230,43 @@ class CodebaseStartupOrchestrator(AbstractStartupOrchestrator):
                 status=IndexingStatusEnum.PENDING,
             )
             indexing_statuses.append(status)
+            self._publish_progress(status, force=True)
+
+        # Index up to max_concurrent_indexing repositories at a time, cheapest
+        # first, so that most workers have their index as early as possible
+        queue: asyncio.Queue[tuple[RepositoryConfig, IndexingStatus]] = asyncio.Queue()
+        statuses_by_name = {
+            status.repository_id: status for status in indexing_statuses
+        }
+        scheduled = await asyncio.to_thread(self._schedule_repositories, python_repos)
+        for repo in scheduled:
+            queue.put_nowait((repo, statuses_by_name[repo.name]))
+
+        runner_count = min(self.max_concurrent_indexing, len(python_repos))
+        if runner_count:
+            logger.info(f"Indexing up to {runner_count} repositories concurrently")
+        await asyncio.gather(
+            *(
+                self._run_indexing_queue(queue, on_repository_indexed)
+                for _ in range(runner_count)
+            )
+        )
 
-        # Index repositories sequentially to avoid resource contention
-        indexed_count = 0
-        failed_count = 0
-
-        for status in indexing_statuses:
-            try:
-                repo_config = next(
-                    r for r in python_repos if r.name == status.repository_id
-                )
-                await self._index_repository(repo_config, status)
-
-                if status.status == IndexingStatusEnum.COMPLETED:
-                    indexed_count += 1
-                else:
-                    failed_count += 1
+        # Repositories still queued after a cancellation won't be indexed in
+        # this run; give them a final state rather than leaving them pending
+        while not queue.empty():
+            _, status = queue.get_nowait()
+            status.status = IndexingStatusEnum.FAILED
+            status.error_message = "Indexing was cancelled before it started"
+            status.end_time = time.time()
+            self._publish_progress(status, force=True)
 
-            except Exception as e:
-                logger.error(f"Unexpected error indexing {status.repository_id}: {e}")
-                status.status = IndexingStatusEnum.FAILED
-                status.error_message = str(e)
-                status.end_time = time.time()
-                failed_count += 1
+        indexed_count = sum(
+            1 for s in indexing_statuses if s.status == IndexingStatusEnum.COMPLETED
+        )
+        failed_count = sum(
+            1 for s in indexing_statuses if s.status == IndexingStatusEnum.FAILED
+        )
 
         # Calculate results
         startup_duration = time.time() - start_time
@@ -214,11 +290,172 @@ class CodebaseStartupOrchestrator(AbstractStartupOrchestrator):
 
         return result
 
+    def _schedule_repositories(
+        self, repositories: list[RepositoryConfig]
+    ) -> list[RepositoryConfig]:
+        """Order repositories for indexing.
+
+        Higher-priority repositories come first. Within a priority, repositories
+        that already have an index come before ones that have never been indexed
+        (an incremental run only re-extracts changed files), and smaller
+        repositories before larger ones. The size of an indexed repository is
+        that of its indexed files; the size of a new one is estimated from the
+        files discovery lists. Repositories whose size can't be estimated come
+        last. Ties keep configuration order.
+
+        Runs file discovery for new repositories, so call it off the event loop.
+
+        Args:
+            repositories: Repositories to index
+
+        Returns:
+            Repositories in the order they should be indexed
+        """
+
+        def sort_key(repo: RepositoryConfig) -> tuple[int, bool, int]:
+            try:
+                indexed_bytes = sum(
+                    fingerprint.size
+                    for fingerprint in self.symbol_storage.get_file_fingerprints(
+                        repo.name
+                    ).values()
+                )
+            except Exception as e:
+                logger.debug(f"Could not estimate indexing cost of {repo.name}: {e}")
+                indexed_bytes = 0
+            priority = self.repository_priorities.get(repo.name, 0)
+            if indexed_bytes:
+                return (-priority, False, indexed_bytes)
+            return (-priority, True, self._estimate_source_bytes(repo))
+
+        return sorted(repositories, key=sort_key)
+
+    def _estimate_source_bytes(self, repo: RepositoryConfig) -> int:
+        """Estimate the bytes of Python source a never-indexed repository has.
+
+        Returns:
+            Summed size of the files discovery lists, or sys.maxsize if the
+            repository's files can't be listed
+        """
+        file_discovery = getattr(self.indexer, "file_discovery", None)
+        if not isinstance(file_discovery, AbstractFileDiscovery):
+            file_discovery = GitFileDiscovery()
+        try:
+            files = file_discovery.list_files(Path(repo.path), ".py")
+        except Exception as e:
+            logger.debug(f"Could not list files of {repo.name}: {e}")
+            files = None
+        if files is None:
+            return sys.maxsize
+
+        total = 0
+        for file_path in files:
+            try:
+                total += file_path.stat().st_size
+            except OSError:
+                pass
+        return total
+
+    async def _run_indexing_queue(
+        self,
+        queue: asyncio.Queue[tuple[RepositoryConfig, IndexingStatus]],
+        on_repository_indexed: RepositoryIndexedCallback | None = None,
+    ) -> None:
+        """Index repositories from the queue until it is empty.
+
+        Args:
+            queue: Pending repositories with their indexing status
+            on_repository_indexed: Optional callback for each completed index
+        """
+        while not queue.empty() and not self._cancel_event.is_set():
+            repo_config, status = queue.get_nowait()
+            try:
+                await self._index_repository(repo_config, status)
+            except Exception as e:
+                logger.error(f"Unexpected error indexing {status.repository_id}: {e}")
+                status.status = IndexingStatusEnum.FAILED
+                status.error_message = str(e)
+                status.end_time = time.time()
+                self._publish_progress(status, force=True)
+
+            if (
+                on_repository_indexed is not None
+                and status.status == IndexingStatusEnum.COMPLETED
+            ):
+                try:
+                    await on_repository_indexed(status)
+                except Exception as e:
+                    logger.error(
+                        f"Completion callback failed for {status.repository_id}: {e}"
+                    )
+
+    def _make_progress_callback(
+        self, status: IndexingStatus
+    ) -> IndexingProgressCallback:
+        """Create the indexer progress callback for a repository.
+
+        The callback runs on the indexing thread. It updates the status
+        counters, records them in the storage, and aborts the run by raising
+        IndexingCancelledError once indexing has been cancelled.
+
+        Args:
+            status: Indexing status to update
+
+        Returns:
+            Callback taking (files_done, files_total)
+        """
+
+        def on_progress(files_done: int, files_total: int) -> None:
+            if self._cancel_event.is_set():
+                raise IndexingCancelledError(
+                    f"Indexing of {status.repository_id} was cancelled"
+                )
+            status.files_processed = files_done
+            status.files_total = files_total
+            self._publish_progress(status)
+
+        return on_progress
+
+    def _publish_progress(self, status: IndexingStatus, force: bool = False) -> None:
+        """Record a repository's indexing progress in the symbol storage.
+
+        Updates are rate limited to one per PROGRESS_PUBLISH_INTERVAL unless
+        forced. Failures are logged and never interrupt indexing.
+
+        Args:
+            status: Indexing status to record
+            force: Record even if the last update was recent
+        """
+        now = time.time()
+        last_published = self._progress_published_at.get(status.repository_id, 0.0)
+        if not force and now - last_published < PROGRESS_PUBLISH_INTERVAL:
+            return
+        self._progress_published_at[status.repository_id] = now
+
+        try:
+            self.symbol_storage.set_indexing_progress(
+                IndexingProgress(
+                    repository_id=status.repository_id,
+                    state=status.status.value,
+                    files_processed=status.files_processed,
+                    files_total=status.files_total,
+                    updated_at=now,
+                    error_message=status.error_message,
+                )
+            )
+        except Exception as e:
+            logger.warning(
+                f"Failed to record indexing progress for {status.repository_id}: {e}"
+            )
+
     async def _index_repository(
         self, repo_config: RepositoryConfig, status: IndexingStatus
     ) -> None:
         """Index a single repository.
 
+        Indexing runs in a worker thread so that the event loop stays
+        responsive while large repositories are processed.
+
         Args:
             repo_config: Repository configuration
             status: Indexing status to update
@@ -227,20 +464,23 @@ class CodebaseStartupOrchestrator(AbstractStartupOrchestrator):
 
         status.status = IndexingStatusEnum.IN_PROGRESS
         status.start_time = time.time()
+        self._publish_progress(status, force=True)
 
         try:
-            # Clear existing data for this repository
-            logger.debug(f"Clearing existing index for {repo_config.name}")
-            self.indexer.clear_repository_index(repo_config.name)
-
-            # Index the repository
+            # Index the repository; the indexer only re-extracts changed files
             logger.debug(f"Indexing repository at {repo_config.path}")
-            result = self.indexer.index_repository(repo_config.path, repo_config.name)
+            result = await asyncio.to_thread(
+                self.indexer.index_repository,
+                repo_config.path,
+                repo_config.name,
+                self._make_progress_callback(status),
+            )
 
             # Update status
             status.status = IndexingStatusEnum.COMPLETED
             status.end_time = time.time()
             status.result = result
+            self._publish_progress(status, force=True)
 
             logger.info(
                 f"Completed indexing {repo_config.name}: "
@@ -254,6 +494,7 @@ class CodebaseStartupOrchestrator(AbstractStartupOrchestrator):
             status.status = IndexingStatusEnum.FAILED
             status.end_time = time.time()
             status.error_message = str(e)
+            self._publish_progress(status, force=True)
 
     def get_indexing_status(
         self, repository_id: str, statuses: list[IndexingStatus]
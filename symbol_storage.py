@@ -10,15 +10,76 @@ import sqlite3
 import threading
 import time
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
+from types import SimpleNamespace
 from typing import Any
 
 from constants import DATA_DIR
 
 logger = logging.getLogger(__name__)
 
+# Trigram tokens are three characters long, so shorter queries cannot be
+# answered from the FTS index and fall back to scanning the symbols table.
+FTS_MIN_QUERY_LENGTH = 3
+
+# Secondary indexes on the symbols table, keyed by name
+SYMBOL_INDEXES = {
+    "idx_symbols_name": "CREATE INDEX IF NOT EXISTS idx_symbols_name ON symbols(name)",
+    "idx_symbols_repository_id": (
+        "CREATE INDEX IF NOT EXISTS idx_symbols_repository_id ON symbols(repository_id)"
+    ),
+    "idx_symbols_kind": "CREATE INDEX IF NOT EXISTS idx_symbols_kind ON symbols(kind)",
+    "idx_symbols_file_path": (
+        "CREATE INDEX IF NOT EXISTS idx_symbols_file_path "
+        "ON symbols(file_path, repository_id)"
+    ),
+    "idx_symbols_repo_generation": (
+        "CREATE INDEX IF NOT EXISTS idx_symbols_repo_generation "
+        "ON symbols(repository_id, generation)"
+    ),
+    "idx_symbols_name_repo": (
+        "CREATE INDEX IF NOT EXISTS idx_symbols_name_repo "
+        "ON symbols(name, repository_id)"
+    ),
+}
+
+# Per-file replaces delete by file path, so this index must survive a bulk load
+BULK_LOAD_KEPT_INDEXES = {"idx_symbols_file_path"}
+
+# Rows written between commits during a bulk load
+BULK_LOAD_COMMIT_ROWS = 100_000
+
+# Number of rows deleted per transaction when garbage-collecting old index
+# generations, which keeps the write lock free for indexers and searches
+GC_BATCH_ROWS = 10_000
+
+# SQL expression for the active index generation of the repository given by
+# the ``{repository_id}`` placeholder; repositories never rebuilt use 0
+ACTIVE_GENERATION_SQL = (
+    "COALESCE((SELECT active_generation FROM repository_generations "
+    "WHERE repository_generations.repository_id = {repository_id}), 0)"
+)
+
+# Inserts a symbol into the active generation of its repository; takes the
+# symbol's columns followed by the repository id once more
+INSERT_ACTIVE_SYMBOL_SQL = (
+    "INSERT INTO symbols (name, kind, file_path, line_number, column_number, "
+    "repository_id, docstring, generation) VALUES (?, ?, ?, ?, ?, ?, ?, "
+    + ACTIVE_GENERATION_SQL.format(repository_id="?")
+    + ")"
+)
+
+# Maximum number of seconds a bulk load holds the database write lock before
+# committing, so that concurrent writers on other connections are not starved
+BULK_LOAD_COMMIT_INTERVAL = 1.0
+
+# Page cache used during a bulk load, in KiB (negative values are KiB in SQLite)
+BULK_LOAD_CACHE_SIZE_KIB = 256 * 1024
+
 
 class SymbolKind(Enum):
     """Enumeration of Python symbol types."""
@@ -61,6 +122,41 @@ class Symbol:
         }
 
 
+@dataclass
+class FileFingerprint:
+    """Fingerprint of an indexed file, used to detect changes between indexing runs."""
+
+    file_path: str
+    size: int
+    mtime_ns: int
+    content_hash: str
+    symbol_count: int = 0
+
+
+# Indexing states of a repository, as recorded in IndexingProgress.state
+INDEXING_STATE_PENDING = "pending"
+INDEXING_STATE_IN_PROGRESS = "in_progress"
+INDEXING_STATE_COMPLETED = "completed"
+INDEXING_STATE_FAILED = "failed"
+
+
+@dataclass
+class IndexingProgress:
+    """Indexing progress of a repository, shared with the worker processes."""
+
+    repository_id: str
+    state: str
+    files_processed: int = 0
+    files_total: int = 0
+    updated_at: float = 0.0
+    error_message: str | None = None
+
+    @property
+    def is_complete(self) -> bool:
+        """Whether the repository's index has been fully built."""
+        return self.state == INDEXING_STATE_COMPLETED
+
+
 class AbstractSymbolStorage(ABC):
     """Abstract base class for symbol storage operations."""
 
@@ -81,12 +177,12 @@ class AbstractSymbolStorage(ABC):
 
     @abstractmethod
     def update_symbol(self, symbol: Symbol) -> None:
-        """Update an existing symbol in the database."""
+        """Update an existing symbol in the active index generation."""
         pass
 
     @abstractmethod
     def delete_symbol(self, symbol_id: int) -> None:
-        """Delete a symbol from the database."""
+        """Delete a symbol of the active index generation from the database."""
         pass
 
     @abstractmethod
@@ -101,8 +197,9 @@ class AbstractSymbolStorage(ABC):
         repository_id: str | None = None,
         symbol_kind: str | None = None,
         limit: int = 50,
+        prefix: bool = False,
     ) -> list[Symbol]:
-        """Search for symbols by name."""
+        """Search for symbols by name (substring match, or prefix if requested)."""
         pass
 
     @abstractmethod
@@ -115,6 +212,96 @@ class AbstractSymbolStorage(ABC):
         """Get all symbols from a specific file."""
         pass
 
+    @abstractmethod
+    def get_file_fingerprints(
+        self, repository_id: str, generation: int | None = None
+    ) -> dict[str, FileFingerprint]:
+        """Get the fingerprints of all indexed files of a repository, keyed by path.
+
+        Reads the active index generation unless another one is given.
+        """
+        pass
+
+    @abstractmethod
+    def record_file_fingerprint(
+        self,
+        repository_id: str,
+        fingerprint: FileFingerprint,
+        generation: int | None = None,
+    ) -> None:
+        """Insert or update the fingerprint of an indexed file."""
+        pass
+
+    @abstractmethod
+    def replace_file_symbols(
+        self,
+        repository_id: str,
+        file_path: str,
+        symbols: list[Symbol],
+        fingerprint: FileFingerprint,
+        generation: int | None = None,
+    ) -> None:
+        """Atomically replace the symbols and fingerprint of a single file.
+
+        Writes to the active index generation unless another one is given.
+        """
+        pass
+
+    @abstractmethod
+    def delete_file_symbols(
+        self, repository_id: str, file_path: str, generation: int | None = None
+    ) -> None:
+        """Delete the symbols and fingerprint of a single file."""
+        pass
+
+    @abstractmethod
+    def begin_generation(self, repository_id: str) -> int:
+        """Start building a new index generation for a repository.
+
+        The new generation stays invisible to searches until it is passed to
+        ``activate_generation``. A repository with nothing indexed has nothing
+        to hide, so its new generation is activated right away.
+
+        Returns:
+            Number of the new generation
+        """
+        pass
+
+    @abstractmethod
+    def activate_generation(self, repository_id: str, generation: int) -> None:
+        """Atomically make a generation the one searches see.
+
+        Rows of other generations are discarded afterwards.
+        """
+        pass
+
+    @abstractmethod
+    def is_active_generation_complete(self, repository_id: str) -> bool:
+        """Whether the generation searches see has been fully built.
+
+        False while a first index is built in place, and for repositories
+        that were never indexed.
+        """
+        pass
+
+    @abstractmethod
+    def set_indexing_progress(self, progress: IndexingProgress) -> None:
+        """Record the indexing progress of a repository."""
+        pass
+
+    @abstractmethod
+    def get_indexing_progress(self, repository_id: str) -> IndexingProgress | None:
+        """Get the last recorded indexing progress of a repository."""
+        pass
+
+    def bulk_load(self, rebuild_indexes: bool = False) -> AbstractContextManager[None]:
+        """Group the writes made inside the context into large transactions.
+
+        Storages without a cheaper bulk write path keep their per-call
+        behavior, so the default is a no-op.
+        """
+        return nullcontext()
+
 
 class SQLiteSymbolStorage(AbstractSymbolStorage):
     """SQLite implementation of symbol storage with error handling and resilience."""
@@ -131,24 +318,75 @@ class SQLiteSymbolStorage(AbstractSymbolStorage):
         """
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._connection: sqlite3.Connection | None = None
+        # Each thread gets its own connection (and bulk load state), so that
+        # repositories can be indexed from several threads at once; WAL mode
+        # lets readers proceed while one connection writes. An in-memory
+        # database only exists on its connection, so that one is shared.
+        self._local: Any = (
+            SimpleNamespace() if str(self.db_path) == ":memory:" else threading.local()
+        )
+        self._connections: list[sqlite3.Connection] = []
+        # Bumped by close() so that threads drop their closed connections
+        self._connection_epoch = 0
         self._connection_lock = threading.Lock()
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        self.fts_enabled = False
+        self._gc_threads: list[threading.Thread] = []
         self.create_schema()
 
+    @property
+    def _connection(self) -> sqlite3.Connection | None:
+        """The calling thread's connection, if it has a live one."""
+        if getattr(self._local, "epoch", None) != self._connection_epoch:
+            return None
+        return getattr(self._local, "connection", None)
+
+    @_connection.setter
+    def _connection(self, connection: sqlite3.Connection | None) -> None:
+        self._local.connection = connection
+        self._local.epoch = self._connection_epoch
+
+    @property
+    def _bulk_load_pending_rows(self) -> int | None:
+        """Rows written since the last bulk load commit on the calling thread.
+
+        None when the calling thread is not inside a bulk load.
+        """
+        return getattr(self._local, "bulk_load_pending_rows", None)
+
+    @_bulk_load_pending_rows.setter
+    def _bulk_load_pending_rows(self, rows: int | None) -> None:
+        self._local.bulk_load_pending_rows = rows
+
+    @property
+    def _bulk_load_commit_rows(self) -> int:
+        """Commit threshold of the calling thread's bulk load."""
+        return getattr(self._local, "bulk_load_commit_rows", BULK_LOAD_COMMIT_ROWS)
+
+    @_bulk_load_commit_rows.setter
+    def _bulk_load_commit_rows(self, rows: int) -> None:
+        self._local.bulk_load_commit_rows = rows
+
     def _get_connection(self) -> sqlite3.Connection:
-        """Get a database connection with retry logic."""
-        with self._connection_lock:
-            if self._connection is None:
-                self._connection = self._create_connection()
-            return self._connection
+        """Get the calling thread's database connection, creating it if needed."""
+        connection = self._connection
+        if connection is None:
+            connection = self._create_connection()
+            with self._connection_lock:
+                self._connections.append(connection)
+            self._connection = connection
+        return connection
 
     def _create_connection(self) -> sqlite3.Connection:
         """Create a new database connection with error handling."""
         for attempt in range(self.max_retries + 1):
             try:
-                conn = sqlite3.connect(str(self.db_path), timeout=30.0)
+                # Connections are only used by the thread that created them,
+                # but close() may run on any thread
+                conn = sqlite3.connect(
+                    str(self.db_path), timeout=30.0, check_same_thread=False
+                )
                 conn.row_factory = sqlite3.Row
                 conn.execute("PRAGMA foreign_keys = ON")
                 conn.execute("PRAGMA journal_mode = WAL")
@@ -173,15 +411,19 @@ class SQLiteSymbolStorage(AbstractSymbolStorage):
         raise RuntimeError("Failed to create database connection after all retries")
 
     def close(self) -> None:
-        """Close any persistent database connections."""
+        """Close the persistent database connections of all threads.
+
+        Waits for running garbage collection first.
+        """
+        self.wait_for_garbage_collection()
         with self._connection_lock:
-            if self._connection:
-                try:
-                    self._connection.close()
-                except sqlite3.Error as e:
-                    logger.warning(f"Error closing database connection: {e}")
-                finally:
-                    self._connection = None
+            connections, self._connections = self._connections, []
+            self._connection_epoch += 1
+        for connection in connections:
+            try:
+                connection.close()
+            except sqlite3.Error as e:
+                logger.warning(f"Error closing database connection: {e}")
 
     def _execute_with_retry(self, operation_name: str, operation_func, *args, **kwargs):
         """Execute a database operation with retry logic."""
@@ -194,8 +436,10 @@ class SQLiteSymbolStorage(AbstractSymbolStorage):
                         f"{operation_name} attempt {attempt + 1} failed: {e}. Retrying in {self.retry_delay}s..."
                     )
                     time.sleep(self.retry_delay)
-                    # Reset connection on database errors
-                    self._connection = None
+                    # Reset connection on database errors, unless a bulk load
+                    # owns the open transaction on it
+                    if self._bulk_load_pending_rows is None:
+                        self._connection = None
                 else:
                     logger.error(
                         f"{operation_name} failed after {self.max_retries + 1} attempts: {e}"
@@ -208,6 +452,126 @@ class SQLiteSymbolStorage(AbstractSymbolStorage):
                 logger.error(f"{operation_name} failed with unexpected error: {e}")
                 raise
 
+    @contextmanager
+    def _write_transaction(self, rows: int = 1) -> Iterator[sqlite3.Connection]:
+        """Run a write operation in its own transaction.
+
+        Outside a bulk load the operation commits on success and rolls back on
+        error. During a bulk load it runs in a savepoint of the open bulk
+        transaction instead, keeping each operation atomic without paying for
+        a commit; the bulk load commits once enough rows have accumulated or
+        it has held the write lock for BULK_LOAD_COMMIT_INTERVAL seconds.
+
+        Args:
+            rows: Number of rows the operation writes, counted towards the
+                bulk load's commit threshold
+        """
+        conn = self._get_connection()
+
+        if self._bulk_load_pending_rows is None:
+            with conn:
+                yield conn
+            return
+
+        if not conn.in_transaction:
+            # Take the write lock before the operation's first statement: a
+            # transaction that starts with a read can't be upgraded to a write
+            # once another connection has committed, and fails immediately
+            conn.execute("BEGIN IMMEDIATE")
+            self._local.bulk_load_committed_at = time.monotonic()
+        conn.execute("SAVEPOINT bulk_write")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK TO bulk_write")
+            conn.execute("RELEASE bulk_write")
+            raise
+        conn.execute("RELEASE bulk_write")
+
+        pending_rows = self._bulk_load_pending_rows + rows
+        self._bulk_load_pending_rows = pending_rows
+        if (
+            pending_rows >= self._bulk_load_commit_rows
+            or time.monotonic() - self._local.bulk_load_committed_at
+            >= BULK_LOAD_COMMIT_INTERVAL
+        ):
+            conn.commit()
+            logger.debug(f"Bulk load committed {pending_rows} pending rows")
+            self._bulk_load_pending_rows = 0
+
+    @contextmanager
+    def bulk_load(
+        self,
+        rebuild_indexes: bool = False,
+        commit_rows: int = BULK_LOAD_COMMIT_ROWS,
+    ) -> Iterator[None]:
+        """Group all writes made inside the context into large transactions.
+
+        Intended for full re-indexes: instead of one fsync-bearing commit per
+        write call, writes accumulate in one transaction that is committed
+        every ``commit_rows`` rows (or every BULK_LOAD_COMMIT_INTERVAL seconds)
+        and when the context exits. The bulk load belongs to the calling
+        thread; other threads keep writing in their own transactions. Durability is
+        relaxed (``synchronous = OFF``, larger page cache, in-memory temp
+        store) for the duration of the load and restored afterwards. Each write
+        call stays atomic through a savepoint. If the context raises, the
+        uncommitted tail of the load is rolled back.
+
+        Args:
+            rebuild_indexes: Drop the secondary indexes not needed by the write
+                path before loading and rebuild them afterwards. Only worth it
+                when loading a large share of the table, since the rebuild
+                covers every repository in the database.
+            commit_rows: Number of written rows between intermediate commits
+
+        Raises:
+            RuntimeError: If a bulk load is already in progress
+        """
+        if self._bulk_load_pending_rows is not None:
+            raise RuntimeError("A bulk load is already in progress")
+
+        conn = self._get_connection()
+        conn.commit()
+
+        previous_cache_size = conn.execute("PRAGMA cache_size").fetchone()[0]
+        previous_temp_store = conn.execute("PRAGMA temp_store").fetchone()[0]
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute(f"PRAGMA cache_size = {-BULK_LOAD_CACHE_SIZE_KIB}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+
+        dropped_indexes = []
+        if rebuild_indexes:
+            for index_name in SYMBOL_INDEXES:
+                if index_name not in BULK_LOAD_KEPT_INDEXES:
+                    conn.execute(f"DROP INDEX IF EXISTS {index_name}")
+                    dropped_indexes.append(index_name)
+            conn.commit()
+            logger.info(f"Dropped {len(dropped_indexes)} indexes for bulk load")
+
+        start_time = time.time()
+        self._bulk_load_pending_rows = 0
+        self._bulk_load_commit_rows = commit_rows
+        try:
+            yield
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self._bulk_load_pending_rows = None
+            self._bulk_load_commit_rows = BULK_LOAD_COMMIT_ROWS
+
+            for index_name in dropped_indexes:
+                conn.execute(SYMBOL_INDEXES[index_name])
+            conn.commit()
+            if dropped_indexes:
+                logger.info(f"Rebuilt {len(dropped_indexes)} indexes after bulk load")
+
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute(f"PRAGMA cache_size = {previous_cache_size}")
+            conn.execute(f"PRAGMA temp_store = {previous_temp_store}")
+            logger.info(f"Bulk load finished in {time.time() - start_time:.2f}s")
+
     def _recover_from_corruption(self) -> None:
         """Attempt to recover from database corruption."""
         logger.error("Database corruption detected. Attempting recovery...")
@@ -248,47 +612,65 @@ class SQLiteSymbolStorage(AbstractSymbolStorage):
                     column_number INTEGER NOT NULL,
                     repository_id TEXT NOT NULL,
                     docstring TEXT,
+                    generation INTEGER NOT NULL DEFAULT 0,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             """
             )
+            self._migrate_to_generations(conn)
 
-            # Create indexes for common query patterns
+            # Active index generation of each rebuilt repository
             conn.execute(
                 """
-            CREATE INDEX IF NOT EXISTS idx_symbols_name
-            ON symbols(name)
+                CREATE TABLE IF NOT EXISTS repository_generations (
+                    repository_id TEXT PRIMARY KEY,
+                    active_generation INTEGER NOT NULL DEFAULT 0,
+                    building_generation INTEGER,
+                    next_generation INTEGER NOT NULL DEFAULT 1,
+                    active_complete INTEGER NOT NULL DEFAULT 1
+                )
             """
             )
+            self._migrate_generation_completeness(conn)
 
-            conn.execute(
-                """
-            CREATE INDEX IF NOT EXISTS idx_symbols_repository_id
-            ON symbols(repository_id)
-            """
-            )
+            # Create indexes for common query patterns
+            for index_sql in SYMBOL_INDEXES.values():
+                conn.execute(index_sql)
 
+            # Per-file fingerprints used for incremental re-indexing
             conn.execute(
                 """
-            CREATE INDEX IF NOT EXISTS idx_symbols_kind
-            ON symbols(kind)
+                CREATE TABLE IF NOT EXISTS file_manifest (
+                    repository_id TEXT NOT NULL,
+                    file_path TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    symbol_count INTEGER NOT NULL DEFAULT 0,
+                    generation INTEGER NOT NULL DEFAULT 0,
+                    indexed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (repository_id, generation, file_path)
+                )
             """
             )
 
+            # Indexing progress, read by workers serving a repository whose
+            # index is still being built
             conn.execute(
                 """
-            CREATE INDEX IF NOT EXISTS idx_symbols_file_path
-            ON symbols(file_path, repository_id)
+                CREATE TABLE IF NOT EXISTS indexing_progress (
+                    repository_id TEXT PRIMARY KEY,
+                    state TEXT NOT NULL,
+                    files_processed INTEGER NOT NULL DEFAULT 0,
+                    files_total INTEGER NOT NULL DEFAULT 0,
+                    updated_at REAL NOT NULL,
+                    error_message TEXT
+                )
             """
             )
 
-            conn.execute(
-                """
-            CREATE INDEX IF NOT EXISTS idx_symbols_name_repo
-            ON symbols(name, repository_id)
-            """
-            )
+            self.fts_enabled = self._create_fts_schema(conn)
 
             conn.commit()
             logger.info(f"Created symbol storage schema in {self.db_path}")
@@ -302,17 +684,128 @@ class SQLiteSymbolStorage(AbstractSymbolStorage):
             else:
                 raise
 
+    def _migrate_to_generations(self, conn: sqlite3.Connection) -> None:
+        """Upgrade a database created before index generations existed.
+
+        Existing symbols become generation 0, which is what repositories
+        without a recorded generation read. The file manifest's primary key
+        changes, so an old manifest is dropped; the next indexing run then
+        rebuilds each repository into a fresh generation.
+        """
+        symbol_columns = {
+            row["name"] for row in conn.execute("PRAGMA table_info(symbols)")
+        }
+        if "generation" not in symbol_columns:
+            conn.execute(
+                "ALTER TABLE symbols ADD COLUMN generation INTEGER NOT NULL DEFAULT 0"
+            )
+            logger.info("Added generation column to symbols table")
+
+        manifest_columns = {
+            row["name"] for row in conn.execute("PRAGMA table_info(file_manifest)")
+        }
+        if manifest_columns and "generation" not in manifest_columns:
+            conn.execute("DROP TABLE file_manifest")
+            logger.info("Dropped file manifest without generations; next run rebuilds")
+
+    def _migrate_generation_completeness(self, conn: sqlite3.Connection) -> None:
+        """Add the active_complete column to an older repository_generations.
+
+        Generations activated before the column existed count as complete.
+        """
+        columns = {
+            row["name"]
+            for row in conn.execute("PRAGMA table_info(repository_generations)")
+        }
+        if "active_complete" not in columns:
+            conn.execute(
+                "ALTER TABLE repository_generations "
+                "ADD COLUMN active_complete INTEGER NOT NULL DEFAULT 1"
+            )
+            logger.info("Added active_complete column to repository_generations")
+
+    def _create_fts_schema(self, conn: sqlite3.Connection) -> bool:
+        """Create the trigram FTS5 index over symbol names.
+
+        The ``symbols_fts`` table is an external-content FTS5 table backed by
+        ``symbols`` and kept in sync by triggers, so every write path that
+        touches ``symbols`` keeps the index current. Existing databases that
+        predate the index are backfilled once when the table is first created.
+
+        Args:
+            conn: Open database connection to create the schema on
+
+        Returns:
+            True if the FTS index is available, False if this SQLite build
+            lacks FTS5 or the trigram tokenizer
+        """
+        fts_exists = (
+            conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name='symbols_fts'"
+            ).fetchone()
+            is not None
+        )
+
+        try:
+            conn.execute(
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS symbols_fts USING fts5(
+                    name,
+                    content='symbols',
+                    content_rowid='id',
+                    tokenize='trigram'
+                )
+            """
+            )
+        except sqlite3.OperationalError as e:
+            logger.warning(
+                f"FTS5 trigram index unavailable, symbol search will scan the table: {e}"
+            )
+            return False
+
+        conn.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS symbols_fts_insert AFTER INSERT ON symbols
+            BEGIN
+                INSERT INTO symbols_fts(rowid, name) VALUES (new.id, new.name);
+            END
+            """
+        )
+
+        conn.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS symbols_fts_delete AFTER DELETE ON symbols
+            BEGIN
+                INSERT INTO symbols_fts(symbols_fts, rowid, name)
+                VALUES ('delete', old.id, old.name);
+            END
+            """
+        )
+
+        conn.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS symbols_fts_update AFTER UPDATE OF name ON symbols
+            BEGIN
+                INSERT INTO symbols_fts(symbols_fts, rowid, name)
+                VALUES ('delete', old.id, old.name);
+                INSERT INTO symbols_fts(rowid, name) VALUES (new.id, new.name);
+            END
+            """
+        )
+
+        if not fts_exists:
+            conn.execute("INSERT INTO symbols_fts(symbols_fts) VALUES ('rebuild')")
+            logger.info("Built FTS5 trigram index for existing symbols")
+
+        return True
+
     def insert_symbol(self, symbol: Symbol) -> None:
         """Insert a symbol into the database."""
 
         def _insert_symbol():
-            with self._get_connection() as conn:
+            with self._write_transaction() as conn:
                 conn.execute(
-                    """
-                    INSERT INTO symbols (name, kind, file_path, line_number,
-                                       column_number, repository_id, docstring)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
+                    INSERT_ACTIVE_SYMBOL_SQL,
                     (
                         symbol.name,
                         symbol.kind.value,
@@ -321,9 +814,9 @@ class SQLiteSymbolStorage(AbstractSymbolStorage):
                         symbol.column_number,
                         symbol.repository_id,
                         symbol.docstring,
+                        symbol.repository_id,
                     ),
                 )
-                conn.commit()
 
         self._execute_with_retry("Insert symbol", _insert_symbol)
 
@@ -341,7 +834,7 @@ class SQLiteSymbolStorage(AbstractSymbolStorage):
 
             def _insert_batch(batch_symbols=batch):
                 nonlocal total_inserted
-                with self._get_connection() as conn:
+                with self._write_transaction(len(batch_symbols)) as conn:
                     data = [
                         (
                             s.name,
@@ -351,18 +844,11 @@ class SQLiteSymbolStorage(AbstractSymbolStorage):
                             s.column_number,
                             s.repository_id,
                             s.docstring,
+                            s.repository_id,
                         )
                         for s in batch_symbols
                     ]
-                    conn.executemany(
-                        """
-                        INSERT INTO symbols (name, kind, file_path, line_number,
-                                           column_number, repository_id, docstring)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """,
-                        data,
-                    )
-                    conn.commit()
+                    conn.executemany(INSERT_ACTIVE_SYMBOL_SQL, data)
                     total_inserted += len(batch_symbols)
                     logger.debug(
                         f"Inserted batch of {len(batch_symbols)} symbols into database"
@@ -381,15 +867,16 @@ class SQLiteSymbolStorage(AbstractSymbolStorage):
         logger.info(f"Inserted {total_inserted} symbols into database")
 
     def update_symbol(self, symbol: Symbol) -> None:
-        """Update an existing symbol in the database."""
-        with self._get_connection() as conn:
+        """Update an existing symbol in the active index generation."""
+        with self._write_transaction() as conn:
             conn.execute(
-                """
+                f"""
                 UPDATE symbols
                 SET name = ?, kind = ?, file_path = ?, line_number = ?,
                     column_number = ?, repository_id = ?, docstring = ?,
                     updated_at = CURRENT_TIMESTAMP
                 WHERE name = ? AND file_path = ? AND repository_id = ?
+                  AND generation = {ACTIVE_GENERATION_SQL.format(repository_id="?")}
             """,
                 (
                     symbol.name,
@@ -402,23 +889,37 @@ class SQLiteSymbolStorage(AbstractSymbolStorage):
                     symbol.name,
                     symbol.file_path,
                     symbol.repository_id,
+                    symbol.repository_id,
                 ),
             )
-            conn.commit()
 
     def delete_symbol(self, symbol_id: int) -> None:
-        """Delete a symbol from the database."""
-        with self._get_connection() as conn:
-            conn.execute("DELETE FROM symbols WHERE id = ?", (symbol_id,))
-            conn.commit()
+        """Delete a symbol of the active index generation from the database."""
+        active_generation = ACTIVE_GENERATION_SQL.format(
+            repository_id="symbols.repository_id"
+        )
+        with self._write_transaction() as conn:
+            conn.execute(
+                f"DELETE FROM symbols WHERE id = ? AND generation = {active_generation}",
+                (symbol_id,),
+            )
 
     def delete_symbols_by_repository(self, repository_id: str) -> None:
-        """Delete all symbols for a specific repository."""
-        with self._get_connection() as conn:
+        """Delete all symbols and file fingerprints for a specific repository.
+
+        Every index generation of the repository is deleted.
+        """
+        with self._write_transaction() as conn:
             result = conn.execute(
                 "DELETE FROM symbols WHERE repository_id = ?", (repository_id,)
             )
-            conn.commit()
+            conn.execute(
+                "DELETE FROM file_manifest WHERE repository_id = ?", (repository_id,)
+            )
+            conn.execute(
+                "DELETE FROM repository_generations WHERE repository_id = ?",
+                (repository_id,),
+            )
             logger.info(
                 f"Deleted {result.rowcount} symbols for repository {repository_id}"
             )
@@ -429,20 +930,51 @@ class SQLiteSymbolStorage(AbstractSymbolStorage):
         repository_id: str | None = None,
         symbol_kind: SymbolKind | str | None = None,
         limit: int = 50,
+        prefix: bool = False,
     ) -> list[Symbol]:
-        """Search for symbols by name."""
+        """Search for symbols by name.
+
+        Queries of at least ``FTS_MIN_QUERY_LENGTH`` characters are answered
+        from the trigram FTS index instead of scanning every symbol row.
+        Matching is case-insensitive and exact matches are returned first.
+        Only the active index generation of each repository is searched.
+
+        Args:
+            query: Substring (or prefix) of the symbol name to search for
+            repository_id: Optional repository to restrict the search to
+            symbol_kind: Optional symbol kind to filter by
+            limit: Maximum number of results to return
+            prefix: Only match names that start with the query
+
+        Returns:
+            List of matching symbols
+        """
+        pattern = f"{query}%" if prefix else f"%{query}%"
+        use_fts = self.fts_enabled and len(query) >= FTS_MIN_QUERY_LENGTH
 
         def _search_symbols():
             with self._get_connection() as conn:
-                sql = "SELECT * FROM symbols WHERE name LIKE ?"
-                params: list[Any] = [f"%{query}%"]
+                if use_fts:
+                    # The trigram tokenizer serves LIKE constraints on the FTS
+                    # column from its index, preserving LIKE semantics.
+                    sql = (
+                        "SELECT symbols.* FROM symbols_fts "
+                        "JOIN symbols ON symbols.id = symbols_fts.rowid "
+                        "WHERE symbols_fts.name LIKE ?"
+                    )
+                else:
+                    sql = "SELECT symbols.* FROM symbols WHERE symbols.name LIKE ?"
+                sql += " AND symbols.generation = " + ACTIVE_GENERATION_SQL.format(
+                    repository_id="symbols.repository_id"
+                )
+                params: list[Any] = [pattern]
 
                 if repository_id:
-                    sql += " AND repository_id = ?"
+                    sql += " AND symbols.repository_id = ?"
                     params.append(repository_id)
 
                 if symbol_kind:
-                    sql += " AND kind = ?"
+                    sql += " AND symbols.kind = ?"
                     # Convert enum to string value if needed
                     kind_value = (
                         symbol_kind.value
@@ -452,7 +984,10 @@ class SQLiteSymbolStorage(AbstractSymbolStorage):
                     params.append(kind_value)
 
                 # Order by exact match first, then by name
-                sql += " ORDER BY (CASE WHEN name = ? THEN 0 ELSE 1 END), name LIMIT ?"
+                sql += (
+                    " ORDER BY (CASE WHEN symbols.name = ? THEN 0 ELSE 1 END),"
+                    " symbols.name LIMIT ?"
+                )
                 params.append(query)
                 params.append(limit)
 
@@ -494,15 +1029,16 @@ class SQLiteSymbolStorage(AbstractSymbolStorage):
             )
 
     def get_symbols_by_file(self, file_path: str, repository_id: str) -> list[Symbol]:
-        """Get all symbols from a specific file."""
+        """Get all symbols from a specific file in the active index generation."""
         with self._get_connection() as conn:
             rows = conn.execute(
-                """
+                f"""
                 SELECT * FROM symbols
                 WHERE file_path = ? AND repository_id = ?
+                  AND generation = {ACTIVE_GENERATION_SQL.format(repository_id="?")}
                 ORDER BY line_number, column_number
             """,
-                (file_path, repository_id),
+                (file_path, repository_id, repository_id),
             ).fetchall()
 
             return [
@@ -518,6 +1054,504 @@ class SQLiteSymbolStorage(AbstractSymbolStorage):
                 for row in rows
             ]
 
+    def get_file_fingerprints(
+        self, repository_id: str, generation: int | None = None
+    ) -> dict[str, FileFingerprint]:
+        """Get the fingerprints of all indexed files of a repository.
+
+        Args:
+            repository_id: Repository identifier
+            generation: Index generation to read; defaults to the active one
+
+        Returns:
+            Dictionary mapping file paths to their recorded fingerprints
+        """
+
+        def _get_file_fingerprints():
+            with self._get_connection() as conn:
+                rows = conn.execute(
+                    """
+                    SELECT file_path, size, mtime_ns, content_hash, symbol_count
+                    FROM file_manifest
+                    WHERE repository_id = ? AND generation = ?
+                """,
+                    (
+                        repository_id,
+                        self._resolve_generation(conn, repository_id, generation),
+                    ),
+                ).fetchall()
+
+                return {
+                    row["file_path"]: FileFingerprint(
+                        file_path=row["file_path"],
+                        size=row["size"],
+                        mtime_ns=row["mtime_ns"],
+                        content_hash=row["content_hash"],
+                        symbol_count=row["symbol_count"],
+                    )
+                    for row in rows
+                }
+
+        return self._execute_with_retry("Get file fingerprints", _get_file_fingerprints)
+
+    def _resolve_generation(
+        self, conn: sqlite3.Connection, repository_id: str, generation: int | None
+    ) -> int:
+        """Return the given generation, or the repository's active one if None."""
+        if generation is not None:
+            return generation
+        row = conn.execute(
+            "SELECT " + ACTIVE_GENERATION_SQL.format(repository_id="?"),
+            (repository_id,),
+        ).fetchone()
+        return row[0]
+
+    def _upsert_fingerprint(
+        self,
+        conn: sqlite3.Connection,
+        repository_id: str,
+        fingerprint: FileFingerprint,
+        generation: int,
+    ) -> None:
+        """Insert or update a file fingerprint on an open connection."""
+        conn.execute(
+            """
+            INSERT INTO file_manifest (repository_id, file_path, size, mtime_ns,
+                                       content_hash, symbol_count, generation)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (repository_id, generation, file_path) DO UPDATE SET
+                size = excluded.size,
+                mtime_ns = excluded.mtime_ns,
+                content_hash = excluded.content_hash,
+                symbol_count = excluded.symbol_count,
+                indexed_at = CURRENT_TIMESTAMP
+        """,
+            (
+                repository_id,
+                fingerprint.file_path,
+                fingerprint.size,
+                fingerprint.mtime_ns,
+                fingerprint.content_hash,
+                fingerprint.symbol_count,
+                generation,
+            ),
+        )
+
+    def record_file_fingerprint(
+        self,
+        repository_id: str,
+        fingerprint: FileFingerprint,
+        generation: int | None = None,
+    ) -> None:
+        """Insert or update the fingerprint of an indexed file.
+
+        Args:
+            repository_id: Repository identifier
+            fingerprint: Fingerprint to record
+            generation: Index generation to write; defaults to the active one
+        """
+
+        def _record_file_fingerprint():
+            with self._write_transaction() as conn:
+                self._upsert_fingerprint(
+                    conn,
+                    repository_id,
+                    fingerprint,
+                    self._resolve_generation(conn, repository_id, generation),
+                )
+
+        self._execute_with_retry("Record file fingerprint", _record_file_fingerprint)
+
+    def replace_file_symbols(
+        self,
+        repository_id: str,
+        file_path: str,
+        symbols: list[Symbol],
+        fingerprint: FileFingerprint,
+        generation: int | None = None,
+    ) -> None:
+        """Atomically replace the symbols and fingerprint of a single file.
+
+        The old symbols are deleted, the new ones inserted and the fingerprint
+        recorded in one transaction, so readers never see a half-updated file.
+
+        Args:
+            repository_id: Repository identifier
+            file_path: Path of the file whose symbols are replaced
+            symbols: New symbols extracted from the file
+            fingerprint: Fingerprint of the file contents the symbols came from
+            generation: Index generation to write; defaults to the active one
+        """
+
+        def _replace_file_symbols():
+            with self._write_transaction(len(symbols) + 1) as conn:
+                target = self._resolve_generation(conn, repository_id, generation)
+                conn.execute(
+                    """
+                    DELETE FROM symbols
+                    WHERE file_path = ? AND repository_id = ? AND generation = ?
+                """,
+                    (file_path, repository_id, target),
+                )
+                conn.executemany(
+                    """
+                    INSERT INTO symbols (name, kind, file_path, line_number,
+                                       column_number, repository_id, docstring,
+                                       generation)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                    [
+                        (
+                            s.name,
+                            s.kind.value,
+                            s.file_path,
+                            s.line_number,
+                            s.column_number,
+                            s.repository_id,
+                            s.docstring,
+                            target,
+                        )
+                        for s in symbols
+                    ],
+                )
+                self._upsert_fingerprint(conn, repository_id, fingerprint, target)
+
+        self._execute_with_retry("Replace file symbols", _replace_file_symbols)
+
+    def delete_file_symbols(
+        self, repository_id: str, file_path: str, generation: int | None = None
+    ) -> None:
+        """Delete the symbols and fingerprint of a single file.
+
+        Args:
+            repository_id: Repository identifier
+            file_path: Path of the file to remove from the index
+            generation: Index generation to delete from; defaults to the active one
+        """
+
+        def _delete_file_symbols():
+            with self._write_transaction() as conn:
+                target = self._resolve_generation(conn, repository_id, generation)
+                conn.execute(
+                    """
+                    DELETE FROM symbols
+                    WHERE file_path = ? AND repository_id = ? AND generation = ?
+                """,
+                    (file_path, repository_id, target),
+                )
+                conn.execute(
+                    """
+                    DELETE FROM file_manifest
+                    WHERE file_path = ? AND repository_id = ? AND generation = ?
+                """,
+                    (file_path, repository_id, target),
+                )
+
+        self._execute_with_retry("Delete file symbols", _delete_file_symbols)
+
+    def begin_generation(self, repository_id: str) -> int:
+        """Start building a new index generation for a repository.
+
+        Symbols written to the new generation stay invisible to searches until
+        ``activate_generation`` is called, so a rebuild never exposes a
+        half-built index. If the active generation is empty there is nothing to
+        hide and the new generation is activated right away, which lets a first
+        index become searchable while it is being built.
+
+        Args:
+            repository_id: Repository identifier
+
+        Returns:
+            Number of the new generation
+        """
+
+        def _begin_generation():
+            with self._write_transaction() as conn:
+                conn.execute(
+                    "INSERT OR IGNORE INTO repository_generations (repository_id) "
+                    "VALUES (?)",
+                    (repository_id,),
+                )
+                active, generation = conn.execute(
+                    """
+                    SELECT active_generation, next_generation
+                    FROM repository_generations WHERE repository_id = ?
+                """,
+                    (repository_id,),
+                ).fetchone()
+
+                active_is_empty = (
+                    conn.execute(
+                        """
+                        SELECT 1 FROM symbols WHERE repository_id = ? AND generation = ?
+                        UNION ALL
+                        SELECT 1 FROM file_manifest
+                        WHERE repository_id = ? AND generation = ?
+                        LIMIT 1
+                    """,
+                        (repository_id, active, repository_id, active),
+                    ).fetchone()
+                    is None
+                )
+                conn.execute(
+                    """
+                    UPDATE repository_generations
+                    SET next_generation = ?, building_generation = ?,
+                        active_generation = ?,
+                        active_complete = active_complete AND ?
+                    WHERE repository_id = ?
+                """,
+                    (
+                        generation + 1,
+                        None if active_is_empty else generation,
+                        generation if active_is_empty else active,
+                        not active_is_empty,
+                        repository_id,
+                    ),
+                )
+                return generation, active_is_empty
+
+        generation, activated = self._execute_with_retry(
+            "Begin index generation", _begin_generation
+        )
+        if activated:
+            logger.info(f"Building generation {generation} of {repository_id} in place")
+            # Leftovers of an interrupted rebuild are no longer needed
+            self._schedule_garbage_collection(repository_id)
+        else:
+            logger.info(f"Building generation {generation} of {repository_id}")
+        return generation
+
+    def activate_generation(self, repository_id: str, generation: int) -> None:
+        """Atomically make a generation the one searches see.
+
+        The switch is a single row update, so searches see either the complete
+        old generation or the complete new one. Rows of other generations are
+        then deleted by a background garbage collection.
+
+        Args:
+            repository_id: Repository identifier
+            generation: Generation returned by ``begin_generation``
+        """
+
+        def _activate_generation():
+            with self._write_transaction() as conn:
+                conn.execute(
+                    """
+                    INSERT INTO repository_generations
+                    (repository_id, active_generation, next_generation)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT (repository_id) DO UPDATE SET
+                        active_generation = excluded.active_generation,
+                        building_generation = NULL,
+                        active_complete = 1
+                """,
+                    (repository_id, generation, generation + 1),
+                )
+
+        self._execute_with_retry("Activate index generation", _activate_generation)
+        logger.info(f"Activated generation {generation} of {repository_id}")
+        self._schedule_garbage_collection(repository_id)
+
+    def collect_garbage(self, repository_id: str) -> int:
+        """Delete the rows of a repository's inactive index generations.
+
+        The active generation and one being built are kept. Symbols are
+        deleted in batches of ``GC_BATCH_ROWS``, each in its own transaction.
+
+        Args:
+            repository_id: Repository identifier
+
+        Returns:
+            Number of symbol rows deleted
+        """
+
+        def _stale_generations() -> list[int]:
+            conn = self._get_connection()
+            row = conn.execute(
+                """
+                SELECT active_generation, building_generation
+                FROM repository_generations WHERE repository_id = ?
+            """,
+                (repository_id,),
+            ).fetchone()
+            keep = {0} if row is None else {row[0], row[1]}
+            rows = conn.execute(
+                """
+                SELECT DISTINCT generation FROM symbols WHERE repository_id = ?
+                UNION
+                SELECT DISTINCT generation FROM file_manifest WHERE repository_id = ?
+            """,
+                (repository_id, repository_id),
+            ).fetchall()
+            return [row[0] for row in rows if row[0] not in keep]
+
+        def _delete_batch(generation: int) -> int:
+            with self._write_transaction() as conn:
+                return conn.execute(
+                    """
+                    DELETE FROM symbols WHERE id IN (
+                        SELECT id FROM symbols
+                        WHERE repository_id = ? AND generation = ?
+                        LIMIT ?
+                    )
+                """,
+                    (repository_id, generation, GC_BATCH_ROWS),
+                ).rowcount
+
+        def _delete_manifest(generation: int) -> None:
+            with self._write_transaction() as conn:
+                conn.execute(
+                    "DELETE FROM file_manifest WHERE repository_id = ? AND generation = ?",
+                    (repository_id, generation),
+                )
+
+        deleted = 0
+        for generation in self._execute_with_retry(
+            "Find stale generations", _stale_generations
+        ):
+            while True:
+                batch = self._execute_with_retry(
+                    "Delete stale generation", _delete_batch, generation
+                )
+                deleted += batch
+                if batch < GC_BATCH_ROWS:
+                    break
+            self._execute_with_retry(
+                "Delete stale manifest", _delete_manifest, generation
+            )
+            logger.info(f"Collected generation {generation} of {repository_id}")
+
+        return deleted
+
+    def _schedule_garbage_collection(self, repository_id: str) -> None:
+        """Collect a repository's stale generations on a background thread.
+
+        In-memory databases share one connection between threads, so they
+        collect synchronously instead.
+        """
+        if isinstance(self._local, SimpleNamespace):
+            self.collect_garbage(repository_id)
+            return
+
+        def _collect():
+            try:
+                self.collect_garbage(repository_id)
+            except Exception as e:
+                logger.warning(f"Garbage collection for {repository_id} failed: {e}")
+
+        thread = threading.Thread(
+            target=_collect, name=f"symbol-gc-{repository_id}", daemon=True
+        )
+        with self._connection_lock:
+            self._gc_threads = [t for t in self._gc_threads if t.is_alive()]
+            self._gc_threads.append(thread)
+        thread.start()
+
+    def wait_for_garbage_collection(self, timeout: float | None = None) -> None:
+        """Wait for background garbage collection to finish.
+
+        Args:
+            timeout: Maximum number of seconds to wait per collection
+        """
+        with self._connection_lock:
+            threads = list(self._gc_threads)
+        for thread in threads:
+            thread.join(timeout)
+
+    def is_active_generation_complete(self, repository_id: str) -> bool:
+        """Whether the generation searches see has been fully built.
+
+        A rebuild is staged in a generation of its own, so only a first index
+        built in place leaves the active generation incomplete until it is
+        activated.
+
+        Args:
+            repository_id: Repository identifier
+
+        Returns:
+            True if the active generation is complete, False while it is
+            built in place or if the repository was never indexed
+        """
+
+        def _is_active_generation_complete():
+            row = (
+                self._get_connection()
+                .execute(
+                    "SELECT active_complete FROM repository_generations "
+                    "WHERE repository_id = ?",
+                    (repository_id,),
+                )
+                .fetchone()
+            )
+            return row is not None and bool(row["active_complete"])
+
+        return self._execute_with_retry(
+            "Check active generation", _is_active_generation_complete
+        )
+
+    def set_indexing_progress(self, progress: IndexingProgress) -> None:
+        """Record the indexing progress of a repository.
+
+        Args:
+            progress: Progress to record, replacing the previous record
+        """
+
+        def _set_indexing_progress():
+            with self._write_transaction() as conn:
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO indexing_progress
+                    (repository_id, state, files_processed, files_total,
+                     updated_at, error_message)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                    (
+                        progress.repository_id,
+                        progress.state,
+                        progress.files_processed,
+                        progress.files_total,
+                        progress.updated_at or time.time(),
+                        progress.error_message,
+                    ),
+                )
+
+        self._execute_with_retry("Set indexing progress", _set_indexing_progress)
+
+    def get_indexing_progress(self, repository_id: str) -> IndexingProgress | None:
+        """Get the last recorded indexing progress of a repository.
+
+        Args:
+            repository_id: Repository identifier
+
+        Returns:
+            IndexingProgress if any was recorded, None otherwise
+        """
+
+        def _get_indexing_progress():
+            row = (
+                self._get_connection()
+                .execute(
+                    """
+                    SELECT * FROM indexing_progress WHERE repository_id = ?
+                """,
+                    (repository_id,),
+                )
+                .fetchone()
+            )
+            if row is None:
+                return None
+            return IndexingProgress(
+                repository_id=row["repository_id"],
+                state=row["state"],
+                files_processed=row["files_processed"],
+                files_total=row["files_total"],
+                updated_at=row["updated_at"],
+                error_message=row["error_message"],
+            )
+
+        return self._execute_with_retry("Get indexing progress", _get_indexing_progress)
+
 
 class ProductionSymbolStorage(SQLiteSymbolStorage):
     """Production symbol storage that uses standard data directory and database name."""
@@ -13,10 +13,13 @@ from typing import Any
 
 import pytest
 
+import github_tools
 import mcp_master
+from github_http import shutdown_github_executor
 from python_symbol_extractor import AbstractSymbolExtractor, PythonSymbolExtractor
 from repository_indexer import (
     AbstractRepositoryIndexer,
+    IndexingProgressCallback,
     IndexingResult,
     PythonRepositoryIndexer,
 )
@@ -25,6 +28,8 @@ from shutdown_simple import SimpleHealthMonitor, SimpleShutdownCoordinator
 from startup_orchestrator import CodebaseStartupOrchestrator
 from symbol_storage import (
     AbstractSymbolStorage,
+    FileFingerprint,
+    IndexingProgress,
     ProductionSymbolStorage,
     SQLiteSymbolStorage,
     Symbol,
@@ -132,6 +137,23 @@ def cleanup_threads():
                 pass  # Best effort cleanup
 
 
+@pytest.fixture(autouse=True)
+def clear_github_context_cache():
+    """Keep GitHub contexts (and the mocks inside them) from leaking between tests."""
+    github_tools.github_context_cache.invalidate()
+    github_tools.branch_pr_cache.invalidate()
+    yield
+    github_tools.github_context_cache.invalidate()
+    github_tools.branch_pr_cache.invalidate()
+
+
+@pytest.fixture(autouse=True)
+def shutdown_github_io_threads():
+    """Stop the GitHub I/O pool so its threads don't outlive the test."""
+    yield
+    shutdown_github_executor()
+
+
 class MockTimeProvider:
     """Mock time provider for testing time-dependent behavior."""
 
@@ -245,6 +267,26 @@ class MockSymbolStorage(AbstractSymbolStorage):
         """Initialize mock storage."""
         self.symbols: list[Symbol] = []
         self.deleted_repositories: list[str] = []
+        self.file_fingerprints: dict[str, dict[str, FileFingerprint]] = {}
+        self.indexing_progress: dict[str, IndexingProgress] = {}
+        self.active_generations: dict[str, int] = {}
+        # Repositories whose active generation has been fully built
+        self.complete_generations: set[str] = set()
+        # Generations being built: (repository_id, generation) -> symbols and
+        # fingerprints that become visible on activation
+        self.staged_generations: dict[
+            tuple[str, int], tuple[list[Symbol], dict[str, FileFingerprint]]
+        ] = {}
+
+    def _staged(
+        self, repository_id: str, generation: int | None
+    ) -> tuple[list[Symbol], dict[str, FileFingerprint]] | None:
+        """Get the staged contents of a generation, or None for the active one."""
+        if generation is None or generation == self.active_generations.get(
+            repository_id, 0
+        ):
+            return None
+        return self.staged_generations.setdefault((repository_id, generation), ([], {}))
 
     def create_schema(self) -> None:
         """Create schema (no-op for mock)."""
@@ -270,6 +312,9 @@ class MockSymbolStorage(AbstractSymbolStorage):
         """Delete symbols by repository in mock storage."""
         self.deleted_repositories.append(repository_id)
         self.symbols = [s for s in self.symbols if s.repository_id != repository_id]
+        self.file_fingerprints.pop(repository_id, None)
+        self.active_generations.pop(repository_id, None)
+        self.complete_generations.discard(repository_id)
 
     def search_symbols(
         self,
@@ -277,11 +322,14 @@ class MockSymbolStorage(AbstractSymbolStorage):
         repository_id: str | None = None,
         symbol_kind: str | None = None,
         limit: int = 50,
+        prefix: bool = False,
     ) -> list[Symbol]:
         """Search symbols in mock storage."""
         results = self.symbols.copy()
 
-        if query:
+        if query and prefix:
+            results = [s for s in results if s.name.lower().startswith(query.lower())]
+        elif query:
             results = [s for s in results if query.lower() in s.name.lower()]
         if repository_id:
             results = [s for s in results if s.repository_id == repository_id]
@@ -302,6 +350,100 @@ class MockSymbolStorage(AbstractSymbolStorage):
             if s.file_path == file_path and s.repository_id == repository_id
         ]
 
+    def get_file_fingerprints(
+        self, repository_id: str, generation: int | None = None
+    ) -> dict[str, FileFingerprint]:
+        """Get file fingerprints recorded in mock storage."""
+        staged = self._staged(repository_id, generation)
+        if staged is not None:
+            return dict(staged[1])
+        return dict(self.file_fingerprints.get(repository_id, {}))
+
+    def record_file_fingerprint(
+        self,
+        repository_id: str,
+        fingerprint: FileFingerprint,
+        generation: int | None = None,
+    ) -> None:
+        """Record a file fingerprint in mock storage."""
+        staged = self._staged(repository_id, generation)
+        fingerprints = (
+            staged[1]
+            if staged is not None
+            else self.file_fingerprints.setdefault(repository_id, {})
+        )
+        fingerprints[fingerprint.file_path] = fingerprint
+
+    def replace_file_symbols(
+        self,
+        repository_id: str,
+        file_path: str,
+        symbols: list[Symbol],
+        fingerprint: FileFingerprint,
+        generation: int | None = None,
+    ) -> None:
+        """Replace the symbols of a file in mock storage."""
+        self.delete_file_symbols(repository_id, file_path, generation)
+        staged = self._staged(repository_id, generation)
+        (staged[0] if staged is not None else self.symbols).extend(symbols)
+        self.record_file_fingerprint(repository_id, fingerprint, generation)
+
+    def delete_file_symbols(
+        self, repository_id: str, file_path: str, generation: int | None = None
+    ) -> None:
+        """Delete the symbols of a file from mock storage."""
+        staged = self._staged(repository_id, generation)
+        if staged is not None:
+            staged[0][:] = [s for s in staged[0] if s.file_path != file_path]
+            staged[1].pop(file_path, None)
+            return
+        self.symbols = [
+            s
+            for s in self.symbols
+            if not (s.file_path == file_path and s.repository_id == repository_id)
+        ]
+        self.file_fingerprints.get(repository_id, {}).pop(file_path, None)
+
+    def begin_generation(self, repository_id: str) -> int:
+        """Start a new generation, activating it if the repository is empty."""
+        generation = 1 + max(
+            [self.active_generations.get(repository_id, 0)]
+            + [g for repo, g in self.staged_generations if repo == repository_id]
+        )
+        has_content = self.file_fingerprints.get(repository_id) or any(
+            s.repository_id == repository_id for s in self.symbols
+        )
+        if has_content:
+            self.staged_generations[(repository_id, generation)] = ([], {})
+        else:
+            self.active_generations[repository_id] = generation
+            self.complete_generations.discard(repository_id)
+        return generation
+
+    def activate_generation(self, repository_id: str, generation: int) -> None:
+        """Swap a staged generation in for the repository's current contents."""
+        staged = self.staged_generations.pop((repository_id, generation), None)
+        self.active_generations[repository_id] = generation
+        self.complete_generations.add(repository_id)
+        if staged is None:
+            return
+        self.symbols = [
+            s for s in self.symbols if s.repository_id != repository_id
+        ] + staged[0]
+        self.file_fingerprints[repository_id] = staged[1]
+
+    def is_active_generation_complete(self, repository_id: str) -> bool:
+        """Check whether the active generation was activated after its build."""
+        return repository_id in self.complete_generations
+
+    def set_indexing_progress(self, progress: IndexingProgress) -> None:
+        """Record indexing progress in mock storage."""
+        self.indexing_progress[progress.repository_id] = progress
+
+    def get_indexing_progress(self, repository_id: str) -> IndexingProgress | None:
+        """Get indexing progress from mock storage."""
+        return self.indexing_progress.get(repository_id)
+
 
 class MockSymbolExtractor(AbstractSymbolExtractor):
     """Mock symbol extractor for testing."""
@@ -330,19 +472,34 @@ class MockRepositoryIndexer(AbstractRepositoryIndexer):
         self.last_repository_path = ""
         self.last_repository_id = ""
         self.clear_calls: list[str] = []
+        self.reindexed_files: list[list[str]] = []
 
     def index_repository(
-        self, repository_path: str, repository_id: str
+        self,
+        repository_path: str,
+        repository_id: str,
+        progress_callback: IndexingProgressCallback | None = None,
     ) -> IndexingResult:
         """Return predefined result and track call parameters."""
         self.last_repository_path = repository_path
         self.last_repository_id = repository_id
+        if progress_callback:
+            progress_callback(0, 0)
         return self.predefined_result
 
     def clear_repository_index(self, repository_id: str) -> None:
         """Track clear repository calls."""
         self.clear_calls.append(repository_id)
 
+    def reindex_files(
+        self, repository_path: str, repository_id: str, file_paths: list[str]
+    ) -> IndexingResult:
+        """Return predefined result and track the re-indexed files."""
+        self.last_repository_path = repository_path
+        self.last_repository_id = repository_id
+        self.reindexed_files.append(list(file_paths))
+        return self.predefined_result
+
 
 # Test fixtures for mock objects
 @pytest.fixture
@@ -0,0 +1,194 @@
+"""
+Tests for the on-disk artifact cache.
+"""
+
+import asyncio
+import io
+import threading
+import time
+import zipfile
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import github_tools
+from artifact_cache import METADATA_FILE, ArtifactCache
+
+
+def make_zip(files: dict[str, str]) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as z:
+        for name, content in files.items():
+            z.writestr(name, content)
+    return buffer.getvalue()
+
+
+def writer(data: bytes, calls: list | None = None):
+    """Build a download callback writing data to the archive path."""
+
+    def download(archive: Path) -> None:
+        if calls is not None:
+            calls.append(archive)
+        archive.write_bytes(data)
+
+    return download
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ArtifactCache(tmp_path / "artifacts")
+
+
+class TestArtifactCache:
+    """Test the ArtifactCache class."""
+
+    def test_download_is_extracted(self, cache):
+        """Test that the archive is extracted into the entry's directory."""
+        data = make_zip({"lint-output.txt": "E501", "nested/log.txt": "ok"})
+
+        output_dir = cache.get_or_fetch("test/repo", 42, writer(data))
+
+        assert (output_dir / "lint-output.txt").read_text() == "E501"
+        assert (output_dir / "nested" / "log.txt").read_text() == "ok"
+        assert not list(output_dir.parent.glob("*.zip"))
+
+    def test_repeated_fetch_skips_download(self, cache):
+        """Test that a cached artifact isn't downloaded again."""
+        calls: list[Path] = []
+        data = make_zip({"out.txt": "x"})
+
+        first = cache.get_or_fetch("test/repo", 42, writer(data, calls))
+        second = cache.get_or_fetch("test/repo", 42, writer(data, calls))
+
+        assert first == second
+        assert len(calls) == 1
+        assert cache.get("test/repo", 42) == first
+
+    def test_repositories_get_separate_directories(self, cache):
+        """Test that artifacts of different repositories never share output."""
+        a = cache.get_or_fetch("test/a", 1, writer(make_zip({"out.txt": "a"})))
+        b = cache.get_or_fetch("test/b", 1, writer(make_zip({"out.txt": "b"})))
+
+        assert a != b
+        assert (a / "out.txt").read_text() == "a"
+        assert (b / "out.txt").read_text() == "b"
+
+    def test_concurrent_fetches_download_once(self, cache):
+        """Test that concurrent callers for one artifact share a download."""
+        calls = []
+        data = make_zip({"out.txt": "x"})
+
+        def slow_download(archive: Path) -> None:
+            calls.append(archive)
+            time.sleep(0.1)
+            archive.write_bytes(data)
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    cache.get_or_fetch("test/repo", 7, slow_download)
+                )
+            )
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert len(set(results)) == 1
+
+    def test_failed_download_leaves_no_entry(self, cache):
+        """Test that an interrupted download isn't mistaken for a cached one."""
+
+        def failing(archive: Path) -> None:
+            archive.write_bytes(b"partial")
+            raise ConnectionError("reset")
+
+        with pytest.raises(ConnectionError):
+            cache.get_or_fetch("test/repo", 42, failing)
+
+        assert cache.get("test/repo", 42) is None
+        assert not list(cache.cache_dir.iterdir())
+
+    def test_least_recently_used_is_evicted(self, tmp_path):
+        """Test that the cache stays within its size bound."""
+        cache = ArtifactCache(tmp_path, max_bytes=250)
+        data = make_zip({"out.txt": "x" * 100})
+
+        cache.get_or_fetch("test/repo", 1, writer(data))
+        time.sleep(0.01)
+        cache.get_or_fetch("test/repo", 2, writer(data))
+        time.sleep(0.01)
+        # Using the first artifact makes the second the eviction candidate
+        cache.get("test/repo", 1)
+        time.sleep(0.01)
+        cache.get_or_fetch("test/repo", 3, writer(data))
+
+        assert cache.get("test/repo", 1) is not None
+        assert cache.get("test/repo", 2) is None
+        assert cache.get("test/repo", 3) is not None
+        assert cache.total_size() == 200
+
+    def test_oversized_artifact_is_kept(self, tmp_path):
+        """Test that the artifact just fetched survives its own eviction pass."""
+        cache = ArtifactCache(tmp_path, max_bytes=10)
+
+        output_dir = cache.get_or_fetch(
+            "test/repo", 1, writer(make_zip({"out.txt": "x" * 100}))
+        )
+
+        assert (output_dir / "out.txt").exists()
+        assert (output_dir.parent / METADATA_FILE).exists()
+
+
+class TestDownloadAndExtractArtifact:
+    """Test the streaming download in github_tools."""
+
+    def make_session(self, data: bytes) -> MagicMock:
+        response = MagicMock()
+        response.__enter__.return_value = response
+        response.iter_content.side_effect = lambda chunk_size: [
+            data[i : i + chunk_size] for i in range(0, len(data), chunk_size)
+        ]
+        session = MagicMock()
+        session.get.return_value = response
+        return session
+
+    def test_artifact_is_streamed_into_cache(self, cache):
+        """Test that the archive is streamed and cached by artifact id."""
+        session = self.make_session(make_zip({"out.txt": "lint"}))
+
+        with (
+            patch("github_tools.get_github_session", return_value=session),
+            patch("github_tools.artifact_cache", cache),
+        ):
+            first = asyncio.run(
+                github_tools.download_and_extract_artifact("test/repo", "5", "token")
+            )
+            second = asyncio.run(
+                github_tools.download_and_extract_artifact("test/repo", "5", "token")
+            )
+
+        assert first == second
+        assert (Path(first) / "out.txt").read_text() == "lint"
+        session.get.assert_called_once()
+        assert session.get.call_args.kwargs["stream"] is True
+
+    def test_explicit_directory(self, tmp_path):
+        """Test that an explicit extract_dir bypasses the cache."""
+        session = self.make_session(make_zip({"out.txt": "build"}))
+        target = tmp_path / "out"
+
+        with patch("github_tools.get_github_session", return_value=session):
+            result = asyncio.run(
+                github_tools.download_and_extract_artifact(
+                    "test/repo", "5", "token", str(target)
+                )
+            )
+
+        assert result == str(target)
+        assert (target / "out.txt").read_text() == "build"
@@ -12,7 +12,14 @@ from pathlib import Path
 import pytest
 
 import codebase_tools
-from symbol_storage import Symbol, SymbolKind
+from symbol_storage import (
+    INDEXING_STATE_COMPLETED,
+    INDEXING_STATE_FAILED,
+    INDEXING_STATE_IN_PROGRESS,
+    IndexingProgress,
+    Symbol,
+    SymbolKind,
+)
 
 # temp_git_repo fixture now consolidated in conftest.py
 
@@ -615,6 +622,85 @@ class TestCodebaseTools:
             assert symbol["docstring"] == "Test function docstring"
             assert symbol["repository_id"] == "test-repo"
 
+    @pytest.mark.asyncio
+    async def test_search_symbols_while_indexing(self, mock_symbol_storage):
+        """Test that results from an incomplete index are flagged as partial"""
+        mock_symbol_storage.insert_symbol(
+            Symbol("test_function", SymbolKind.FUNCTION, "/a.py", 1, 0, "test-repo")
+        )
+        mock_symbol_storage.set_indexing_progress(
+            IndexingProgress(
+                "test-repo",
+                INDEXING_STATE_IN_PROGRESS,
+                files_processed=40,
+                files_total=100,
+                updated_at=1234.0,
+            )
+        )
+
+        result = await codebase_tools.execute_search_symbols(
+            "test-repo", "/test/path", "test", symbol_storage=mock_symbol_storage
+        )
+
+        data = json.loads(result)
+        assert data["total_results"] == 1
+        assert data["partial_results"] is True
+        assert data["indexing"]["status"] == "in_progress"
+        assert data["indexing"]["files_processed"] == 40
+        assert data["indexing"]["files_total"] == 100
+        assert "in progress" in data["indexing"]["message"]
+
+    @pytest.mark.asyncio
+    async def test_search_symbols_after_failed_indexing(self, mock_symbol_storage):
+        """Test that results from a failed indexing run are flagged as partial"""
+        mock_symbol_storage.set_indexing_progress(
+            IndexingProgress(
+                "test-repo", INDEXING_STATE_FAILED, error_message="disk full"
+            )
+        )
+
+        result = await codebase_tools.execute_search_symbols(
+            "test-repo", "/test/path", "test", symbol_storage=mock_symbol_storage
+        )
+
+        data = json.loads(result)
+        assert data["partial_results"] is True
+        assert data["indexing"]["status"] == "failed"
+        assert data["indexing"]["error"] == "disk full"
+
+    @pytest.mark.asyncio
+    async def test_search_symbols_during_rebuild(self, mock_symbol_storage):
+        """Test that results of a complete index aren't flagged during a rebuild"""
+        mock_symbol_storage.activate_generation(
+            "test-repo", mock_symbol_storage.begin_generation("test-repo")
+        )
+        mock_symbol_storage.set_indexing_progress(
+            IndexingProgress("test-repo", INDEXING_STATE_IN_PROGRESS, 10, 100)
+        )
+
+        result = await codebase_tools.execute_search_symbols(
+            "test-repo", "/test/path", "test", symbol_storage=mock_symbol_storage
+        )
+
+        data = json.loads(result)
+        assert "partial_results" not in data
+        assert "indexing" not in data
+
+    @pytest.mark.asyncio
+    async def test_search_symbols_complete_index(self, mock_symbol_storage):
+        """Test that results from a complete index carry no indexing marker"""
+        mock_symbol_storage.set_indexing_progress(
+            IndexingProgress("test-repo", INDEXING_STATE_COMPLETED, 100, 100)
+        )
+
+        result = await codebase_tools.execute_search_symbols(
+            "test-repo", "/test/path", "test", symbol_storage=mock_symbol_storage
+        )
+
+        data = json.loads(result)
+        assert "partial_results" not in data
+        assert "indexing" not in data
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
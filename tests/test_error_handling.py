@@ -10,7 +10,7 @@ import sqlite3
 import tempfile
 import unittest
 from pathlib import Path
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock, Mock, patch
 
 from python_symbol_extractor import PythonSymbolExtractor
 from repository_indexer import PythonRepositoryIndexer
@@ -257,7 +257,8 @@ class TestRepositoryIndexerErrorHandling(unittest.TestCase):
         self.temp_repo.mkdir()
 
         # Create mock storage and extractor
-        self.mock_storage = Mock()
+        self.mock_storage = MagicMock()
+        self.mock_storage.get_file_fingerprints.return_value = {}
         self.mock_extractor = Mock()
 
         self.indexer = PythonRepositoryIndexer(
@@ -0,0 +1,161 @@
+"""
+Unit tests for git-backed file discovery.
+"""
+
+import subprocess
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from file_discovery import ChangedFiles, GitFileDiscovery
+
+
+def git(repo_path: Path, *args: str) -> str:
+    """Run a git command in the test repository."""
+    result = subprocess.run(
+        ["git", *args], cwd=repo_path, capture_output=True, text=True, check=True
+    )
+    return result.stdout.strip()
+
+
+@pytest.fixture
+def discovery():
+    """Create a git file discovery backend."""
+    return GitFileDiscovery()
+
+
+class TestChangedFiles:
+    """Test the ChangedFiles dataclass."""
+
+    def test_all_paths(self):
+        """Test combining modified and deleted paths."""
+        changed = ChangedFiles(modified=[Path("a.py")], deleted=[Path("b.py")])
+        assert changed.all_paths == [Path("a.py"), Path("b.py")]
+
+    def test_defaults(self):
+        """Test that a new ChangedFiles is empty."""
+        assert ChangedFiles().all_paths == []
+
+
+class TestGitFileDiscovery:
+    """Test the GitFileDiscovery backend."""
+
+    def test_list_files_tracked_and_untracked(self, discovery, temp_git_repo):
+        """Test listing tracked plus untracked-but-not-ignored files."""
+        repo_path = Path(temp_git_repo)
+        (repo_path / "src").mkdir()
+        (repo_path / "src" / "untracked.py").write_text("x = 1")
+        (repo_path / "notes.txt").write_text("not python")
+
+        files = discovery.list_files(repo_path, ".py")
+
+        assert files == [repo_path / "main.py", repo_path / "src" / "untracked.py"]
+
+    def test_list_files_skips_ignored(self, discovery, temp_git_repo):
+        """Test that files covered by .gitignore are not listed."""
+        repo_path = Path(temp_git_repo)
+        (repo_path / ".gitignore").write_text("build/\n*_generated.py\n")
+        (repo_path / "build").mkdir()
+        (repo_path / "build" / "output.py").write_text("x = 1")
+        (repo_path / "schema_generated.py").write_text("x = 1")
+
+        files = discovery.list_files(repo_path, ".py")
+
+        assert files == [repo_path / "main.py"]
+
+    def test_list_files_skips_deleted_tracked_files(self, discovery, temp_git_repo):
+        """Test that tracked files removed from the work tree are not listed."""
+        repo_path = Path(temp_git_repo)
+        (repo_path / "main.py").unlink()
+
+        assert discovery.list_files(repo_path, ".py") == []
+
+    def test_list_files_from_subdirectory(self, discovery, temp_git_repo):
+        """Test listing files of a subdirectory of a work tree."""
+        repo_path = Path(temp_git_repo)
+        (repo_path / "pkg").mkdir()
+        (repo_path / "pkg" / "module.py").write_text("x = 1")
+
+        files = discovery.list_files(repo_path / "pkg", ".py")
+
+        assert files == [repo_path / "pkg" / "module.py"]
+
+    def test_list_files_outside_git(self, discovery):
+        """Test that directories outside a work tree are not handled."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            (Path(tmp_dir) / "main.py").write_text("x = 1")
+            assert discovery.list_files(Path(tmp_dir), ".py") is None
+
+    def test_get_ignored_files(self, discovery, temp_git_repo):
+        """Test that ignored untracked paths are reported, existing or not."""
+        repo_path = Path(temp_git_repo)
+        (repo_path / ".gitignore").write_text("build/\nmain.py\n")
+        (repo_path / "build").mkdir()
+        (repo_path / "build" / "output.py").write_text("x = 1")
+        (repo_path / "src.py").write_text("x = 1")
+
+        ignored = discovery.get_ignored_files(
+            repo_path,
+            [
+                repo_path / "build" / "output.py",
+                repo_path / "build" / "deleted.py",
+                repo_path / "src.py",
+                repo_path / "main.py",
+            ],
+        )
+
+        # main.py is tracked, so the ignore rule doesn't apply to it
+        assert ignored == {
+            repo_path / "build" / "output.py",
+            repo_path / "build" / "deleted.py",
+        }
+        assert discovery.get_ignored_files(repo_path, [repo_path / "src.py"]) == set()
+
+    def test_get_ignored_files_outside_git(self, discovery):
+        """Test that ignore rules outside a work tree are unknown."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "main.py"
+            assert discovery.get_ignored_files(Path(tmp_dir), [path]) is None
+
+    def test_get_changed_files(self, discovery, temp_git_repo):
+        """Test listing files changed between two commits."""
+        repo_path = Path(temp_git_repo)
+        (repo_path / "old_name.py").write_text("def old():\n    pass\n")
+        (repo_path / "removed.py").write_text("x = 1")
+        git(repo_path, "add", ".")
+        git(repo_path, "commit", "-m", "Add files")
+        base_commit = git(repo_path, "rev-parse", "HEAD")
+
+        (repo_path / "main.py").write_text("# changed")
+        (repo_path / "removed.py").unlink()
+        git(repo_path, "mv", "old_name.py", "new_name.py")
+        (repo_path / "added.py").write_text("x = 2")
+        (repo_path / "README.md").write_text("# changed too")
+        git(repo_path, "add", "-A")
+        git(repo_path, "commit", "-m", "Change files")
+
+        changed = discovery.get_changed_files(repo_path, base_commit, "HEAD", ".py")
+
+        assert changed is not None
+        assert sorted(changed.modified) == [
+            repo_path / "added.py",
+            repo_path / "main.py",
+            repo_path / "new_name.py",
+        ]
+        assert sorted(changed.deleted) == [
+            repo_path / "old_name.py",
+            repo_path / "removed.py",
+        ]
+
+    def test_get_changed_files_unknown_commit(self, discovery, temp_git_repo):
+        """Test that an unknown base commit yields no change set."""
+        changed = discovery.get_changed_files(
+            Path(temp_git_repo), "0" * 40, "HEAD", ".py"
+        )
+        assert changed is None
+
+    def test_git_not_installed(self, temp_git_repo, monkeypatch):
+        """Test that a missing git binary makes the backend step aside."""
+        monkeypatch.setenv("PATH", "")
+        assert GitFileDiscovery().list_files(Path(temp_git_repo), ".py") is None
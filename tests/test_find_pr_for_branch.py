@@ -0,0 +1,164 @@
+"""
+Tests for looking up the PR of a branch.
+"""
+
+import asyncio
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import github_tools
+from github_tools import BranchPRCache, _find_pr_by_head_ref
+
+
+def make_pr(number: int, branch: str, state: str = "open") -> MagicMock:
+    pr = MagicMock()
+    pr.number = number
+    pr.state = state
+    pr.title = f"PR {number}"
+    pr.html_url = f"https://github.com/test/repo/pull/{number}"
+    pr.user.login = "author"
+    pr.base.ref = "main"
+    pr.head.ref = branch
+    return pr
+
+
+@pytest.fixture
+def repo():
+    return MagicMock()
+
+
+class TestFindPRByHeadRef:
+    """Test the server-side head lookup and its cache."""
+
+    def test_filters_by_head_on_the_server(self, repo):
+        """Test that GitHub is asked for the branch's PRs only."""
+        repo.get_pulls.return_value = [make_pr(7, "feature")]
+
+        pr = _find_pr_by_head_ref(repo, "test/repo", "feature")
+
+        assert pr is not None and pr.number == 7
+        repo.get_pulls.assert_called_once_with(state="all", head="test:feature")
+
+    def test_only_first_result_is_read(self, repo):
+        """Test that the lookup stops at the newest PR instead of paging on."""
+        consumed = []
+
+        def pulls():
+            for pr in [make_pr(9, "feature", "closed"), make_pr(3, "feature")]:
+                consumed.append(pr.number)
+                yield pr
+
+        repo.get_pulls.return_value = pulls()
+
+        pr = _find_pr_by_head_ref(repo, "test/repo", "feature")
+
+        assert pr is not None and pr.number == 9
+        assert consumed == [9]
+
+    def test_open_pr_is_cached(self, repo):
+        """Test that a second lookup fetches the cached PR directly."""
+        repo.get_pulls.return_value = [make_pr(7, "feature")]
+        repo.get_pull.return_value = make_pr(7, "feature")
+
+        _find_pr_by_head_ref(repo, "test/repo", "feature")
+        pr = _find_pr_by_head_ref(repo, "test/repo", "feature")
+
+        assert pr is not None and pr.number == 7
+        repo.get_pulls.assert_called_once()
+        repo.get_pull.assert_called_once_with(7)
+
+    def test_closed_cached_pr_triggers_new_lookup(self, repo):
+        """Test that a newer PR is found after the cached one was closed."""
+        repo.get_pulls.return_value = [make_pr(7, "feature")]
+        _find_pr_by_head_ref(repo, "test/repo", "feature")
+
+        repo.get_pull.return_value = make_pr(7, "feature", "closed")
+        repo.get_pulls.return_value = [make_pr(8, "feature")]
+        pr = _find_pr_by_head_ref(repo, "test/repo", "feature")
+
+        assert pr is not None and pr.number == 8
+        assert github_tools.branch_pr_cache.get("test/repo", "feature") == 8
+
+    def test_closed_pr_is_not_cached(self, repo):
+        """Test that only open PRs are remembered."""
+        repo.get_pulls.return_value = [make_pr(7, "feature", "merged")]
+
+        pr = _find_pr_by_head_ref(repo, "test/repo", "feature")
+
+        assert pr is not None and pr.number == 7
+        assert github_tools.branch_pr_cache.get("test/repo", "feature") is None
+
+    def test_missing_pr(self, repo):
+        """Test that a branch without PRs yields None and isn't cached."""
+        repo.get_pulls.return_value = []
+
+        assert _find_pr_by_head_ref(repo, "test/repo", "feature") is None
+        assert github_tools.branch_pr_cache.get("test/repo", "feature") is None
+
+
+class TestBranchPRCache:
+    """Test the BranchPRCache class."""
+
+    def test_entries_expire(self):
+        """Test that mappings are looked up again after the TTL."""
+        cache = BranchPRCache(ttl=10.0)
+        with patch("github_tools.time.monotonic", return_value=100.0):
+            cache.put("test/repo", "feature", 7)
+        with patch("github_tools.time.monotonic", return_value=105.0):
+            assert cache.get("test/repo", "feature") == 7
+        with patch("github_tools.time.monotonic", return_value=111.0):
+            assert cache.get("test/repo", "feature") is None
+
+    def test_invalidate(self):
+        """Test dropping one branch, one repository or everything."""
+        cache = BranchPRCache()
+        cache.put("test/a", "one", 1)
+        cache.put("test/a", "two", 2)
+        cache.put("test/b", "one", 3)
+
+        cache.invalidate("test/a", "one")
+        assert cache.get("test/a", "one") is None
+        assert cache.get("test/a", "two") == 2
+
+        cache.invalidate("test/a")
+        assert cache.get("test/a", "two") is None
+        assert cache.get("test/b", "one") == 3
+
+        cache.invalidate()
+        assert cache.get("test/b", "one") is None
+
+
+class TestExecuteFindPRForBranch:
+    """Test the tool handler."""
+
+    def test_result(self, repo):
+        """Test that the handler reports the PR found for the branch."""
+        context = MagicMock()
+        context.repo = repo
+        context.repo_name = "test/repo"
+        repo.get_pulls.return_value = [make_pr(7, "feature")]
+
+        with patch("github_tools.get_github_context", return_value=context):
+            result = json.loads(
+                asyncio.run(github_tools.execute_find_pr_for_branch("repo", "feature"))
+            )
+
+        assert result["found"] is True
+        assert result["pr_number"] == 7
+        assert result["head_branch"] == "feature"
+
+    def test_not_found(self, repo):
+        """Test the result for a branch without a PR."""
+        context = MagicMock()
+        context.repo = repo
+        context.repo_name = "test/repo"
+        repo.get_pulls.return_value = []
+
+        with patch("github_tools.get_github_context", return_value=context):
+            result = json.loads(
+                asyncio.run(github_tools.execute_find_pr_for_branch("repo", "feature"))
+            )
+
+        assert result["found"] is False
@@ -0,0 +1,156 @@
+"""
+Tests for reading git metadata without running git.
+"""
+
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from git_metadata import GitMetadataError, GitMetadataReader, _parse_config
+
+
+def git(repo_path: Path | str, *args: str) -> str:
+    """Run a git command in the test repository and return its output."""
+    return subprocess.run(
+        ["git", *args], cwd=repo_path, capture_output=True, check=True, text=True
+    ).stdout.strip()
+
+
+@pytest.fixture
+def reader():
+    return GitMetadataReader()
+
+
+class TestHead:
+    """Test reading the current branch and commit."""
+
+    def test_matches_git(self, reader, temp_git_repo):
+        """Test that branch and commit agree with git's own answers."""
+        assert reader.current_branch(temp_git_repo) == git(
+            temp_git_repo, "branch", "--show-current"
+        )
+        assert reader.current_commit(temp_git_repo) == git(
+            temp_git_repo, "rev-parse", "HEAD"
+        )
+
+    def test_branch_switch_is_noticed(self, reader, temp_git_repo):
+        """Test that a cached result is dropped once HEAD changes."""
+        reader.current_branch(temp_git_repo)
+        git(temp_git_repo, "checkout", "-q", "-b", "feature/x")
+        (Path(temp_git_repo) / "new.txt").write_text("new")
+        git(temp_git_repo, "add", "new.txt")
+        git(temp_git_repo, "commit", "-q", "-m", "New file")
+
+        assert reader.current_branch(temp_git_repo) == "feature/x"
+        assert reader.current_commit(temp_git_repo) == git(
+            temp_git_repo, "rev-parse", "HEAD"
+        )
+
+    def test_packed_refs(self, reader, temp_git_repo):
+        """Test that branches moved into packed-refs are still resolved."""
+        git(temp_git_repo, "pack-refs", "--all")
+        branch = git(temp_git_repo, "branch", "--show-current")
+
+        assert not (Path(temp_git_repo) / ".git" / "refs" / "heads" / branch).exists()
+        assert reader.current_commit(temp_git_repo) == git(
+            temp_git_repo, "rev-parse", "HEAD"
+        )
+
+    def test_detached_head(self, reader, temp_git_repo):
+        """Test that a detached HEAD has no branch but a commit."""
+        commit = git(temp_git_repo, "rev-parse", "HEAD")
+        git(temp_git_repo, "checkout", "-q", "--detach")
+
+        assert reader.current_branch(temp_git_repo) == ""
+        assert reader.current_commit(temp_git_repo) == commit
+
+    def test_unborn_branch(self, reader, tmp_path):
+        """Test that a branch without commits has no commit."""
+        git(tmp_path, "init", "-q", "-b", "main")
+
+        assert reader.current_branch(tmp_path) == "main"
+        with pytest.raises(GitMetadataError, match="no commits yet"):
+            reader.current_commit(tmp_path)
+
+    def test_linked_worktree(self, reader, temp_git_repo, tmp_path):
+        """Test that a linked worktree has its own HEAD but shared refs."""
+        worktree = tmp_path / "worktree"
+        git(temp_git_repo, "worktree", "add", "-q", "-b", "topic", str(worktree))
+
+        assert reader.current_branch(worktree) == "topic"
+        assert reader.current_commit(worktree) == git(worktree, "rev-parse", "HEAD")
+        assert reader.git_dirs(worktree).common_dir == (
+            (Path(temp_git_repo) / ".git").resolve()
+        )
+
+    def test_not_a_repository(self, reader, tmp_path):
+        """Test that a directory without git metadata is an error."""
+        with pytest.raises(GitMetadataError, match="Not a git work tree"):
+            reader.current_branch(tmp_path)
+
+    def test_unchanged_files_are_not_read_again(self, reader, temp_git_repo):
+        """Test that a cached result costs stat calls only."""
+        reader.current_commit(temp_git_repo)
+
+        with patch("pathlib.Path.read_text") as read_text:
+            reader.current_branch(temp_git_repo)
+            reader.current_commit(temp_git_repo)
+
+        read_text.assert_not_called()
+
+    def test_no_subprocess(self, reader, temp_git_repo):
+        """Test that queries don't run git."""
+        with patch("subprocess.run") as run, patch("subprocess.Popen") as popen:
+            reader.current_branch(temp_git_repo)
+            reader.current_commit(temp_git_repo)
+            reader.remote_url(temp_git_repo)
+
+        run.assert_not_called()
+        popen.assert_not_called()
+
+
+class TestConfig:
+    """Test reading the repository config."""
+
+    def test_remote_url_matches_git(self, reader, temp_git_repo):
+        """Test that the origin URL agrees with git config."""
+        assert reader.remote_url(temp_git_repo) is None
+
+        git(temp_git_repo, "remote", "add", "origin", "git@github.com:test/repo.git")
+
+        assert reader.remote_url(temp_git_repo) == git(
+            temp_git_repo, "config", "--get", "remote.origin.url"
+        )
+
+    def test_parse_config(self):
+        """Test sections, quoting, comments and repeated keys."""
+        values = _parse_config(
+            "[core]\n"
+            "\tbare = false\n"
+            "\tFileMode\n"
+            '[remote "Upstream"]\n'
+            '\turl = "https://example.com/a b.git" ; comment\n'
+            "\turl = https://example.com/last.git # comment\n"
+            "[branch.main]\n"
+            "\tremote = origin\n"
+            "; [ignored]\n"
+        )
+
+        assert values == {
+            "core.bare": "false",
+            "core.filemode": "true",
+            "remote.Upstream.url": "https://example.com/last.git",
+            "branch.main.remote": "origin",
+        }
+
+    def test_config_value_case(self, reader, temp_git_repo):
+        """Test that only subsections are matched case sensitively."""
+        git(temp_git_repo, "remote", "add", "Upstream", "https://example.com/u.git")
+
+        assert reader.config_value(temp_git_repo, "REMOTE.Upstream.URL") == (
+            "https://example.com/u.git"
+        )
+        assert reader.config_value(temp_git_repo, "remote.upstream.url") is None
+        assert reader.config_value(temp_git_repo, "Core.Bare") == "false"
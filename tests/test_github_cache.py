@@ -0,0 +1,255 @@
+"""
+Tests for the conditional-request GitHub response cache.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from github_cache import GitHubResponseCache, response_cache_key
+from github_http import create_github_session
+
+
+class VersionedServer:
+    """Local HTTP server serving JSON resources with ETag revalidation."""
+
+    def __init__(self):
+        self.version = 1
+        self.requests: list[dict[str, str]] = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):  # noqa: N802
+                server.requests.append(dict(self.headers))
+                etag = f'"v{server.version}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                body = json.dumps(
+                    {"path": self.path, "version": server.version}
+                ).encode()
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    versioned = VersionedServer()
+    yield versioned
+    versioned.close()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return GitHubResponseCache(tmp_path / "cache")
+
+
+@pytest.fixture
+def session(cache):
+    http = create_github_session(backoff_factor=0.0, cache=cache)
+    yield http
+    http.close()
+
+
+def make_response(url, body, headers=None):
+    """Build a 200 JSON response as if received from the server."""
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response._content = body
+    response.headers.update(
+        {"Content-Type": "application/json", "ETag": '"e1"', **(headers or {})}
+    )
+    return response
+
+
+def make_key(url, token="secret"):
+    return response_cache_key(
+        requests.Request(
+            "GET", url, headers={"Authorization": f"token {token}"}
+        ).prepare()
+    )
+
+
+class TestConditionalRequests:
+    """Test revalidation through the session."""
+
+    def test_unchanged_resource_is_served_from_cache(self, server, session, cache):
+        """Test that a 304 is answered with the cached body."""
+        url = server.url + "/repos/o/r/pulls/1/comments"
+        headers = {"Authorization": "token secret"}
+
+        first = session.get(url, headers=headers)
+        second = session.get(url, headers=headers)
+
+        assert (
+            first.json()
+            == second.json()
+            == {"path": "/repos/o/r/pulls/1/comments", "version": 1}
+        )
+        assert second.status_code == 200
+        assert "If-None-Match" not in server.requests[0]
+        assert server.requests[1]["If-None-Match"] == '"v1"'
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_changed_resource_is_refetched(self, server, session, cache):
+        """Test that a modified resource replaces the cached entry."""
+        url = server.url + "/repos/o/r/actions/runs"
+
+        session.get(url)
+        server.version = 2
+        changed = session.get(url)
+        again = session.get(url)
+
+        assert changed.json()["version"] == 2
+        assert again.json()["version"] == 2
+        assert server.requests[2]["If-None-Match"] == '"v2"'
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 2
+
+    def test_tokens_do_not_share_entries(self, server, session):
+        """Test that responses cached for one token aren't used for another."""
+        url = server.url + "/repos/o/r/pulls/1"
+
+        session.get(url, headers={"Authorization": "token first"})
+        session.get(url, headers={"Authorization": "token second"})
+
+        assert "If-None-Match" not in server.requests[1]
+
+    def test_writes_are_not_cached(self, server, session, cache):
+        """Test that only GET requests use the cache."""
+        url = server.url + "/repos/o/r/pulls/1"
+        session.get(url)
+
+        # The server doesn't implement POST and answers 501
+        assert session.post(url, json={}).status_code == 501
+        assert "If-None-Match" not in server.requests[-1]
+        assert cache.stats()["misses"] == 1
+
+    def test_disk_tier_survives_a_new_cache(self, server, tmp_path):
+        """Test that a restarted worker revalidates from the disk tier."""
+        url = server.url + "/repos/o/r/issues/1/comments"
+        for _ in range(2):
+            cache = GitHubResponseCache(tmp_path / "cache")
+            http = create_github_session(cache=cache)
+            try:
+                assert http.get(url).json()["version"] == 1
+            finally:
+                http.close()
+
+        assert server.requests[1]["If-None-Match"] == '"v1"'
+        assert cache.stats()["hits"] == 1
+
+
+class TestGitHubResponseCache:
+    """Test storage and eviction."""
+
+    def test_key_ignores_authorization_scheme(self):
+        """Test that "token" and "Bearer" headers of one token share a key."""
+        url = "https://api.github.com/repos/o/r/actions/runs"
+        bearer = requests.Request(
+            "GET", url, headers={"Authorization": "Bearer secret"}
+        ).prepare()
+
+        assert response_cache_key(bearer) == make_key(url)
+        assert make_key(url, "other") != make_key(url)
+
+    def test_token_is_not_written_to_disk(self, cache, tmp_path):
+        """Test that cache files don't contain the token."""
+        url = "https://api.github.com/repos/o/r/pulls/1"
+        cache.store(make_key(url), make_response(url, b"{}"))
+
+        for path in (tmp_path / "cache").iterdir():
+            assert "secret" not in path.read_text()
+
+    def test_uncacheable_responses(self, cache):
+        """Test that responses without validators or JSON bodies are skipped."""
+        url = "https://api.github.com/repos/o/r/actions/artifacts/1/zip"
+        no_validator = make_response(url, b"{}")
+        del no_validator.headers["ETag"]
+        archive = make_response(url, b"PK", {"Content-Type": "application/zip"})
+
+        assert not cache.store(make_key(url), no_validator)
+        assert not cache.store(make_key(url), archive)
+        assert cache.lookup(make_key(url)) is None
+
+    def test_large_responses_are_not_cached(self, tmp_path):
+        """Test that bodies above the entry limit are skipped."""
+        cache = GitHubResponseCache(tmp_path, max_entry_bytes=10)
+        url = "https://api.github.com/repos/o/r/pulls"
+
+        assert not cache.store(
+            make_key(url), make_response(url, b"[" + b" " * 20 + b"]")
+        )
+
+    def test_memory_tier_evicts_least_recently_used(self):
+        """Test that the memory tier stays within its size bound."""
+        cache = GitHubResponseCache(None, max_memory_bytes=25)
+        keys = []
+        for i in range(3):
+            url = f"https://api.github.com/repos/o/r/pulls/{i}"
+            keys.append(make_key(url))
+            cache.store(keys[-1], make_response(url, b"[" + b"0" * 8 + b"]"))
+            if i == 1:
+                # Touch the first entry so the second one is evicted instead
+                cache.lookup(keys[0])
+
+        assert cache.lookup(keys[0]) is not None
+        assert cache.lookup(keys[1]) is None
+        assert cache.lookup(keys[2]) is not None
+        assert cache.stats()["evictions"] == 1
+
+    def test_disk_tier_evicts_down_to_budget(self, tmp_path):
+        """Test that old disk entries are deleted once over budget."""
+        cache = GitHubResponseCache(tmp_path, max_disk_bytes=1000)
+        for i in range(10):
+            url = f"https://api.github.com/repos/o/r/pulls/{i}"
+            cache.store(make_key(url), make_response(url, b"[" + b"0" * 100 + b"]"))
+
+        disk_bytes = sum(path.stat().st_size for path in tmp_path.glob("*.json"))
+        assert disk_bytes <= 1000
+        assert cache.stats()["disk_bytes"] == disk_bytes
+
+    def test_corrupt_disk_entry_is_dropped(self, tmp_path):
+        """Test that an unreadable file is treated as a miss and removed."""
+        url = "https://api.github.com/repos/o/r/pulls/1"
+        key = make_key(url)
+        (tmp_path / f"{key}.json").write_text("{not json")
+
+        assert GitHubResponseCache(tmp_path).lookup(key) is None
+        assert not (tmp_path / f"{key}.json").exists()
+
+    def test_clear(self, cache, tmp_path):
+        """Test that clear empties both tiers."""
+        url = "https://api.github.com/repos/o/r/pulls/1"
+        cache.store(make_key(url), make_response(url, b"{}"))
+
+        cache.clear()
+
+        assert cache.lookup(make_key(url)) is None
+        assert list((tmp_path / "cache").glob("*.json")) == []
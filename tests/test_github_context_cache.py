@@ -0,0 +1,183 @@
+"""
+Tests for the per-repository GitHubAPIContext cache.
+"""
+
+import os
+import subprocess
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from constants import Language
+from github_tools import GitHubContextCache, _git_config_path
+from repository_manager import RepositoryConfig
+
+
+def git(repo_path: Path, *args: str) -> None:
+    """Run a git command in the test repository."""
+    subprocess.run(["git", *args], cwd=repo_path, capture_output=True, check=True)
+
+
+@pytest.fixture
+def repo_config(temp_git_repo):
+    """Configuration of a git repository with a GitHub remote."""
+    git(
+        Path(temp_git_repo),
+        "remote",
+        "add",
+        "origin",
+        "https://github.com/test/project-a.git",
+    )
+    return RepositoryConfig.create_repository_config(
+        name="project-a",
+        path=temp_git_repo,
+        description="Project A",
+        language=Language.PYTHON,
+        port=8081,
+        python_path="/usr/bin/python3",
+    )
+
+
+@pytest.fixture
+def github_class():
+    """Patch the Github client class."""
+    with (
+        patch("github_tools.Github") as mock_github_class,
+        patch.dict(os.environ, {"GITHUB_TOKEN": "test-token"}),
+    ):
+        mock_github_class.return_value = MagicMock()
+        yield mock_github_class
+
+
+def touch_git_config(repo_path: str) -> None:
+    """Move the git config's mtime forward, as an edit would."""
+    config_path = Path(repo_path) / ".git" / "config"
+    stat = config_path.stat()
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestGitHubContextCache:
+    """Test the GitHubContextCache class."""
+
+    def test_context_is_reused(self, repo_config, github_class):
+        """Test that the setup cost is paid once per repository."""
+        cache = GitHubContextCache()
+
+        first = cache.get(repo_config)
+        second = cache.get(repo_config)
+
+        assert first is second
+        assert first.repo_name == "test/project-a"
+        github_class.return_value.get_repo.assert_called_once_with("test/project-a")
+
+    def test_remote_change_rebuilds_context(self, repo_config, github_class):
+        """Test that editing the git config invalidates the context."""
+        cache = GitHubContextCache()
+        first = cache.get(repo_config)
+
+        git(
+            Path(repo_config.path),
+            "remote",
+            "set-url",
+            "origin",
+            "git@github.com:test/project-b.git",
+        )
+        touch_git_config(repo_config.path)
+        second = cache.get(repo_config)
+
+        assert second is not first
+        assert second.repo_name == "test/project-b"
+
+    def test_token_change_rebuilds_context(self, repo_config, github_class):
+        """Test that a new GITHUB_TOKEN invalidates the context."""
+        cache = GitHubContextCache()
+        first = cache.get(repo_config)
+
+        with patch.dict(os.environ, {"GITHUB_TOKEN": "rotated-token"}):
+            second = cache.get(repo_config)
+
+        assert second is not first
+        assert second.github_token == "rotated-token"
+
+    def test_expired_context_is_rebuilt(self, repo_config, github_class):
+        """Test that contexts are rebuilt after the TTL."""
+        cache = GitHubContextCache(ttl=0.0)
+
+        assert cache.get(repo_config) is not cache.get(repo_config)
+
+    def test_invalidate(self, repo_config, github_class):
+        """Test dropping a cached context explicitly."""
+        cache = GitHubContextCache()
+        first = cache.get(repo_config)
+
+        cache.invalidate("other-repo")
+        assert cache.get(repo_config) is first
+
+        cache.invalidate("project-a")
+        assert cache.get(repo_config) is not first
+
+    def test_failures_are_not_cached(self, repo_config, github_class):
+        """Test that a failed build is retried on the next call."""
+        cache = GitHubContextCache()
+        github_class.return_value.get_repo.side_effect = [
+            Exception("network down"),
+            MagicMock(),
+        ]
+
+        with pytest.raises(RuntimeError, match="network down"):
+            cache.get(repo_config)
+        assert cache.get(repo_config).repo is not None
+
+    def test_concurrent_callers_share_one_build(self, repo_config, github_class):
+        """Test that simultaneous cache misses build a single context."""
+        cache = GitHubContextCache()
+        contexts = []
+        barrier = threading.Barrier(4)
+
+        def get_context():
+            barrier.wait()
+            contexts.append(cache.get(repo_config))
+
+        threads = [threading.Thread(target=get_context) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len({id(context) for context in contexts}) == 1
+        github_class.return_value.get_repo.assert_called_once()
+
+    def test_put_seeds_cache(self, repo_config, github_class):
+        """Test that a context built elsewhere is reused."""
+        cache = GitHubContextCache()
+        context = MagicMock()
+
+        cache.put(repo_config, context)
+
+        assert cache.get(repo_config) is context
+        github_class.assert_not_called()
+
+
+class TestGitConfigPath:
+    """Test locating the git config of a work tree."""
+
+    def test_regular_repository(self, temp_git_repo):
+        """Test a work tree with a .git directory."""
+        assert (
+            _git_config_path(temp_git_repo) == Path(temp_git_repo) / ".git" / "config"
+        )
+
+    def test_linked_worktree(self, temp_git_repo, tmp_path):
+        """Test that linked worktrees resolve to the shared config."""
+        worktree = tmp_path / "worktree"
+        git(Path(temp_git_repo), "worktree", "add", "-b", "topic", str(worktree))
+
+        config_path = _git_config_path(str(worktree))
+
+        assert config_path == (Path(temp_git_repo) / ".git" / "config").resolve()
+
+    def test_not_a_repository(self, tmp_path):
+        """Test a directory without git metadata."""
+        assert _git_config_path(str(tmp_path)) is None
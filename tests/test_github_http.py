@@ -0,0 +1,283 @@
+"""
+Tests for the pooled GitHub HTTP session.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+import github_tools
+from github_http import (
+    DEFAULT_IO_WORKERS,
+    close_github_session,
+    create_github_session,
+    get_github_session,
+    run_blocking,
+    shutdown_github_executor,
+)
+
+
+class ScriptedServer:
+    """Local HTTP server answering with a scripted sequence of responses."""
+
+    def __init__(self):
+        self.responses: deque[tuple[int, dict[str, str], float]] = deque()
+        self.requests: list[tuple[str, str, tuple[str, int]]] = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _respond(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+                server.requests.append((self.command, self.path, self.client_address))
+                status, headers, delay = (
+                    server.responses.popleft() if server.responses else (200, {}, 0.0)
+                )
+                time.sleep(delay)
+                body = json.dumps({"status": status}).encode()
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = _respond  # noqa: N815
+            do_POST = _respond  # noqa: N815
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    scripted = ScriptedServer()
+    yield scripted
+    scripted.close()
+
+
+@pytest.fixture
+def session():
+    http = create_github_session(backoff_factor=0.0)
+    yield http
+    http.close()
+
+
+class TestGitHubSession:
+    """Test the retrying, pooled session."""
+
+    def test_connections_are_reused(self, server, session):
+        """Test that consecutive requests share one keep-alive connection."""
+        for path in ["/pulls/1", "/pulls/1/comments", "/issues/1/comments"]:
+            assert session.get(server.url + path).status_code == 200
+
+        client_addresses = {address for _, _, address in server.requests}
+        assert len(server.requests) == 3
+        assert len(client_addresses) == 1
+
+    def test_server_errors_are_retried(self, server, session):
+        """Test that transient 5xx responses are retried for GET."""
+        server.responses.extend([(502, {}, 0.0), (503, {}, 0.0)])
+
+        response = session.get(server.url + "/repos")
+
+        assert response.status_code == 200
+        assert len(server.requests) == 3
+
+    def test_retries_are_bounded(self, server):
+        """Test that the final failed response is returned to the caller."""
+        server.responses.extend([(500, {}, 0.0)] * 5)
+        http = create_github_session(max_retries=2, backoff_factor=0.0)
+        try:
+            response = http.get(server.url + "/repos")
+        finally:
+            http.close()
+
+        assert response.status_code == 500
+        assert len(server.requests) == 3
+
+    def test_post_is_not_retried_on_server_error(self, server, session):
+        """Test that a POST that may have been processed is not repeated."""
+        server.responses.append((500, {}, 0.0))
+
+        response = session.post(server.url + "/comments", json={"body": "hi"})
+
+        assert response.status_code == 500
+        assert len(server.requests) == 1
+
+    def test_secondary_rate_limit_is_retried(self, server, session):
+        """Test that rate-limited requests are retried after Retry-After."""
+        server.responses.extend(
+            [(403, {"Retry-After": "0"}, 0.0), (429, {"Retry-After": "0"}, 0.0)]
+        )
+
+        response = session.post(server.url + "/comments", json={"body": "hi"})
+
+        assert response.status_code == 200
+        assert [method for method, _, _ in server.requests] == ["POST"] * 3
+
+    def test_forbidden_without_retry_after_is_not_retried(self, server, session):
+        """Test that plain permission errors are returned immediately."""
+        server.responses.append((403, {}, 0.0))
+
+        assert session.get(server.url + "/repos").status_code == 403
+        assert len(server.requests) == 1
+
+    def test_long_rate_limit_is_not_waited_for(self, server, session):
+        """Test that a rate limit lifting far in the future isn't slept on."""
+        server.responses.append((403, {"Retry-After": "3600"}, 0.0))
+
+        started = time.monotonic()
+        response = session.get(server.url + "/repos")
+
+        assert response.status_code == 403
+        assert time.monotonic() - started < 5
+        assert len(server.requests) == 1
+
+    def test_default_timeout(self, server):
+        """Test that requests without a timeout can't hang forever."""
+        server.responses.append((200, {}, 1.0))
+        http = create_github_session(max_retries=0, timeout=0.1)
+        try:
+            with pytest.raises(requests.exceptions.ConnectionError):
+                http.get(server.url + "/slow")
+        finally:
+            http.close()
+
+    def test_shared_session(self):
+        """Test that the process-wide session is created once."""
+        close_github_session()
+        try:
+            first = get_github_session()
+            assert get_github_session() is first
+
+            close_github_session()
+            assert get_github_session() is not first
+        finally:
+            close_github_session()
+
+
+class TestRunBlocking:
+    """Test offloading blocking calls from the event loop."""
+
+    def test_event_loop_stays_responsive(self):
+        """Test that the loop keeps running while a blocking call is offloaded."""
+
+        async def scenario():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.01)
+
+            def slow_call() -> str:
+                time.sleep(0.2)
+                return "done"
+
+            task = asyncio.create_task(ticker())
+            result = await run_blocking(slow_call)
+            task.cancel()
+            return result, ticks
+
+        result, ticks = asyncio.run(scenario())
+
+        assert result == "done"
+        assert ticks >= 5
+
+    def test_calls_run_concurrently_up_to_the_limit(self):
+        """Test that independent calls overlap, bounded by the pool size."""
+        lock = threading.Lock()
+        running = 0
+        peak = 0
+
+        def work():
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.05)
+            with lock:
+                running -= 1
+
+        async def scenario():
+            await asyncio.gather(
+                *(run_blocking(work) for _ in range(DEFAULT_IO_WORKERS * 2))
+            )
+
+        asyncio.run(scenario())
+
+        assert 1 < peak <= DEFAULT_IO_WORKERS
+
+    def test_exceptions_propagate(self):
+        """Test that errors of the blocking call reach the awaiting caller."""
+
+        def fail(message):
+            raise RuntimeError(message)
+
+        with pytest.raises(RuntimeError, match="boom"):
+            asyncio.run(run_blocking(fail, "boom"))
+
+    def test_executor_is_recreated_after_shutdown(self):
+        """Test that calls after a shutdown get a fresh pool."""
+        shutdown_github_executor()
+
+        assert asyncio.run(run_blocking(sum, [1, 2, 3])) == 6
+
+
+class TestGitHubToolsUseSession:
+    """Test that raw REST calls in github_tools go through the session."""
+
+    def test_pr_comments_use_shared_session(self):
+        """Test that the PR comment fetch makes its calls on one session."""
+        context = MagicMock()
+        context.repo_name = "test/repo"
+        context.github_token = "token"
+
+        def response(data):
+            resp = MagicMock(status_code=200)
+            resp.json.return_value = data
+            return resp
+
+        responses = {
+            "https://api.github.com/repos/test/repo/pulls/1": {
+                "title": "Test PR",
+                "state": "open",
+            },
+            "https://api.github.com/repos/test/repo/pulls/1/comments": [],
+            "https://api.github.com/repos/test/repo/issues/1/comments": [],
+        }
+        http = MagicMock()
+        http.get.side_effect = lambda url, **kwargs: response(responses[url])
+
+        with (
+            patch("github_tools.get_github_context", return_value=context),
+            patch("github_tools.get_github_session", return_value=http),
+        ):
+            result = json.loads(
+                asyncio.run(github_tools.execute_get_pr_comments("repo", 1))
+            )
+
+        assert result["title"] == "Test PR"
+        assert http.get.call_count == 3
@@ -0,0 +1,334 @@
+"""
+Tests for the streaming CI log parsers.
+"""
+
+import json
+import re
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+import github_tools
+from log_parsing import (
+    OutputParser,
+    OutputParserRegistry,
+    dispatch_files,
+    iter_file_lines,
+    iter_lint_errors,
+    iter_swiftlint_violations,
+    parse_artifact,
+)
+
+RUFF_LINE = (
+    "::error title=Ruff (UP045),file=/repo/app/models.py,line=503,col=49,"
+    "endLine=503,endColumn=62::app/models.py:503:49: UP045 Use `X | None`"
+)
+MYPY_LINE = "app/models.py:12: error: Cannot assign to a method  [method-assign]"
+SWIFT_LINE = (
+    "/repo/Sources/App/View.swift:42:7: warning: Line should be 120 characters"
+    " or less (line_length)"
+)
+
+
+class TestLintErrors:
+    """Test iter_lint_errors."""
+
+    def test_ruff_annotation(self):
+        """Test that one match captures every field of a ruff annotation."""
+        [error] = iter_lint_errors([RUFF_LINE], "python")
+
+        assert error == {
+            "type": "ruff",
+            "file": "/repo/app/models.py",
+            "line": 503,
+            "column": 49,
+            "rule": "UP045",
+            "message": "app/models.py:503:49: UP045 Use `X | None`",
+            "severity": "error",
+        }
+
+    def test_mypy_error(self):
+        """Test that the error code is split off the mypy message."""
+        [error] = iter_lint_errors([MYPY_LINE], "python")
+
+        assert error == {
+            "type": "mypy",
+            "file": "app/models.py",
+            "line": 12,
+            "message": "Cannot assign to a method",
+            "error_code": "method-assign",
+            "severity": "error",
+        }
+
+    def test_swiftlint_violation(self):
+        """Test that SwiftLint lines are parsed for Swift repositories."""
+        [error] = iter_lint_errors([SWIFT_LINE], "swift")
+
+        assert error["file"] == "/repo/Sources/App/View.swift"
+        assert error["line"] == 42
+        assert error["severity"] == "warning"
+        assert error["message"] == "Line should be 120 characters or less"
+        assert error["rule"] == "line_length"
+
+    @pytest.mark.parametrize(
+        "line",
+        [
+            "/a/B.swift:3:1: error: Force cast (force_cast)",
+            "/a/B.swift: warning: no line number",
+            "/a/B.swift:3:1: error: Force cast",
+        ],
+    )
+    def test_matches_per_field_extractors(self, line):
+        """Test that the combined regex agrees with the per-field extractors."""
+        [error] = iter_lint_errors([line], "swift")
+
+        assert error["file"] == github_tools.extract_file_from_violation(line)
+        assert error["line"] == github_tools.extract_line_number_from_violation(line)
+        assert error["severity"] == github_tools.extract_severity_from_violation(line)
+        assert error["message"] == github_tools.extract_message_from_violation(line)
+        assert error["rule"] == github_tools.extract_rule_from_violation(line)
+
+    def test_unrecognized_lines_are_skipped(self):
+        """Test that other output doesn't produce errors."""
+        lines = ["", "Found 2 errors.", "app.py:3: note: See docs", "Success"]
+
+        assert list(iter_lint_errors(lines, "python")) == []
+
+    def test_unsupported_language(self):
+        """Test that unsupported languages are rejected."""
+        with pytest.raises(ValueError, match="Unsupported language"):
+            list(iter_lint_errors([], "javascript"))
+
+    def test_input_is_consumed_lazily(self):
+        """Test that errors are yielded before the input is exhausted."""
+        consumed = []
+
+        def lines():
+            for line in [MYPY_LINE, RUFF_LINE, MYPY_LINE]:
+                consumed.append(line)
+                yield line
+
+        errors = iter_lint_errors(lines(), "python")
+
+        assert next(errors)["type"] == "mypy"
+        assert len(consumed) == 1
+
+
+class TestFiles:
+    """Test reading artifact files."""
+
+    def test_lines_are_read_without_line_endings(self, tmp_path):
+        """Test that LF and CRLF endings are stripped across files."""
+        (tmp_path / "a.txt").write_bytes(b"one\r\ntwo\n")
+        (tmp_path / "b.txt").write_bytes(b"three")
+
+        lines = iter_file_lines([tmp_path / "a.txt", tmp_path / "b.txt"])
+
+        assert list(lines) == ["one", "two", "three"]
+
+
+def parse_with(name, lines):
+    """Parse lines with a registered parser."""
+    parser = OutputParserRegistry.get(name)
+    assert parser is not None
+    return list(parser.parse(lines))
+
+
+class TestBuildIssues:
+    """Test the build output parsers and iter_swiftlint_violations."""
+
+    def test_python_failure_location_from_following_lines(self):
+        """Test that the lookahead finds the file/line of a failure."""
+        lines = [
+            ">       assert result is True",
+            "E       assert False is True",
+            "",
+            "tests/test_utilities.py:274: AssertionError",
+        ]
+
+        issues = parse_with("pytest", lines)
+
+        assert issues[0]["type"] == "python_test_failure"
+        assert issues[0]["error"] == "      assert False is True"
+        assert issues[0]["file"] == "tests/test_utilities.py"
+        assert issues[0]["line_number"] == 274
+
+    def test_lookahead_is_bounded(self):
+        """Test that file/line markers beyond the lookahead are not used."""
+        lines = ["E   TypeError: bad call"] + [""] * 5 + ["tests/t.py:1: TypeError"]
+
+        [issue] = parse_with("pytest", lines)
+
+        assert issue["type"] == "python_runtime_error"
+        assert "file" not in issue
+
+    def test_swift_issues(self):
+        """Test compiler errors, warnings and test failures in Swift output."""
+        lines = [
+            "/src/A.swift:1:2: error: cannot find 'x' in scope",
+            "/src/A.swift:3:4: warning: unused variable",
+            "/src/ATests.swift:9: error: -[ATests testX] : XCTAssertEqual failed",
+        ]
+
+        issues = parse_with("swiftc", lines)
+
+        assert [issue["type"] for issue in issues] == [
+            "compiler_error",
+            "compiler_warning",
+            "test_failure",
+        ]
+        assert issues[2]["test_info"] == "-[ATests testX]"
+
+    def test_swiftlint_violations(self):
+        """Test that only complete SwiftLint violations are reported."""
+        lines = [SWIFT_LINE, "Linting 'View.swift' (1/1)", "/a/B.swift:3:1: error: x"]
+
+        [violation] = iter_swiftlint_violations(lines)
+
+        assert violation["line_number"] == 42
+        assert violation["rule"] == "line_length"
+
+
+class TestParseArtifact:
+    """Test dispatching artifact files to registered parsers."""
+
+    def test_files_are_dispatched_by_name(self, tmp_path):
+        """Test that known file names go to the parsers declaring them."""
+        (tmp_path / "ruff-output.txt").write_text(RUFF_LINE)
+        (tmp_path / "mypy-output.txt").write_text(MYPY_LINE)
+        (tmp_path / "lint-output.txt").write_text(f"{RUFF_LINE}\n{MYPY_LINE}")
+
+        parsers = OutputParserRegistry.parsers_for("python", "lint")
+        assignments = {
+            path.name: [parser.name for parser in matching]
+            for path, matching in dispatch_files(tmp_path, parsers)
+        }
+
+        assert assignments == {
+            "lint-output.txt": ["ruff", "mypy"],
+            "mypy-output.txt": ["mypy"],
+            "ruff-output.txt": ["ruff"],
+        }
+
+    def test_unknown_files_are_probed(self, tmp_path):
+        """Test that other files are dispatched by their content."""
+        (tmp_path / "job-3.log").write_text(f"Running mypy\n{MYPY_LINE}\n")
+        (tmp_path / "notes.md").write_text("nothing to see")
+
+        [(path, matching)] = dispatch_files(
+            tmp_path, OutputParserRegistry.parsers_for("python", "lint")
+        )
+
+        assert path.name == "job-3.log"
+        assert [parser.name for parser in matching] == ["mypy"]
+
+    def test_multi_job_artifact_is_merged(self, tmp_path):
+        """Test that issues from several jobs are merged without duplicates."""
+        for job in ("py311", "py312"):
+            (tmp_path / job).mkdir()
+            (tmp_path / job / "mypy-output.txt").write_text(MYPY_LINE)
+        (tmp_path / "py312" / "ruff-output.txt").write_text(RUFF_LINE)
+
+        issues = parse_artifact(tmp_path, "python", "lint", max_workers=2)
+
+        assert sorted(issue["type"] for issue in issues) == ["mypy", "ruff"]
+
+    def test_large_artifact_is_parsed_by_worker_processes(self, tmp_path):
+        """Test that worker processes find the same issues as the caller."""
+        for job in ("py311", "py312"):
+            (tmp_path / job).mkdir()
+            (tmp_path / job / "mypy-output.txt").write_text(MYPY_LINE)
+            (tmp_path / job / "ruff-output.txt").write_text(RUFF_LINE)
+
+        in_process = parse_artifact(tmp_path, "python", "lint", max_workers=1)
+        in_pool = parse_artifact(
+            tmp_path, "python", "lint", max_workers=2, parallel_min_bytes=0
+        )
+
+        assert in_pool == in_process
+        assert sorted(issue["type"] for issue in in_pool) == ["mypy", "ruff"]
+
+    def test_expected_file_is_preferred(self, tmp_path):
+        """Test that an existing expected file is parsed on its own."""
+        (tmp_path / "custom.txt").write_text("/a/B.swift:1:2: error: boom")
+        (tmp_path / "build.txt").write_text("/a/C.swift:3:4: error: other")
+
+        [issue] = parse_artifact(tmp_path, "swift", "build", "custom.txt")
+
+        assert issue["file"] == "/a/B.swift"
+
+    def test_missing_output(self, tmp_path):
+        """Test that an artifact without matching files is an error."""
+        (tmp_path / "readme.md").write_text("no output here")
+
+        with pytest.raises(FileNotFoundError, match="readme.md"):
+            parse_artifact(tmp_path, "swift", "build")
+
+    def test_xcodebuild_output(self, tmp_path):
+        """Test that xcodebuild and swiftc issues of one log are combined."""
+        (tmp_path / "build_and_test_all.txt").write_text(
+            "/src/A.swift:1:2: error: cannot find 'x' in scope\n"
+            "Test Case '-[ATests testX]' failed (0.002 seconds).\n"
+            "xcodebuild: error: Failed to build workspace App\n"
+            "** TEST FAILED **\n"
+        )
+
+        issues = parse_artifact(tmp_path, "swift", "build")
+
+        assert [issue["type"] for issue in issues] == [
+            "compiler_error",
+            "test_case_failure",
+            "xcodebuild_error",
+        ]
+
+    def test_registered_parser_is_used(self, tmp_path, monkeypatch):
+        """Test that parsers can be added to the registry."""
+        monkeypatch.setattr(
+            OutputParserRegistry, "_parsers", dict(OutputParserRegistry._parsers)
+        )
+        OutputParserRegistry.register(
+            OutputParser(
+                name="todo",
+                language="python",
+                category="lint",
+                globs=("todo.txt",),
+                probe=re.compile(r"^TODO"),
+                parse=lambda lines: (
+                    {"type": "todo", "message": line} for line in lines
+                ),
+            )
+        )
+        (tmp_path / "todo.txt").write_text("fix me")
+
+        assert parse_artifact(tmp_path, "python", "lint") == [
+            {"type": "todo", "message": "fix me"}
+        ]
+
+    @pytest.mark.asyncio
+    async def test_xcodebuild_issues_are_listed_by_the_tool(self, tmp_path):
+        """Test that every counted xcodebuild issue is listed in a category."""
+        (tmp_path / "build_and_test_all.txt").write_text(
+            "Test Case '-[ATests testX]' failed (0.002 seconds).\n"
+            "xcodebuild: error: Failed to build workspace App\n"
+        )
+        context = Mock(repo_name="test/repo", github_token="token")
+
+        with (
+            patch.object(github_tools, "get_github_context", return_value=context),
+            patch.object(github_tools, "get_artifact_id", AsyncMock(return_value=7)),
+            patch.object(
+                github_tools,
+                "download_and_extract_artifact",
+                AsyncMock(return_value=tmp_path),
+            ),
+        ):
+            result = json.loads(
+                await github_tools.execute_github_check_ci_build_and_test_errors_not_local(
+                    "app", "swift", build_id="1"
+                )
+            )
+
+        assert result["total_issues"] == 2
+        assert [e["type"] for e in result["compiler_errors"]] == ["xcodebuild_error"]
+        assert [f["type"] for f in result["test_failures"]] == ["test_case_failure"]
+        assert result["total_errors"] == result["total_test_failures"] == 1
@@ -0,0 +1,309 @@
+"""
+Tests for the LSP navigation result cache.
+"""
+
+import logging
+import threading
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+import lsp_cache
+from lsp_cache import LSPResultCache
+from lsp_client import AbstractLSPClient
+from lsp_constants import LSPMethod
+from lsp_jsonrpc import JSONRPCNotification
+
+
+def position_params(path, line=1, character=4):
+    return {
+        "textDocument": {"uri": path.as_uri()},
+        "position": {"line": line, "character": character},
+    }
+
+
+def symbol_params(path):
+    return {"textDocument": {"uri": path.as_uri()}}
+
+
+class Server:
+    """Stand-in for the language server counting the requests it answers."""
+
+    def __init__(self, result="result"):
+        self.result = result
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return self.result
+
+
+class CachingClient(AbstractLSPClient):
+    """Client sending navigation requests through request_result."""
+
+    async def get_definition(self, uri, line, character):
+        return await self.request_result(
+            LSPMethod.DEFINITION,
+            {
+                "textDocument": {"uri": uri},
+                "position": {"line": line, "character": character},
+            },
+        )
+
+    async def get_references(self, uri, line, character, include_declaration=True):
+        return None
+
+    async def get_hover(self, uri, line, character):
+        return None
+
+    async def get_document_symbols(self, uri):
+        return None
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "module.py"
+    path.write_text("def f():\n    return 1\n")
+    return path
+
+
+@pytest.fixture
+def other(tmp_path):
+    path = tmp_path / "other.py"
+    path.write_text("from module import f\n")
+    return path
+
+
+class TestLSPResultCache:
+    """Test lookups, versioning and invalidation."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_request_is_answered_from_cache(self, source):
+        """Test that the same question reaches the server once."""
+        cache = LSPResultCache()
+        server = Server([{"uri": source.as_uri()}])
+
+        first = await cache.get_or_fetch(
+            LSPMethod.DEFINITION, position_params(source), server
+        )
+        first.append("modified by the caller")
+        second = await cache.get_or_fetch(
+            LSPMethod.DEFINITION, position_params(source), server
+        )
+
+        assert server.calls == 1
+        assert second == [{"uri": source.as_uri()}]
+        assert cache.stats()["hit_rate"] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_positions_are_cached_separately(self, source):
+        """Test that the position is part of the key."""
+        cache = LSPResultCache()
+        server = Server()
+
+        await cache.get_or_fetch(LSPMethod.HOVER, position_params(source, 0), server)
+        await cache.get_or_fetch(LSPMethod.HOVER, position_params(source, 1), server)
+
+        assert server.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_content_change_misses_without_event(self, source):
+        """Test that the content hash versions results of closed documents."""
+        cache = LSPResultCache()
+        server = Server()
+        await cache.get_or_fetch(LSPMethod.HOVER, position_params(source), server)
+
+        source.write_text("def g():\n    return 2\n")
+        await cache.get_or_fetch(LSPMethod.HOVER, position_params(source), server)
+
+        assert server.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_change_event_drops_dependent_results(self, source, other):
+        """Test that a change drops cross-file results but not others' symbols."""
+        cache = LSPResultCache()
+        server = Server()
+        for params in (position_params(source), position_params(other)):
+            await cache.get_or_fetch(LSPMethod.REFERENCES, params, server)
+        for path in (source, other):
+            await cache.get_or_fetch(
+                LSPMethod.DOCUMENT_SYMBOLS, symbol_params(path), server
+            )
+        assert server.calls == 4
+
+        cache.invalidate_path(source)
+
+        await cache.get_or_fetch(
+            LSPMethod.DOCUMENT_SYMBOLS, symbol_params(other), server
+        )
+        assert server.calls == 4
+        await cache.get_or_fetch(
+            LSPMethod.DOCUMENT_SYMBOLS, symbol_params(source), server
+        )
+        await cache.get_or_fetch(LSPMethod.REFERENCES, position_params(other), server)
+        assert server.calls == 6
+        assert cache.stats()["invalidations"] == 1
+
+    @pytest.mark.asyncio
+    async def test_files_are_read_off_the_event_loop(self, source, monkeypatch):
+        """Test that closed documents are stat'ed and hashed in a worker thread."""
+        threads = set()
+        file_state = lsp_cache._file_state
+
+        def record_thread(path):
+            threads.add(threading.get_ident())
+            return file_state(path)
+
+        monkeypatch.setattr(lsp_cache, "_file_state", record_thread)
+        cache = LSPResultCache()
+
+        await cache.get_or_fetch(LSPMethod.HOVER, position_params(source), Server())
+
+        assert threads
+        assert threading.get_ident() not in threads
+
+    @pytest.mark.asyncio
+    async def test_open_document_versions(self, source):
+        """Test that announced versions key results of open documents."""
+        cache = LSPResultCache()
+        server = Server()
+        uri = source.as_uri()
+        cache.notification_sent(
+            LSPMethod.DID_OPEN, {"textDocument": {"uri": uri, "version": 1}}
+        )
+        await cache.get_or_fetch(LSPMethod.HOVER, position_params(source), server)
+        await cache.get_or_fetch(LSPMethod.HOVER, position_params(source), server)
+        assert server.calls == 1
+
+        cache.notification_sent(
+            LSPMethod.DID_CHANGE, {"textDocument": {"uri": uri, "version": 2}}
+        )
+        await cache.get_or_fetch(LSPMethod.HOVER, position_params(source), server)
+
+        assert server.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_change_during_fetch_is_not_stored(self, source):
+        """Test that a result computed across a change isn't cached."""
+        cache = LSPResultCache()
+
+        async def fetch():
+            cache.invalidate_path(source)
+            return "stale"
+
+        await cache.get_or_fetch(LSPMethod.HOVER, position_params(source), fetch)
+
+        assert cache.stats()["entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_uncacheable_requests(self, source, tmp_path):
+        """Test that None results, other methods and missing files pass through."""
+        cache = LSPResultCache()
+        server = Server(None)
+        await cache.get_or_fetch(LSPMethod.HOVER, position_params(source), server)
+        server.result = "result"
+        await cache.get_or_fetch(LSPMethod.COMPLETION, position_params(source), server)
+        await cache.get_or_fetch(
+            LSPMethod.HOVER, position_params(tmp_path / "missing.py"), server
+        )
+
+        assert server.calls == 3
+        assert cache.stats()["entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_memory_bound_evicts_least_recently_used(self, source):
+        """Test LRU eviction and the entry size limit."""
+        result = "x" * 100
+        cache = LSPResultCache(max_memory_bytes=250, max_entry_bytes=200)
+        server = Server(result)
+        for line in range(3):
+            await cache.get_or_fetch(
+                LSPMethod.HOVER, position_params(source, line), server
+            )
+        # Line 0 was evicted, line 1 survives
+        await cache.get_or_fetch(LSPMethod.HOVER, position_params(source, 1), server)
+        assert server.calls == 3
+        await cache.get_or_fetch(LSPMethod.HOVER, position_params(source, 0), server)
+        assert server.calls == 4
+
+        server.result = "x" * 300
+        await cache.get_or_fetch(LSPMethod.HOVER, position_params(source, 9), server)
+
+        stats = cache.stats()
+        assert stats["evictions"] == 2
+        assert stats["memory_bytes"] <= 250
+
+    @pytest.mark.asyncio
+    async def test_stats_per_method(self, source):
+        """Test that hit rates are reported for each method."""
+        cache = LSPResultCache()
+        server = Server()
+        for _ in range(4):
+            await cache.get_or_fetch(LSPMethod.HOVER, position_params(source), server)
+        await cache.get_or_fetch(
+            LSPMethod.DOCUMENT_SYMBOLS, symbol_params(source), server
+        )
+
+        methods = cache.stats()["methods"]
+
+        assert methods[LSPMethod.HOVER] == {"hits": 3, "misses": 1, "hit_rate": 0.75}
+        assert methods[LSPMethod.DOCUMENT_SYMBOLS]["hit_rate"] == 0.0
+
+
+class TestClientIntegration:
+    """Test the result cache behind AbstractLSPClient."""
+
+    def make_client(self, tmp_path):
+        return CachingClient(
+            Mock(),
+            str(tmp_path),
+            logging.getLogger("test"),
+            result_cache=LSPResultCache(),
+        )
+
+    @pytest.mark.asyncio
+    async def test_request_result_uses_cache(self, tmp_path, source):
+        """Test that navigation requests are answered from the cache."""
+        client = self.make_client(tmp_path)
+        client.send_request = AsyncMock(
+            return_value={"jsonrpc": "2.0", "id": 1, "result": [{"line": 0}]}
+        )
+
+        for _ in range(3):
+            assert await client.get_definition(source.as_uri(), 0, 4) == [{"line": 0}]
+
+        client.send_request.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_errors_are_not_cached(self, tmp_path, source):
+        """Test that error responses pass through as None."""
+        client = self.make_client(tmp_path)
+        client.send_request = AsyncMock(
+            return_value={"jsonrpc": "2.0", "id": 1, "error": {"code": -32603}}
+        )
+
+        assert await client.get_definition(source.as_uri(), 0, 4) is None
+        assert await client.get_definition(source.as_uri(), 0, 4) is None
+
+        assert client.send_request.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_sent_change_notification_invalidates(self, tmp_path, source):
+        """Test that didChange sent to the server drops stale results."""
+        client = self.make_client(tmp_path)
+        client.server_process = Mock()
+        client.server_process.stdin.drain = AsyncMock()
+        client.send_request = AsyncMock(
+            return_value={"jsonrpc": "2.0", "id": 1, "result": [{"line": 0}]}
+        )
+        await client.get_definition(source.as_uri(), 0, 4)
+
+        await client._send_message(
+            JSONRPCNotification(
+                LSPMethod.DID_CHANGE,
+                {"textDocument": {"uri": source.as_uri(), "version": 2}},
+            )
+        )
+        await client.get_definition(source.as_uri(), 0, 4)
+
+        assert client.send_request.await_count == 2
@@ -2,10 +2,11 @@
 Unit tests for LSP client infrastructure.
 """
 
+import asyncio
 import json
 import logging
-import subprocess
-import threading
+import sys
+from contextlib import asynccontextmanager
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
@@ -17,6 +18,72 @@ from lsp_client import (
 from lsp_constants import LSPMethod
 from lsp_server_manager import LSPCommunicationMode, LSPServerManager
 
+# Minimal stdio LSP server: answers "test/echo" after params["delay"] seconds
+# unless cancelled, "test/big" with params["size"] bytes, "test/cancelled" with
+# the ids of cancelled requests, definitions with the requested position, and
+# other requests with MethodNotFound; exits on "test/crash"
+FAKE_SERVER = r"""
+import json
+import os
+import sys
+import threading
+
+lock = threading.Lock()
+timers = {}
+cancelled = []
+
+
+def send(payload):
+    body = json.dumps(payload).encode()
+    with lock:
+        sys.stdout.buffer.write(b"Content-Length: %d\r\n\r\n" % len(body) + body)
+        sys.stdout.buffer.flush()
+
+
+def reply(message, result):
+    send({"jsonrpc": "2.0", "id": message["id"], "result": result})
+
+
+while True:
+    header = b""
+    while not header.endswith(b"\r\n\r\n"):
+        byte = sys.stdin.buffer.read(1)
+        if not byte:
+            sys.exit(0)
+        header += byte
+    length = int(header.split(b":")[1].split(b"\r\n")[0])
+    message = json.loads(sys.stdin.buffer.read(length))
+    method, params = message.get("method"), message.get("params", {})
+    if method == "initialize":
+        reply(message, {"capabilities": {"hoverProvider": True}})
+    elif method == "test/echo":
+        timers[message["id"]] = threading.Timer(params["delay"], reply, (message, params))
+        timers[message["id"]].start()
+    elif method == "$/cancelRequest":
+        timers.pop(params["id"]).cancel()
+        cancelled.append(params["id"])
+        error = {"code": -32800, "message": "Request cancelled"}
+        send({"jsonrpc": "2.0", "id": params["id"], "error": error})
+    elif method == "test/cancelled":
+        reply(message, cancelled)
+    elif method == "test/big":
+        sys.stderr.write("sending big response\n")
+        reply(message, "x" * params["size"])
+    elif method == "test/crash":
+        os._exit(1)
+    elif method == "shutdown":
+        reply(message, None)
+    elif method == "exit":
+        sys.exit(0)
+    elif method == "textDocument/definition":
+        position = params["position"]
+        location_range = {"start": position, "end": position}
+        reply(message, {"uri": params["textDocument"]["uri"], "range": location_range})
+    elif "id" in message:
+        error = {"code": -32601, "message": "Method not found"}
+        send({"jsonrpc": "2.0", "id": message["id"], "error": error})
+"""
+
 
 class MockLSPServerManager(LSPServerManager):
     """Mock LSP server manager for testing."""
@@ -160,38 +227,38 @@ class TestAbstractLSPClient:
         assert "test/notification" not in self.client._notification_handlers
 
     @pytest.mark.asyncio
-    @patch("subprocess.Popen")
-    async def test_start_server_success(self, mock_popen):
+    @patch("asyncio.create_subprocess_exec")
+    async def test_start_server_success(self, mock_exec):
         """Test successful server start."""
         mock_process = Mock()
-        mock_process.poll.return_value = None  # Process is running
-        mock_popen.return_value = mock_process
+        mock_process.returncode = None  # Process is running
+        mock_exec.return_value = mock_process
 
         result = await self.client._start_server()
 
         assert result is True
         assert self.client.server_process == mock_process
-        mock_popen.assert_called_once()
+        mock_exec.assert_called_once()
 
     @pytest.mark.asyncio
-    @patch("subprocess.Popen")
-    async def test_start_server_failure(self, mock_popen):
+    @patch("asyncio.create_subprocess_exec")
+    async def test_start_server_failure(self, mock_exec):
         """Test server start failure."""
         mock_process = Mock()
-        mock_process.poll.return_value = 1  # Process exited with error
-        mock_process.stderr.read.return_value = b"Server error"
-        mock_popen.return_value = mock_process
+        mock_process.returncode = 1  # Process exited with error
+        mock_process.stderr.read = AsyncMock(return_value=b"Server error")
+        mock_exec.return_value = mock_process
 
         result = await self.client._start_server()
 
         assert result is False
-        self.logger.error.assert_called()
+        self.logger.error.assert_called_with("Server failed to start: Server error")
 
     @pytest.mark.asyncio
-    @patch("subprocess.Popen")
-    async def test_start_server_exception(self, mock_popen):
+    @patch("asyncio.create_subprocess_exec")
+    async def test_start_server_exception(self, mock_exec):
         """Test server start with exception."""
-        mock_popen.side_effect = Exception("Failed to start")
+        mock_exec.side_effect = Exception("Failed to start")
 
         result = await self.client._start_server()
 
@@ -203,6 +270,7 @@ class TestAbstractLSPClient:
         """Test sending message to server."""
         mock_process = Mock()
         mock_stdin = Mock()
+        mock_stdin.drain = AsyncMock()
         mock_process.stdin = mock_stdin
         self.client.server_process = mock_process
 
@@ -213,7 +281,7 @@ class TestAbstractLSPClient:
         await self.client._send_message(notification)
 
         mock_stdin.write.assert_called_once()
-        mock_stdin.flush.assert_called_once()
+        mock_stdin.drain.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_send_message_no_server(self):
@@ -257,10 +325,8 @@ class TestAbstractLSPClient:
 
         # Mock _send_message to simulate response
         async def mock_send_message(msg):
-            # Simulate response handler being called
-            handler = self.client._response_handlers.get("test_id")
-            if handler:
-                await handler(mock_response)
+            # Simulate the reader receiving the response
+            await self.client._handle_response(mock_response)
 
         self.client._send_message = mock_send_message  # type: ignore[method-assign]
 
@@ -282,12 +348,86 @@ class TestAbstractLSPClient:
 
         assert result is None
         self.logger.error.assert_called_with("Request timeout: test/method")
+        assert "test_id" not in self.client._pending_responses
+
+    @pytest.mark.asyncio
+    async def test_send_request_timeout_cancels_on_server(self):
+        """Test that a timed out request is cancelled on the server."""
+        from lsp_jsonrpc import JSONRPCRequest
+
+        request = JSONRPCRequest("test/method", message_id="test_id")
+        self.client.server_process = Mock()
+        self.client._send_message = AsyncMock()  # type: ignore[method-assign]
+
+        await self.client._send_request(request, timeout=0.05)
+
+        cancel = self.client._send_message.call_args_list[-1].args[0]
+        assert cancel.method == LSPMethod.CANCEL_REQUEST
+        assert cancel.params == {"id": "test_id"}
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_cancels_on_server(self):
+        """Test that cancelling the caller cancels the request on the server."""
+        from lsp_jsonrpc import JSONRPCRequest
+
+        request = JSONRPCRequest("test/method", message_id="test_id")
+        self.client.server_process = Mock()
+        self.client._send_message = AsyncMock()  # type: ignore[method-assign]
+
+        task = asyncio.create_task(self.client._send_request(request))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        cancel = self.client._send_message.call_args_list[-1].args[0]
+        assert cancel.method == LSPMethod.CANCEL_REQUEST
+        assert self.client._pending_responses == {}
+
+    @pytest.mark.asyncio
+    async def test_in_flight_window(self):
+        """Test that no more than max_in_flight requests are sent at once."""
+        client = MockLSPClient(
+            server_manager=self.server_manager,
+            workspace_root=self.workspace_root,
+            logger=self.logger,
+            max_in_flight=3,
+        )
+        in_flight = []
+        responders = []
+
+        async def respond(message):
+            await asyncio.sleep(0.01)
+            await client._handle_response({"id": message.id, "result": message.id})
+
+        async def mock_send_message(msg):
+            in_flight.append(len(client._pending_responses))
+            responders.append(asyncio.create_task(respond(msg)))
+
+        client._send_message = mock_send_message  # type: ignore[method-assign]
+
+        responses = await client.send_requests("test/method", [{}] * 10)
+
+        assert max(in_flight) == 3
+        assert None not in responses
+        assert len({response["result"] for response in responses if response}) == 10
+
+    @pytest.mark.asyncio
+    async def test_hover_batch(self):
+        """Test that hovers for several positions are gathered in order."""
+        self.client.get_hover = AsyncMock(  # type: ignore[method-assign]
+            side_effect=lambda uri, line, character: {"line": line}
+        )
+
+        hovers = await self.client.get_hover_batch("file:///a.py", [(3, 1), (1, 2)])
+
+        assert hovers == [{"line": 3}, {"line": 1}]
 
     @pytest.mark.asyncio
     async def test_process_message_response(self):
         """Test processing response message."""
-        response_handler = AsyncMock()
-        self.client._response_handlers["test_id"] = response_handler
+        future = asyncio.get_running_loop().create_future()
+        self.client._pending_responses["test_id"] = future
 
         message_content = json.dumps(
             {"jsonrpc": "2.0", "id": "test_id", "result": {"success": True}}
@@ -295,8 +435,8 @@ class TestAbstractLSPClient:
 
         await self.client._process_message(message_content)
 
-        response_handler.assert_called_once()
-        assert "test_id" not in self.client._response_handlers
+        assert future.result()["result"] == {"success": True}
+        assert "test_id" not in self.client._pending_responses
 
     @pytest.mark.asyncio
     async def test_process_message_notification(self):
@@ -461,20 +601,30 @@ class TestAbstractLSPClient:
         assert response.id == "show_id"
         assert response.result is None
 
+    @staticmethod
+    def running_process(hangs: int) -> Mock:
+        """Build a mock server process whose first waits hang."""
+        waits: list[None] = []
+
+        async def wait():
+            waits.append(None)
+            if len(waits) <= hangs:
+                await asyncio.sleep(60)
+            return 0
+
+        process = Mock()
+        process.returncode = None
+        process.wait = wait
+        return process
+
     @pytest.mark.asyncio
-    @patch("subprocess.Popen")
-    async def test_stop_with_graceful_shutdown(self, mock_popen):
+    async def test_stop_with_graceful_shutdown(self):
         """Test stopping client with graceful shutdown."""
-        mock_process = Mock()
-        mock_process.poll.return_value = None
-        mock_process.wait.return_value = 0
-        mock_process.stdin = Mock()
-        mock_popen.return_value = mock_process
+        mock_process = self.running_process(hangs=0)
 
         # Set up client state
         self.client.server_process = mock_process
         self.client.state = LSPClientState.INITIALIZED
-        self.client._stop_event = threading.Event()
 
         # Mock _send_message
         self.client._send_message = AsyncMock()  # type: ignore[method-assign]
@@ -484,21 +634,17 @@ class TestAbstractLSPClient:
         assert self.client.state == LSPClientState.DISCONNECTED
         assert self.client.server_process is None
         self.client._send_message.assert_called()  # Should send exit notification
+        mock_process.terminate.assert_not_called()
 
     @pytest.mark.asyncio
-    @patch("subprocess.Popen")
-    async def test_stop_with_force_termination(self, mock_popen):
+    @patch("lsp_client.SERVER_EXIT_TIMEOUT", 0.01)
+    async def test_stop_with_force_termination(self):
         """Test stopping client with force termination."""
-        mock_process = Mock()
-        mock_process.poll.return_value = None
-        mock_process.wait.side_effect = [subprocess.TimeoutExpired("cmd", 5), 0]
-        mock_process.stdin = Mock()
-        mock_popen.return_value = mock_process
+        mock_process = self.running_process(hangs=1)
 
         # Set up client state
         self.client.server_process = mock_process
         self.client.state = LSPClientState.INITIALIZED
-        self.client._stop_event = threading.Event()
 
         # Mock _send_message
         self.client._send_message = AsyncMock()  # type: ignore[method-assign]
@@ -508,21 +654,18 @@ class TestAbstractLSPClient:
         assert self.client.state == LSPClientState.DISCONNECTED
         assert self.client.server_process is None
         mock_process.terminate.assert_called_once()
+        mock_process.kill.assert_not_called()
 
     @pytest.mark.asyncio
-    @patch("subprocess.Popen")
-    async def test_stop_with_kill(self, mock_popen):
+    @patch("lsp_client.SERVER_TERMINATE_TIMEOUT", 0.01)
+    @patch("lsp_client.SERVER_EXIT_TIMEOUT", 0.01)
+    async def test_stop_with_kill(self):
         """Test stopping client with kill."""
-        mock_process = Mock()
-        mock_process.poll.return_value = None
-        mock_process.wait.side_effect = subprocess.TimeoutExpired("cmd", 5)
-        mock_process.stdin = Mock()
-        mock_popen.return_value = mock_process
+        mock_process = self.running_process(hangs=2)
 
         # Set up client state
         self.client.server_process = mock_process
         self.client.state = LSPClientState.INITIALIZED
-        self.client._stop_event = threading.Event()
 
         # Mock _send_message
         self.client._send_message = AsyncMock()  # type: ignore[method-assign]
@@ -558,3 +701,101 @@ class TestLSPCommunicationMode:
         """Test communication mode enum values."""
         assert LSPCommunicationMode.STDIO.value == "stdio"
         assert LSPCommunicationMode.TCP.value == "tcp"
+
+
+@asynccontextmanager
+async def running_client(tmp_path):
+    """Start a client connected to the fake server, stopping it afterwards."""
+    script = tmp_path / "fake_server.py"
+    script.write_text(FAKE_SERVER)
+    server_manager = MockLSPServerManager()
+    server_manager.server_command = [sys.executable, str(script)]
+    lsp_client = MockLSPClient(
+        server_manager=server_manager,
+        workspace_root=str(tmp_path),
+        logger=logging.getLogger("test_lsp_client"),
+    )
+    assert await lsp_client.start()
+    try:
+        yield lsp_client
+    finally:
+        await lsp_client.stop()
+
+
+class TestAsyncioTransport:
+    """Test the client against a real server subprocess."""
+
+    @pytest.mark.asyncio
+    async def test_initialize(self, tmp_path):
+        """Test the initialize handshake over the subprocess pipes."""
+        async with running_client(tmp_path) as client:
+            assert client.is_initialized()
+            assert client.get_server_capabilities() == {"hoverProvider": True}
+
+    @pytest.mark.asyncio
+    async def test_pipelined_requests(self, tmp_path):
+        """Test that responses arriving out of order reach their requests."""
+        async with running_client(tmp_path) as client:
+            requests = [
+                client.protocol.create_request("test/echo", {"n": n, "delay": delay})
+                for n, delay in enumerate([0.3, 0.2, 0.1, 0.0] * 5)
+            ]
+
+            responses = await asyncio.gather(
+                *(client._send_request(request) for request in requests)
+            )
+
+            assert [r["result"]["n"] for r in responses] == list(range(20))
+            assert client._pending_responses == {}
+
+    @pytest.mark.asyncio
+    async def test_large_response(self, tmp_path):
+        """Test a response much larger than the pipe and read sizes."""
+        async with running_client(tmp_path) as client:
+            request = client.protocol.create_request("test/big", {"size": 3_000_000})
+
+            response = await client._send_request(request)
+
+            assert len(response["result"]) == 3_000_000
+
+    @pytest.mark.asyncio
+    async def test_server_exit_fails_pending_requests(self, tmp_path):
+        """Test that requests in flight fail as soon as the server dies."""
+        async with running_client(tmp_path) as client:
+            slow = client.protocol.create_request("test/echo", {"delay": 30})
+            pending = asyncio.create_task(client._send_request(slow, timeout=30))
+            await asyncio.sleep(0.1)
+
+            await client._send_message(client.protocol.create_request("test/crash"))
+
+            assert await asyncio.wait_for(pending, 5) is None
+
+    @pytest.mark.asyncio
+    async def test_timed_out_requests_are_cancelled_on_server(self, tmp_path):
+        """Test that the server receives $/cancelRequest for abandoned requests."""
+        async with running_client(tmp_path) as client:
+            slow = client.protocol.create_request("test/echo", {"delay": 30})
+            fast = client.protocol.create_request("test/echo", {"delay": 0})
+
+            results = await asyncio.gather(
+                client._send_request(slow, timeout=0.2),
+                client._send_request(fast, timeout=5),
+            )
+            cancelled = await client.send_request("test/cancelled")
+
+            assert results[0] is None
+            assert results[1]["result"]["delay"] == 0
+            assert cancelled["result"] == [slow.id]
+
+    @pytest.mark.asyncio
+    async def test_batch_requests(self, tmp_path):
+        """Test fanning out a batch through a small in-flight window."""
+        async with running_client(tmp_path) as client:
+            client.max_in_flight = 4
+            client._in_flight = asyncio.Semaphore(4)
+
+            responses = await client.send_requests(
+                "test/echo", [{"n": n, "delay": 0.05} for n in range(12)]
+            )
+
+            assert [r["result"]["n"] for r in responses] == list(range(12))
@@ -2,8 +2,10 @@
 Unit tests for LSP JSON-RPC protocol implementation.
 """
 
+import io
 import json
 import logging
+import time
 from unittest.mock import Mock
 
 import pytest
@@ -15,9 +17,37 @@ from lsp_jsonrpc import (
     JSONRPCProtocol,
     JSONRPCRequest,
     JSONRPCResponse,
+    LSPMessageFramer,
 )
 
 
+def frame(payload: dict) -> bytes:
+    """Encode a message with an LSP header."""
+    body = json.dumps(payload).encode("utf-8")
+    return b"Content-Length: %d\r\n\r\n" % len(body) + body
+
+
+def large_response(size: int) -> dict:
+    """Build a workspace/symbol style response of roughly size bytes."""
+    symbol = {
+        "name": "symbol_name",
+        "kind": 12,
+        "location": {
+            "uri": "file:///repo/package/module.py",
+            "range": {
+                "start": {"line": 10, "character": 4},
+                "end": {"line": 10, "character": 15},
+            },
+        },
+    }
+    count = size // len(json.dumps(symbol))
+    return {"jsonrpc": "2.0", "id": 1, "result": [symbol] * count}
+
+
+def decode_all(framer: LSPMessageFramer) -> list[dict]:
+    return [json.loads(str(body, "utf-8")) for body in framer.messages()]
+
+
 class TestJSONRPCRequest:
     """Test JSON-RPC request message handling."""
 
@@ -405,3 +435,102 @@ class TestJSONRPCError:
         assert error.code == LSPErrorCode.INVALID_REQUEST
         assert error.message == "Invalid request"
         assert error.data is None
+
+
+class TestLSPMessageFramer:
+    """Test splitting the server's output into messages."""
+
+    def test_messages_split_across_reads(self):
+        """Test that messages are returned once complete, in any chunking."""
+        first = {"jsonrpc": "2.0", "id": 1, "result": {"text": "héllo"}}
+        second = {"jsonrpc": "2.0", "method": "window/logMessage"}
+        data = frame(first) + frame(second)
+        framer = LSPMessageFramer(read_size=16)
+
+        received = []
+        for i in range(0, len(data), 7):
+            framer.feed(data[i : i + 7])
+            received.extend(decode_all(framer))
+
+        assert received == [first, second]
+        assert framer.buffered == 0
+
+    def test_back_to_back_messages(self):
+        """Test messages received in one read, each header right after a body."""
+        messages = [{"jsonrpc": "2.0", "id": n, "result": n} for n in range(3)]
+        framer = LSPMessageFramer()
+        framer.feed(b"".join(frame(message) for message in messages))
+
+        assert decode_all(framer) == messages
+
+    def test_extra_headers(self):
+        """Test that other headers and header case don't matter."""
+        body = b'{"jsonrpc":"2.0","id":1,"result":null}'
+        framer = LSPMessageFramer()
+        framer.feed(
+            b"Content-Type: application/vscode-jsonrpc; charset=utf-8\r\n"
+            b"content-length: %d\r\n\r\n" % len(body) + body
+        )
+
+        assert decode_all(framer) == [{"jsonrpc": "2.0", "id": 1, "result": None}]
+
+    def test_missing_content_length_is_skipped(self):
+        """Test that a header without Content-Length is dropped."""
+        message = {"jsonrpc": "2.0", "id": 2, "result": 1}
+        logger = Mock()
+        framer = LSPMessageFramer(logger=logger)
+        framer.feed(b"Content-Type: x\r\n\r\n" + frame(message))
+
+        assert decode_all(framer) == [message]
+        logger.error.assert_called_once()
+
+    def test_bodies_are_views_of_the_buffer(self):
+        """Test that bodies are handed out without copying."""
+        framer = LSPMessageFramer()
+        framer.feed(frame({"jsonrpc": "2.0", "id": 1, "result": "x"}))
+
+        [body] = [isinstance(body, memoryview) for body in framer.messages()]
+
+        assert body
+
+    def test_read_from_stream(self):
+        """Test reading a large response straight from a stream."""
+        message = large_response(3 * 1024 * 1024)
+        stream = io.BufferedReader(io.BytesIO(frame(message) * 2))
+        framer = LSPMessageFramer()
+
+        received = []
+        while framer.read_from(stream):
+            received.extend(decode_all(framer))
+
+        assert received == [message, message]
+
+    @pytest.mark.slow
+    def test_large_response_benchmark(self):
+        """Benchmark framing multi-MB responses delivered in small chunks.
+
+        Framing time must grow linearly with the response size; re-slicing a
+        bytes buffer per chunk would grow quadratically.
+        """
+
+        def best_time(data: bytes, chunk: int = 4096) -> float:
+            timings = []
+            for _ in range(3):
+                framer = LSPMessageFramer()
+                started = time.perf_counter()
+                for i in range(0, len(data), chunk):
+                    framer.feed(data[i : i + chunk])
+                    for body in framer.messages():
+                        assert len(body) > 0
+                timings.append(time.perf_counter() - started)
+            return min(timings)
+
+        small = frame(large_response(1024 * 1024))
+        big = frame(large_response(8 * 1024 * 1024))
+        small_time, big_time = best_time(small), best_time(big)
+        print(
+            f"Framed {len(small) / 2**20:.1f} MB in {small_time * 1000:.1f} ms, "
+            f"{len(big) / 2**20:.1f} MB in {big_time * 1000:.1f} ms"
+        )
+
+        assert big_time < small_time * 8 * 3
@@ -0,0 +1,199 @@
+"""
+Tests for the pool of warm language servers.
+"""
+
+import asyncio
+import logging
+import sys
+import time
+from contextlib import asynccontextmanager
+
+import pytest
+
+from lsp_constants import LSPMethod
+from lsp_server_pool import (
+    WARM_LSP_SERVERS_ENV,
+    LSPServerPool,
+    LSPServerState,
+    LSPServerUnavailableError,
+    PooledLSPServer,
+    lsp_server_pool_enabled,
+)
+from pyright_lsp_client import PyrightLSPClient
+from tests.test_lsp_client import FAKE_SERVER, MockLSPServerManager
+
+
+def fake_server_factory(tmp_path):
+    """Build a factory of clients connected to the fake server."""
+    script = tmp_path / "fake_server.py"
+    script.write_text(FAKE_SERVER)
+    server_manager = MockLSPServerManager()
+    server_manager.server_command = [sys.executable, str(script)]
+
+    def create_client(result_cache):
+        return PyrightLSPClient(
+            server_manager,
+            str(tmp_path),
+            logging.getLogger("test_lsp_server_pool"),
+            result_cache=result_cache,
+        )
+
+    return create_client
+
+
+def failing_factory(result_cache):
+    raise OSError("pyright-langserver not found")
+
+
+@asynccontextmanager
+async def running_pool(**kwargs):
+    """Run a pool with fast health checks and restarts, stopping it afterwards."""
+    pool = LSPServerPool(
+        health_check_interval=kwargs.pop("health_check_interval", 0.05),
+        restart_delay=kwargs.pop("restart_delay", 0.01),
+        **kwargs,
+    )
+    pool.start()
+    try:
+        yield pool
+    finally:
+        await pool.stop()
+
+
+async def wait_for(condition, timeout=5.0):
+    """Wait until a condition holds, failing the test after the timeout."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        await asyncio.sleep(0.02)
+
+
+class TestLSPServerPool:
+    """Test warm-up, leasing and supervision of pooled servers."""
+
+    @pytest.mark.asyncio
+    async def test_lease_gets_warm_client(self, tmp_path):
+        """Test that a lease gets an initialized client with a result cache."""
+        source = tmp_path / "module.py"
+        source.write_text("x = 1\n")
+        async with running_pool() as pool:
+            pool.add_server("repo", str(tmp_path), fake_server_factory(tmp_path))
+
+            for _ in range(2):
+                async with pool.lease("repo") as client:
+                    assert client.is_initialized()
+                    definition = await client.get_definition(source.as_uri(), 0, 0)
+
+            stats = pool.stats()["repo"]
+            assert definition[0]["uri"] == source.as_uri()
+            assert stats["state"] == LSPServerState.READY.value
+            assert stats["leases"] == 0
+            assert stats["result_cache"]["methods"][LSPMethod.DEFINITION]["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_crashed_server_is_restarted(self, tmp_path):
+        """Test that a lease after a crash waits for a fresh server."""
+        async with running_pool(health_check_interval=60) as pool:
+            pool.add_server(
+                "repo", str(tmp_path), fake_server_factory(tmp_path), watch=False
+            )
+            async with pool.lease("repo") as first:
+                await first.send_request("test/crash", timeout=0.5)
+            await wait_for(lambda: not first.is_server_running())
+
+            async with pool.lease("repo") as second:
+                assert second is not first
+                assert second.is_server_running()
+            assert pool.stats()["repo"]["restarts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_health_check_detects_crash(self, tmp_path):
+        """Test that the supervisor restarts a server nobody is leasing."""
+        async with running_pool() as pool:
+            pool.add_server(
+                "repo", str(tmp_path), fake_server_factory(tmp_path), watch=False
+            )
+            async with pool.lease("repo") as client:
+                await client.send_request("test/crash", timeout=0.5)
+
+            await wait_for(lambda: pool.stats()["repo"]["restarts"] == 1)
+            stats = pool.stats()["repo"]
+            assert stats["last_error"] == "Server process exited"
+
+    @pytest.mark.asyncio
+    async def test_busy_server_passes_health_check(self, tmp_path):
+        """Test that a full in-flight window doesn't fail the health check."""
+        async with running_pool(health_check_timeout=0.2) as pool:
+            pool.add_server(
+                "repo", str(tmp_path), fake_server_factory(tmp_path), watch=False
+            )
+            async with pool.lease("repo") as client:
+                slow = asyncio.gather(
+                    *(
+                        client.send_request("test/echo", {"delay": 1.0}, timeout=5)
+                        for _ in range(client.max_in_flight + 1)
+                    )
+                )
+                await asyncio.sleep(0.6)
+                stats = pool.stats()["repo"]
+                responses = await slow
+
+            assert all(response is not None for response in responses)
+            assert stats["state"] == LSPServerState.READY.value
+            assert stats["restarts"] == 0
+
+    @pytest.mark.asyncio
+    async def test_lease_times_out_while_server_fails(self, tmp_path):
+        """Test that a lease gives up with the reason the server isn't ready."""
+        async with running_pool() as pool:
+            pool.add_server("repo", str(tmp_path), failing_factory, watch=False)
+
+            with pytest.raises(LSPServerUnavailableError, match="not found"):
+                async with pool.lease("repo", timeout=0.2):
+                    pass
+            assert pool.stats()["repo"]["consecutive_failures"] >= 2
+
+    @pytest.mark.asyncio
+    async def test_lease_unknown_repository(self):
+        """Test that leasing without a registered server fails immediately."""
+        async with running_pool() as pool:
+            with pytest.raises(LSPServerUnavailableError, match="No language server"):
+                async with pool.lease("missing"):
+                    pass
+
+    @pytest.mark.asyncio
+    async def test_file_change_invalidates_results(self, tmp_path):
+        """Test that changes in the workspace reach the result cache."""
+        source = tmp_path / "module.py"
+        source.write_text("x = 1\n")
+        async with running_pool() as pool:
+            pool.add_server("repo", str(tmp_path), fake_server_factory(tmp_path))
+            async with pool.lease("repo"):
+                pass
+            await wait_for(lambda: pool._servers["repo"].change_source is not None)
+
+            source.write_text("x = 2\n")
+
+            await wait_for(
+                lambda: pool.stats()["repo"]["result_cache"]["invalidations"] > 0
+            )
+
+    def test_restart_delay_backs_off_exponentially(self, tmp_path):
+        """Test that the delay doubles per failure up to the maximum."""
+        pool = LSPServerPool(restart_delay=1.0, max_restart_delay=10.0)
+        server = PooledLSPServer("repo", str(tmp_path), failing_factory, False)
+
+        delays = []
+        for failures in range(1, 7):
+            server.consecutive_failures = failures
+            delays.append(pool._restart_delay(server))
+
+        assert delays == [1.0, 2.0, 4.0, 8.0, 10.0, 10.0]
+
+    def test_pool_is_disabled_by_default(self, monkeypatch):
+        """Test that workers only warm up servers when configured to."""
+        monkeypatch.delenv(WARM_LSP_SERVERS_ENV, raising=False)
+        assert not lsp_server_pool_enabled()
+
+        monkeypatch.setenv(WARM_LSP_SERVERS_ENV, "1")
+        assert lsp_server_pool_enabled()
@@ -179,6 +179,7 @@ class TestMCPWorker:
             worker = MCPWorker(repo_config)
 
             client = TestClient(worker.app)
+            session = worker.sse_sessions.open()
 
             # Test MCP initialize
             initialize_request = {
@@ -188,13 +189,16 @@ class TestMCPWorker:
                 "params": {},
             }
 
-            response = client.post("/mcp/", json=initialize_request)
+            response = client.post(
+                f"/mcp/?session_id={session.session_id}", json=initialize_request
+            )
             assert response.status_code == 200
             assert response.json()["status"] == "queued"
 
             # Check that response was queued
-            assert not worker.message_queue.empty()
-            queued_response = worker.message_queue.get()
+            assert not session.queue.empty()
+            queued_response = session.queue.get_nowait()
+            assert queued_response is not None
             assert (
                 queued_response["result"]["serverInfo"]["name"] == "mcp-agent-test-repo"
             )
@@ -215,6 +219,7 @@ class TestMCPWorker:
             worker = MCPWorker(repo_config)
 
             client = TestClient(worker.app)
+            session = worker.sse_sessions.open()
 
             # Test tools/list
             tools_request = {
@@ -224,13 +229,16 @@ class TestMCPWorker:
                 "params": {},
             }
 
-            response = client.post("/mcp/", json=tools_request)
+            response = client.post(
+                f"/mcp/?session_id={session.session_id}", json=tools_request
+            )
             assert response.status_code == 200
             assert response.json()["status"] == "queued"
 
             # Check that response was queued
-            assert not worker.message_queue.empty()
-            queued_response = worker.message_queue.get()
+            assert not session.queue.empty()
+            queued_response = session.queue.get_nowait()
+            assert queued_response is not None
             tools = queued_response["result"]["tools"]
 
             # Should have both GitHub and codebase tools
@@ -268,6 +276,7 @@ class TestMCPWorker:
             worker = MCPWorker(repo_config)
 
             client = TestClient(worker.app)
+            session = worker.sse_sessions.open()
 
             # Test codebase health check tool call
             tool_call_request = {
@@ -277,13 +286,16 @@ class TestMCPWorker:
                 "params": {"name": "codebase_health_check", "arguments": {}},
             }
 
-            response = client.post("/mcp/", json=tool_call_request)
+            response = client.post(
+                f"/mcp/?session_id={session.session_id}", json=tool_call_request
+            )
             assert response.status_code == 200
             assert response.json()["status"] == "queued"
 
             # Check that response was queued
-            assert not worker.message_queue.empty()
-            queued_response = worker.message_queue.get()
+            assert not session.queue.empty()
+            queued_response = session.queue.get_nowait()
+            assert queued_response is not None
             result_text = queued_response["result"]["content"][0]["text"]
             assert (
                 '"status":' in result_text
@@ -308,6 +320,7 @@ class TestMCPWorker:
             worker = MCPWorker(repo_config)
 
             client = TestClient(worker.app)
+            session = worker.sse_sessions.open()
 
             # Test unknown tool call
             tool_call_request = {
@@ -317,17 +330,53 @@ class TestMCPWorker:
                 "params": {"name": "unknown_tool", "arguments": {}},
             }
 
-            response = client.post("/mcp/", json=tool_call_request)
+            response = client.post(
+                f"/mcp/?session_id={session.session_id}", json=tool_call_request
+            )
             assert response.status_code == 200
             assert response.json()["status"] == "queued"
 
             # Check that error response was queued
-            assert not worker.message_queue.empty()
-            queued_response = worker.message_queue.get()
+            assert not session.queue.empty()
+            queued_response = session.queue.get_nowait()
+            assert queued_response is not None
             result_text = queued_response["result"]["content"][0]["text"]
             assert '"error"' in result_text
             assert "not implemented" in result_text
 
+    def test_mcp_request_for_unknown_session(
+        self, temp_repo, mock_github_token, mock_subprocess
+    ):
+        """Test that responses are never delivered to another client"""
+        with patch("github_tools.Github"), patch("mcp_worker.GitHubAPIContext"):
+            from repository_manager import RepositoryConfig
+
+            repo_config = RepositoryConfig.create_repository_config(
+                name="test-repo",
+                path=temp_repo,
+                description="Test repository",
+                language=Language.PYTHON,
+                port=8080,
+                python_path="/usr/bin/python3",
+            )
+            worker = MCPWorker(repo_config)
+
+            client = TestClient(worker.app)
+            other_session = worker.sse_sessions.open()
+
+            initialize_request = {
+                "jsonrpc": "2.0",
+                "id": 5,
+                "method": "initialize",
+                "params": {},
+            }
+
+            response = client.post("/mcp/?session_id=unknown", json=initialize_request)
+            assert response.status_code == 200
+            assert response.json()["error"]["code"] == -32600
+            assert response.json()["id"] == 5
+            assert other_session.queue.empty()
+
     def test_shutdown_endpoint(self, temp_repo, mock_github_token, mock_subprocess):
         """Test the shutdown endpoint"""
         with patch("github_tools.Github"), patch("mcp_worker.GitHubAPIContext"):
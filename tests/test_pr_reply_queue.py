@@ -0,0 +1,485 @@
+"""
+Tests for the durable PR reply outbox and its background sender.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+import github_tools
+import pr_reply_queue
+from pr_reply_queue import (
+    STATUS_FAILED,
+    STATUS_QUEUED,
+    STATUS_SENDING,
+    STATUS_SENT,
+    PRReplyQueue,
+    PRReplySender,
+    ReplyDelivery,
+    ReplyDeliveryError,
+    post_pr_reply,
+)
+
+REPO = "owner/repo"
+
+
+class FakeGitHub:
+    """Local HTTP server answering GitHub comment endpoints from a script."""
+
+    def __init__(self):
+        # (method, path) -> queued (status, headers, body) responses
+        self.routes: dict[tuple[str, str], deque] = {}
+        self.requests: list[tuple[str, str, dict | None]] = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _respond(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length)) if length else None
+                server.requests.append((self.command, self.path, payload))
+                responses = server.routes.get((self.command, self.path))
+                status, headers, body = (
+                    responses.popleft() if responses else (404, {}, {})
+                )
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):  # noqa: N802
+                self._respond()
+
+            def do_POST(self):  # noqa: N802
+                self._respond()
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def add(self, method, path, status, body=None, headers=None):
+        self.routes.setdefault((method, f"/repos/{REPO}{path}"), deque()).append(
+            (status, headers or {}, body or {})
+        )
+
+    def posts(self):
+        return [
+            (path, payload)
+            for method, path, payload in self.requests
+            if method == "POST"
+        ]
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def github():
+    fake = FakeGitHub()
+    yield fake
+    fake.close()
+
+
+@pytest.fixture
+def queue(tmp_path):
+    outbox = PRReplyQueue(tmp_path / "replies.db")
+    yield outbox
+    outbox.close()
+
+
+def deliver_to(github):
+    """Build a deliver callable posting to the fake server."""
+    session = requests.Session()
+
+    def deliver(repo_name, comment_id, body):
+        return post_pr_reply(session, "token", REPO, comment_id, body, github.url)
+
+    return deliver
+
+
+def reply_created(reply_id, headers=None):
+    body = {"id": reply_id, "html_url": f"https://github.com/{REPO}/c/{reply_id}"}
+    return 201, body, headers
+
+
+class TestQueue:
+    """Test the SQLite outbox."""
+
+    def test_identical_replies_are_queued_once(self, queue):
+        """Test that retrying the tool call doesn't queue a duplicate."""
+        first, created = queue.enqueue("repo", REPO, 1, "Done")
+        again, created_again = queue.enqueue("repo", REPO, 1, "Done")
+        other, _ = queue.enqueue("repo", REPO, 1, "Also done")
+
+        assert created and not created_again
+        assert again.id == first.id
+        assert other.id != first.id
+
+    def test_failed_replies_can_be_queued_again(self, queue):
+        """Test that a reply that was given up on may be queued again."""
+        reply, _ = queue.enqueue("repo", REPO, 1, "Done")
+        queue.claim_due()
+        queue.mark_failed([reply.id], "boom")
+
+        again, created = queue.enqueue("repo", REPO, 1, "Done")
+
+        assert created and again.id != reply.id
+
+    def test_claims_are_scoped_to_the_repository(self, queue):
+        """Test that a worker only claims replies of its own repository."""
+        queue.enqueue("repo", REPO, 1, "Mine")
+        queue.enqueue("other", "owner/other", 2, "Theirs")
+
+        [claimed] = queue.claim_due("repo")
+
+        assert claimed.body == "Mine"
+        assert claimed.status == STATUS_SENDING
+        assert claimed.attempt_count == 1
+        assert queue.claim_due("repo") == []
+
+    def test_replies_survive_restart(self, tmp_path):
+        """Test that queued and interrupted replies are delivered after reopening."""
+        outbox = PRReplyQueue(tmp_path / "replies.db")
+        outbox.enqueue("repo", REPO, 1, "In flight")
+        outbox.enqueue("repo", REPO, 2, "Waiting")
+        outbox.claim_due(limit=1)
+        outbox.close()
+
+        reopened = PRReplyQueue(tmp_path / "replies.db")
+        try:
+            assert reopened.requeue_interrupted("repo") == 1
+            claimed = reopened.claim_due("repo")
+            assert [reply.body for reply in claimed] == ["In flight", "Waiting"]
+        finally:
+            reopened.close()
+
+    def test_ack(self, queue):
+        """Test that acknowledging marks all replies to a comment."""
+        queue.enqueue("repo", REPO, 1, "One")
+        queue.enqueue("repo", REPO, 1, "Two")
+        queue.enqueue("repo", REPO, 2, "Other")
+
+        assert queue.ack("repo", 1) == 2
+        assert queue.ack("repo", 1) == 0
+        acked = [reply.acked_at is not None for reply in queue.list_replies("repo")]
+        assert acked == [True, True, False]
+
+
+class TestPostPrReply:
+    """Test posting a reply to GitHub."""
+
+    def test_direct_reply(self, github):
+        """Test that review comments get a threaded reply."""
+        status, body, _ = reply_created(10)
+        github.add("POST", "/pulls/comments/1/replies", status, body)
+
+        delivery = deliver_to(github)("repo", 1, "Fixed")
+
+        assert delivery.method == "direct_reply"
+        assert delivery.reply_comment_id == 10
+        assert github.posts() == [
+            (f"/repos/{REPO}/pulls/comments/1/replies", {"body": "Fixed"})
+        ]
+
+    def test_issue_comment_fallback(self, github):
+        """Test that issue comments get a PR comment mentioning their author."""
+        github.add(
+            "GET",
+            "/issues/comments/1",
+            200,
+            {
+                "issue_url": f"https://api.github.com/repos/{REPO}/issues/7",
+                "user": {"login": "octo"},
+            },
+        )
+        status, body, _ = reply_created(11)
+        github.add("POST", "/issues/7/comments", status, body)
+
+        delivery = deliver_to(github)("repo", 1, "Thanks")
+
+        assert delivery.method == "issue_comment_fallback"
+        assert github.posts()[-1] == (
+            f"/repos/{REPO}/issues/7/comments",
+            {"body": "@octo Thanks"},
+        )
+
+    def test_unknown_comment_is_permanent(self, github):
+        """Test that a missing comment is not retried."""
+        with pytest.raises(ReplyDeliveryError, match="Could not find") as error:
+            deliver_to(github)("repo", 1, "Hello")
+
+        assert not error.value.retryable
+
+    def test_forbidden_is_permanent(self, github):
+        """Test that a 403 that isn't a rate limit is not retried."""
+        github.add(
+            "POST",
+            "/pulls/comments/1/replies",
+            403,
+            {"message": "Resource not accessible by integration"},
+            {"X-RateLimit-Remaining": "4999", "X-RateLimit-Reset": "0"},
+        )
+
+        with pytest.raises(ReplyDeliveryError) as error:
+            deliver_to(github)("repo", 1, "Hello")
+
+        assert not error.value.retryable
+
+    @pytest.mark.parametrize(
+        "status,headers,retry_after",
+        [
+            (429, {"Retry-After": "30"}, 30.0),
+            (429, {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}, 0.0),
+            (403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "0"}, 0.0),
+            (403, {"X-RateLimit-Remaining": "4999", "X-RateLimit-Reset": "0"}, 60.0),
+            (502, {}, None),
+        ],
+    )
+    def test_transient_errors_are_retryable(self, github, status, headers, retry_after):
+        """Test that rate limits and server errors are reported as retryable."""
+        body = {"message": "You have exceeded a secondary rate limit."}
+        github.add("POST", "/pulls/comments/1/replies", status, body, headers)
+
+        with pytest.raises(ReplyDeliveryError) as error:
+            deliver_to(github)("repo", 1, "Hello")
+
+        assert error.value.retryable
+        assert error.value.retry_after == retry_after
+
+
+class TestSender:
+    """Test the background sender."""
+
+    def test_replies_to_one_comment_are_coalesced(self, queue, github):
+        """Test that replies queued for the same comment become one post."""
+        status, body, _ = reply_created(10)
+        github.add("POST", "/pulls/comments/1/replies", status, body)
+        first, _ = queue.enqueue("repo", REPO, 1, "First")
+        second, _ = queue.enqueue("repo", REPO, 1, "Second")
+        sender = PRReplySender(queue, deliver_to(github), min_post_interval=0)
+
+        assert asyncio.run(sender.process_due())
+
+        assert github.posts() == [
+            (f"/repos/{REPO}/pulls/comments/1/replies", {"body": "First\n\nSecond"})
+        ]
+        for reply_id in (first.id, second.id):
+            reply = queue.get(reply_id)
+            assert reply.status == STATUS_SENT
+            assert reply.reply_comment_id == 10
+
+    def test_transient_failure_is_retried_with_backoff(self, queue):
+        """Test that failed posts are requeued with a growing delay."""
+        deliver = MagicMock(side_effect=ReplyDeliveryError("502", retryable=True))
+        reply, _ = queue.enqueue("repo", REPO, 1, "Hello")
+        sender = PRReplySender(
+            queue, deliver, retry_delay=10, min_post_interval=0, max_attempts=5
+        )
+
+        before = time.time()
+        asyncio.run(sender.process_due())
+        first = queue.get(reply.id)
+        assert first.status == STATUS_QUEUED
+        assert first.last_error == "502"
+        assert first.next_attempt_at >= before + 10
+
+        queue.claim_due(now=first.next_attempt_at)
+        queue.mark_retry([reply.id], "502", 0)
+        asyncio.run(sender.process_due())
+        second = queue.get(reply.id)
+        assert second.next_attempt_at >= before + 40
+        assert second.attempt_count == 3
+
+    def test_gives_up_after_max_attempts(self, queue):
+        """Test that replies are marked failed once attempts are exhausted."""
+        deliver = MagicMock(side_effect=ConnectionError("offline"))
+        reply, _ = queue.enqueue("repo", REPO, 1, "Hello")
+        sender = PRReplySender(queue, deliver, max_attempts=1, min_post_interval=0)
+
+        asyncio.run(sender.process_due())
+
+        failed = queue.get(reply.id)
+        assert failed.status == STATUS_FAILED
+        assert "offline" in failed.last_error
+
+    def test_permanent_failure_is_not_retried(self, queue):
+        """Test that a non-retryable error fails the reply at once."""
+        deliver = MagicMock(side_effect=ReplyDeliveryError("gone", retryable=False))
+        reply, _ = queue.enqueue("repo", REPO, 1, "Hello")
+        sender = PRReplySender(queue, deliver, min_post_interval=0)
+
+        asyncio.run(sender.process_due())
+
+        assert queue.get(reply.id).status == STATUS_FAILED
+
+    def test_exhausted_rate_limit_pauses_posting(self, queue):
+        """Test that no post is made until the rate limit resets."""
+        reset = time.time() + 60
+        deliver = MagicMock(
+            return_value=ReplyDelivery("direct_reply", 10, "url", 0, reset)
+        )
+        queue.enqueue("repo", REPO, 1, "One")
+        second, _ = queue.enqueue("repo", REPO, 2, "Two")
+        sender = PRReplySender(queue, deliver, min_post_interval=0)
+
+        asyncio.run(sender.process_due())
+
+        # The second reply was claimed with the first and handed back
+        deliver.assert_called_once()
+        assert queue.get(second.id).status == STATUS_QUEUED
+        assert queue.get(second.id).attempt_count == 0
+        assert not asyncio.run(sender.process_due())
+
+    def test_outbox_is_queried_off_the_event_loop(self, queue):
+        """Test that every outbox call goes through run_blocking."""
+        deliver = MagicMock(side_effect=ReplyDeliveryError("502", retryable=True))
+        queue.enqueue("repo", REPO, 1, "One")
+        queue.enqueue("repo", REPO, 2, "Two")
+        blocking_calls = []
+
+        async def run_blocking(func, *args):
+            blocking_calls.append(func)
+            return await asyncio.to_thread(func, *args)
+
+        sender = PRReplySender(
+            queue, deliver, min_post_interval=0, run_blocking=run_blocking
+        )
+        asyncio.run(sender.process_due())
+
+        assert blocking_calls == [
+            queue.claim_due,
+            deliver,
+            queue.mark_retry,
+            deliver,
+            queue.mark_retry,
+        ]
+
+    def test_background_delivery(self, queue, github):
+        """Test that a running sender is woken by newly queued replies."""
+        status, body, _ = reply_created(10)
+        github.add("POST", "/pulls/comments/1/replies", status, body)
+
+        async def scenario():
+            sender = PRReplySender(
+                queue, deliver_to(github), min_post_interval=0, repo_name="repo"
+            )
+            sender.start()
+            reply, _ = await asyncio.to_thread(queue.enqueue, "repo", REPO, 1, "Fixed")
+            for _ in range(200):
+                if queue.get(reply.id).status == STATUS_SENT:
+                    break
+                await asyncio.sleep(0.01)
+            await sender.stop()
+            return queue.get(reply.id)
+
+        assert asyncio.run(scenario()).status == STATUS_SENT
+
+
+class TestTools:
+    """Test the reply tools."""
+
+    @pytest.fixture(autouse=True)
+    def process_queue(self, queue, monkeypatch):
+        monkeypatch.setattr(pr_reply_queue, "_queue", queue)
+        context = MagicMock(repo=MagicMock(), repo_name=REPO)
+        with patch("github_tools.get_github_context", return_value=context):
+            yield
+
+    def test_post_returns_without_posting(self, queue):
+        """Test that the tool queues the reply instead of calling GitHub."""
+        with patch("github_tools.get_github_session") as get_session:
+            result = json.loads(
+                asyncio.run(github_tools.execute_post_pr_reply("repo", 1, "Done"))
+            )
+
+        get_session.assert_not_called()
+        assert result["success"] and result["queued"]
+        assert result["status"] == STATUS_QUEUED
+        assert queue.get(result["reply_id"]).body == "Done"
+
+    def test_status_and_acknowledge(self, queue):
+        """Test reporting and acknowledging the replies to a comment."""
+        reply, _ = queue.enqueue("repo", REPO, 1, "Done")
+        queue.claim_due()
+        queue.mark_sent([reply.id], ReplyDelivery("direct_reply", 10, "url"))
+
+        result = json.loads(
+            asyncio.run(
+                github_tools.execute_pr_reply_status(
+                    "repo", reply_id=reply.id, acknowledge=True
+                )
+            )
+        )
+
+        assert result["counts"] == {STATUS_SENT: 1}
+        assert result["acknowledged"] == 1
+        assert result["replies"][0]["reply_url"] == "url"
+        assert result["replies"][0]["acked_at"] is not None
+
+    def test_unhandled_comments(self, queue):
+        """Test that acknowledged comments are left out on request."""
+        queue.enqueue("repo", REPO, 1, "Done")
+        queue.ack("repo", 1)
+
+        def response(data):
+            resp = MagicMock(status_code=200)
+            resp.json.return_value = data
+            return resp
+
+        comment = {
+            "user": {"login": "reviewer"},
+            "body": "Please fix",
+            "created_at": "2024-01-01T00:00:00Z",
+            "html_url": "url",
+        }
+        base = f"https://api.github.com/repos/{REPO}"
+        responses = {
+            f"{base}/pulls/7": {"title": "PR", "state": "open"},
+            f"{base}/pulls/7/comments": [{**comment, "id": 1}, {**comment, "id": 2}],
+            f"{base}/issues/7/comments": [{**comment, "id": 3}],
+        }
+        http = MagicMock()
+        http.get.side_effect = lambda url, **kwargs: response(responses[url])
+
+        with patch("github_tools.get_github_session", return_value=http):
+            everything, unhandled = (
+                json.loads(
+                    asyncio.run(
+                        github_tools.execute_get_pr_comments(
+                            "repo", 7, unhandled_only=unhandled_only
+                        )
+                    )
+                )
+                for unhandled_only in (False, True)
+            )
+
+        assert everything["total_comments"] == 3
+        assert [c["id"] for c in unhandled["review_comments"]] == [2]
+        assert unhandled["total_comments"] == 2
+
+    def test_status_of_other_repository(self, queue):
+        """Test that replies of other repositories are not reported."""
+        reply, _ = queue.enqueue("other", "owner/other", 1, "Done")
+
+        result = json.loads(
+            asyncio.run(github_tools.execute_pr_reply_status("repo", reply_id=reply.id))
+        )
+
+        assert "error" in result
@@ -1,24 +1,19 @@
 #!/usr/bin/env python3
 
 """
-Tests for Python linter error parsing functions in github_tools.py
-
-Tests for parsing ruff and mypy error outputs.
+Tests for parsing ruff and mypy error output with iter_lint_errors.
 """
 
 import unittest
+from typing import Any
+
+from log_parsing import MYPY_RE, iter_lint_errors
+
 
-from github_tools import (
-    extract_column_from_ruff_error,
-    extract_error_code_from_mypy_error,
-    extract_file_from_mypy_error,
-    extract_file_from_ruff_error,
-    extract_line_number_from_mypy_error,
-    extract_line_number_from_ruff_error,
-    extract_message_from_mypy_error,
-    extract_message_from_ruff_error,
-    extract_rule_from_ruff_error,
-)
+def parse_line(line: str) -> dict[str, Any]:
+    """Parse one error line of Python linter output."""
+    [error] = iter_lint_errors([line], "python")
+    return error
 
 
 class TestRuffErrorParsing(unittest.TestCase):
@@ -27,19 +22,11 @@ class TestRuffErrorParsing(unittest.TestCase):
     def setUp(self):
         """Set up test data with realistic ruff error lines"""
         # GitHub Actions format
-        self.sample_ruff_errors_github = [
+        self.sample_ruff_errors = [
             "::error title=Ruff (UP045),file=/Volumes/Code/github-agent/github_tools.py,line=503,col=49,endLine=503,endColumn=62::github_tools.py:503:49: UP045 Use `X | None` for type annotations",
             "::error title=Ruff (E501),file=/path/to/project/src/main.py,line=42,col=80,endLine=42,endColumn=120::main.py:42:80: E501 line too long (120 > 79 characters)",
             "::error title=Ruff (F401),file=/Users/dev/project/utils/helpers.py,line=15,col=1,endLine=15,endColumn=20::helpers.py:15:1: F401 'os' imported but unused",
         ]
-        # Direct command format (actual ruff output)
-        self.sample_ruff_errors_direct = [
-            "Error: mcp_master.py:97:14: UP007 Use `X | Y` for type annotations",
-            "Error: github_mcp_worker.py:632:13: RUF006 Store a reference to the return value of `asyncio.create_task`",
-            "Error: repository_manager.py:166:21: B904 Within an `except` clause, raise exceptions with `raise ... from err` or `raise ... from None` to distinguish them from errors in exception handling",
-        ]
-        # Combined for compatibility
-        self.sample_ruff_errors = self.sample_ruff_errors_github
 
     def test_extract_file_from_ruff_error(self):
         """Test file path extraction from ruff error lines"""
@@ -53,7 +40,7 @@ class TestRuffErrorParsing(unittest.TestCase):
             self.sample_ruff_errors, expected_files, strict=False
         ):
             with self.subTest(error_line=error_line):
-                result = extract_file_from_ruff_error(error_line)
+                result = parse_line(error_line)["file"]
                 self.assertEqual(result, expected_file)
 
     def test_extract_line_number_from_ruff_error(self):
@@ -64,7 +51,7 @@ class TestRuffErrorParsing(unittest.TestCase):
             self.sample_ruff_errors, expected_line_numbers, strict=False
         ):
             with self.subTest(error_line=error_line):
-                result = extract_line_number_from_ruff_error(error_line)
+                result = parse_line(error_line)["line"]
                 self.assertEqual(result, expected_line)
 
     def test_extract_column_from_ruff_error(self):
@@ -75,7 +62,7 @@ class TestRuffErrorParsing(unittest.TestCase):
             self.sample_ruff_errors, expected_columns, strict=False
         ):
             with self.subTest(error_line=error_line):
-                result = extract_column_from_ruff_error(error_line)
+                result = parse_line(error_line)["column"]
                 self.assertEqual(result, expected_col)
 
     def test_extract_rule_from_ruff_error(self):
@@ -86,7 +73,7 @@ class TestRuffErrorParsing(unittest.TestCase):
             self.sample_ruff_errors, expected_rules, strict=False
         ):
             with self.subTest(error_line=error_line):
-                result = extract_rule_from_ruff_error(error_line)
+                result = parse_line(error_line)["rule"]
                 self.assertEqual(result, expected_rule)
 
     def test_extract_message_from_ruff_error(self):
@@ -101,50 +88,11 @@ class TestRuffErrorParsing(unittest.TestCase):
             self.sample_ruff_errors, expected_messages, strict=False
         ):
             with self.subTest(error_line=error_line):
-                result = extract_message_from_ruff_error(error_line)
+                result = parse_line(error_line)["message"]
                 self.assertEqual(result, expected_message)
 
-    def test_extract_from_direct_ruff_errors(self):
-        """Test extraction from direct ruff command output"""
-        expected_files = [
-            "mcp_master.py",
-            "github_mcp_worker.py",
-            "repository_manager.py",
-        ]
-        expected_lines = [97, 632, 166]
-        expected_columns = [14, 13, 21]
-        expected_rules = ["UP007", "RUF006", "B904"]
-
-        for (
-            error_line,
-            expected_file,
-            expected_line,
-            expected_col,
-            expected_rule,
-        ) in zip(
-            self.sample_ruff_errors_direct,
-            expected_files,
-            expected_lines,
-            expected_columns,
-            expected_rules,
-            strict=False,
-        ):
-            with self.subTest(error_line=error_line):
-                self.assertEqual(
-                    extract_file_from_ruff_error(error_line), expected_file
-                )
-                self.assertEqual(
-                    extract_line_number_from_ruff_error(error_line), expected_line
-                )
-                self.assertEqual(
-                    extract_column_from_ruff_error(error_line), expected_col
-                )
-                self.assertEqual(
-                    extract_rule_from_ruff_error(error_line), expected_rule
-                )
-
     def test_extract_from_invalid_ruff_lines(self):
-        """Test extraction functions with invalid ruff lines"""
+        """Test that lines that aren't ruff errors are skipped"""
         invalid_lines = [
             "",  # Empty line
             "This is not a ruff error line",  # Random text
@@ -154,12 +102,7 @@ class TestRuffErrorParsing(unittest.TestCase):
 
         for invalid_line in invalid_lines:
             with self.subTest(invalid_line=invalid_line):
-                # These should return empty strings or 0 for invalid input
-                self.assertEqual(extract_file_from_ruff_error(invalid_line), "")
-                self.assertEqual(extract_line_number_from_ruff_error(invalid_line), 0)
-                self.assertEqual(extract_column_from_ruff_error(invalid_line), 0)
-                self.assertEqual(extract_rule_from_ruff_error(invalid_line), "")
-                self.assertEqual(extract_message_from_ruff_error(invalid_line), "")
+                self.assertEqual(list(iter_lint_errors([invalid_line], "python")), [])
 
 
 class TestMypyErrorParsing(unittest.TestCase):
@@ -193,7 +136,7 @@ class TestMypyErrorParsing(unittest.TestCase):
             self.sample_mypy_errors, expected_files, strict=False
         ):
             with self.subTest(error_line=error_line):
-                result = extract_file_from_mypy_error(error_line)
+                result = parse_line(error_line)["file"]
                 self.assertEqual(result, expected_file)
 
     def test_extract_line_number_from_mypy_error(self):
@@ -204,7 +147,7 @@ class TestMypyErrorParsing(unittest.TestCase):
             self.sample_mypy_errors, expected_line_numbers, strict=False
         ):
             with self.subTest(error_line=error_line):
-                result = extract_line_number_from_mypy_error(error_line)
+                result = parse_line(error_line)["line"]
                 self.assertEqual(result, expected_line)
 
     def test_extract_message_from_mypy_error(self):
@@ -220,7 +163,7 @@ class TestMypyErrorParsing(unittest.TestCase):
             self.sample_mypy_errors, expected_messages, strict=False
         ):
             with self.subTest(error_line=error_line):
-                result = extract_message_from_mypy_error(error_line)
+                result = parse_line(error_line)["message"]
                 self.assertEqual(result, expected_message)
 
     def test_extract_error_code_from_mypy_error(self):
@@ -231,7 +174,7 @@ class TestMypyErrorParsing(unittest.TestCase):
             self.sample_mypy_errors, expected_codes, strict=False
         ):
             with self.subTest(error_line=error_line):
-                result = extract_error_code_from_mypy_error(error_line)
+                result = parse_line(error_line)["error_code"]
                 self.assertEqual(result, expected_code)
 
     def test_extract_from_actual_mypy_errors(self):
@@ -252,46 +195,34 @@ class TestMypyErrorParsing(unittest.TestCase):
             strict=False,
         ):
             with self.subTest(error_line=error_line):
-                self.assertEqual(
-                    extract_file_from_mypy_error(error_line), expected_file
-                )
-                self.assertEqual(
-                    extract_line_number_from_mypy_error(error_line), expected_line
-                )
-                self.assertEqual(
-                    extract_error_code_from_mypy_error(error_line), expected_code
-                )
+                error = parse_line(error_line)
+                self.assertEqual(error["file"], expected_file)
+                self.assertEqual(error["line"], expected_line)
+                self.assertEqual(error["error_code"], expected_code)
 
     def test_extract_from_invalid_mypy_lines(self):
-        """Test extraction functions with invalid mypy lines"""
+        """Test that lines that aren't mypy errors are skipped"""
         invalid_lines = [
             "",  # Empty line
             "This is not a mypy error line",  # Random text
             "file.txt:25: info: Some info message",  # Not an error (info, not error)
-            "file.py:abc: error: Invalid line number",  # Non-numeric line
+            "file.py:abc: error: Invalid line number [misc]",  # Non-numeric line
             "note: Some note without file",  # Note without file
         ]
 
         for invalid_line in invalid_lines:
             with self.subTest(invalid_line=invalid_line):
-                # These should return empty strings or 0 for invalid input
-                self.assertEqual(extract_file_from_mypy_error(invalid_line), "")
-                self.assertEqual(extract_line_number_from_mypy_error(invalid_line), 0)
-                self.assertEqual(extract_message_from_mypy_error(invalid_line), "")
-                self.assertEqual(extract_error_code_from_mypy_error(invalid_line), "")
+                self.assertEqual(list(iter_lint_errors([invalid_line], "python")), [])
 
     def test_mypy_error_without_error_code(self):
-        """Test mypy error line without error code brackets"""
-        error_without_code = "src/main.py:25: error: Some error message"
-
-        self.assertEqual(
-            extract_file_from_mypy_error(error_without_code), "src/main.py"
-        )
-        self.assertEqual(extract_line_number_from_mypy_error(error_without_code), 25)
-        self.assertEqual(
-            extract_message_from_mypy_error(error_without_code), "Some error message"
-        )
-        self.assertEqual(extract_error_code_from_mypy_error(error_without_code), "")
+        """Test the mypy pattern on an error line without error code brackets"""
+        match = MYPY_RE.match("src/main.py:25: error: Some error message")
+
+        assert match is not None
+        self.assertEqual(match["file"], "src/main.py")
+        self.assertEqual(match["line"], "25")
+        self.assertEqual(match["message"], "Some error message")
+        self.assertIsNone(match["code"])
 
 
 if __name__ == "__main__":
@@ -2,6 +2,8 @@
 Unit tests for repository indexing functionality.
 """
 
+import os
+import subprocess
 import tempfile
 from pathlib import Path
 
@@ -13,7 +15,7 @@ from repository_indexer import (
     IndexingResult,
     PythonRepositoryIndexer,
 )
-from symbol_storage import Symbol, SymbolKind
+from symbol_storage import SQLiteSymbolStorage, Symbol, SymbolKind
 from tests.conftest import MockSymbolExtractor
 
 
@@ -75,6 +77,41 @@ class TestIndexingResult:
         result.add_failed_file("bad2.py", "error")
         assert result.success_rate == 0.5  # 2 success out of 4 attempts
 
+    def test_add_unchanged_and_removed_files(self):
+        """Test tracking unchanged and removed files."""
+        result = IndexingResult()
+        result.add_processed_file("changed.py", 2)
+        result.add_unchanged_file("same.py", 3)
+        result.add_removed_file("gone.py")
+
+        assert result.unchanged_files == ["same.py"]
+        assert result.removed_files == ["gone.py"]
+        # Unchanged files still contribute their indexed symbols
+        assert result.total_symbols == 5
+        # ...but don't count as attempted work
+        assert result.success_rate == 1.0
+
+    def test_merge(self):
+        """Test merging another result into this one."""
+        result = IndexingResult()
+        result.add_processed_file("a.py", 2)
+
+        other = IndexingResult()
+        other.add_processed_file("b.py", 3)
+        other.add_failed_file("c.py", "error")
+        other.add_skipped_file("d.py")
+        other.add_unchanged_file("e.py", 4)
+        other.add_removed_file("f.py")
+
+        result.merge(other)
+
+        assert result.processed_files == ["a.py", "b.py"]
+        assert result.failed_files == [("c.py", "error")]
+        assert result.skipped_files == ["d.py"]
+        assert result.unchanged_files == ["e.py"]
+        assert result.removed_files == ["f.py"]
+        assert result.total_symbols == 9
+
     def test_str_representation(self):
         """Test string representation."""
         result = IndexingResult()
@@ -389,6 +426,424 @@ def helper():
             assert "CONSTANT" in symbol_names
             assert "helper" in symbol_names
 
+    def test_incremental_reindex_skips_unchanged_files(self, temp_database):
+        """Test that re-indexing an unchanged repository re-extracts nothing."""
+        indexer = PythonRepositoryIndexer(PythonSymbolExtractor(), temp_database)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            repo_path = Path(tmp_dir)
+            (repo_path / "main.py").write_text("def main():\n    pass\n")
+            (repo_path / "utils.py").write_text("def helper():\n    pass\n")
+
+            first = indexer.index_repository(tmp_dir, "incremental")
+            assert len(first.processed_files) == 2
+
+            second = indexer.index_repository(tmp_dir, "incremental")
+            assert second.processed_files == []
+            assert sorted(Path(f).name for f in second.unchanged_files) == [
+                "main.py",
+                "utils.py",
+            ]
+            assert second.total_symbols == first.total_symbols
+
+            symbols = temp_database.search_symbols("", repository_id="incremental")
+            assert sorted(s.name for s in symbols) == ["helper", "main"]
+
+    def test_incremental_reindex_updates_changed_files(self, temp_database):
+        """Test that only modified files are re-extracted."""
+        indexer = PythonRepositoryIndexer(PythonSymbolExtractor(), temp_database)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            repo_path = Path(tmp_dir)
+            main_file = repo_path / "main.py"
+            main_file.write_text("def main():\n    pass\n")
+            (repo_path / "utils.py").write_text("def helper():\n    pass\n")
+            indexer.index_repository(tmp_dir, "incremental")
+
+            main_file.write_text("def renamed_main():\n    pass\n")
+            stat_result = main_file.stat()
+            os.utime(
+                main_file,
+                ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1_000_000),
+            )
+
+            result = indexer.index_repository(tmp_dir, "incremental")
+            assert [Path(f).name for f in result.processed_files] == ["main.py"]
+            assert [Path(f).name for f in result.unchanged_files] == ["utils.py"]
+
+            symbols = temp_database.search_symbols("", repository_id="incremental")
+            assert sorted(s.name for s in symbols) == ["helper", "renamed_main"]
+
+    def test_incremental_reindex_removes_deleted_files(self, temp_database):
+        """Test that symbols of deleted files are dropped."""
+        indexer = PythonRepositoryIndexer(PythonSymbolExtractor(), temp_database)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            repo_path = Path(tmp_dir)
+            (repo_path / "main.py").write_text("def main():\n    pass\n")
+            (repo_path / "utils.py").write_text("def helper():\n    pass\n")
+            indexer.index_repository(tmp_dir, "incremental")
+
+            (repo_path / "utils.py").unlink()
+
+            result = indexer.index_repository(tmp_dir, "incremental")
+            assert [Path(f).name for f in result.removed_files] == ["utils.py"]
+
+            symbols = temp_database.search_symbols("", repository_id="incremental")
+            assert [s.name for s in symbols] == ["main"]
+            fingerprints = temp_database.get_file_fingerprints("incremental")
+            assert [Path(f).name for f in fingerprints] == ["main.py"]
+
+    def test_incremental_reindex_touched_file_keeps_symbols(self, temp_database):
+        """Test that a touched file with identical content is not re-extracted."""
+        indexer = PythonRepositoryIndexer(PythonSymbolExtractor(), temp_database)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            main_file = Path(tmp_dir) / "main.py"
+            main_file.write_text("def main():\n    pass\n")
+            indexer.index_repository(tmp_dir, "incremental")
+
+            stat_result = main_file.stat()
+            new_mtime_ns = stat_result.st_mtime_ns + 1_000_000
+            os.utime(main_file, ns=(stat_result.st_atime_ns, new_mtime_ns))
+
+            result = indexer.index_repository(tmp_dir, "incremental")
+            assert result.processed_files == []
+            assert [Path(f).name for f in result.unchanged_files] == ["main.py"]
+            assert result.total_symbols == 1
+
+            fingerprint = temp_database.get_file_fingerprints("incremental")[
+                str(main_file)
+            ]
+            assert fingerprint.mtime_ns == new_mtime_ns
+            assert fingerprint.symbol_count == 1
+
+    def test_incremental_reindex_drops_symbols_of_broken_file(self, temp_database):
+        """Test that a file that no longer parses loses its stale symbols."""
+        indexer = PythonRepositoryIndexer(PythonSymbolExtractor(), temp_database)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            main_file = Path(tmp_dir) / "main.py"
+            main_file.write_text("def main():\n    pass\n")
+            indexer.index_repository(tmp_dir, "incremental")
+
+            main_file.write_text("def main(:\n")
+            stat_result = main_file.stat()
+            os.utime(
+                main_file,
+                ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1_000_000),
+            )
+
+            result = indexer.index_repository(tmp_dir, "incremental")
+            assert len(result.failed_files) == 1
+            assert temp_database.search_symbols("main", "incremental") == []
+            assert temp_database.get_file_fingerprints("incremental") == {}
+
+    def test_clear_repository_index_forces_full_reindex(self, temp_database):
+        """Test that clearing the index drops the manifest as well."""
+        indexer = PythonRepositoryIndexer(PythonSymbolExtractor(), temp_database)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            (Path(tmp_dir) / "main.py").write_text("def main():\n    pass\n")
+            indexer.index_repository(tmp_dir, "incremental")
+
+            indexer.clear_repository_index("incremental")
+            assert temp_database.get_file_fingerprints("incremental") == {}
+
+            result = indexer.index_repository(tmp_dir, "incremental")
+            assert len(result.processed_files) == 1
+            assert result.unchanged_files == []
+
+    @staticmethod
+    def _create_parallel_test_repo(repo_path: Path) -> None:
+        """Create a repository mixing good, broken and oversized files."""
+        for i in range(7):
+            package = repo_path / f"pkg{i % 3}"
+            package.mkdir(exist_ok=True)
+            (package / f"module{i}.py").write_text(
+                f"class Model{i}:\n    def run(self):\n        pass\n\n"
+                f"def helper_{i}():\n    pass\n"
+            )
+        (repo_path / "broken.py").write_text("def broken(:\n")
+        (repo_path / "large.py").write_text("# " + "x" * 2048 + "\n")
+
+    @staticmethod
+    def _result_fields(result: IndexingResult) -> tuple:
+        return (
+            result.processed_files,
+            result.failed_files,
+            result.skipped_files,
+            result.unchanged_files,
+            result.removed_files,
+            result.total_symbols,
+        )
+
+    def test_parallel_extraction_matches_serial(self):
+        """Test that pooled extraction produces the same result as serial indexing."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            repo_path = Path(tmp_dir) / "repo"
+            repo_path.mkdir()
+            self._create_parallel_test_repo(repo_path)
+
+            serial_storage = SQLiteSymbolStorage(Path(tmp_dir) / "serial.db")
+            parallel_storage = SQLiteSymbolStorage(Path(tmp_dir) / "parallel.db")
+            try:
+                serial_indexer = PythonRepositoryIndexer(
+                    PythonSymbolExtractor(), serial_storage
+                )
+                parallel_indexer = PythonRepositoryIndexer(
+                    PythonSymbolExtractor(),
+                    parallel_storage,
+                    extraction_workers=2,
+                    extraction_chunk_size=2,
+                )
+                serial_indexer.max_file_size_bytes = 1024
+                parallel_indexer.max_file_size_bytes = 1024
+
+                progress: list[tuple[int, int]] = []
+                serial = serial_indexer.index_repository(str(repo_path), "repo")
+                parallel = parallel_indexer.index_repository(
+                    str(repo_path),
+                    "repo",
+                    lambda done, total: progress.append((done, total)),
+                )
+
+                assert progress == [(done, 9) for done in range(10)]
+
+                assert len(parallel.processed_files) == 7
+                assert len(parallel.failed_files) == 1
+                assert len(parallel.skipped_files) == 1
+                assert self._result_fields(parallel) == self._result_fields(serial)
+
+                def stored(storage):
+                    return sorted(
+                        (s.file_path, s.name, s.line_number)
+                        for s in storage.search_symbols("", "repo", limit=1000)
+                    )
+
+                assert stored(parallel_storage) == stored(serial_storage)
+
+                # A second pooled run only reconsiders the failed file
+                rerun = parallel_indexer.index_repository(str(repo_path), "repo")
+                assert len(rerun.unchanged_files) == 7
+                assert rerun.processed_files == []
+                assert len(rerun.failed_files) == 1
+            finally:
+                serial_storage.close()
+                parallel_storage.close()
+
+    def test_parallel_extraction_falls_back_for_unpicklable_extractor(
+        self, mock_symbol_storage
+    ):
+        """Test that an extractor that can't be sent to workers is run serially."""
+
+        class LocalExtractor(MockSymbolExtractor):
+            """Locally defined, so it cannot be pickled."""
+
+        extractor = LocalExtractor()
+        extractor.symbols = [
+            Symbol("func", SymbolKind.FUNCTION, "main.py", 1, 0, "test-repo")
+        ]
+        indexer = PythonRepositoryIndexer(
+            extractor, mock_symbol_storage, extraction_workers=4
+        )
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            (Path(tmp_dir) / "main.py").write_text("def func(): pass")
+            result = indexer.index_repository(tmp_dir, "test-repo")
+
+        assert len(result.processed_files) == 1
+        assert result.total_symbols == 1
+
+    def test_progress_callback(self, temp_database):
+        """Test that progress is reported after every file."""
+        indexer = PythonRepositoryIndexer(PythonSymbolExtractor(), temp_database)
+        progress: list[tuple[int, int]] = []
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for name in ["a.py", "b.py", "c.py"]:
+                (Path(tmp_dir) / name).write_text("def func():\n    pass\n")
+
+            indexer.index_repository(
+                tmp_dir, "repo", lambda done, total: progress.append((done, total))
+            )
+
+        assert progress == [(0, 3), (1, 3), (2, 3), (3, 3)]
+
+    def test_progress_callback_can_abort(self, temp_database):
+        """Test that an exception from the progress callback stops indexing."""
+        indexer = PythonRepositoryIndexer(PythonSymbolExtractor(), temp_database)
+
+        def abort_after_first_file(done, total):
+            if done == 1:
+                raise RuntimeError("stop")
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for name in ["a.py", "b.py", "c.py"]:
+                (Path(tmp_dir) / name).write_text("def func():\n    pass\n")
+
+            with pytest.raises(RuntimeError, match="stop"):
+                indexer.index_repository(tmp_dir, "repo", abort_after_first_file)
+
+            # The next run picks up where the aborted one left off
+            result = indexer.index_repository(tmp_dir, "repo")
+
+        assert len(result.processed_files) + len(result.unchanged_files) == 3
+        assert result.failed_files == []
+        assert len(temp_database.search_symbols("func", repository_id="repo")) == 3
+
+    def test_rebuild_keeps_previous_index_searchable(self, temp_database):
+        """Test that a rebuild only becomes visible once it is complete."""
+        indexer = PythonRepositoryIndexer(PythonSymbolExtractor(), temp_database)
+        visible_during_rebuild: list[list[str]] = []
+
+        def record_visible(done, total):
+            symbols = temp_database.search_symbols("", repository_id="repo")
+            visible_during_rebuild.append(sorted(s.name for s in symbols))
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for name in ["a", "b"]:
+                (Path(tmp_dir) / f"{name}.py").write_text(
+                    f"def old_{name}():\n    pass\n"
+                )
+            indexer.index_repository(tmp_dir, "repo")
+
+            for name in ["a", "b"]:
+                (Path(tmp_dir) / f"{name}.py").write_text(
+                    f"def new_{name}():\n    pass\n"
+                )
+            result = indexer.index_repository(
+                tmp_dir, "repo", record_visible, rebuild=True
+            )
+
+        assert len(result.processed_files) == 2
+        assert visible_during_rebuild == [["old_a", "old_b"]] * 3
+        symbols = temp_database.search_symbols("", repository_id="repo")
+        assert sorted(s.name for s in symbols) == ["new_a", "new_b"]
+
+    def test_find_python_files_uses_git_index(self, indexer, temp_git_repo):
+        """Test that discovery in a git work tree honors .gitignore."""
+        repo_path = Path(temp_git_repo)
+        (repo_path / ".gitignore").write_text("build/\n")
+        (repo_path / "build").mkdir()
+        (repo_path / "build" / "generated.py").write_text("x = 1")
+        (repo_path / "src").mkdir()
+        (repo_path / "src" / "module.py").write_text("x = 1")
+        # Exclude patterns still apply to files git reports
+        (repo_path / "venv").mkdir()
+        (repo_path / "venv" / "site.py").write_text("x = 1")
+
+        files = indexer._find_python_files(repo_path)
+
+        assert files == [repo_path / "main.py", repo_path / "src" / "module.py"]
+
+    def test_is_excluded_relative(self, indexer):
+        """Test component-based exclusion of repository-relative paths."""
+        names, suffixes = indexer._split_exclude_patterns()
+
+        assert indexer._is_excluded_relative(Path(".venv/lib/x.py"), names, suffixes)
+        assert indexer._is_excluded_relative(Path("pkg/__pycache__"), names, suffixes)
+        assert indexer._is_excluded_relative(Path("pkg/module.pyc"), names, suffixes)
+        assert not indexer._is_excluded_relative(
+            Path("environment/config.py"), names, suffixes
+        )
+        assert not indexer._is_excluded_relative(Path("src/main.py"), names, suffixes)
+
+    def test_reindex_files(self, temp_database):
+        """Test re-indexing a specific set of files."""
+        indexer = PythonRepositoryIndexer(PythonSymbolExtractor(), temp_database)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            repo_path = Path(tmp_dir)
+            main_file = repo_path / "main.py"
+            utils_file = repo_path / "utils.py"
+            main_file.write_text("def main():\n    pass\n")
+            utils_file.write_text("def helper():\n    pass\n")
+            indexer.index_repository(tmp_dir, "repo")
+
+            main_file.write_text("def main():\n    pass\n\ndef extra():\n    pass\n")
+            utils_file.unlink()
+            new_file = repo_path / "new.py"
+            new_file.write_text("class New:\n    pass\n")
+
+            result = indexer.reindex_files(
+                tmp_dir,
+                "repo",
+                [str(main_file), str(utils_file), str(new_file), "/elsewhere/x.py"],
+            )
+
+            assert sorted(Path(f).name for f in result.processed_files) == [
+                "main.py",
+                "new.py",
+            ]
+            assert [Path(f).name for f in result.removed_files] == ["utils.py"]
+
+            symbols = temp_database.search_symbols("", repository_id="repo")
+            assert sorted(s.name for s in symbols) == ["New", "extra", "main"]
+
+    def test_reindex_files_skips_ignored(self, temp_database, temp_git_repo):
+        """Test that changes of files ignored by git aren't indexed."""
+        indexer = PythonRepositoryIndexer(PythonSymbolExtractor(), temp_database)
+        repo_path = Path(temp_git_repo)
+        (repo_path / ".gitignore").write_text("generated/\n")
+        (repo_path / "generated").mkdir()
+        generated_file = repo_path / "generated" / "models.py"
+        generated_file.write_text("class Generated:\n    pass\n")
+        main_file = repo_path / "main.py"
+        main_file.write_text("def main():\n    pass\n")
+
+        result = indexer.reindex_files(
+            temp_git_repo, "repo", [str(generated_file), str(main_file)]
+        )
+
+        assert [Path(f).name for f in result.processed_files] == ["main.py"]
+        symbols = temp_database.search_symbols("", repository_id="repo")
+        assert [s.name for s in symbols] == ["main"]
+
+    def test_index_changed_files(self, temp_database, temp_git_repo):
+        """Test diff-driven re-indexing between two commits."""
+        indexer = PythonRepositoryIndexer(PythonSymbolExtractor(), temp_database)
+        repo_path = Path(temp_git_repo)
+
+        def git(*args):
+            return subprocess.run(
+                ["git", *args],
+                cwd=repo_path,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+
+        (repo_path / "main.py").write_text("def main():\n    pass\n")
+        (repo_path / "stale.py").write_text("def stale():\n    pass\n")
+        git("add", ".")
+        git("commit", "-m", "Add code")
+        base_commit = git("rev-parse", "HEAD")
+        indexer.index_repository(temp_git_repo, "repo")
+
+        (repo_path / "stale.py").unlink()
+        (repo_path / "fresh.py").write_text("def fresh():\n    pass\n")
+        git("add", "-A")
+        git("commit", "-m", "Replace stale with fresh")
+
+        result = indexer.index_changed_files(temp_git_repo, "repo", base_commit)
+
+        assert [Path(f).name for f in result.processed_files] == ["fresh.py"]
+        assert [Path(f).name for f in result.removed_files] == ["stale.py"]
+        symbols = temp_database.search_symbols("", repository_id="repo")
+        assert sorted(s.name for s in symbols) == ["fresh", "main"]
+
+    def test_index_changed_files_falls_back_without_git(self, temp_database):
+        """Test that diff-driven re-indexing falls back outside a work tree."""
+        indexer = PythonRepositoryIndexer(PythonSymbolExtractor(), temp_database)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            (Path(tmp_dir) / "main.py").write_text("def main():\n    pass\n")
+
+            result = indexer.index_changed_files(tmp_dir, "repo", "HEAD~1")
+
+            assert [Path(f).name for f in result.processed_files] == ["main.py"]
+
     def test_mock_indexer_default_result(self, mock_repository_indexer):
         """Test mock indexer with default result."""
         result = mock_repository_indexer.index_repository("/test/path", "test-repo")
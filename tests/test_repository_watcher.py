@@ -0,0 +1,311 @@
+"""
+Unit tests for live repository watching.
+"""
+
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from watchdog.events import (
+    DirCreatedEvent,
+    FileModifiedEvent,
+    FileMovedEvent,
+    FileOpenedEvent,
+)
+
+from python_symbol_extractor import PythonSymbolExtractor
+from repository_indexer import PythonRepositoryIndexer
+from repository_watcher import (
+    AbstractChangeSource,
+    ChangeCallback,
+    PollingChangeSource,
+    RepositoryWatcher,
+    SharedChangeSource,
+    WatchdogChangeSource,
+    _WatchdogEventHandler,
+)
+
+
+class ManualChangeSource(AbstractChangeSource):
+    """Change source driven by the test."""
+
+    def __init__(self):
+        self.on_change: ChangeCallback | None = None
+        self.stopped = False
+
+    def start(self, repository_path: Path, on_change: ChangeCallback) -> None:
+        self.on_change = on_change
+
+    def stop(self) -> None:
+        self.stopped = True
+
+    def change(self, path: Path) -> None:
+        assert self.on_change is not None
+        self.on_change(path)
+
+
+class FailingChangeSource(AbstractChangeSource):
+    """Change source whose backend is unavailable."""
+
+    def start(self, repository_path: Path, on_change: ChangeCallback) -> None:
+        raise OSError("inotify watch limit reached")
+
+    def stop(self) -> None:
+        pass
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    """Poll a condition until it holds or the timeout expires."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+class TestRepositoryWatcher:
+    """Test batching of changes by RepositoryWatcher."""
+
+    @pytest.fixture
+    def source(self):
+        return ManualChangeSource()
+
+    def test_debounces_burst_into_one_batch(self, mock_repository_indexer, source):
+        """Test that a burst of changes is applied as a single batch."""
+        watcher = RepositoryWatcher(
+            "/repo", "repo", mock_repository_indexer, source, debounce_seconds=0.05
+        )
+        watcher.start()
+        try:
+            for name in ["b.py", "a.py", "b.py"]:
+                source.change(Path("/repo") / name)
+
+            assert wait_for(lambda: mock_repository_indexer.reindexed_files)
+            time.sleep(0.1)
+        finally:
+            watcher.stop()
+
+        assert mock_repository_indexer.reindexed_files == [["/repo/a.py", "/repo/b.py"]]
+        assert mock_repository_indexer.last_repository_id == "repo"
+        assert source.stopped
+
+    def test_max_latency_bounds_continuous_changes(
+        self, mock_repository_indexer, source
+    ):
+        """Test that a steady stream of changes is still applied in time."""
+        watcher = RepositoryWatcher(
+            "/repo",
+            "repo",
+            mock_repository_indexer,
+            source,
+            debounce_seconds=0.1,
+            max_update_latency=0.2,
+        )
+        watcher.start()
+        try:
+            deadline = time.monotonic() + 0.6
+            while time.monotonic() < deadline:
+                source.change(Path("/repo/busy.py"))
+                time.sleep(0.02)
+            # The stream never paused for the debounce delay
+            assert len(mock_repository_indexer.reindexed_files) >= 2
+        finally:
+            watcher.stop()
+
+    def test_stop_applies_pending_changes(self, mock_repository_indexer, source):
+        """Test that stopping the watcher doesn't drop pending changes."""
+        watcher = RepositoryWatcher(
+            "/repo",
+            "repo",
+            mock_repository_indexer,
+            source,
+            debounce_seconds=10.0,
+            max_update_latency=10.0,
+        )
+        watcher.start()
+        source.change(Path("/repo/a.py"))
+        watcher.stop()
+
+        assert mock_repository_indexer.reindexed_files == [["/repo/a.py"]]
+        assert not watcher.is_running
+
+    def test_flush(self, mock_repository_indexer, source):
+        """Test applying pending changes on demand."""
+        watcher = RepositoryWatcher("/repo", "repo", mock_repository_indexer, source)
+
+        assert watcher.flush() is None
+        watcher.notify_changed(Path("/repo/a.py"))
+        assert watcher.flush() is mock_repository_indexer.predefined_result
+        assert mock_repository_indexer.reindexed_files == [["/repo/a.py"]]
+
+    def test_indexer_errors_keep_watcher_running(self, mock_repository_indexer, source):
+        """Test that a failing batch doesn't stop later batches."""
+        calls = []
+
+        def reindex_files(repository_path, repository_id, file_paths):
+            calls.append(file_paths)
+            if len(calls) == 1:
+                raise RuntimeError("database is locked")
+            return mock_repository_indexer.predefined_result
+
+        mock_repository_indexer.reindex_files = reindex_files
+        watcher = RepositoryWatcher(
+            "/repo", "repo", mock_repository_indexer, source, debounce_seconds=0.01
+        )
+        watcher.start()
+        try:
+            source.change(Path("/repo/a.py"))
+            assert wait_for(lambda: len(calls) == 1)
+            source.change(Path("/repo/b.py"))
+            assert wait_for(lambda: len(calls) == 2)
+        finally:
+            watcher.stop()
+
+        assert calls == [["/repo/a.py"], ["/repo/b.py"]]
+
+    def test_invalid_latency(self, mock_repository_indexer):
+        """Test that the debounce delay can't exceed the maximum latency."""
+        with pytest.raises(ValueError, match="max_update_latency"):
+            RepositoryWatcher(
+                "/repo",
+                "repo",
+                mock_repository_indexer,
+                debounce_seconds=1.0,
+                max_update_latency=0.5,
+            )
+
+    def test_falls_back_to_polling(self, mock_repository_indexer, monkeypatch):
+        """Test that polling is used when native watching is unavailable."""
+        monkeypatch.setattr(
+            "repository_watcher.WatchdogChangeSource", FailingChangeSource
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            watcher = RepositoryWatcher(tmp_dir, "repo", mock_repository_indexer)
+            watcher.start()
+            try:
+                assert isinstance(watcher.change_source, SharedChangeSource)
+                assert isinstance(watcher.change_source.source, PollingChangeSource)
+            finally:
+                watcher.stop()
+
+
+class TestChangeSources:
+    """Test the change sources against a real file system."""
+
+    def test_watchdog_event_handler_filters_events(self):
+        """Test that only content changes of watched files are forwarded."""
+        changes: list[Path] = []
+        handler = _WatchdogEventHandler(changes.append)
+
+        handler.on_any_event(FileModifiedEvent("/repo/a.py"))
+        handler.on_any_event(FileOpenedEvent("/repo/b.py"))
+        handler.on_any_event(FileModifiedEvent("/repo/notes.txt"))
+        handler.on_any_event(DirCreatedEvent("/repo/pkg.py"))
+        handler.on_any_event(FileMovedEvent("/repo/old.py", "/repo/new.py"))
+
+        assert changes == [
+            Path("/repo/a.py"),
+            Path("/repo/old.py"),
+            Path("/repo/new.py"),
+        ]
+
+    def test_watchdog_change_source(self):
+        """Test that native notifications report a written file."""
+        changes: list[Path] = []
+        source = WatchdogChangeSource()
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            repo_path = Path(tmp_dir).resolve()
+            source.start(repo_path, changes.append)
+            try:
+                (repo_path / "a.py").write_text("x = 1")
+                assert wait_for(lambda: repo_path / "a.py" in changes)
+            finally:
+                source.stop()
+
+    def test_shared_change_source(self, monkeypatch):
+        """Test that subscribers of one repository share a single source."""
+        started: list[ManualChangeSource] = []
+
+        def start_manual(repository_path, on_change, poll_interval):
+            source = ManualChangeSource()
+            source.start(repository_path, on_change)
+            started.append(source)
+            return source
+
+        monkeypatch.setattr("repository_watcher.start_change_source", start_manual)
+        first_changes: list[Path] = []
+        second_changes: list[Path] = []
+        first, second = SharedChangeSource(), SharedChangeSource()
+
+        first.start(Path("/repo"), first_changes.append)
+        second.start(Path("/repo/../repo"), second_changes.append)
+        [source] = started
+        source.change(Path("/repo/a.py"))
+        first.stop()
+        source.change(Path("/repo/b.py"))
+        assert not source.stopped
+        second.stop()
+
+        assert first_changes == [Path("/repo/a.py")]
+        assert second_changes == [Path("/repo/a.py"), Path("/repo/b.py")]
+        assert source.stopped
+
+    def test_polling_change_source(self, temp_git_repo):
+        """Test that polling reports modified, added and deleted files."""
+        repo_path = Path(temp_git_repo)
+        changes: set[Path] = set()
+        lock = threading.Lock()
+
+        def on_change(path: Path) -> None:
+            with lock:
+                changes.add(path)
+
+        source = PollingChangeSource(poll_interval=0.02)
+        source.start(repo_path, on_change)
+        try:
+            (repo_path / "main.py").write_text("# changed contents")
+            (repo_path / "added.py").write_text("x = 1")
+            (repo_path / "notes.txt").write_text("not watched")
+            assert wait_for(lambda: len(changes) >= 2)
+            time.sleep(0.1)
+            assert changes == {repo_path / "main.py", repo_path / "added.py"}
+
+            with lock:
+                changes.clear()
+            (repo_path / "added.py").unlink()
+            assert wait_for(lambda: changes == {repo_path / "added.py"})
+        finally:
+            source.stop()
+
+
+class TestLiveIndexing:
+    """Test that watched changes reach the symbol storage."""
+
+    def test_edits_become_searchable(self, temp_database):
+        """Test the full path from a file write to search results."""
+        indexer = PythonRepositoryIndexer(PythonSymbolExtractor(), temp_database)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            repo_path = Path(tmp_dir).resolve()
+            (repo_path / "main.py").write_text("def old_name():\n    pass\n")
+            indexer.index_repository(str(repo_path), "repo")
+
+            watcher = RepositoryWatcher(
+                str(repo_path), "repo", indexer, debounce_seconds=0.05
+            )
+            watcher.start()
+            try:
+                (repo_path / "main.py").write_text("def new_name():\n    pass\n")
+                assert wait_for(lambda: temp_database.search_symbols("new_name"))
+                assert temp_database.search_symbols("old_name") == []
+
+                (repo_path / "main.py").unlink()
+                assert wait_for(
+                    lambda: not temp_database.search_symbols("", repository_id="repo")
+                )
+            finally:
+                watcher.stop()
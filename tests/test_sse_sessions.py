@@ -0,0 +1,120 @@
+"""
+Unit tests for SSE session routing.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from sse_sessions import SSESessionManager
+
+ENDPOINT_URL = "http://localhost:8080/mcp/"
+
+
+async def read_event(stream) -> str:
+    """Read the next complete event from an SSE stream."""
+    chunks: list[str] = []
+    while not chunks or not chunks[-1].endswith("\n\n"):
+        chunks.append(await asyncio.wait_for(anext(stream), 1.0))
+    return "".join(chunks)
+
+
+async def open_stream(manager: SSESessionManager):
+    """Start a stream and return it with its session id."""
+    stream = manager.stream(ENDPOINT_URL)
+    endpoint_event = await read_event(stream)
+    assert endpoint_event.startswith("event: endpoint\n")
+    session_id = endpoint_event.split("session_id=")[1].strip()
+    return stream, session_id
+
+
+class TestSSESessionManager:
+    """Test the SSESessionManager class."""
+
+    @pytest.mark.asyncio
+    async def test_messages_reach_only_their_session(self):
+        """Test that each session receives only its own responses."""
+        manager = SSESessionManager()
+        first, first_id = await open_stream(manager)
+        second, second_id = await open_stream(manager)
+        assert first_id != second_id
+        assert len(manager) == 2
+
+        assert manager.publish(second_id, {"id": 2})
+        assert manager.publish(first_id, {"id": 1})
+
+        assert (
+            await read_event(first)
+            == f"event: message\ndata: {json.dumps({'id': 1})}\n\n"
+        )
+        assert (
+            await read_event(second)
+            == f"event: message\ndata: {json.dumps({'id': 2})}\n\n"
+        )
+
+        await first.aclose()
+        await second.aclose()
+
+    @pytest.mark.asyncio
+    async def test_waiting_stream_is_woken_immediately(self):
+        """Test that a message is delivered without polling delay."""
+        manager = SSESessionManager()
+        stream, session_id = await open_stream(manager)
+
+        pending = asyncio.ensure_future(read_event(stream))
+        await asyncio.sleep(0)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        manager.publish(session_id, {"id": 1})
+        event = await pending
+
+        assert '"id": 1' in event
+        assert loop.time() - started < 0.05
+        await stream.aclose()
+
+    @pytest.mark.asyncio
+    async def test_closing_stream_closes_session(self):
+        """Test that a disconnected client's session is removed."""
+        manager = SSESessionManager()
+        stream, session_id = await open_stream(manager)
+
+        await stream.aclose()
+
+        assert len(manager) == 0
+        assert not manager.publish(session_id, {"id": 1})
+
+    @pytest.mark.asyncio
+    async def test_keepalive(self):
+        """Test that idle streams send keepalive comments."""
+        manager = SSESessionManager(keepalive_interval=0.01)
+        stream, _ = await open_stream(manager)
+
+        assert await read_event(stream) == ": keepalive\n\n"
+        await stream.aclose()
+
+    @pytest.mark.asyncio
+    async def test_close_all_ends_streams(self):
+        """Test that close_all ends every open stream."""
+        manager = SSESessionManager()
+        stream, _ = await open_stream(manager)
+
+        manager.close_all()
+
+        with pytest.raises(StopAsyncIteration):
+            await anext(stream)
+        assert len(manager) == 0
+
+    def test_missing_session_id(self):
+        """Test routing of requests that don't name a session."""
+        manager = SSESessionManager()
+        assert manager.get(None) is None
+
+        only = manager.open()
+        assert manager.get(None) is only
+
+        # With several clients connected the target would be a guess
+        manager.open()
+        assert manager.get(None) is None
+        assert not manager.publish(None, {"id": 1})
+        assert manager.get("unknown") is None
@@ -4,8 +4,11 @@
 Unit tests for the startup orchestrator module.
 """
 
+import asyncio
 import sqlite3
+import subprocess
 import tempfile
+import threading
 import time
 from pathlib import Path
 
@@ -13,7 +16,11 @@ import pytest
 
 from constants import Language
 from python_symbol_extractor import PythonSymbolExtractor
-from repository_indexer import PythonRepositoryIndexer
+from repository_indexer import (
+    IndexingProgressCallback,
+    IndexingResult,
+    PythonRepositoryIndexer,
+)
 from repository_manager import RepositoryConfig
 from startup_orchestrator import (
     CodebaseStartupOrchestrator,
@@ -21,7 +28,8 @@ from startup_orchestrator import (
     IndexingStatusEnum,
     StartupResult,
 )
-from symbol_storage import SQLiteSymbolStorage
+from symbol_storage import FileFingerprint, SQLiteSymbolStorage
+from tests.conftest import MockRepositoryIndexer
 
 
 class TestIndexingStatus:
@@ -452,3 +460,335 @@ class TestCodebaseStartupOrchestrator:
             assert status.error_message is not None
             assert status.start_time is not None
             assert status.end_time is not None
+
+
+def make_python_repo(name: str, path: str) -> RepositoryConfig:
+    """Create a Python repository config for scheduling tests."""
+    return RepositoryConfig(
+        name=name,
+        path=path,
+        description=f"{name} repository",
+        language=Language.PYTHON,
+        port=8080,
+        python_path="/usr/bin/python3",
+        github_owner="owner",
+        github_repo=name,
+    )
+
+
+class RecordingIndexer(MockRepositoryIndexer):
+    """Indexer that records call order, threads, and concurrency."""
+
+    def __init__(self, delay: float = 0.05, fail_for: set[str] | None = None):
+        super().__init__()
+        self.delay = delay
+        self.fail_for = fail_for or set()
+        self.order: list[str] = []
+        self.threads: set[int] = set()
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def index_repository(
+        self,
+        repository_path: str,
+        repository_id: str,
+        progress_callback: IndexingProgressCallback | None = None,
+    ) -> IndexingResult:
+        with self._lock:
+            self.order.append(repository_id)
+            self.threads.add(threading.get_ident())
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            # Simulate a repository of two files
+            for files_done in range(3):
+                if progress_callback:
+                    progress_callback(files_done, 2)
+                if files_done < 2:
+                    time.sleep(self.delay / 2)
+            if repository_id in self.fail_for:
+                raise RuntimeError(f"cannot index {repository_id}")
+            return IndexingResult()
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+class TestConcurrentIndexing:
+    """Test concurrent scheduling of repository indexing."""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self, mock_symbol_storage):
+        """Test that no more than the configured repositories index at once."""
+        indexer = RecordingIndexer()
+        orchestrator = CodebaseStartupOrchestrator(
+            mock_symbol_storage,
+            PythonSymbolExtractor(),
+            indexer,
+            max_concurrent_indexing=2,
+        )
+        repos = [make_python_repo(f"repo-{i}", f"/repos/repo-{i}") for i in range(5)]
+
+        result = await orchestrator.initialize_repositories(repos)
+
+        assert result.indexed_repositories == 5
+        assert indexer.max_active == 2
+        assert [s.repository_id for s in result.indexing_statuses] == [
+            r.name for r in repos
+        ]
+
+    @pytest.mark.asyncio
+    async def test_indexing_runs_off_event_loop(self, mock_symbol_storage):
+        """Test that the event loop keeps running while repositories index."""
+        indexer = RecordingIndexer(delay=0.2)
+        orchestrator = CodebaseStartupOrchestrator(
+            mock_symbol_storage, PythonSymbolExtractor(), indexer
+        )
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker_task = asyncio.create_task(ticker())
+        try:
+            await orchestrator.initialize_repositories(
+                [make_python_repo("repo", "/repos/repo")]
+            )
+        finally:
+            ticker_task.cancel()
+
+        assert ticks > 5
+        assert threading.get_ident() not in indexer.threads
+
+    @pytest.mark.asyncio
+    async def test_failures_are_isolated(self, mock_symbol_storage):
+        """Test that one failing repository does not affect the others."""
+        indexer = RecordingIndexer(fail_for={"bad"})
+        orchestrator = CodebaseStartupOrchestrator(
+            mock_symbol_storage,
+            PythonSymbolExtractor(),
+            indexer,
+            max_concurrent_indexing=3,
+        )
+        repos = [
+            make_python_repo("good", "/repos/good"),
+            make_python_repo("bad", "/repos/bad"),
+            make_python_repo("other", "/repos/other"),
+        ]
+
+        result = await orchestrator.initialize_repositories(repos)
+
+        assert result.indexed_repositories == 2
+        assert result.failed_repositories == 1
+        bad_status = orchestrator.get_indexing_status("bad", result.indexing_statuses)
+        assert bad_status is not None
+        assert bad_status.status == IndexingStatusEnum.FAILED
+        assert bad_status.error_message == "cannot index bad"
+        assert bad_status.end_time is not None
+
+    def test_schedule_priority_then_size(self, mock_symbol_storage):
+        """Test ordering by priority, then indexed before new, then size."""
+        mock_symbol_storage.file_fingerprints["small"] = {
+            "a.py": FileFingerprint("a.py", 100, 0, "hash")
+        }
+        mock_symbol_storage.file_fingerprints["large"] = {
+            "a.py": FileFingerprint("a.py", 5000, 0, "hash"),
+            "b.py": FileFingerprint("b.py", 5000, 0, "hash"),
+        }
+        orchestrator = CodebaseStartupOrchestrator(
+            mock_symbol_storage,
+            PythonSymbolExtractor(),
+            RecordingIndexer(),
+            repository_priorities={"urgent": 10},
+        )
+        repos = [
+            make_python_repo(name, f"/repos/{name}")
+            for name in ["new", "large", "small", "urgent"]
+        ]
+
+        ordered = orchestrator._schedule_repositories(repos)
+
+        assert [r.name for r in ordered] == ["urgent", "small", "large", "new"]
+
+    def test_schedule_new_repositories_by_estimated_size(
+        self, mock_symbol_storage, tmp_path
+    ):
+        """Test that never-indexed repositories are ordered by their source size."""
+        for name, size in [("big", 5000), ("tiny", 10)]:
+            repo_path = tmp_path / name
+            repo_path.mkdir()
+            subprocess.run(["git", "init"], cwd=repo_path, capture_output=True)
+            (repo_path / "module.py").write_text("x" * size)
+        orchestrator = CodebaseStartupOrchestrator(
+            mock_symbol_storage, PythonSymbolExtractor(), RecordingIndexer()
+        )
+        repos = [
+            make_python_repo("unlisted", str(tmp_path / "missing")),
+            make_python_repo("big", str(tmp_path / "big")),
+            make_python_repo("tiny", str(tmp_path / "tiny")),
+        ]
+
+        ordered = orchestrator._schedule_repositories(repos)
+
+        assert [r.name for r in ordered] == ["tiny", "big", "unlisted"]
+
+    @pytest.mark.asyncio
+    async def test_single_runner_indexes_in_schedule_order(self, mock_symbol_storage):
+        """Test that repositories are started in schedule order."""
+        mock_symbol_storage.file_fingerprints["indexed"] = {
+            "a.py": FileFingerprint("a.py", 10, 0, "hash")
+        }
+        indexer = RecordingIndexer(delay=0)
+        orchestrator = CodebaseStartupOrchestrator(
+            mock_symbol_storage,
+            PythonSymbolExtractor(),
+            indexer,
+            max_concurrent_indexing=1,
+        )
+        repos = [
+            make_python_repo("fresh", "/repos/fresh"),
+            make_python_repo("indexed", "/repos/indexed"),
+        ]
+
+        await orchestrator.initialize_repositories(repos)
+
+        assert indexer.order == ["indexed", "fresh"]
+
+    @pytest.mark.asyncio
+    async def test_completion_callback_runs_per_repository(self, mock_symbol_storage):
+        """Test that each completed repository is reported before the next starts."""
+        indexer = RecordingIndexer(delay=0, fail_for={"bad"})
+        orchestrator = CodebaseStartupOrchestrator(
+            mock_symbol_storage,
+            PythonSymbolExtractor(),
+            indexer,
+            max_concurrent_indexing=1,
+        )
+        reported = []
+
+        async def on_indexed(status):
+            reported.append((status.repository_id, list(indexer.order)))
+            if status.repository_id == "first":
+                raise RuntimeError("watcher failed")
+
+        result = await orchestrator.initialize_repositories(
+            [
+                make_python_repo("first", "/repos/first"),
+                make_python_repo("bad", "/repos/bad"),
+                make_python_repo("last", "/repos/last"),
+            ],
+            on_indexed,
+        )
+
+        assert reported == [
+            ("first", ["first"]),
+            ("last", ["first", "bad", "last"]),
+        ]
+        assert result.indexed_repositories == 2
+
+    @pytest.mark.asyncio
+    async def test_progress_is_published(self, mock_symbol_storage):
+        """Test that indexing progress is recorded in the symbol storage."""
+        indexer = RecordingIndexer(fail_for={"bad"})
+        orchestrator = CodebaseStartupOrchestrator(
+            mock_symbol_storage, PythonSymbolExtractor(), indexer
+        )
+        published = []
+        set_progress = mock_symbol_storage.set_indexing_progress
+
+        def record_progress(progress):
+            published.append((progress.repository_id, progress.state))
+            set_progress(progress)
+
+        mock_symbol_storage.set_indexing_progress = record_progress
+
+        result = await orchestrator.initialize_repositories(
+            [
+                make_python_repo("good", "/repos/good"),
+                make_python_repo("bad", "/repos/bad"),
+            ]
+        )
+
+        good_states = [state for repo, state in published if repo == "good"]
+        assert good_states[0] == "pending"
+        assert "in_progress" in good_states
+        assert good_states[-1] == "completed"
+
+        good = mock_symbol_storage.get_indexing_progress("good")
+        assert good.is_complete
+        assert (good.files_processed, good.files_total) == (2, 2)
+        assert result.indexing_statuses[0].files_processed == 2
+
+        bad = mock_symbol_storage.get_indexing_progress("bad")
+        assert bad.state == "failed"
+        assert bad.error_message == "cannot index bad"
+
+    @pytest.mark.asyncio
+    async def test_cancel_indexing(self, mock_symbol_storage):
+        """Test that cancelling stops running jobs and skips queued ones."""
+        indexer = RecordingIndexer(delay=0.4)
+        orchestrator = CodebaseStartupOrchestrator(
+            mock_symbol_storage,
+            PythonSymbolExtractor(),
+            indexer,
+            max_concurrent_indexing=1,
+        )
+        repos = [make_python_repo(f"repo-{i}", f"/repos/repo-{i}") for i in range(3)]
+
+        task = asyncio.create_task(orchestrator.initialize_repositories(repos))
+        await asyncio.sleep(0.1)
+        orchestrator.cancel_indexing()
+        result = await task
+
+        assert indexer.order == ["repo-0"]
+        assert result.indexed_repositories == 0
+        assert result.failed_repositories == 3
+        for status in result.indexing_statuses:
+            assert status.status == IndexingStatusEnum.FAILED
+            assert "cancelled" in (status.error_message or "")
+            assert status.end_time is not None
+            progress = mock_symbol_storage.get_indexing_progress(status.repository_id)
+            assert progress.state == IndexingStatusEnum.FAILED.value
+
+    def test_invalid_concurrency(self, mock_symbol_storage):
+        """Test that the concurrency limit must be positive."""
+        with pytest.raises(ValueError):
+            CodebaseStartupOrchestrator(
+                mock_symbol_storage,
+                PythonSymbolExtractor(),
+                RecordingIndexer(),
+                max_concurrent_indexing=0,
+            )
+
+    @pytest.mark.asyncio
+    async def test_concurrent_indexing_shares_database(self):
+        """Test indexing several repositories into one database concurrently."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            storage = SQLiteSymbolStorage(Path(temp_dir) / "test.db")
+            extractor = PythonSymbolExtractor()
+            indexer = PythonRepositoryIndexer(extractor, storage)
+            orchestrator = CodebaseStartupOrchestrator(
+                storage, extractor, indexer, max_concurrent_indexing=3
+            )
+
+            repos = []
+            for i in range(3):
+                repo_dir = Path(temp_dir) / f"repo_{i}"
+                repo_dir.mkdir()
+                for j in range(20):
+                    (repo_dir / f"module_{j}.py").write_text(
+                        f"def function_{i}_{j}():\n    pass\n"
+                    )
+                repos.append(make_python_repo(f"repo-{i}", str(repo_dir)))
+
+            result = await orchestrator.initialize_repositories(repos)
+
+            assert result.indexed_repositories == 3
+            for i in range(3):
+                symbols = storage.search_symbols("function", repository_id=f"repo-{i}")
+                assert len(symbols) == 20
+            storage.close()
@@ -2,13 +2,17 @@
 Unit tests for symbol storage functionality.
 """
 
+import sqlite3
 import tempfile
+import threading
 from pathlib import Path
 
 import pytest
 
 from symbol_storage import (
     AbstractSymbolStorage,
+    FileFingerprint,
+    IndexingProgress,
     SQLiteSymbolStorage,
     Symbol,
     SymbolKind,
@@ -359,6 +363,559 @@ class TestSQLiteSymbolStorage:
         assert len(results) == 1
         assert results[0].repository_id == "repo2"
 
+    def test_fts_index_created(self, storage):
+        """Test that the trigram FTS index and its sync triggers exist."""
+        assert storage.fts_enabled
+
+        with storage._get_connection() as conn:
+            tables = [
+                row[0]
+                for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type='table'"
+                ).fetchall()
+            ]
+            triggers = [
+                row[0]
+                for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type='trigger'"
+                ).fetchall()
+            ]
+
+        assert "symbols_fts" in tables
+        for trigger in [
+            "symbols_fts_insert",
+            "symbols_fts_delete",
+            "symbols_fts_update",
+        ]:
+            assert trigger in triggers
+
+    def test_fts_index_used_for_search(self, storage, sample_symbols):
+        """Test that substring searches are served from the FTS index."""
+        storage.insert_symbols(sample_symbols)
+
+        with storage._get_connection() as conn:
+            plan = conn.execute(
+                """
+                EXPLAIN QUERY PLAN
+                SELECT symbols.* FROM symbols_fts
+                JOIN symbols ON symbols.id = symbols_fts.rowid
+                WHERE symbols_fts.name LIKE ?
+                """,
+                ("%function%",),
+            ).fetchall()
+
+        assert any("VIRTUAL TABLE INDEX" in row[3] for row in plan)
+
+        results = storage.search_symbols("function")
+        assert sorted(s.name for s in results) == [
+            "helper_function",
+            "test_function",
+        ]
+
+    def test_fts_index_tracks_deletes_and_updates(self, storage, sample_symbols):
+        """Test that the FTS index stays in sync with the symbols table."""
+        storage.insert_symbols(sample_symbols)
+
+        storage.delete_symbols_by_repository("other-repo")
+        assert storage.search_symbols("helper") == []
+
+        updated = Symbol(
+            name="test_function",
+            kind=SymbolKind.FUNCTION,
+            file_path="test.py",
+            line_number=12,
+            column_number=0,
+            repository_id="test-repo",
+        )
+        storage.update_symbol(updated)
+        results = storage.search_symbols("t_func")
+        assert len(results) == 1
+        assert results[0].line_number == 12
+
+    def test_search_symbols_short_query(self, storage, sample_symbols):
+        """Test that queries shorter than a trigram still match."""
+        storage.insert_symbols(sample_symbols)
+
+        results = storage.search_symbols("TC")
+        assert [s.name for s in results] == ["TestClass"]
+
+        results = storage.search_symbols("lp", "other-repo")
+        assert [s.name for s in results] == ["helper_function"]
+
+    def test_search_symbols_prefix(self, storage, sample_symbols):
+        """Test prefix-only searches."""
+        storage.insert_symbols(sample_symbols)
+
+        results = storage.search_symbols("test", prefix=True)
+        assert {s.name for s in results} == {
+            "TestClass",
+            "test_function",
+            "test_method",
+            "TEST_CONSTANT",
+        }
+
+        results = storage.search_symbols("function", prefix=True)
+        assert results == []
+
+        results = storage.search_symbols("he", prefix=True)
+        assert [s.name for s in results] == ["helper_function"]
+
+    def test_search_symbols_fts_exact_match_first(self, storage):
+        """Test that FTS-backed searches keep exact matches first."""
+        symbols = [
+            Symbol("a_parser", SymbolKind.FUNCTION, "p.py", 1, 0, "repo"),
+            Symbol("parser", SymbolKind.CLASS, "p.py", 2, 0, "repo"),
+            Symbol("parser_utils", SymbolKind.FUNCTION, "p.py", 3, 0, "repo"),
+        ]
+        storage.insert_symbols(symbols)
+
+        results = storage.search_symbols("parser")
+        assert [s.name for s in results] == ["parser", "a_parser", "parser_utils"]
+
+    def test_fts_index_backfilled_for_existing_database(self):
+        """Test that a database created before the FTS index gets backfilled."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = Path(temp_dir) / "legacy.db"
+            storage = SQLiteSymbolStorage(db_path)
+            storage.insert_symbols(
+                [Symbol("LegacyClass", SymbolKind.CLASS, "old.py", 1, 0, "repo")]
+            )
+
+            # Simulate a database that predates the FTS index
+            conn = storage._get_connection()
+            for trigger in ["insert", "delete", "update"]:
+                conn.execute(f"DROP TRIGGER symbols_fts_{trigger}")
+            conn.execute("DROP TABLE symbols_fts")
+            conn.commit()
+            storage.close()
+
+            reopened = SQLiteSymbolStorage(db_path)
+            try:
+                results = reopened.search_symbols("acyCla")
+                assert [s.name for s in results] == ["LegacyClass"]
+            finally:
+                reopened.close()
+
+    def test_record_and_get_file_fingerprints(self, storage):
+        """Test recording and reading back file fingerprints."""
+        fingerprint = FileFingerprint("a.py", 10, 123, "abc", symbol_count=2)
+        storage.record_file_fingerprint("repo", fingerprint)
+
+        assert storage.get_file_fingerprints("repo") == {"a.py": fingerprint}
+        assert storage.get_file_fingerprints("other") == {}
+
+        # Recording again updates the existing entry
+        updated = FileFingerprint("a.py", 12, 456, "def", symbol_count=3)
+        storage.record_file_fingerprint("repo", updated)
+        assert storage.get_file_fingerprints("repo") == {"a.py": updated}
+
+    def test_replace_file_symbols(self, storage, sample_symbols):
+        """Test replacing the symbols of a single file."""
+        storage.insert_symbols(sample_symbols)
+
+        new_symbols = [
+            Symbol("NewClass", SymbolKind.CLASS, "test.py", 3, 0, "test-repo"),
+        ]
+        fingerprint = FileFingerprint("test.py", 100, 1, "hash", symbol_count=1)
+        storage.replace_file_symbols("test-repo", "test.py", new_symbols, fingerprint)
+
+        results = storage.get_symbols_by_file("test.py", "test-repo")
+        assert [s.name for s in results] == ["NewClass"]
+        # Other files are untouched
+        assert len(storage.get_symbols_by_file("constants.py", "test-repo")) == 1
+        assert storage.get_file_fingerprints("test-repo") == {"test.py": fingerprint}
+
+    def test_delete_file_symbols(self, storage, sample_symbols):
+        """Test deleting the symbols and fingerprint of a single file."""
+        storage.insert_symbols(sample_symbols)
+        storage.record_file_fingerprint(
+            "test-repo", FileFingerprint("test.py", 1, 1, "hash", symbol_count=3)
+        )
+
+        storage.delete_file_symbols("test-repo", "test.py")
+
+        assert storage.get_symbols_by_file("test.py", "test-repo") == []
+        assert storage.get_file_fingerprints("test-repo") == {}
+        assert len(storage.search_symbols("", "test-repo")) == 1
+
+    def test_delete_symbols_by_repository_clears_fingerprints(self, storage):
+        """Test that deleting a repository also drops its manifest."""
+        storage.record_file_fingerprint("repo", FileFingerprint("a.py", 1, 1, "x"))
+        storage.record_file_fingerprint("other", FileFingerprint("b.py", 1, 1, "y"))
+
+        storage.delete_symbols_by_repository("repo")
+
+        assert storage.get_file_fingerprints("repo") == {}
+        assert list(storage.get_file_fingerprints("other")) == ["b.py"]
+
+    @staticmethod
+    def _count_committed_symbols(storage):
+        """Count symbol rows visible to an independent connection."""
+        conn = sqlite3.connect(str(storage.db_path))
+        try:
+            return conn.execute("SELECT COUNT(*) FROM symbols").fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_bulk_load_commits_on_exit(self, storage, sample_symbols):
+        """Test that bulk-loaded writes are committed together at the end."""
+        with storage.bulk_load():
+            for symbol in sample_symbols:
+                storage.insert_symbols([symbol])
+            # Nothing is committed yet, but this connection sees its own writes
+            assert self._count_committed_symbols(storage) == 0
+            assert len(storage.search_symbols("")) == 5
+
+        assert self._count_committed_symbols(storage) == 5
+
+    def test_bulk_load_intermediate_commits(self, storage, sample_symbols):
+        """Test that a bulk load commits every commit_rows rows."""
+        with storage.bulk_load(commit_rows=2):
+            storage.insert_symbols(sample_symbols[:2])
+            assert self._count_committed_symbols(storage) == 2
+            storage.insert_symbols(sample_symbols[2:3])
+            assert self._count_committed_symbols(storage) == 2
+
+        assert self._count_committed_symbols(storage) == 3
+
+    def test_bulk_load_relaxes_and_restores_pragmas(self, storage):
+        """Test that durability pragmas are relaxed only during the load."""
+        conn = storage._get_connection()
+        cache_size = conn.execute("PRAGMA cache_size").fetchone()[0]
+
+        with storage.bulk_load():
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 0
+
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == cache_size
+
+    def test_bulk_load_rebuilds_indexes(self, storage, sample_symbols):
+        """Test dropping and rebuilding secondary indexes around a load."""
+
+        def index_names():
+            rows = storage._get_connection().execute(
+                "SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='symbols'"
+            )
+            return {row[0] for row in rows}
+
+        with storage.bulk_load(rebuild_indexes=True):
+            assert "idx_symbols_name" not in index_names()
+            assert "idx_symbols_file_path" in index_names()
+            storage.insert_symbols(sample_symbols)
+
+        assert {
+            "idx_symbols_name",
+            "idx_symbols_repository_id",
+            "idx_symbols_kind",
+            "idx_symbols_file_path",
+            "idx_symbols_name_repo",
+        } <= index_names()
+        assert len(storage.search_symbols("test")) == 4
+
+    def test_bulk_load_failed_write_is_rolled_back_alone(self, sample_symbols):
+        """Test that a failing write inside a bulk load doesn't lose the others."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            storage = SQLiteSymbolStorage(
+                Path(temp_dir) / "bulk.db", max_retries=0, retry_delay=0
+            )
+            try:
+                broken = FileFingerprint("bad.py", 1, 1, None)  # type: ignore[arg-type]
+                with storage.bulk_load():
+                    storage.insert_symbols(sample_symbols[:2])
+                    with pytest.raises(sqlite3.IntegrityError):
+                        storage.replace_file_symbols(
+                            "test-repo", "bad.py", sample_symbols[2:], broken
+                        )
+                    storage.insert_symbols(sample_symbols[4:])
+
+                assert self._count_committed_symbols(storage) == 3
+                assert storage.get_file_fingerprints("test-repo") == {}
+            finally:
+                storage.close()
+
+    def test_bulk_load_rolls_back_on_error(self, storage, sample_symbols):
+        """Test that an error inside the context discards uncommitted writes."""
+        with pytest.raises(ValueError):
+            with storage.bulk_load():
+                storage.insert_symbols(sample_symbols)
+                raise ValueError("indexing failed")
+
+        assert self._count_committed_symbols(storage) == 0
+
+        # Regular writes commit again after the load
+        storage.insert_symbols(sample_symbols[:1])
+        assert self._count_committed_symbols(storage) == 1
+
+    def test_bulk_load_cannot_nest(self, storage):
+        """Test that only one bulk load can be active at a time."""
+        with storage.bulk_load():
+            with pytest.raises(RuntimeError, match="already in progress"):
+                with storage.bulk_load():
+                    pass
+
+    def test_set_and_get_indexing_progress(self, storage):
+        """Test recording and replacing a repository's indexing progress."""
+        assert storage.get_indexing_progress("test-repo") is None
+
+        storage.set_indexing_progress(
+            IndexingProgress("test-repo", "in_progress", 5, 10, updated_at=100.0)
+        )
+        progress = storage.get_indexing_progress("test-repo")
+        assert progress == IndexingProgress("test-repo", "in_progress", 5, 10, 100.0)
+        assert not progress.is_complete
+
+        storage.set_indexing_progress(
+            IndexingProgress("test-repo", "completed", 10, 10)
+        )
+        progress = storage.get_indexing_progress("test-repo")
+        assert progress is not None
+        assert progress.is_complete
+        assert progress.updated_at > 0
+        assert storage.get_indexing_progress("other-repo") is None
+
+    def test_bulk_load_commits_after_interval(
+        self, storage, sample_symbols, monkeypatch
+    ):
+        """Test that a bulk load doesn't hold the write lock indefinitely."""
+        monkeypatch.setattr("symbol_storage.BULK_LOAD_COMMIT_INTERVAL", 0.0)
+
+        with storage.bulk_load():
+            storage.insert_symbols(sample_symbols[:1])
+            assert self._count_committed_symbols(storage) == 1
+
+    def test_connections_are_per_thread(self, storage):
+        """Test that each thread uses its own connection."""
+        main_connection = storage._get_connection()
+        thread_connections = []
+
+        thread = threading.Thread(
+            target=lambda: thread_connections.append(storage._get_connection())
+        )
+        thread.start()
+        thread.join()
+
+        assert thread_connections[0] is not main_connection
+        assert storage._get_connection() is main_connection
+
+        # close() closes every thread's connection; the next use reconnects
+        storage.close()
+        with pytest.raises(sqlite3.ProgrammingError):
+            thread_connections[0].execute("SELECT 1")
+        assert storage._get_connection() is not main_connection
+        assert storage.search_symbols("") == []
+
+    def test_in_memory_storage_shares_connection(self):
+        """Test that an in-memory database is visible from every thread."""
+        storage = SQLiteSymbolStorage(":memory:")
+        try:
+            storage.insert_symbol(
+                Symbol("shared", SymbolKind.FUNCTION, "a.py", 1, 0, "repo")
+            )
+            results = []
+            thread = threading.Thread(
+                target=lambda: results.extend(storage.search_symbols("shared"))
+            )
+            thread.start()
+            thread.join()
+
+            assert [symbol.name for symbol in results] == ["shared"]
+        finally:
+            storage.close()
+
+    def test_bulk_load_is_per_thread(self, storage, sample_symbols):
+        """Test that other threads write normally during a bulk load."""
+        errors = []
+
+        def write_from_thread():
+            try:
+                storage.insert_symbols(sample_symbols[:1])
+            except Exception as e:
+                errors.append(e)
+
+        with storage.bulk_load():
+            thread = threading.Thread(target=write_from_thread)
+            thread.start()
+            thread.join()
+            assert errors == []
+            assert self._count_committed_symbols(storage) == 1
+
+            storage.insert_symbols(sample_symbols[1:])
+            assert self._count_committed_symbols(storage) == 1
+
+        assert self._count_committed_symbols(storage) == 5
+
+    def test_first_generation_is_searchable_while_built(self, storage):
+        """Test that building into an empty repository activates right away."""
+        generation = storage.begin_generation("repo")
+        storage.replace_file_symbols(
+            "repo",
+            "a.py",
+            [Symbol("first", SymbolKind.FUNCTION, "a.py", 1, 0, "repo")],
+            FileFingerprint("a.py", 1, 1, "x", symbol_count=1),
+            generation,
+        )
+
+        assert [s.name for s in storage.search_symbols("first")] == ["first"]
+        assert list(storage.get_file_fingerprints("repo")) == ["a.py"]
+
+    def test_rebuild_generation_hidden_until_activated(self, storage):
+        """Test that a rebuild is invisible until its generation is activated."""
+        storage.insert_symbol(Symbol("old", SymbolKind.FUNCTION, "a.py", 1, 0, "repo"))
+        storage.record_file_fingerprint("repo", FileFingerprint("a.py", 1, 1, "x"))
+
+        generation = storage.begin_generation("repo")
+        storage.replace_file_symbols(
+            "repo",
+            "a.py",
+            [Symbol("new", SymbolKind.FUNCTION, "a.py", 1, 0, "repo")],
+            FileFingerprint("a.py", 2, 2, "y", symbol_count=1),
+            generation,
+        )
+
+        assert [s.name for s in storage.search_symbols("", "repo")] == ["old"]
+        assert [s.name for s in storage.get_symbols_by_file("a.py", "repo")] == ["old"]
+        assert storage.get_file_fingerprints("repo")["a.py"].content_hash == "x"
+        assert (
+            storage.get_file_fingerprints("repo", generation)["a.py"].content_hash
+            == "y"
+        )
+
+        storage.activate_generation("repo", generation)
+        storage.wait_for_garbage_collection()
+
+        assert [s.name for s in storage.search_symbols("", "repo")] == ["new"]
+        assert storage.get_file_fingerprints("repo")["a.py"].content_hash == "y"
+        # The old generation has been garbage collected
+        conn = storage._get_connection()
+        assert conn.execute("SELECT COUNT(*) FROM symbols").fetchone()[0] == 1
+        assert conn.execute("SELECT COUNT(*) FROM file_manifest").fetchone()[0] == 1
+
+    def test_symbol_edits_leave_rebuild_untouched(self, storage):
+        """Test that single-symbol updates and deletes only see the active index."""
+        storage.insert_symbol(Symbol("f", SymbolKind.FUNCTION, "a.py", 1, 0, "repo"))
+        storage.record_file_fingerprint("repo", FileFingerprint("a.py", 1, 1, "x"))
+        generation = storage.begin_generation("repo")
+        storage.replace_file_symbols(
+            "repo",
+            "a.py",
+            [Symbol("f", SymbolKind.FUNCTION, "a.py", 1, 0, "repo")],
+            FileFingerprint("a.py", 2, 2, "y", symbol_count=1),
+            generation,
+        )
+        conn = storage._get_connection()
+        staged_id = conn.execute(
+            "SELECT id FROM symbols WHERE generation = ?", (generation,)
+        ).fetchone()[0]
+
+        storage.update_symbol(Symbol("f", SymbolKind.FUNCTION, "a.py", 7, 0, "repo"))
+        storage.delete_symbol(staged_id)
+
+        rows = conn.execute(
+            "SELECT generation, line_number FROM symbols ORDER BY generation"
+        ).fetchall()
+        assert [tuple(row) for row in rows] == [(0, 7), (generation, 1)]
+
+    def test_active_generation_completeness(self, storage):
+        """Test that only an in-place build leaves the active index incomplete."""
+        assert not storage.is_active_generation_complete("repo")
+
+        first = storage.begin_generation("repo")
+        storage.record_file_fingerprint("repo", FileFingerprint("a.py", 1, 1, "x"))
+        assert not storage.is_active_generation_complete("repo")
+        storage.activate_generation("repo", first)
+        assert storage.is_active_generation_complete("repo")
+
+        rebuild = storage.begin_generation("repo")
+        assert storage.is_active_generation_complete("repo")
+        storage.activate_generation("repo", rebuild)
+        assert storage.is_active_generation_complete("repo")
+
+    def test_generations_are_per_repository(self, storage):
+        """Test that activating a generation doesn't affect other repositories."""
+        storage.insert_symbol(Symbol("mine", SymbolKind.FUNCTION, "a.py", 1, 0, "repo"))
+        storage.insert_symbol(
+            Symbol("theirs", SymbolKind.FUNCTION, "a.py", 1, 0, "other")
+        )
+
+        generation = storage.begin_generation("repo")
+        storage.activate_generation("repo", generation)
+        storage.wait_for_garbage_collection()
+
+        assert storage.search_symbols("", "repo") == []
+        assert [s.name for s in storage.search_symbols("", "other")] == ["theirs"]
+        # Generation numbers are never reused
+        assert storage.begin_generation("repo") > generation
+
+    def test_collect_garbage_in_batches(self, storage, monkeypatch):
+        """Test that stale generations are deleted in bounded batches."""
+        monkeypatch.setattr("symbol_storage.GC_BATCH_ROWS", 2)
+        storage.insert_symbols(
+            [
+                Symbol(f"old_{i}", SymbolKind.FUNCTION, "a.py", i, 0, "repo")
+                for i in range(5)
+            ]
+        )
+        generation = storage.begin_generation("repo")
+        # Simulate a crash before the collection scheduled by the flip
+        conn = storage._get_connection()
+        conn.execute(
+            "UPDATE repository_generations SET active_generation = ?, "
+            "building_generation = NULL",
+            (generation,),
+        )
+        conn.commit()
+
+        assert storage.collect_garbage("repo") == 5
+        assert storage.collect_garbage("repo") == 0
+
+    def test_generation_migration_for_existing_database(self):
+        """Test that a database created before generations is migrated."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = Path(temp_dir) / "legacy.db"
+            conn = sqlite3.connect(str(db_path))
+            conn.executescript(
+                """
+                CREATE TABLE symbols (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    file_path TEXT NOT NULL,
+                    line_number INTEGER NOT NULL,
+                    column_number INTEGER NOT NULL,
+                    repository_id TEXT NOT NULL,
+                    docstring TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+                INSERT INTO symbols
+                (name, kind, file_path, line_number, column_number, repository_id)
+                VALUES ('legacy', 'function', 'a.py', 1, 0, 'repo');
+                CREATE TABLE file_manifest (
+                    repository_id TEXT NOT NULL,
+                    file_path TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    symbol_count INTEGER NOT NULL DEFAULT 0,
+                    indexed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (repository_id, file_path)
+                );
+                INSERT INTO file_manifest
+                (repository_id, file_path, size, mtime_ns, content_hash)
+                VALUES ('repo', 'a.py', 1, 1, 'x');
+            """
+            )
+            conn.commit()
+            conn.close()
+
+            storage = SQLiteSymbolStorage(db_path)
+            try:
+                assert [s.name for s in storage.search_symbols("legacy")] == ["legacy"]
+                # The old manifest is dropped so the next run rebuilds
+                assert storage.get_file_fingerprints("repo") == {}
+            finally:
+                storage.close()
+
     def test_abstract_base_class_interface(self, storage):
         """Test that SQLiteSymbolStorage implements all abstract methods."""
         # This ensures we haven't missed any required methods
@@ -375,6 +932,14 @@ class TestSQLiteSymbolStorage:
             "search_symbols",
             "get_symbol_by_id",
             "get_symbols_by_file",
+            "get_file_fingerprints",
+            "record_file_fingerprint",
+            "replace_file_symbols",
+            "delete_file_symbols",
+            "set_indexing_progress",
+            "get_indexing_progress",
+            "begin_generation",
+            "activate_generation",
         ]
 
         for method_name in abstract_methods: